@@ -0,0 +1,183 @@
+"""
+Compilation time benchmarks: cold compilation (with a per compiler pass
+breakdown), loading from the on-disk cache and adding generated LLVM IR to
+a code library.
+"""
+from __future__ import print_function, division, absolute_import
+
+import atexit
+import importlib.util
+import itertools
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+from llvmlite import ir
+from numba import njit
+from numba.core.compiler_lock import global_compiler_lock
+from numba.core.registry import cpu_target
+
+from harness import benchmark
+
+
+SOURCES = {
+    'scalar': """
+def func(a, b):
+    return a * b + 1
+""",
+    'loops': """
+def func(a, b):
+    acc = 0.0
+    for i in range(a.shape[0]):
+        for j in range(a.shape[1]):
+            if a[i, j] > b:
+                acc += a[i, j] ** 2
+            else:
+                acc -= a[i, j]
+    return acc
+""",
+    'arrays': """
+import numpy as np
+
+def func(a, b):
+    c = np.sin(a) * b + np.cos(a).T
+    d = c.sum(axis=0)
+    return np.argsort(d)[:3], c.max(), np.where(c > b, c, 0.0)
+""",
+}
+
+ARGS = {
+    'scalar': (1, 2.0),
+    'loops': (np.ones((3, 3)), 0.5),
+    'arrays': (np.ones((3, 3)), 0.5),
+}
+
+_counter = itertools.count()
+
+
+def _fresh_function(kind, **options):
+    """Return a newly created dispatcher, nothing is shared with previous
+    compilations of the same source.
+    """
+    ns = {}
+    exec(SOURCES[kind], ns)
+    return njit(**options)(ns['func'])
+
+
+def _pass_times(dispatcher):
+    """Sum the time spent in each compiler pass over all pipelines used."""
+    times = OrderedDict()
+    for md in dispatcher.get_metadata().values():
+        for pipeline, passes in md.get('pipeline_times', {}).items():
+            for key, timing in passes.items():
+                # keys are "<index>_<pass name>"
+                name = "%s.%s" % (pipeline, key.split('_', 1)[1])
+                total = (timing.init + timing.run + timing.finalize)
+                times[name] = times.get(name, 0.0) + total
+    return times
+
+
+@benchmark(params={'kind': sorted(SOURCES)}, repeat=5)
+def cold_compile(kind):
+    args = ARGS[kind]
+    # warm up the compiler itself (imports, lazy initialization)
+    _fresh_function(kind)(*args)
+    last = []
+
+    def run():
+        cfunc = _fresh_function(kind)
+        cfunc(*args)
+        last[:] = [cfunc]
+
+    def metrics():
+        return _pass_times(last[0]) if last else {}
+
+    return run, metrics
+
+
+class _CachedModule(object):
+    """A module written to a temporary directory so that its functions can
+    be cached, with a private cache directory.
+    """
+
+    def __init__(self, kind):
+        self.tempdir = tempfile.mkdtemp(prefix='numba-bench-')
+        self.path = os.path.join(self.tempdir, 'cached_%s.py' % kind)
+        with open(self.path, 'w') as fout:
+            fout.write("from numba import njit\n")
+            fout.write(SOURCES[kind])
+            fout.write("\nfunc = njit(cache=True)(func)\n")
+
+    def load(self):
+        name = 'numba_bench_cached_%d' % next(_counter)
+        spec = importlib.util.spec_from_file_location(name, self.path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+
+    def cleanup(self):
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+
+@benchmark(params={'kind': sorted(SOURCES)}, repeat=5)
+def cache_load(kind):
+    args = ARGS[kind]
+    module = _CachedModule(kind)
+    # populate the cache
+    module.load().func(*args)
+
+    def run():
+        cfunc = module.load().func
+        cfunc(*args)
+        assert cfunc.stats.cache_hits, "function was not loaded from cache"
+
+    atexit.register(module.cleanup)
+    return run
+
+
+def _generated_module(context, nblocks, refct):
+    """Build a LLVM IR module with a function of *nblocks* basic blocks
+    resembling the code generated for parfor gufuncs and stencils, with an
+    incref per block if *refct*.
+    """
+    module = context.create_module('bench_ir')
+    i64 = ir.IntType(64)
+    i8p = ir.IntType(8).as_pointer()
+    fn = ir.Function(module, ir.FunctionType(i64, [i8p, i64]), 'bench_func')
+    incref = ir.Function(module, ir.FunctionType(ir.VoidType(), [i8p]),
+                         'NRT_incref')
+    builder = ir.IRBuilder(fn.append_basic_block('entry'))
+    acc = fn.args[1]
+    for i in range(nblocks):
+        block = fn.append_basic_block()
+        builder.branch(block)
+        builder.position_at_end(block)
+        if refct:
+            builder.call(incref, [fn.args[0]])
+        acc = builder.add(builder.mul(acc, ir.Constant(i64, i + 3)),
+                          ir.Constant(i64, i))
+    builder.ret(acc)
+    return module
+
+
+@benchmark(params={'blocks': [100, 2000], 'refct': [False, True]},
+           repeat=5)
+def add_ir_module(blocks, refct):
+    context = cpu_target.target_context
+    codegen = context.codegen()
+    last = []
+
+    def run():
+        module = _generated_module(context, blocks, refct)
+        library = codegen.create_library('bench_ir')
+        with global_compiler_lock:
+            library.add_ir_module(module)
+            library.finalize()
+        last[:] = [library]
+
+    def metrics():
+        return last[0].compile_times if last else {}
+
+    return run, metrics
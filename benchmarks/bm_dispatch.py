@@ -0,0 +1,118 @@
+"""
+Dispatcher call overhead and argument typing (typeof) benchmarks.
+"""
+from __future__ import print_function, division, absolute_import
+
+from collections import namedtuple
+
+import numpy as np
+from numba import njit, typeof
+from numba.typed import Dict, List
+
+from harness import benchmark
+
+
+Point = namedtuple('Point', ['x', 'y'])
+
+
+def _arguments():
+    arr = np.zeros(10)
+    return {
+        'int': 1,
+        'float': 1.0,
+        'complex': 1j,
+        'bool': True,
+        'none': None,
+        'str': 'abc',
+        'array_1d': arr,
+        'array_2d_f': np.asfortranarray(np.zeros((3, 3))),
+        'array_0d': np.array(1.0),
+        'record': np.zeros(1, dtype=[('a', np.int32), ('b', np.float64)])[0],
+        'tuple': (1, 2.0, arr),
+        'unituple': (1, 2, 3, 4),
+        'nested_tuple': ((1, 2), (3.0, (arr, arr))),
+        'namedtuple': Point(1, 2.0),
+        'typed_list': _typed_list(),
+        'typed_dict': _typed_dict(),
+        'tuple_of_arrays': (arr, arr.copy(), arr.copy()),
+        'tuple_with_typed_dict': (arr, _typed_dict()),
+    }
+
+
+def _typed_list():
+    lst = List()
+    lst.append(1)
+    return lst
+
+
+def _typed_dict():
+    d = Dict()
+    d[1] = 1.0
+    return d
+
+
+ARG_KINDS = sorted(_arguments())
+
+
+@benchmark(params={'kind': ARG_KINDS}, number=10000)
+def typeof_arg(kind):
+    value = _arguments()[kind]
+    return lambda: typeof(value)
+
+
+@benchmark(params={'kind': ARG_KINDS}, number=10000)
+def call_identity(kind):
+    @njit
+    def identity(x):
+        return x
+
+    value = _arguments()[kind]
+    identity(value)
+    return lambda: identity(value)
+
+
+@benchmark(params={'nargs': [0, 1, 4, 8]}, number=10000)
+def call_nargs(nargs):
+    names = ['a%d' % i for i in range(nargs)]
+    src = "def f(%s):\n    return 0\n" % ", ".join(names)
+    ns = {}
+    exec(src, ns)
+    cfunc = njit(ns['f'])
+    args = tuple(range(nargs))
+    cfunc(*args)
+    return lambda: cfunc(*args)
+
+
+@benchmark(number=10000)
+def call_kwargs():
+    @njit
+    def f(a, b=1, c=2.0):
+        return a
+
+    f(1, c=3.0)
+    return lambda: f(1, c=3.0)
+
+
+@benchmark(params={'noverloads': [1, 8, 64]}, number=10000)
+def call_many_overloads(noverloads):
+    @njit
+    def f(x):
+        return x
+
+    # every array dimensionality/layout combination is a distinct signature
+    arrays = []
+    for ndim in range(1, 9):
+        for layout in ('C', 'F', 'A'):
+            shape = (1,) * ndim
+            arr = np.zeros(shape)
+            if layout == 'F':
+                arr = np.asfortranarray(arr)
+            elif layout == 'A':
+                arr = np.zeros((2,) * ndim)[(slice(None, None, 2),) * ndim]
+            arrays.append(arr)
+    dtypes = [np.float64, np.int64, np.float32]
+    values = [a.astype(dt) for dt in dtypes for a in arrays][:noverloads]
+    for v in values:
+        f(v)
+    last = values[-1]
+    return lambda: f(last)
@@ -3,7 +3,7 @@
 from __future__ import print_function, division, absolute_import
 import math
 from numba import jit
-from numba.utils import benchmark
+from harness import benchmark
 
 
 def py_factorCount(n):
@@ -58,6 +58,17 @@ def python_main():
     assert result == answer
 
 
+@benchmark(name='python', repeat=3)
+def bench_python():
+    return python_main
+
+
+@benchmark(name='numba', repeat=5)
+def bench_numba():
+    return numba_main
+
+
 if __name__ == '__main__':
-    print(benchmark(python_main))
-    print(benchmark(numba_main))
+    import harness
+    print(harness.measure(python_main, repeat=3))
+    print(harness.measure(numba_main))
@@ -2,7 +2,7 @@ from __future__ import absolute_import, print_function, division
 
 import numpy as np
 from numba import jit
-from numba.utils import benchmark
+from harness import benchmark
 
 
 def jacobi_relax_core(A, Anew):
@@ -60,6 +60,17 @@ def numba_main():
     run(numba_jacobi_relax_core)
 
 
+@benchmark(name='python', repeat=1)
+def bench_python():
+    return python_main
+
+
+@benchmark(name='numba', repeat=5)
+def bench_numba():
+    return numba_main
+
+
 if __name__ == '__main__':
-    print(benchmark(python_main))
-    print(benchmark(numba_main))
\ No newline at end of file
+    import harness
+    print(harness.measure(python_main, repeat=1))
+    print(harness.measure(numba_main))
\ No newline at end of file
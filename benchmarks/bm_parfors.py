@@ -0,0 +1,226 @@
+"""
+Scaling of parallel (parfor) kernels with the number of threads.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+from numba import njit, prange, config, set_num_threads
+
+from harness import benchmark
+
+
+def thread_counts():
+    counts = []
+    n = 1
+    while n < config.NUMBA_NUM_THREADS:
+        counts.append(n)
+        n *= 2
+    counts.append(config.NUMBA_NUM_THREADS)
+    return counts
+
+
+N = 4000000
+
+
+@njit(parallel=True)
+def array_expr(a, b):
+    return np.sqrt(a * a + b * b) + np.sin(a)
+
+
+@njit(parallel=True)
+def prange_reduction(a):
+    acc = 0.0
+    for i in prange(a.shape[0]):
+        acc += np.cos(a[i]) * a[i]
+    return acc
+
+
+@njit(parallel=True)
+def prange_irregular(n):
+    out = np.zeros(n)
+    for i in prange(n):
+        acc = 0.0
+        for j in range(i % 1024):
+            acc += j
+        out[i] = acc
+    return out
+
+
+@njit(parallel={'schedule': 'dynamic', 'chunksize': 64})
+def prange_irregular_dynamic(n):
+    out = np.zeros(n)
+    for i in prange(n):
+        acc = 0.0
+        for j in range(i % 1024):
+            acc += j
+        out[i] = acc
+    return out
+
+
+@njit(parallel=True)
+def scan_cumsum(a):
+    return np.cumsum(a)
+
+
+@njit(parallel=True)
+def parallel_sort(a):
+    return np.sort(a)
+
+
+@njit(parallel=True)
+def parallel_argsort(a):
+    return np.argsort(a, kind='mergesort')
+
+
+@njit(parallel=True)
+def parallel_histogram(a):
+    return np.histogram(a, 100, (0., 1.))
+
+
+@njit(parallel=True)
+def prange_bincount(idx, nbins):
+    counts = np.zeros(nbins, np.intp)
+    for i in prange(len(idx)):
+        counts[idx[i]] += 1
+    return counts
+
+
+@njit(parallel=True)
+def mask_compress(a):
+    return a[a > 0.5]
+
+
+@njit(parallel=True)
+def parallel_nonzero(a):
+    return np.nonzero(a > 0.5)
+
+
+@njit(parallel=True)
+def axis_mean(a, axis):
+    return np.mean(a, axis)
+
+
+@njit(parallel=True)
+def small_temporaries(points):
+    # allocation bound, compare NUMBA_NRT_ALLOCATOR=pool with the default
+    out = np.empty(points.shape[0])
+    for i in prange(points.shape[0]):
+        p = points[i] * 2.0
+        out[i] = np.sqrt((p * p).sum())
+    return out
+
+
+def row_temporaries(a, b, c):
+    out = np.empty(a.shape[0])
+    for i in range(a.shape[0]):
+        tmp = a[i] * b + c
+        out[i] = tmp.sum()
+    return out
+
+
+row_temporaries_scratch = njit(parallel=True)(row_temporaries)
+row_temporaries_noscratch = njit(parallel={'scratch': False})(row_temporaries)
+
+
+@njit(parallel={'autotune': True})
+def array_expr_autotuned(a, b):
+    return np.sqrt(a * a + b * b) + np.sin(a)
+
+
+def _with_threads(nthreads, func, *args):
+    func(*args)
+
+    def run():
+        set_num_threads(nthreads)
+        try:
+            func(*args)
+        finally:
+            set_num_threads(config.NUMBA_NUM_THREADS)
+    return run
+
+
+@benchmark(params={'threads': thread_counts()}, repeat=5)
+def array_expression(threads):
+    a = np.random.random(N)
+    b = np.random.random(N)
+    return _with_threads(threads, array_expr, a, b)
+
+
+@benchmark(params={'threads': thread_counts()}, repeat=5)
+def reduction(threads):
+    a = np.random.random(N)
+    return _with_threads(threads, prange_reduction, a)
+
+
+@benchmark(params={'threads': thread_counts()}, repeat=5)
+def cumsum(threads):
+    a = np.random.random(N)
+    return _with_threads(threads, scan_cumsum, a)
+
+
+@benchmark(params={'threads': thread_counts(),
+                   'func': ['sort', 'argsort']}, repeat=3, number=1)
+def sort(threads, func):
+    a = np.random.random(N)
+    func = parallel_sort if func == 'sort' else parallel_argsort
+    return _with_threads(threads, func, a)
+
+
+@benchmark(params={'threads': thread_counts(),
+                   'func': ['histogram', 'prange']}, repeat=5)
+def histogram(threads, func):
+    a = np.random.random(N)
+    if func == 'histogram':
+        return _with_threads(threads, parallel_histogram, a)
+    return _with_threads(threads, prange_bincount, (a * 1000).astype(np.intp),
+                         1000)
+
+
+@benchmark(params={'threads': thread_counts(),
+                   'func': ['mask', 'nonzero']}, repeat=5)
+def compress(threads, func):
+    a = np.random.random(N)
+    func = mask_compress if func == 'mask' else parallel_nonzero
+    return _with_threads(threads, func, a)
+
+
+@benchmark(params={'threads': thread_counts(), 'axis': [0, 1]}, repeat=5)
+def axis_reduction(threads, axis):
+    a = np.random.random((N // 64, 64))
+    return _with_threads(threads, axis_mean, a, axis)
+
+
+@benchmark(params={'threads': thread_counts(),
+                   'schedule': ['static', 'dynamic']}, repeat=5)
+def irregular_loop(threads, schedule):
+    func = (prange_irregular if schedule == 'static'
+            else prange_irregular_dynamic)
+    return _with_threads(threads, func, 20000)
+
+
+@benchmark(params={'threads': thread_counts()}, repeat=5)
+def small_allocations(threads):
+    points = np.random.random((N // 16, 3))
+    return _with_threads(threads, small_temporaries, points)
+
+
+@benchmark(params={'scratch': [False, True]}, repeat=5)
+def loop_temporaries(scratch):
+    a = np.random.random((N // 1000, 1000))
+    b = np.random.random(1000)
+    c = np.random.random(1000)
+    func = row_temporaries_scratch if scratch else row_temporaries_noscratch
+    func(a, b, c)
+    return lambda: func(a, b, c)
+
+
+@benchmark(params={'size': [10, 1000, 100000],
+                   'autotune': [False, True]}, number=100)
+def small_array_expression(size, autotune):
+    func = array_expr_autotuned if autotune else array_expr
+    a = np.random.random(size)
+    b = np.random.random(size)
+    # let the autotuned loop settle on its thread count
+    for _ in range(100):
+        func(a, b)
+    return lambda: func(a, b)
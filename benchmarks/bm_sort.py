@@ -0,0 +1,60 @@
+"""
+Sorting benchmarks, comparing the sort kinds on typical keys.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+from numba import njit
+
+from harness import benchmark
+
+
+SIZE = 1000000
+
+KINDS = ['quicksort', 'mergesort', 'radix']
+
+# The kind must be a compile-time constant
+SORTS = {
+    'quicksort': njit(lambda a: np.sort(a, kind='quicksort')),
+    'mergesort': njit(lambda a: np.sort(a, kind='mergesort')),
+    'radix': njit(lambda a: np.sort(a, kind='radix')),
+}
+
+ARGSORTS = {
+    'quicksort': njit(lambda a: np.argsort(a, kind='quicksort')),
+    'mergesort': njit(lambda a: np.argsort(a, kind='mergesort')),
+    'radix': njit(lambda a: np.argsort(a, kind='radix')),
+}
+
+
+def _keys(keys):
+    if keys == 'int64_ids':
+        return np.random.randint(0, 2 ** 31, SIZE).astype(np.int64)
+    elif keys == 'int32_small':
+        return np.random.randint(0, 1000, SIZE).astype(np.int32)
+    elif keys == 'float64':
+        return np.random.standard_normal(SIZE)
+    elif keys == 'datetime64':
+        start = np.datetime64('2020-01-01T00:00:00', 'ns').astype(np.int64)
+        offsets = np.random.randint(0, 10 ** 15, SIZE)
+        return (start + offsets).astype('M8[ns]')
+    raise ValueError(keys)
+
+
+KEYS = ['int64_ids', 'int32_small', 'float64', 'datetime64']
+
+
+@benchmark(params={'kind': KINDS, 'keys': KEYS}, repeat=5, number=1)
+def sort(kind, keys):
+    arr = _keys(keys)
+    func = SORTS[kind]
+    func(arr)
+    return lambda: func(arr)
+
+
+@benchmark(params={'kind': KINDS, 'keys': KEYS}, repeat=5, number=1)
+def argsort(kind, keys):
+    arr = _keys(keys)
+    func = ARGSORTS[kind]
+    func(arr)
+    return lambda: func(arr)
@@ -0,0 +1,116 @@
+"""
+Stencil kernels, compiled sequentially and with parallel=True.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+from numba import njit, prange, stencil
+
+from harness import benchmark
+
+
+N = 2048
+
+
+def laplace_kernel(a):
+    return a[-1, 0] + a[1, 0] + a[0, -1] + a[0, 1] - 4 * a[0, 0]
+
+
+laplace_constant = stencil(laplace_kernel)
+laplace_wrap = stencil(laplace_kernel, mode='wrap')
+
+
+@njit
+def laplace_padded_seq(p):
+    return laplace_constant(p)[1:-1, 1:-1].copy()
+
+
+@njit(parallel=True)
+def laplace_padded_par(p):
+    return laplace_constant(p)[1:-1, 1:-1].copy()
+
+
+@njit
+def laplace_wrap_seq(a):
+    return laplace_wrap(a)
+
+
+@njit(parallel=True)
+def laplace_wrap_par(a):
+    return laplace_wrap(a)
+
+
+@benchmark(params={'border': ['pad', 'mode'],
+                   'parallel': [False, True]}, repeat=5)
+def periodic_laplace(border, parallel):
+    """
+    A periodic Laplacian, computed from a copy padded with np.pad() or
+    with the 'wrap' border mode.
+    """
+    a = np.random.random((N, N))
+    if border == 'pad':
+        func = laplace_padded_par if parallel else laplace_padded_seq
+
+        def run():
+            return func(np.pad(a, 1, mode='wrap'))
+    else:
+        func = laplace_wrap_par if parallel else laplace_wrap_seq
+
+        def run():
+            return func(a)
+    run()
+    return run
+
+
+# A 7-point Laplacian on a grid too large for the caches, tiled or not
+N3 = 256
+
+
+def laplace3d_kernel(a):
+    return (a[-1, 0, 0] + a[1, 0, 0] + a[0, -1, 0] + a[0, 1, 0] +
+            a[0, 0, -1] + a[0, 0, 1] - 6 * a[0, 0, 0])
+
+
+laplace3d = stencil(laplace3d_kernel)
+laplace3d_tiled = stencil(laplace3d_kernel, tile=True)
+
+
+@njit(parallel=True)
+def laplace3d_par(a):
+    return laplace3d(a)
+
+
+@njit(parallel=True)
+def laplace3d_tiled_par(a):
+    return laplace3d_tiled(a)
+
+
+def jacobi3d(a, out):
+    n, m, k = a.shape
+    for i in prange(1, n - 1):
+        for j in prange(1, m - 1):
+            for l in prange(1, k - 1):
+                out[i, j, l] = (a[i - 1, j, l] + a[i + 1, j, l] +
+                                a[i, j - 1, l] + a[i, j + 1, l] +
+                                a[i, j, l - 1] + a[i, j, l + 1]) / 6.
+
+
+jacobi3d_par = njit(parallel=True)(jacobi3d)
+jacobi3d_tiled_par = njit(parallel={'tiling': True})(jacobi3d)
+
+
+@benchmark(params={'tiled': [False, True]}, repeat=5)
+def stencil_laplace3d(tiled):
+    a = np.random.random((N3, N3, N3))
+    func = laplace3d_tiled_par if tiled else laplace3d_par
+    func(a)
+    return lambda: func(a)
+
+
+@benchmark(params={'tiled': [False, True]}, repeat=5)
+def prange_jacobi3d(tiled):
+    a = np.random.random((N3, N3, N3))
+    out = np.zeros_like(a)
+    func = jacobi3d_tiled_par if tiled else jacobi3d_par
+    func(a, out)
+    return lambda: func(a, out)
@@ -0,0 +1,135 @@
+"""
+Typed container (numba.typed.Dict and numba.typed.List) benchmarks, both from
+compiled code and from the interpreter.
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+from numba import njit, types
+from numba.typed import Dict, List
+
+from harness import benchmark
+
+
+SIZE = 100000
+
+
+@njit
+def dict_build(keys, values):
+    d = Dict.empty(types.int64, types.float64)
+    for i in range(keys.size):
+        d[keys[i]] = values[i]
+    return d
+
+
+@njit
+def dict_build_presized(keys, values):
+    d = Dict.empty(types.int64, types.float64, n_keys=keys.size)
+    for i in range(keys.size):
+        d[keys[i]] = values[i]
+    return d
+
+
+@njit
+def dict_lookup(d, keys):
+    acc = 0.0
+    for i in range(keys.size):
+        acc += d[keys[i]]
+    return acc
+
+
+@njit
+def dict_delete(d, keys):
+    for i in range(keys.size):
+        del d[keys[i]]
+
+
+@njit
+def list_build(values):
+    lst = List.empty_list(types.float64)
+    for i in range(values.size):
+        lst.append(values[i])
+    return lst
+
+
+@njit
+def list_sum(lst):
+    acc = 0.0
+    for x in lst:
+        acc += x
+    return acc
+
+
+def _data():
+    keys = np.random.permutation(SIZE).astype(np.int64)
+    values = np.random.random(SIZE)
+    return keys, values
+
+
+@benchmark(repeat=5)
+def jit_dict_build():
+    keys, values = _data()
+    dict_build(keys, values)
+    return lambda: dict_build(keys, values)
+
+
+@benchmark(repeat=5)
+def jit_dict_build_presized():
+    keys, values = _data()
+    dict_build_presized(keys, values)
+    return lambda: dict_build_presized(keys, values)
+
+
+@benchmark(repeat=5)
+def jit_dict_lookup():
+    keys, values = _data()
+    d = dict_build(keys, values)
+    dict_lookup(d, keys)
+    return lambda: dict_lookup(d, keys)
+
+
+@benchmark(repeat=5)
+def jit_dict_build_delete():
+    keys, values = _data()
+    dict_delete(dict_build(keys, values), keys)
+    return lambda: dict_delete(dict_build(keys, values), keys)
+
+
+@benchmark(repeat=5)
+def jit_list_build():
+    _, values = _data()
+    list_build(values)
+    return lambda: list_build(values)
+
+
+@benchmark(repeat=5)
+def jit_list_iterate():
+    _, values = _data()
+    lst = list_build(values)
+    list_sum(lst)
+    return lambda: list_sum(lst)
+
+
+@benchmark(number=1000)
+def interp_dict_setitem():
+    d = dict_build(*_data())
+    return lambda: d.__setitem__(1, 2.0)
+
+
+@benchmark(number=1000)
+def interp_dict_getitem():
+    d = dict_build(*_data())
+    d[1] = 2.0
+    return lambda: d[1]
+
+
+@benchmark(number=1000)
+def interp_list_append():
+    lst = list_build(_data()[1])
+    return lambda: lst.append(1.0)
+
+
+@benchmark(number=1000)
+def interp_list_getitem():
+    lst = list_build(_data()[1])
+    return lambda: lst[10]
@@ -0,0 +1,52 @@
+"""
+Throughput of ufuncs created with @vectorize for the cpu and parallel
+targets, against the equivalent NumPy expression.
+"""
+from __future__ import print_function, division, absolute_import
+
+import math
+
+import numpy as np
+from numba import vectorize
+
+from harness import benchmark
+
+
+SIZES = [1000, 1000000]
+
+
+def poly(x, y):
+    return 3.0 * x * x + 2.0 * y + math.exp(-x)
+
+
+def numpy_poly(x, y):
+    return 3.0 * x * x + 2.0 * y + np.exp(-x)
+
+
+SIGNATURES = ['float64(float64, float64)', 'float32(float32, float32)']
+
+
+UFUNCS = {
+    'numpy': numpy_poly,
+    'cpu': vectorize(SIGNATURES, target='cpu')(poly),
+    'parallel': vectorize(SIGNATURES, target='parallel')(poly),
+}
+
+
+@benchmark(params={'target': sorted(UFUNCS), 'size': SIZES,
+                   'dtype': ['float32', 'float64']}, number=10)
+def binary_ufunc(target, size, dtype):
+    x = np.random.random(size).astype(dtype)
+    y = np.random.random(size).astype(dtype)
+    func = UFUNCS[target]
+    func(x, y)
+    return lambda: func(x, y)
+
+
+@benchmark(params={'target': ['cpu', 'parallel']}, number=10)
+def broadcast_ufunc(target):
+    x = np.random.random((1000, 1))
+    y = np.random.random(1000)
+    func = UFUNCS[target]
+    func(x, y)
+    return lambda: func(x, y)
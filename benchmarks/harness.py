@@ -0,0 +1,186 @@
+"""
+Minimal benchmark harness for the scripts in this directory.
+
+Benchmarks are registered with the ``benchmark`` decorator.  The decorated
+function is a *factory*: it performs any (untimed) setup and returns the
+no-argument callable that is timed.  Factories may also return a
+``(callable, metrics)`` pair where ``metrics`` is a function returning a dict
+of extra measurements (e.g. per-stage compile times) recorded alongside the
+timings.
+"""
+from __future__ import print_function, division, absolute_import
+
+import gc
+import itertools
+import json
+import math
+import os
+import platform
+import sys
+import timeit
+from collections import OrderedDict, namedtuple
+
+
+FORMAT_VERSION = 1
+
+Case = namedtuple('Case', ['name', 'factory', 'params', 'repeat', 'number'])
+
+_registry = OrderedDict()
+
+
+def benchmark(name=None, params=None, repeat=5, number=1):
+    """Register a benchmark factory.
+
+    *params* maps parameter names to sequences of values, the factory is
+    called with every combination of them as keyword arguments.  *repeat* is
+    the number of timing samples and *number* the number of calls per sample.
+    """
+    def decorator(factory):
+        module = factory.__module__
+        if module.startswith('bm_'):
+            module = module[len('bm_'):]
+        casename = "%s.%s" % (module, name or factory.__name__)
+        _registry[casename] = Case(casename, factory, params or {}, repeat,
+                                   number)
+        return factory
+    return decorator
+
+
+def registered_cases():
+    return list(_registry.values())
+
+
+def expand_params(params):
+    """Yield every combination of *params* as an ordered dict."""
+    keys = sorted(params)
+    for values in itertools.product(*(params[k] for k in keys)):
+        yield OrderedDict(zip(keys, values))
+
+
+def case_id(name, params):
+    if not params:
+        return name
+    return "%s[%s]" % (name, ",".join("%s=%s" % kv for kv in params.items()))
+
+
+def measure(func, repeat=5, number=1):
+    """Time *number* calls of *func*, *repeat* times.  Returns a dict of
+    per-call statistics in seconds.
+    """
+    timer = timeit.Timer(func)
+    gcold = gc.isenabled()
+    gc.disable()
+    try:
+        samples = [t / number for t in timer.repeat(repeat, number)]
+    finally:
+        if gcold:
+            gc.enable()
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    var = sum((s - mean) ** 2 for s in samples) / len(samples)
+    mid = len(samples) // 2
+    if len(samples) % 2:
+        median = samples[mid]
+    else:
+        median = (samples[mid - 1] + samples[mid]) / 2
+    return OrderedDict([('best', samples[0]),
+                        ('median', median),
+                        ('mean', mean),
+                        ('stdev', math.sqrt(var)),
+                        ('repeat', repeat),
+                        ('number', number)])
+
+
+def run_case(case, params, scale=1.0):
+    made = case.factory(**params)
+    if isinstance(made, tuple):
+        func, metrics = made
+    else:
+        func, metrics = made, None
+    repeat = max(1, int(round(case.repeat * scale)))
+    number = max(1, int(round(case.number * scale)))
+    result = OrderedDict([('name', case.name),
+                          ('params', params)])
+    result.update(measure(func, repeat=repeat, number=number))
+    if metrics is not None:
+        result['metrics'] = metrics()
+    return result
+
+
+def environment():
+    """Describe the software and hardware the results were obtained with."""
+    import numpy
+    import numba
+    env = OrderedDict()
+    env['python'] = platform.python_version()
+    env['implementation'] = platform.python_implementation()
+    env['platform'] = platform.platform()
+    env['machine'] = platform.machine()
+    env['processor'] = platform.processor()
+    env['cpu_count'] = os.cpu_count()
+    env['numpy'] = numpy.__version__
+    env['numba'] = numba.__version__
+    env['num_threads'] = numba.config.NUMBA_NUM_THREADS
+    env['threading_layer'] = numba.config.THREADING_LAYER
+    return env
+
+
+def write_results(path, results):
+    doc = OrderedDict([('version', FORMAT_VERSION),
+                       ('environment', environment()),
+                       ('results', results)])
+    if path == '-':
+        json.dump(doc, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(path, 'w') as fout:
+            json.dump(doc, fout, indent=2)
+
+
+def load_results(path):
+    with open(path) as fin:
+        doc = json.load(fin)
+    if doc.get('version') != FORMAT_VERSION:
+        raise ValueError("%s: unsupported results format version %r"
+                         % (path, doc.get('version')))
+    return doc
+
+
+Comparison = namedtuple('Comparison', ['id', 'baseline', 'current', 'ratio',
+                                       'status'])
+
+
+def compare(baseline, current, threshold=0.1, stat='best'):
+    """Compare two results documents.  A case whose *stat* timing is more
+    than *threshold* (a fraction) slower than in the baseline is reported as
+    a regression, more than *threshold* faster as an improvement.
+    """
+    def index(doc):
+        return OrderedDict((case_id(r['name'], OrderedDict(r['params'])), r)
+                           for r in doc['results'])
+
+    base = index(baseline)
+    comparisons = []
+    for cid, res in index(current).items():
+        if cid not in base:
+            comparisons.append(Comparison(cid, None, res[stat], None, 'new'))
+            continue
+        old = base[cid][stat]
+        ratio = res[stat] / old if old > 0 else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 - threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        comparisons.append(Comparison(cid, old, res[stat], ratio, status))
+    return comparisons
+
+
+def format_time(seconds):
+    if seconds is None:
+        return '-'
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6), ('ns', 1e9)):
+        if seconds * scale >= 1:
+            return "%.3g %s" % (seconds * scale, unit)
+    return "%.3g ns" % (seconds * 1e9)
@@ -1,90 +1,120 @@
 #! /usr/bin/env python
+"""
+Run the benchmark suite, optionally storing the results as JSON and
+comparing them against a stored baseline.
+
+    python runall.py                          # run and print everything
+    python runall.py -k dispatch -o out.json  # run a subset, store results
+    python runall.py --baseline base.json     # fail on regressions
+"""
 from __future__ import print_function, division, absolute_import
+
+import argparse
+import fnmatch
 import os
-import numpy as np
-from matplotlib import pyplot
-from numba.utils import benchmark
+import sys
+from importlib import import_module
 
+HERE = os.path.dirname(os.path.abspath(__file__))
 BENCHMARK_PREFIX = 'bm_'
 
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
 
-def discover_files(startdir=os.curdir):
-    for root, dirs, files in os.walk(startdir):
-        for path in files:
-            if path.startswith(BENCHMARK_PREFIX):
-                fullpath = os.path.join(root, path)
-                yield fullpath
-
-
-try:
-    from importlib import import_module
-except ImportError:
-    # Approximative fallback for Python < 2.7
-    def import_module(modulename):
-        module = __import__(modulename)
-        for comp in modulename.split('.')[:-1]:
-            module = getattr(module, comp)
-        return module
+import harness  # noqa: E402
 
 
-def discover_modules():
-    for fullpath in discover_files():
-        path = os.path.relpath(fullpath)
+def discover_modules(startdir=HERE):
+    for path in sorted(os.listdir(startdir)):
         root, ext = os.path.splitext(path)
-        if ext != '.py':
-            continue
-        modulename = root.replace(os.path.sep, '.')
-        yield import_module(modulename)
-
-
-def discover():
-    for m in discover_modules():
-        yield m.main
-
-
-def run(mod):
-
-    name = mod.__name__[len(BENCHMARK_PREFIX):]
-    print('running', name, end=' ...\n')
-
-    bmr = benchmark(mod.python_main)
-    python_best = bmr.best
-    print('\tpython', python_best, 'seconds')
-
-    bmr = benchmark(mod.numba_main)
-    numba_best = bmr.best
-    print('\tnumba', numba_best, 'seconds')
-
-    print('\tspeedup', python_best / numba_best)
-
-    return name, numba_best / python_best
-
-
-def main():
-    # Generate timings
-    labels = []
-    scores = []
-    for mod in discover_modules():
-        label, result = run(mod)
-        labels.append(label)
-        scores.append(result)
-
-    # Plot
-    width = 0.8
-    ind = np.arange(len(labels))
-    fig, ax = pyplot.subplots()
-
-    ax.bar(ind, scores, width)
-
-    # Draw horizontal line at y=1
-    ax.axhline(y=1, xmax=ind[-1], color='r')
-
-    ax.set_ylabel('Normalized to CPython')
-    ax.set_title('Numba Benchmark')
-    ax.set_xticks(ind + (width/2))
-    ax.set_xticklabels(labels)
+        if path.startswith(BENCHMARK_PREFIX) and ext == '.py':
+            yield import_module(root)
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('-k', '--select', action='append', default=[],
+                        metavar='PATTERN',
+                        help="only run benchmarks whose name contains "
+                             "PATTERN (glob patterns are accepted), may be "
+                             "repeated")
+    parser.add_argument('-o', '--output', metavar='FILE',
+                        help="write the results as JSON to FILE ('-' for "
+                             "stdout)")
+    parser.add_argument('-b', '--baseline', metavar='FILE',
+                        help="compare against the results stored in FILE "
+                             "and exit with status 1 on regressions")
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help="relative slowdown reported as a regression "
+                             "(default: %(default)s)")
+    parser.add_argument('--stat', default='best',
+                        choices=['best', 'median', 'mean'],
+                        help="statistic used for the comparison "
+                             "(default: %(default)s)")
+    parser.add_argument('--quick', action='store_true',
+                        help="take fewer samples, for smoke testing")
+    parser.add_argument('-l', '--list', action='store_true',
+                        help="list the benchmarks and exit")
+    return parser
+
+
+def selected(cid, patterns):
+    if not patterns:
+        return True
+    for pat in patterns:
+        if pat in cid or fnmatch.fnmatch(cid, pat):
+            return True
+    return False
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    for _ in discover_modules():
+        pass
+
+    log = sys.stderr if args.output == '-' else sys.stdout
+    scale = 0.2 if args.quick else 1.0
+    results = []
+    for case in harness.registered_cases():
+        for params in harness.expand_params(case.params):
+            cid = harness.case_id(case.name, params)
+            if not selected(cid, args.select):
+                continue
+            if args.list:
+                print(cid, file=log)
+                continue
+            res = harness.run_case(case, params, scale=scale)
+            results.append(res)
+            print("%-60s %10s  (median %s)"
+                  % (cid, harness.format_time(res['best']),
+                     harness.format_time(res['median'])), file=log)
+            log.flush()
+    if args.list:
+        return 0
+
+    if args.output:
+        harness.write_results(args.output, results)
+
+    if args.baseline:
+        baseline = harness.load_results(args.baseline)
+        current = {'results': results}
+        comparisons = harness.compare(baseline, current,
+                                      threshold=args.threshold, stat=args.stat)
+        print("\nComparison against %s (%s, threshold %.0f%%):"
+              % (args.baseline, args.stat, args.threshold * 100), file=log)
+        regressions = 0
+        for c in comparisons:
+            ratio = '-' if c.ratio is None else "%.2fx" % c.ratio
+            print("%-60s %10s -> %10s %7s  %s"
+                  % (c.id, harness.format_time(c.baseline),
+                     harness.format_time(c.current), ratio, c.status),
+                  file=log)
+            regressions += c.status == 'regression'
+        if regressions:
+            print("\n%d regression(s) found" % regressions, file=log)
+            return 1
+    return 0
 
-    pyplot.show()
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
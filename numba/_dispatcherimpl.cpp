@@ -1,22 +1,121 @@
 #include "core/typeconv/typeconv.hpp"
+#include <algorithm>
 #include <cassert>
 #include <vector>
 
 typedef std::vector<Type> TypeTable;
 typedef std::vector<void*> Functions;
 
+/*
+ * A hash table mapping signatures (arrays of *argct* typecodes) to
+ * overload indices, using open addressing with linear probing.
+ */
+class SignatureTable {
+public:
+    // Values returned by find() besides overload indices
+    enum { NOT_FOUND = -1, AMBIGUOUS = -2 };
+
+    SignatureTable(int argct): argct(argct), used(0) { }
+
+    int find(const Type sig[]) const {
+        const size_t capacity = values.size();
+        if (capacity == 0)
+            return NOT_FOUND;
+        size_t i = hash(sig) & (capacity - 1);
+        while (values[i] != EMPTY) {
+            if (equal(&keys[i * argct], sig))
+                return values[i];
+            i = (i + 1) & (capacity - 1);
+        }
+        return NOT_FOUND;
+    }
+
+    /* Insert *value* for *sig*, marking the signature ambiguous if it
+       was already present with another value. */
+    void insert(const Type sig[], int value) {
+        if (2 * (used + 1) > values.size())
+            grow();
+        const size_t capacity = values.size();
+        size_t i = hash(sig) & (capacity - 1);
+        while (values[i] != EMPTY) {
+            if (equal(&keys[i * argct], sig)) {
+                if (values[i] != value)
+                    values[i] = AMBIGUOUS;
+                return;
+            }
+            i = (i + 1) & (capacity - 1);
+        }
+        std::copy(sig, sig + argct, keys.begin() + i * argct);
+        values[i] = value;
+        used++;
+    }
+
+    void clear() {
+        keys.clear();
+        values.clear();
+        used = 0;
+    }
+
+private:
+    enum { EMPTY = -3 };
+
+    size_t hash(const Type sig[]) const {
+        // FNV-1a
+        size_t x = 2166136261U;
+        for (int j = 0; j < argct; ++j) {
+            x = (x ^ (unsigned int) sig[j]) * 16777619U;
+        }
+        return x ^ (x >> 16);
+    }
+
+    bool equal(const Type a[], const Type b[]) const {
+        for (int j = 0; j < argct; ++j) {
+            if (a[j] != b[j])
+                return false;
+        }
+        return true;
+    }
+
+    void grow() {
+        const size_t old_capacity = values.size();
+        const size_t capacity = old_capacity ? 2 * old_capacity : 8;
+        TypeTable old_keys(capacity * argct);
+        std::vector<int> old_values(capacity, (int) EMPTY);
+        old_keys.swap(keys);
+        old_values.swap(values);
+        used = 0;
+        for (size_t i = 0; i < old_capacity; ++i) {
+            if (old_values[i] != EMPTY)
+                insert(&old_keys[i * argct], old_values[i]);
+        }
+    }
+
+    const int argct;
+    // A flattened array of the keys of all slots
+    TypeTable keys;
+    // The values of all slots, EMPTY for unused slots
+    std::vector<int> values;
+    size_t used;
+};
+
 struct _opaque_dispatcher {};
 
 class Dispatcher: public _opaque_dispatcher {
 public:
-    Dispatcher(TypeManager *tm, int argct): argct(argct), tm(tm) { }
+    Dispatcher(TypeManager *tm, int argct)
+        : argct(argct), tm(tm), exact(argct),
+          resolved_safe(argct), resolved_unsafe(argct),
+          tm_generation(tm->getGeneration()) { }
 
     void addDefinition(Type args[], void *callable) {
         overloads.reserve(argct + overloads.size());
         for (int i=0; i<argct; ++i) {
             overloads.push_back(args[i]);
         }
+        exact.insert(args, functions.size());
         functions.push_back(callable);
+        // A new overload may be a better match for memoized signatures
+        clearResolved();
     }
 
     void* resolve(Type sig[], int &matches, bool allow_unsafe,
@@ -31,14 +130,39 @@ public:
         if (argct == 0) {
             // Nullary function: trivial match on first overload
             matches = 1;
-            selected = 0;
+            return functions[0];
         }
-        else {
-            matches = tm->selectOverload(sig, &overloads[0], selected, argct,
-                                         ovct, allow_unsafe,
-                                         exact_match_required);
+        // Fast path: an exact match is always the single best match
+        selected = exact.find(sig);
+        if (selected >= 0) {
+            matches = 1;
+            return functions[selected];
+        }
+        if (selected == SignatureTable::NOT_FOUND && exact_match_required) {
+            return NULL;
         }
+        // Look for a previously resolved conversion-based match
+        if (tm_generation != tm->getGeneration()) {
+            // New conversions may change the resolutions
+            clearResolved();
+            tm_generation = tm->getGeneration();
+        }
+        SignatureTable &resolved = allow_unsafe ? resolved_unsafe
+                                                : resolved_safe;
+        if (!exact_match_required) {
+            selected = resolved.find(sig);
+            if (selected >= 0) {
+                matches = 1;
+                return functions[selected];
+            }
+        }
+        // Slow path: search all overloads for the best conversions
+        matches = tm->selectOverload(sig, &overloads[0], selected, argct,
+                                     ovct, allow_unsafe,
+                                     exact_match_required);
         if (matches == 1) {
+            if (!exact_match_required)
+                resolved.insert(sig, selected);
             return functions[selected];
         }
         return NULL;
@@ -49,9 +173,16 @@ public:
     void clear() {
         functions.clear();
         overloads.clear();
+        exact.clear();
+        clearResolved();
     }
 
 private:
+    void clearResolved() {
+        resolved_safe.clear();
+        resolved_unsafe.clear();
+    }
+
     const int argct;
     TypeManager *tm;
     // An array of overloads
@@ -59,6 +190,14 @@ private:
     // A flattened array of argument types to all overloads
     // (invariant: sizeof(overloads) == argct * sizeof(functions))
     TypeTable overloads;
+    // The overloads by their exact signature
+    SignatureTable exact;
+    // The overloads selected by conversion-based resolutions, with
+    // and without unsafe conversions allowed
+    SignatureTable resolved_safe;
+    SignatureTable resolved_unsafe;
+    // The TypeManager generation the resolutions are valid for
+    unsigned int tm_generation;
 };
 
 
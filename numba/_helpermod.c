@@ -131,6 +131,9 @@ build_c_helpers_dict(void)
     /* for dictionary support */
     declmethod(test_dict);
     declmethod(dict_new_minsize);
+    declmethod(dict_new_sized);
+    declmethod(dict_reserve);
+    declmethod(dict_sizeof);
     declmethod(dict_set_method_table);
     declmethod(dict_free);
     declmethod(dict_length);
@@ -151,11 +154,13 @@ build_c_helpers_dict(void)
     declmethod(list_free);
     declmethod(list_length);
     declmethod(list_allocated);
+    declmethod(list_base_ptr);
     declmethod(list_is_mutable);
     declmethod(list_set_is_mutable);
     declmethod(list_setitem);
     declmethod(list_getitem);
     declmethod(list_append);
+    declmethod(list_append_n);
     declmethod(list_pop);
     declmethod(list_delete_slice);
     declmethod(list_iter_sizeof);
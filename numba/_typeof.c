@@ -40,6 +40,7 @@ static PyObject *structured_dtypes;
 static PyObject *str_typeof_pyval = NULL;
 static PyObject *str_value = NULL;
 static PyObject *str_numba_type = NULL;
+static PyObject *str_code = NULL;
 
 
 /*
@@ -185,7 +186,8 @@ enum opcode {
     OP_BUFFER = 'B',
     OP_NP_SCALAR = 'S',
     OP_NP_ARRAY = 'A',
-    OP_NP_DTYPE = 'D'
+    OP_NP_DTYPE = 'D',
+    OP_NUMBA_TYPE = 'T'
 };
 
 #define TRY(func, w, arg) \
@@ -238,6 +240,43 @@ compute_dtype_fingerprint(string_writer_t *w, PyArray_Descr *descr)
     return fingerprint_unrecognized((PyObject *) descr);
 }
 
+/*
+ * Fingerprint a value whose class defines "_numba_type_" (typed containers,
+ * jitclass instances...) with the typecode of its Numba type, so that such
+ * values can be fingerprinted alone or nested in tuples.  Typecodes are
+ * never reused, and the types are kept alive by the fingerprint cache once
+ * a fingerprint including them is cached, so this is collision-free.
+ */
+static int
+compute_numba_type_fingerprint(string_writer_t *w, PyObject *val)
+{
+    PyObject *numba_type, *tmpcode;
+    long typecode;
+
+    numba_type = PyObject_GetAttr(val, str_numba_type);
+    if (numba_type == NULL)
+        return -1;
+    tmpcode = PyObject_GetAttr(numba_type, str_code);
+    Py_DECREF(numba_type);
+    if (tmpcode == NULL) {
+        /* _numba_type_ didn't give a Numba type */
+        if (!PyErr_ExceptionMatches(PyExc_AttributeError))
+            return -1;
+        PyErr_Clear();
+        return fingerprint_unrecognized(val);
+    }
+    if (!PyLong_Check(tmpcode)) {
+        Py_DECREF(tmpcode);
+        return fingerprint_unrecognized(val);
+    }
+    typecode = PyLong_AsLong(tmpcode);
+    Py_DECREF(tmpcode);
+    if (typecode == -1 && PyErr_Occurred())
+        return -1;
+    TRY(string_writer_put_char, w, OP_NUMBA_TYPE);
+    return string_writer_put_intp(w, (npy_intp) typecode);
+}
+
 static int
 compute_fingerprint(string_writer_t *w, PyObject *val)
 {
@@ -376,6 +415,10 @@ compute_fingerprint(string_writer_t *w, PyObject *val)
         TRY(string_writer_put_char, w, OP_NP_DTYPE);
         return compute_dtype_fingerprint(w, (PyArray_Descr *) val);
     }
+    /* Only look at the class, to avoid raising and clearing an
+       AttributeError for every unrecognized value */
+    if (_PyType_Lookup(Py_TYPE(val), str_numba_type) != NULL)
+        return compute_numba_type_fingerprint(w, val);
 
 _unrecognized:
     /* Type not recognized */
@@ -893,7 +936,8 @@ typeof_init(PyObject *self, PyObject *args)
     str_typeof_pyval = PyString_InternFromString("typeof_pyval");
     str_value = PyString_InternFromString("value");
     str_numba_type = PyString_InternFromString("_numba_type_");
-    if (!str_value || !str_typeof_pyval || !str_numba_type)
+    str_code = PyString_InternFromString("_code");
+    if (!str_value || !str_typeof_pyval || !str_numba_type || !str_code)
         return NULL;
 
     Py_RETURN_NONE;
@@ -389,6 +389,12 @@ set_index(NB_DictKeys *dk, Py_ssize_t i, Py_ssize_t ix)
  */
 #define GROWTH_RATE(d) ((d)->ma_used*3)
 
+/* ESTIMATE_SIZE is reverse function of USABLE_FRACTION.
+ * This can be used to reserve enough size to insert n entries without
+ * resizing.
+ */
+#define ESTIMATE_SIZE(n)  (((n)*3+1) >> 1)
+
 
 static NB_DictEntry*
 get_entry(NB_DictKeys *dk, Py_ssize_t idx) {
@@ -1011,6 +1017,58 @@ numba_dict_new_minsize(NB_Dict **out, Py_ssize_t key_size, Py_ssize_t val_size)
     return numba_dict_new(out, D_MINSIZE, key_size, val_size);
 }
 
+/* Find the smallest table size (a power of two) able to hold n_keys entries
+ * without resizing.  Returns -1 on overflow.
+ */
+static Py_ssize_t
+table_size_for(Py_ssize_t n_keys)
+{
+    Py_ssize_t size;
+    if (n_keys > (PY_SSIZE_T_MAX - 1) / 3) {
+        return -1;
+    }
+    for (size = D_MINSIZE;
+         size < ESTIMATE_SIZE(n_keys) && size > 0;
+         size <<= 1)
+        ;
+    return size > 0 ? size : -1;
+}
+
+int
+numba_dict_new_sized(NB_Dict **out, Py_ssize_t n_keys, Py_ssize_t key_size, Py_ssize_t val_size)
+{
+    Py_ssize_t size = table_size_for(n_keys);
+    if (size < 0) {
+        return ERR_NO_MEMORY;
+    }
+    return numba_dict_new(out, size, key_size, val_size);
+}
+
+int
+numba_dict_reserve(NB_Dict *d, Py_ssize_t n_keys)
+{
+    Py_ssize_t size;
+    /* Already enough room for the missing entries */
+    if (n_keys - d->used <= d->keys->usable) {
+        return OK;
+    }
+    size = table_size_for(n_keys);
+    if (size < 0) {
+        return ERR_NO_MEMORY;
+    }
+    return numba_dict_resize(d, size);
+}
+
+Py_ssize_t
+numba_dict_sizeof(NB_Dict *d)
+{
+    NB_DictKeys *dk = d->keys;
+    return sizeof(NB_Dict) + aligned_size(
+        sizeof(NB_DictKeys) + dk->entry_offset
+        + dk->entry_size * USABLE_FRACTION(dk->size)
+    );
+}
+
 void
 numba_dict_set_method_table(NB_Dict *d, type_based_methods_table *methods)
 {
@@ -1031,6 +1089,7 @@ numba_test_dict(void) {
     int status;
     Py_ssize_t ix;
     Py_ssize_t usable;
+    Py_ssize_t dk_size;
     Py_ssize_t it_count;
     const char *it_key, *it_val;
     NB_DictIter iter;
@@ -1115,6 +1174,13 @@ numba_test_dict(void) {
     CHECK (d->used == 6);
     CHECK (d->keys->usable == USABLE_FRACTION(d->keys->size) - d->used);
 
+    // reserving less than the capacity does not resize
+    dk_size = d->keys->size;
+    status = numba_dict_reserve(d, 6);
+    CHECK (status == OK);
+    CHECK (d->keys->size == dk_size);
+    CHECK (numba_dict_sizeof(d) > (Py_ssize_t)sizeof(NB_Dict));
+
     // Dump
     numba_dict_dump(d);
 
@@ -1183,6 +1249,17 @@ numba_test_dict(void) {
     CHECK(status == ERR_ITER_EXHAUSTED);
     CHECK(d->used == it_count);
 
+    numba_dict_free(d);
+
+    // pre-sized dictionary
+    status = numba_dict_new_sized(&d, 100, 4, 8);
+    CHECK (status == OK);
+    CHECK (d->keys->usable >= 100);
+    dk_size = d->keys->size;
+    status = numba_dict_reserve(d, 1000);
+    CHECK (status == OK);
+    CHECK (d->keys->usable >= 1000);
+    CHECK (d->keys->size > dk_size);
     numba_dict_free(d);
     return 0;
 
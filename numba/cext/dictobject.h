@@ -105,6 +105,12 @@ See numba_dict_new().
 NUMBA_EXPORT_FUNC(int)
 numba_dict_new_minsize(NB_Dict **out, Py_ssize_t key_size, Py_ssize_t val_size);
 
+/* Allocates a new dict able to hold *n_keys* entries without resizing
+See numba_dict_new().
+*/
+NUMBA_EXPORT_FUNC(int)
+numba_dict_new_sized(NB_Dict **out, Py_ssize_t n_keys, Py_ssize_t key_size, Py_ssize_t val_size);
+
 /* Set the method table for type specific operations
 */
 NUMBA_EXPORT_FUNC(void)
@@ -131,6 +137,18 @@ numba_dict_lookup(NB_Dict *d, const char *key_bytes, Py_hash_t hash, char *oldva
 NUMBA_EXPORT_FUNC(int)
 numba_dict_resize(NB_Dict *d, Py_ssize_t minsize);
 
+/* Resize the dict, if needed, so that it holds *n_keys* entries without
+further resizing.
+*/
+NUMBA_EXPORT_FUNC(int)
+numba_dict_reserve(NB_Dict *d, Py_ssize_t n_keys);
+
+/* Returns the number of bytes allocated for the dict and its hash table,
+excluding the memory owned by the keys and values.
+*/
+NUMBA_EXPORT_FUNC(Py_ssize_t)
+numba_dict_sizeof(NB_Dict *d);
+
 /* Insert to the dict
 
 Parameters
@@ -46,6 +46,8 @@
  * needed to make the list work within Numba.
  *
  * - Accessing the allocation numba_list_allocated
+ * - Accessing the storage    numba_list_base_ptr
+ * - Appending many items     numba_list_append_n
  * - Copying an item          copy_item
  * - Calling incref on item   list_incref_item
  * - Calling decref on item   list_decref_item
@@ -234,6 +236,18 @@ numba_list_allocated(NB_List *lp) {
     return lp->allocated;
 }
 
+/* Return a pointer to the storage of the items of a list.
+ *
+ * lp: a list
+ *
+ * The items are stored contiguously, each of them taking item_size bytes.
+ * The pointer is invalidated by any operation resizing the list.
+ */
+char *
+numba_list_base_ptr(NB_List *lp) {
+    return lp->items;
+}
+
 /* Return the mutability status of the list
  *
  * lp: a list
@@ -329,6 +343,42 @@ numba_list_append(NB_List *lp, const char *item) {
     return LIST_OK;
 }
 
+/* Append n contiguous items to the end of a list with a single copy.
+ *
+ * lp: a list
+ * items: a pointer to the n items to append, stored contiguously
+ * n: the number of items to append
+ *
+ * The items are incref'ed like in numba_list_append.
+ */
+int
+numba_list_append_n(NB_List *lp, const char *items, Py_ssize_t n) {
+    char *loc;
+    Py_ssize_t i, size;
+    // check for mutability
+    if (!lp->is_mutable) {
+        return LIST_ERR_IMMUTABLE;
+    }
+    if (n == 0) {
+        return LIST_OK;
+    }
+    size = lp->size;
+    // resize by n, will change list size
+    int result = numba_list_resize(lp, size + n);
+    if(result < LIST_OK) {
+        return result;
+    }
+    // insert items at index: original size before resize
+    loc = lp->items + lp->item_size * size;
+    memcpy(loc, items, lp->item_size * n);
+    if (lp->methods.item_incref) {
+        for (i = 0; i < n; i++) {
+            list_incref_item(lp, loc + lp->item_size * i);
+        }
+    }
+    return LIST_OK;
+}
+
 /* Pop (get and delete) an item from a list at a given location.
  *
  * lp: a list
@@ -695,6 +745,20 @@ numba_test_list(void) {
     CHECK(memcmp(got_item, "mno", 4) == 0);
     CHECK(memcmp(lp->items, "def\x00ghi\x00jkl\x00", 12) == 0);
 
+    // append 2 items at once, then pop them
+    status = numba_list_append_n(lp, "stu\x00vwx", 2);
+    CHECK(status == LIST_OK);
+    CHECK(lp->size == 5);
+    CHECK(numba_list_base_ptr(lp) == lp->items);
+    CHECK(memcmp(lp->items, "def\x00ghi\x00jkl\x00stu\x00vwx\x00", 20) == 0);
+    status = numba_list_pop(lp, 4, got_item);
+    CHECK(status == LIST_OK);
+    CHECK(memcmp(got_item, "vwx", 4) == 0);
+    status = numba_list_pop(lp, 3, got_item);
+    CHECK(status == LIST_OK);
+    CHECK(memcmp(got_item, "stu", 4) == 0);
+    CHECK(lp->size == 3);
+
     // flip and check the is_mutable member
     CHECK(numba_list_is_mutable(lp) == 1);
     numba_list_set_is_mutable(lp, 0);
@@ -703,6 +767,7 @@ numba_test_list(void) {
     // ensure that any attempts to mutate an immutable list fail
     CHECK(numba_list_setitem(lp, 0, "zzz") == LIST_ERR_IMMUTABLE);
     CHECK(numba_list_append(lp, "zzz") == LIST_ERR_IMMUTABLE);
+    CHECK(numba_list_append_n(lp, "zzz", 1) == LIST_ERR_IMMUTABLE);
     CHECK(numba_list_pop(lp, 0, got_item) == LIST_ERR_IMMUTABLE);
     CHECK(numba_list_resize(lp, 23) == LIST_ERR_IMMUTABLE);
     CHECK(numba_list_delete_slice(lp, 0, 3, 1) == LIST_ERR_IMMUTABLE);
@@ -88,6 +88,9 @@ numba_list_length(NB_List *lp);
 NUMBA_EXPORT_FUNC(Py_ssize_t)
 numba_list_allocated(NB_List *lp);
 
+NUMBA_EXPORT_FUNC(char *)
+numba_list_base_ptr(NB_List *lp);
+
 NUMBA_EXPORT_FUNC(int)
 numba_list_is_mutable(NB_List *lp);
 
@@ -103,6 +106,9 @@ numba_list_getitem(NB_List *lp, Py_ssize_t index, char *out);
 NUMBA_EXPORT_FUNC(int)
 numba_list_append(NB_List *lp, const char *item);
 
+NUMBA_EXPORT_FUNC(int)
+numba_list_append_n(NB_List *lp, const char *items, Py_ssize_t n);
+
 NUMBA_EXPORT_FUNC(int)
 numba_list_pop(NB_List *lp, Py_ssize_t index, char *out);
 
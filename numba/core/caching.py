@@ -4,16 +4,20 @@ Caching mechanism for compiled functions.
 
 
 from abc import ABCMeta, abstractmethod, abstractproperty
+from collections import namedtuple
 import contextlib
 import errno
 import hashlib
 import inspect
 import itertools
+import mmap
 import os
 import pickle
+import struct
 import sys
 import tempfile
 import warnings
+import zlib
 
 from numba.misc.appdirs import AppDirs
 from numba.core.utils import add_metaclass, file_replace
@@ -46,6 +50,74 @@ def _cache_log(msg, *args):
         print(msg)
 
 
+if os.name == 'nt':
+    import msvcrt
+
+    def _lock_file(fd):
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError as e:
+                # LK_LOCK gives up after 10 seconds, keep waiting
+                if e.errno != errno.EDEADLOCK:
+                    raise
+
+    def _unlock_file(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(fd):
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_file(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class _FileLock(object):
+    """
+    A re-entrant, exclusive lock shared between processes, implemented
+    with an advisory lock on the file at *path*.  Entering the context
+    blocks until the lock is acquired.
+    """
+    # Locks held by this process, as path -> [fd, depth]
+    _held = {}
+
+    def __init__(self, path):
+        self._path = path
+
+    def __enter__(self):
+        held = self._held.get(self._path)
+        if held is not None:
+            # Nested compilation of the same function
+            held[1] += 1
+            return self
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            _lock_file(fd)
+        except BaseException:
+            os.close(fd)
+            raise
+        _cache_log("[cache] lock acquired on %r", self._path)
+        self._held[self._path] = [fd, 1]
+        return self
+
+    def __exit__(self, *exc_info):
+        held = self._held[self._path]
+        held[1] -= 1
+        if held[1] == 0:
+            del self._held[self._path]
+            fd = held[0]
+            try:
+                _unlock_file(fd)
+            finally:
+                os.close(fd)
+            _cache_log("[cache] lock released on %r", self._path)
+
+
 @add_metaclass(ABCMeta)
 class _Cache(object):
 
@@ -87,6 +159,16 @@ class _Cache(object):
         Flush the cache.
         """
 
+    @contextlib.contextmanager
+    def compile_lock(self, sig):
+        """
+        Context manager serializing the compilation and saving of the
+        overload for the given signature with other processes.  It yields
+        True if a lock is held, in which case the overload should be
+        looked up again as it may have been saved while waiting.
+        """
+        yield False
+
 
 class NullCache(_Cache):
     @property
@@ -543,6 +625,8 @@ class IndexDataCacheFile(object):
         path = self._data_path(name)
         with open(path, "rb") as f:
             data = f.read()
+        if config.CACHE_MAX_SIZE:
+            _mark_used(path)
         tup = pickle.loads(data)
         _cache_log("[cache] data loaded from %r", path)
         return tup
@@ -583,6 +667,555 @@ class IndexDataCacheFile(object):
             raise
 
 
+class _MappedStore(object):
+    """
+    An append-only, memory-mapped file holding the cache entries of all
+    the functions cached in a given directory.
+
+    Each record is made of a fixed-size header, the filename base of the
+    function it belongs to, the pickled ``(source_stamp, key)`` pair and
+    the pickled data.  Later records supersede earlier ones with the same
+    key; a record with an empty key invalidates all the previous records
+    of its function.  Only the record headers and function names are read
+    when indexing the file, keys are unpickled lazily on first lookup for
+    a function and data is unpickled directly from the mapping.
+
+    Records cut short by a crashed writer or otherwise damaged are skipped
+    up to the next intact record, and the store is compacted once most of
+    it is taken by superseded records.
+    """
+    _record_magic = b'NBSR'
+    # magic, name length, key length, data length, CRC-32 of the name, key
+    # and data
+    _record_header = struct.Struct('<4sIIQI')
+    # Size of the store before it is first considered for compaction
+    _compact_min_size = 16 * 1024 * 1024
+
+    # Stores already opened in this process, by path
+    _stores = {}
+
+    def __init__(self, path):
+        self._path = path
+        self._reset(None)
+        self._compact_size = self._compact_min_size
+
+    @classmethod
+    def for_directory(cls, cache_path):
+        """
+        Return the store for the given cache directory, creating it
+        if necessary.
+        """
+        path = os.path.join(cache_path, cls.get_filename())
+        try:
+            return cls._stores[path]
+        except KeyError:
+            store = cls._stores[path] = cls(path)
+            return store
+
+    @classmethod
+    def get_filename(cls):
+        """
+        The filename of the stores for this Numba and Python version.
+        """
+        abiflags = getattr(sys, 'abiflags', '')
+        return 'numba-%s.py%d%d%s.nbs' % (numba.__version__,
+                                          sys.version_info[0],
+                                          sys.version_info[1], abiflags)
+
+    @property
+    def path(self):
+        return self._path
+
+    def _reset(self, file_id):
+        self._file_id = file_id
+        self._close_mapping()
+        self._scanned = 0
+        # filename base -> list of not yet decoded records
+        self._pending = {}
+        # filename base -> {key: (source stamp, record)}
+        self._entries = {}
+
+    def _close_mapping(self):
+        mm = getattr(self, '_mmap', None)
+        self._mmap = None
+        if mm is not None:
+            mm.close()
+
+    def _map(self, end):
+        """
+        Return a mapping of the store covering at least the first *end*
+        bytes.  The store is only mapped again when it has grown past the
+        current mapping.
+        """
+        if self._mmap is None or len(self._mmap) < end:
+            self._close_mapping()
+            with open(self._path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                self._mmap = mmap.mmap(f.fileno(), size,
+                                       access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _record_end(self, record):
+        offset, name_size, key_size, data_size, _ = record
+        return (offset + self._record_header.size + name_size + key_size +
+                data_size)
+
+    def _read_record(self, f, offset, size):
+        """
+        Read the header and function name of the record at *offset* of the
+        open store *f* of *size* bytes.  Return the name and the record, or
+        None if the record is damaged or incomplete.
+        """
+        header = self._record_header
+        f.seek(offset)
+        magic, name_size, key_size, data_size, crc = header.unpack(
+            f.read(header.size))
+        if magic != self._record_magic:
+            return None
+        record = offset, name_size, key_size, data_size, crc
+        if self._record_end(record) > size:
+            return None
+        try:
+            name = f.read(name_size).decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+        return name, record
+
+    def _check_record(self, mm, offset, size):
+        """
+        Whether an intact record starts at *offset* of the mapping *mm* of
+        *size* bytes.
+        """
+        header = self._record_header
+        if offset + header.size > size:
+            return False
+        magic, name_size, key_size, data_size, crc = header.unpack_from(
+            mm, offset)
+        record = offset, name_size, key_size, data_size, crc
+        end = self._record_end(record)
+        return (magic == self._record_magic and end <= size and
+                zlib.crc32(mm[offset + header.size:end]) == crc)
+
+    def _resync(self, offset, size):
+        """
+        Return the offset of the first intact record after the record at
+        *offset*, which is damaged or still being written, or None if there
+        is none.
+        """
+        mm = self._map(size)
+        pos = offset + 1
+        while True:
+            pos = mm.find(self._record_magic, pos, size)
+            if pos < 0:
+                return None
+            if self._check_record(mm, pos, size):
+                return pos
+            pos += 1
+
+    def _refresh(self):
+        """
+        Index the records appended since the last refresh, possibly by
+        other processes.
+        """
+        try:
+            st = os.stat(self._path)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return
+        file_id = st.st_dev, st.st_ino
+        if file_id != self._file_id:
+            # The store was created or replaced (e.g. the cache was cleared)
+            self._reset(file_id)
+        size = st.st_size
+        if size <= self._scanned:
+            return
+        header = self._record_header
+        pos = self._scanned
+        damaged = False
+        with open(self._path, 'rb') as f:
+            while pos + header.size <= size:
+                result = self._read_record(f, pos, size)
+                if result is None:
+                    # A damaged record, or one still being written if no
+                    # intact record follows it
+                    next_pos = self._resync(pos, size)
+                    if next_pos is None:
+                        break
+                    warnings.warn(NumbaWarning(
+                        "skipping %d damaged bytes at offset %d of the cache "
+                        "store %r" % (next_pos - pos, pos, self._path)))
+                    pos = next_pos
+                    damaged = True
+                    continue
+                name, record = result
+                entries = self._entries.get(name)
+                if entries is None:
+                    self._pending.setdefault(name, []).append(record)
+                else:
+                    self._apply_record(f, entries, record)
+                pos = self._record_end(record)
+        self._scanned = pos
+        _cache_log("[cache] store indexed up to offset %d in %r",
+                   pos, self._path)
+        if damaged:
+            # Drop the damaged bytes so that they are not met again
+            self.compact()
+
+    def _apply_record(self, f, entries, record):
+        offset, name_size, key_size, _, _ = record
+        if key_size == 0:
+            entries.clear()
+            return
+        f.seek(offset + self._record_header.size + name_size)
+        try:
+            stamp, key = pickle.loads(f.read(key_size))
+        except Exception:
+            warnings.warn(NumbaWarning(
+                "ignoring a damaged record at offset %d of the cache store "
+                "%r" % (offset, self._path)))
+            return
+        entries[key] = stamp, record
+
+    def _get_entries(self, name):
+        entries = self._entries.get(name)
+        if entries is None:
+            entries = self._entries[name] = {}
+            pending = self._pending.pop(name, ())
+            if pending:
+                with open(self._path, 'rb') as f:
+                    for record in pending:
+                        self._apply_record(f, entries, record)
+        return entries
+
+    def load(self, name, source_stamp, key):
+        """
+        Load the data saved for *key* by function *name*, or None if
+        there is no fresh entry.
+        """
+        for attempt in range(2):
+            entry = self._get_entries(name).get(key)
+            if entry is not None and entry[0] == source_stamp:
+                return self._load_record(name, key, entry[1])
+            if attempt == 0:
+                # Another process may have saved the entry in the meantime
+                self._refresh()
+
+    def _load_record(self, name, key, record):
+        offset, name_size, key_size, data_size, crc = record
+        end = self._record_end(record)
+        mm = self._map(end)
+        if zlib.crc32(mm[offset + self._record_header.size:end]) != crc:
+            warnings.warn(NumbaWarning(
+                "ignoring a damaged record at offset %d of the cache store "
+                "%r" % (offset, self._path)))
+            del self._entries[name][key]
+            return
+        data_offset = end - data_size
+        data = mm[data_offset:end]
+        _cache_log("[cache] data loaded from %r at offset %d",
+                   self._path, data_offset)
+        if config.CACHE_MAX_SIZE:
+            _mark_used(self._path)
+        return pickle.loads(data)
+
+    def save(self, name, source_stamp, key, data):
+        """
+        Append an entry for *key* by function *name*.
+        """
+        key_data = pickle.dumps((source_stamp, key), protocol=-1)
+        self._append(name, key_data, pickle.dumps(data, protocol=-1))
+
+    def invalidate(self, name):
+        """
+        Drop all entries saved by function *name*.
+        """
+        self._append(name, b'', b'')
+
+    def _append(self, name, key_data, data):
+        name_data = name.encode('utf-8')
+        crc = zlib.crc32(data, zlib.crc32(key_data, zlib.crc32(name_data)))
+        header = self._record_header.pack(self._record_magic, len(name_data),
+                                          len(key_data), len(data), crc)
+        record = b''.join([header, name_data, key_data, data])
+        # A single write in append mode, so that records written
+        # concurrently by several processes don't interleave.
+        flags = (os.O_WRONLY | os.O_APPEND | os.O_CREAT |
+                 getattr(os, 'O_BINARY', 0))
+        fd = os.open(self._path, flags, 0o666)
+        try:
+            written = os.write(fd, record)
+        finally:
+            os.close(fd)
+        if written != len(record):
+            # The partial record is skipped by the readers
+            raise IOError("short write to cache store %r" % (self._path,))
+        _cache_log("[cache] record appended to %r", self._path)
+        # Index the new record (and any record appended by other processes)
+        self._refresh()
+        if self._scanned >= self._compact_size:
+            self._compact_size = 2 * self._scanned
+            if 2 * self._live_size() < self._scanned:
+                self.compact()
+
+    def names(self):
+        """
+        The filename bases of the functions with entries in the store.
+        """
+        self._refresh()
+        names = set(self._pending) | set(self._entries)
+        return set(name for name in names if self._get_entries(name))
+
+    def _live_records(self):
+        """
+        The records of the entries which are not superseded, in file order.
+        """
+        for name in list(self._pending):
+            self._get_entries(name)
+        return sorted(record for entries in self._entries.values()
+                      for _, record in entries.values())
+
+    def _live_size(self):
+        return sum(self._record_end(record) - record[0]
+                   for record in self._live_records())
+
+    def compact(self):
+        """
+        Rewrite the store with only the records which are not superseded
+        or invalidated.  Records appended by other processes while the store
+        is rewritten are lost, which only costs their recompilation.  Return
+        the number of bytes reclaimed.
+        """
+        self._refresh()
+        if self._file_id is None:
+            return 0
+        old_size = self._scanned
+        records = self._live_records()
+        if sum(self._record_end(r) - r[0] for r in records) == old_size:
+            return 0
+        tmpname = '%s.tmp.%d' % (self._path, os.getpid())
+        try:
+            with open(self._path, 'rb') as src, open(tmpname, 'wb') as dst:
+                for record in records:
+                    src.seek(record[0])
+                    dst.write(src.read(self._record_end(record) - record[0]))
+            # The mapping must be closed for the file to be replaced on
+            # Windows
+            self._close_mapping()
+            file_replace(tmpname, self._path)
+        except OSError:
+            # e.g. still mapped by another process on Windows
+            try:
+                os.unlink(tmpname)
+            except OSError:
+                pass
+            return 0
+        self._refresh()
+        _cache_log("[cache] store %r compacted from %d to %d bytes",
+                   self._path, old_size, self._scanned)
+        return old_size - self._scanned
+
+
+class MappedCacheFile(object):
+    """
+    Implements the same interface as IndexDataCacheFile on top of the
+    memory-mapped store shared by all functions of a cache directory.
+    """
+    def __init__(self, cache_path, filename_base, source_stamp):
+        self._cache_path = cache_path
+        self._filename_base = filename_base
+        self._source_stamp = source_stamp
+
+    @property
+    def _store(self):
+        return _MappedStore.for_directory(self._cache_path)
+
+    def flush(self):
+        self._store.invalidate(self._filename_base)
+
+    def save(self, key, data):
+        """
+        Save a new cache entry with *key* and *data*.
+        """
+        self._store.save(self._filename_base, self._source_stamp, key, data)
+
+    def load(self, key):
+        """
+        Load a cache entry with *key*.
+        """
+        return self._store.load(self._filename_base, self._source_stamp, key)
+
+
+def _mark_used(path):
+    """
+    Record a use of the cache file at *path* for LRU eviction.  The
+    modification time is used as access times are often unreliable.
+    """
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+_index_suffix = '.nbi'
+_data_suffix = '.nbc'
+_store_suffix = '.nbs'
+_lock_suffix = '.nbl'
+_cache_suffixes = (_index_suffix, _data_suffix, _store_suffix, _lock_suffix)
+
+
+CacheDirStats = namedtuple('CacheDirStats',
+                           ('path', 'index_files', 'data_files', 'store_files',
+                            'lock_files', 'total_size', 'stale_files',
+                            'stale_size'))
+
+
+def _scan_cache_dir(cache_path):
+    """
+    Return a dict of {filename: os.stat_result} for the cache files
+    in *cache_path*.
+    """
+    files = {}
+    try:
+        names = os.listdir(cache_path)
+    except OSError:
+        return files
+    for name in names:
+        if name.endswith(_cache_suffixes):
+            try:
+                files[name] = os.stat(os.path.join(cache_path, name))
+            except OSError:
+                # Removed concurrently
+                pass
+    return files
+
+
+def _find_stale_files(cache_path, files):
+    """
+    Return the names of the cache files which can't be used anymore:
+    indices written by other Numba versions, data files not referenced
+    by any index, stores of other Numba versions and the lock files of
+    functions without any cache entry.
+    """
+    stale = set()
+    referenced = set()
+    current_store = _MappedStore.get_filename()
+    for name in files:
+        if name.endswith(_index_suffix):
+            index_path = os.path.join(cache_path, name)
+            try:
+                with open(index_path, "rb") as f:
+                    version = pickle.load(f)
+                    if version == numba.__version__:
+                        _, overloads = pickle.load(f)
+                        referenced.update(overloads.values())
+                        continue
+            except Exception:
+                # Unreadable or corrupt index
+                pass
+            stale.add(name)
+        elif name.endswith(_store_suffix) and name != current_store:
+            stale.add(name)
+    for name in files:
+        if name.endswith(_data_suffix) and name not in referenced:
+            stale.add(name)
+    lock_files = [name for name in files if name.endswith(_lock_suffix)]
+    if lock_files:
+        if current_store in files:
+            store_path = os.path.join(cache_path, current_store)
+            stored = _MappedStore(store_path).names()
+        else:
+            stored = set()
+        for name in lock_files:
+            base = name[:-len(_lock_suffix)]
+            index_name = base + _index_suffix
+            # Removing the lock file of a function being compiled for the
+            # first time can at worst let another process compile it too
+            if ((index_name not in files or index_name in stale)
+                    and base not in stored):
+                stale.add(name)
+    return stale
+
+
+def get_cache_stats(cache_path):
+    """
+    Return a CacheDirStats for the cache files in *cache_path*.
+    """
+    files = _scan_cache_dir(cache_path)
+    stale = _find_stale_files(cache_path, files)
+
+    def count(suffix):
+        return sum(1 for name in files if name.endswith(suffix))
+
+    return CacheDirStats(
+        path=cache_path,
+        index_files=count(_index_suffix),
+        data_files=count(_data_suffix),
+        store_files=count(_store_suffix),
+        lock_files=count(_lock_suffix),
+        total_size=sum(st.st_size for st in files.values()),
+        stale_files=len(stale),
+        stale_size=sum(files[name].st_size for name in stale),
+        )
+
+
+def _remove_cache_file(cache_path, name):
+    path = os.path.join(cache_path, name)
+    try:
+        os.unlink(path)
+    except OSError:
+        # Removed concurrently, or still mapped on Windows
+        return False
+    _cache_log("[cache] removed %r", path)
+    return True
+
+
+def evict_cache_files(cache_path, max_size):
+    """
+    Remove the least recently used data files in *cache_path* until the
+    total size of the cache files is at most *max_size* bytes.  Return the
+    list of removed filenames.
+
+    The store shared by all the functions of the directory is not removed,
+    as it holds recently used entries as well, it is compacted instead.
+    """
+    files = _scan_cache_dir(cache_path)
+    total_size = sum(st.st_size for st in files.values())
+    if total_size > max_size and _MappedStore.get_filename() in files:
+        total_size -= _MappedStore.for_directory(cache_path).compact()
+    candidates = sorted((st.st_mtime, name) for name, st in files.items()
+                        if name.endswith(_data_suffix))
+    removed = []
+    for _, name in candidates:
+        if total_size <= max_size:
+            break
+        if _remove_cache_file(cache_path, name):
+            total_size -= files[name].st_size
+            removed.append(name)
+    return removed
+
+
+def prune_cache(cache_path, max_size=0):
+    """
+    Remove the stale cache files in *cache_path*, then evict the least
+    recently used files if *max_size* is non-zero.  Return the list of
+    removed filenames.
+    """
+    files = _scan_cache_dir(cache_path)
+    removed = [name for name in sorted(_find_stale_files(cache_path, files))
+               if _remove_cache_file(cache_path, name)]
+    if max_size:
+        removed += evict_cache_files(cache_path, max_size)
+    return removed
+
+
+# The cache file implementations selectable with NUMBA_CACHE_STORE
+_cache_file_classes = {
+    'files': IndexDataCacheFile,
+    'mmap': MappedCacheFile,
+}
+
+
 class Cache(_Cache):
     """
     A per-function compilation cache.  The cache saves data in separate
@@ -600,6 +1233,10 @@ class Cache(_Cache):
     Separate index and data files per Python version avoid pickle
     compatibility problems.
 
+    Alternatively, when NUMBA_CACHE_STORE is set to "mmap", all functions
+    cached in a directory share a single memory-mapped store per Numba
+    and Python version (see ``MappedCacheFile``).
+
     Note:
     This contains the driver logic only.  The core logic is provided
     by a subclass of ``_CacheImpl`` specified as *_impl_class* in the subclass.
@@ -615,11 +1252,20 @@ class Cache(_Cache):
         # This may be a bit strict but avoids us maintaining a magic number
         source_stamp = self._impl.locator.get_source_stamp()
         filename_base = self._impl.filename_base
-        self._cache_file = IndexDataCacheFile(cache_path=self._cache_path,
-                                              filename_base=filename_base,
-                                              source_stamp=source_stamp)
+        cache_file_class = self._get_cache_file_class()
+        self._cache_file = cache_file_class(cache_path=self._cache_path,
+                                            filename_base=filename_base,
+                                            source_stamp=source_stamp)
         self.enable()
 
+    def _get_cache_file_class(self):
+        try:
+            return _cache_file_classes[config.CACHE_STORE]
+        except KeyError:
+            raise ValueError("unknown cache store %r, expected one of %s"
+                             % (config.CACHE_STORE,
+                                sorted(_cache_file_classes)))
+
     def __repr__(self):
         return "<%s py_func=%r>" % (self.__class__.__name__, self._name)
 
@@ -672,6 +1318,21 @@ class Cache(_Cache):
         key = self._index_key(sig, _get_codegen(data))
         data = self._impl.reduce(data)
         self._cache_file.save(key, data)
+        if config.CACHE_MAX_SIZE:
+            evict_cache_files(self._cache_path, config.CACHE_MAX_SIZE)
+
+    @contextlib.contextmanager
+    def compile_lock(self, sig):
+        if not (self._enabled and config.CACHE_LOCKING):
+            yield False
+            return
+        # One lock per function: this also protects the read-modify-write
+        # of its index file.
+        self._impl.locator.ensure_cache_path()
+        lock_path = os.path.join(self._cache_path,
+                                 self._impl.filename_base + _lock_suffix)
+        with _FileLock(lock_path):
+            yield True
 
     @contextlib.contextmanager
     def _guard_against_spurious_io_errors(self):
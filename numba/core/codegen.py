@@ -9,7 +9,7 @@ import llvmlite.llvmpy.passes as lp
 import llvmlite.binding as ll
 import llvmlite.ir as llvmir
 
-from numba.core import utils, config, cgutils
+from numba.core import utils, config, cgutils, compile_stats
 from numba.core.runtime.nrtopt import remove_redundant_nrt_refct
 from numba.core.runtime import rtsys
 from numba.core.compiler_lock import require_global_compiler_lock
@@ -99,6 +99,8 @@ class CodeLibrary(object):
         self._shared_module = None
         # Track names of the dynamic globals
         self._dynamic_globals = []
+        # Time spent in the LLVM stages, see compile_times
+        self._compile_times = dict.fromkeys(compile_stats.LLVM_STAGES, 0.0)
 
     @property
     def has_dynamic_globals(self):
@@ -112,6 +114,20 @@ class CodeLibrary(object):
         """
         return self._codegen
 
+    @property
+    def compile_times(self):
+        """
+        The time in seconds spent in each LLVM stage of this library so far:
+        'function_opt', 'module_opt' and 'codegen'.
+        """
+        return dict(self._compile_times)
+
+    def _add_compile_time(self, stage, start):
+        end = compile_stats.timer()
+        self._compile_times[stage] += end - start
+        compile_stats.trace_event(stage, 'llvm', start, end,
+                                  library=self._name)
+
     def __repr__(self):
         return "<Library %r at 0x%x>" % (self._name, id(self))
 
@@ -128,6 +144,7 @@ class CodeLibrary(object):
         """
         Internal: run function-level optimizations inside *ll_module*.
         """
+        start = compile_stats.timer()
         # Enforce data layout to enable layout-specific optimizations
         ll_module.data_layout = self._codegen._data_layout
         with self._codegen._function_pass_manager(ll_module) as fpm:
@@ -137,13 +154,16 @@ class CodeLibrary(object):
                 fpm.initialize()
                 fpm.run(func)
                 fpm.finalize()
+        self._add_compile_time('function_opt', start)
 
     def _optimize_final_module(self):
         """
         Internal: optimize this library's final module.
         """
+        start = compile_stats.timer()
         self._codegen._mpm.run(self._final_module)
         self._final_module = remove_redundant_nrt_refct(self._final_module)
+        self._add_compile_time('module_opt', start)
 
     def _get_module_for_linking(self):
         """
@@ -202,6 +222,8 @@ class CodeLibrary(object):
         """
         self._raise_if_finalized()
         assert isinstance(ir_module, llvmir.Module)
+        # llvmlite can only hand an llvmlite.ir module over to LLVM as text,
+        # it has no bitcode writer for it.
         ir = cgutils.normalize_ir_text(str(ir_module))
         ll_module = ll.parse_assembly(ir)
         ll_module.name = ir_module.name
@@ -210,7 +232,7 @@ class CodeLibrary(object):
 
     def add_llvm_module(self, ll_module):
         self._optimize_functions(ll_module)
-        # TODO: we shouldn't need to recreate the LLVM module object
+        # The LLVM module is only recreated if refct operations were pruned
         ll_module = remove_redundant_nrt_refct(ll_module)
         self._final_module.link_in(ll_module)
 
@@ -274,10 +296,12 @@ class CodeLibrary(object):
         # It seems add_module() must be done only here and not before
         # linking in other modules, otherwise get_pointer_to_function()
         # could fail.
+        start = compile_stats.timer()
         cleanup = self._codegen._add_module(self._final_module)
         if cleanup:
             weakref.finalize(self, cleanup)
         self._finalize_specific()
+        self._add_compile_time('codegen', start)
 
         self._finalized = True
 
@@ -0,0 +1,210 @@
+"""
+Compile-time statistics.
+
+Every compilation through the compiler pipelines produces a CompileStats
+breakdown (compiler passes and LLVM stages), available from
+``Dispatcher.get_compile_stats()``.  The breakdowns are also summed into a
+process-wide aggregate, see get_compile_stats(), and, if the
+NUMBA_COMPILE_PROFILE environment variable names a file, written as events
+of a Chrome trace (viewable in chrome://tracing or https://ui.perfetto.dev)
+when the process exits.
+"""
+
+import atexit
+import json
+import os
+import threading
+import timeit
+from collections import OrderedDict, defaultdict, namedtuple
+
+from numba.core import config
+
+
+timer = timeit.default_timer
+
+# Names of the LLVM stages recorded by CodeLibrary
+LLVM_STAGES = ('function_opt', 'module_opt', 'codegen')
+
+
+class CompileStats(object):
+    """
+    Compile time breakdown of a single compilation, all times are in
+    seconds.
+
+    - *function*: the qualified name of the compiled function
+    - *signature*: the argument types it was compiled for
+    - *total*: the time spent in the compiler pipelines
+    - *passes*: the time spent in each compiler pass, keyed by
+      ``"<pipeline>.<pass name>"``, in execution order
+    - *llvm*: the time spent in the LLVM stages of the function's own code
+      library: ``function_opt`` (per-function optimization), ``module_opt``
+      (module optimization) and ``codegen`` (machine code generation).
+      These happen during the ``native_lowering`` pass and are included in
+      its time.
+    """
+
+    def __init__(self, function, signature, total, passes, llvm):
+        self.function = function
+        self.signature = signature
+        self.total = total
+        self.passes = passes
+        self.llvm = llvm
+
+    @property
+    def typing(self):
+        """The time spent in type inference passes."""
+        return sum(t for name, t in self.passes.items()
+                   if name.endswith('type_inference'))
+
+    @property
+    def lowering(self):
+        """The time spent lowering to LLVM IR, excluding the LLVM stages."""
+        lowering = sum(t for name, t in self.passes.items()
+                       if name.endswith('_lowering'))
+        return max(lowering - sum(self.llvm.values()), 0.0)
+
+    def as_dict(self):
+        return OrderedDict([('function', self.function),
+                            ('signature', str(self.signature)),
+                            ('total', self.total),
+                            ('typing', self.typing),
+                            ('lowering', self.lowering),
+                            ('passes', OrderedDict(self.passes)),
+                            ('llvm', OrderedDict(self.llvm))])
+
+    def __repr__(self):
+        return "<CompileStats %s%s: %.3fs>" % (self.function,
+                                               self.signature, self.total)
+
+
+def pass_times(pipeline_times):
+    """Flatten the ``pipeline_times`` compile metadata into an ordered
+    mapping of ``"<pipeline>.<pass name>"`` to seconds.
+    """
+    passes = OrderedDict()
+    for pipeline, exec_times in pipeline_times.items():
+        for key, timing in exec_times.items():
+            # keys are "<index>_<pass name>"
+            name = "%s.%s" % (pipeline, key.split('_', 1)[1])
+            passes[name] = (passes.get(name, 0.0) + timing.init + timing.run +
+                            timing.finalize)
+    return passes
+
+
+AggregateCompileStats = namedtuple('AggregateCompileStats',
+                                   ['compilations', 'total', 'passes', 'llvm',
+                                    'functions'])
+
+
+class _Aggregate(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._compilations = 0
+            self._total = 0.0
+            self._passes = defaultdict(float)
+            self._llvm = defaultdict(float)
+            self._functions = defaultdict(float)
+
+    def record(self, stats):
+        with self._lock:
+            self._compilations += 1
+            self._total += stats.total
+            for name, t in stats.passes.items():
+                self._passes[name] += t
+            for name, t in stats.llvm.items():
+                self._llvm[name] += t
+            self._functions[stats.function] += stats.total
+
+    def snapshot(self):
+        def ordered(d):
+            return OrderedDict(sorted(d.items(), key=lambda kv: -kv[1]))
+        with self._lock:
+            return AggregateCompileStats(compilations=self._compilations,
+                                         total=self._total,
+                                         passes=ordered(self._passes),
+                                         llvm=ordered(self._llvm),
+                                         functions=ordered(self._functions))
+
+
+_aggregate = _Aggregate()
+
+
+def record(stats):
+    """Add a CompileStats to the process-wide aggregate."""
+    _aggregate.record(stats)
+
+
+def get_compile_stats():
+    """
+    Return the compile time statistics aggregated over all compilations in
+    this process, as an AggregateCompileStats of the number of compilations,
+    the total compile time and the total time per compiler pass, per LLVM
+    stage and per function (the latter three sorted by decreasing time).
+    Nested compilations (e.g. of callees) are included both on their own and
+    in the time of their callers.
+    """
+    return _aggregate.snapshot()
+
+
+def reset_compile_stats():
+    """Clear the process-wide compile time statistics."""
+    _aggregate.reset()
+
+
+class _ChromeTrace(object):
+    """
+    Collects complete ("X") events of the Chrome trace event format and
+    writes them out when the process exits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = []
+        self._registered = False
+
+    def add(self, name, cat, start, end, args):
+        event = {'name': name, 'cat': cat, 'ph': 'X',
+                 'ts': start * 1e6, 'dur': (end - start) * 1e6,
+                 'pid': os.getpid(), 'tid': threading.get_ident(),
+                 'args': args}
+        with self._lock:
+            if not self._registered:
+                atexit.register(self.write)
+                self._registered = True
+            self._events.append(event)
+
+    def write(self, path=None):
+        path = path or config.COMPILE_PROFILE
+        with self._lock:
+            events = list(self._events)
+        if not path or not events:
+            return
+        with open(path, 'w') as fout:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, fout)
+
+
+_trace = _ChromeTrace()
+
+
+def trace_enabled():
+    return bool(config.COMPILE_PROFILE)
+
+
+def trace_event(name, cat, start, end, **args):
+    """Record an event from *start* to *end* (timer() values) in the
+    Chrome trace, if NUMBA_COMPILE_PROFILE is set.
+    """
+    if config.COMPILE_PROFILE:
+        _trace.add(name, cat, start, end, args)
+
+
+def write_trace(path=None):
+    """Write the Chrome trace collected so far to *path*, by default the
+    file named by NUMBA_COMPILE_PROFILE.  This happens automatically when
+    the process exits.
+    """
+    _trace.write(path)
@@ -1,10 +1,10 @@
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 import copy
 import warnings
 from numba.core.tracing import event
 
 from numba.core import (utils, errors, typing, interpreter, bytecode, postproc,
-                        config, callconv, cpu)
+                        config, callconv, cpu, compile_stats)
 from numba.parfors.parfor import ParforDiagnostics
 from numba.core.inline_closurecall import InlineClosureCallPass
 from numba.core.errors import CompilerError
@@ -357,15 +357,18 @@ class CompilerBase(object):
         """
         Populate and run compiler pipeline
         """
+        start = compile_stats.timer()
         pms = self.define_pipelines()
+        # pass timings of every pipeline run, including failed ones
+        self.state.metadata['pipeline_times'] = OrderedDict()
         for pm in pms:
             pipeline_name = pm.pipeline_name
             func_name = "%s.%s" % (self.state.func_id.modname,
                                    self.state.func_id.func_qualname)
 
             event("Pipeline: %s for %s" % (pipeline_name, func_name))
-            self.state.metadata['pipeline_times'] = {pipeline_name:
-                                                     pm.exec_times}
+            self.state.metadata['pipeline_times'][pipeline_name] = \
+                pm.exec_times
             is_final_pipeline = pm == pms[-1]
             res = None
             try:
@@ -382,6 +385,8 @@ class CompilerBase(object):
         else:
             raise CompilerError("All available pipelines exhausted")
 
+        self._record_compile_stats(start)
+
         # Pipeline is done, remove self reference to release refs to user code
         self.state.pipeline = None
 
@@ -393,6 +398,25 @@ class CompilerBase(object):
             assert self.state.cr is not None
             return self.state.cr
 
+    def _record_compile_stats(self, start):
+        """
+        Store the compile time breakdown in the metadata and add it to the
+        process-wide statistics.
+        """
+        end = compile_stats.timer()
+        func_name = "%s.%s" % (self.state.func_id.modname,
+                               self.state.func_id.func_qualname)
+        library = self.state.library
+        llvm_times = getattr(library, 'compile_times', None) or {}
+        passes = compile_stats.pass_times(self.state.metadata['pipeline_times'])
+        stats = compile_stats.CompileStats(func_name, self.state.args,
+                                           end - start, passes,
+                                           OrderedDict(llvm_times))
+        self.state.metadata['compile_stats'] = stats
+        compile_stats.record(stats)
+        compile_stats.trace_event(func_name, 'compile', start, end,
+                                  signature=str(self.state.args))
+
     def _compile_bytecode(self):
         """
         Populate and run pipeline for bytecode input
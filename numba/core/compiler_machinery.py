@@ -3,7 +3,7 @@ from abc import abstractmethod, ABCMeta
 from collections import namedtuple, OrderedDict
 import inspect
 from numba.core.compiler_lock import global_compiler_lock
-from numba.core import errors, config, transforms
+from numba.core import errors, config, transforms, compile_stats
 from numba.core.utils import add_metaclass
 from numba.core.tracing import event
 from numba.core.postproc import PostProcessor
@@ -311,6 +311,13 @@ class PassManager(object):
         pt = pass_timings(init_time.elapsed, pass_time.elapsed,
                           finalize_time.elapsed)
         self.exec_times["%s_%s" % (index, pss.name())] = pt
+        if compile_stats.trace_enabled():
+            fid = internal_state.func_id
+            compile_stats.trace_event(
+                pss.name(), 'pass', init_time.ts,
+                finalize_time.ts + finalize_time.elapsed,
+                pipeline=self.pipeline_name,
+                function="%s.%s" % (fid.modname, fid.func_qualname))
 
         # debug print after this pass?
         debug_print(pss.name(), self._print_after + self._print_wrap, "AFTER")
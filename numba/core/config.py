@@ -42,6 +42,19 @@ def _parse_cc(text):
         return int(grp[0]), int(grp[1])
 
 
+def _parse_size(text):
+    """
+    Parse a size in bytes, optionally suffixed with K, M or G.
+    """
+    m = re.match(r'^\s*(\d+)\s*([KMG]?)B?\s*$', text, re.IGNORECASE)
+    if not m:
+        raise ValueError("size must be specified as an integer number of "
+                         "bytes, optionally followed by K, M or G")
+    value, unit = m.groups()
+    scale = {'': 1, 'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30}[unit.upper()]
+    return int(value) * scale
+
+
 def _os_supports_avx():
     """
     Whether the current OS supports AVX, regardless of the CPU.
@@ -176,6 +189,14 @@ class _EnvReloader(object):
         # (up to and including IR generation)
         DEBUG_FRONTEND = _readenv("NUMBA_DEBUG_FRONTEND", int, 0)
 
+        # Write a Chrome trace of the compiler passes and LLVM stages of
+        # every compilation to the given path when the process exits
+        COMPILE_PROFILE = _readenv("NUMBA_COMPILE_PROFILE", str, "")
+
+        # Defer the compilation of the signatures given to @jit to a
+        # compiler thread instead of compiling them at decoration time
+        DEFERRED_COMPILE = _readenv("NUMBA_DEFERRED_COMPILE", int, 0)
+
         # How many recently deserialized functions to retain regardless
         # of external references
         FUNCTION_CACHE_SIZE = _readenv("NUMBA_FUNCTION_CACHE_SIZE", int, 128)
@@ -185,6 +206,17 @@ class _EnvReloader(object):
         PARFOR_MAX_TUPLE_SIZE = _readenv("NUMBA_PARFOR_MAX_TUPLE_SIZE",
                                          int, 100)
 
+        # Load the thread counts learned by autotuned parallel loops from
+        # this file, and save them back to it when the process exits
+        PARFOR_AUTOTUNE_FILE = _readenv("NUMBA_PARFOR_AUTOTUNE_FILE", str, "")
+
+        # Cache sizes in bytes that the tiles of tiled parallel loops are
+        # fitted to
+        PARFOR_TILE_L1_SIZE = _readenv("NUMBA_PARFOR_TILE_L1_SIZE", int,
+                                       32 * 1024)
+        PARFOR_TILE_L2_SIZE = _readenv("NUMBA_PARFOR_TILE_L2_SIZE", int,
+                                       1024 * 1024)
+
         # Enable logging of cache operation
         DEBUG_CACHE = _readenv("NUMBA_DEBUG_CACHE", int, DEBUG)
 
@@ -192,6 +224,19 @@ class _EnvReloader(object):
         # Contains path to the directory
         CACHE_DIR = _readenv("NUMBA_CACHE_DIR", str, "")
 
+        # Select the on-disk cache format: "files" uses an index file and
+        # data files per function, "mmap" a single memory-mapped store per
+        # cache directory
+        CACHE_STORE = _readenv("NUMBA_CACHE_STORE", str, "files")
+
+        # Serialize compilation of cached functions across processes using
+        # file locks, so that only one process compiles a given function
+        CACHE_LOCKING = _readenv("NUMBA_CACHE_LOCKING", int, 0)
+
+        # Maximum size of the data in a cache directory, least recently used
+        # entries are evicted beyond it (0 means unlimited)
+        CACHE_MAX_SIZE = _readenv("NUMBA_CACHE_MAX_SIZE", _parse_size, 0)
+
         # Enable tracing support
         TRACE = _readenv("NUMBA_TRACE", int, 0)
 
@@ -298,6 +343,15 @@ class _EnvReloader(object):
         # choose parallel backend to use
         THREADING_LAYER = _readenv("NUMBA_THREADING_LAYER", str, 'default')
 
+        # choose the allocator of the Numba runtime, either the CPython raw
+        # memory allocator, the libc allocator or a thread-caching pool
+        NRT_ALLOCATOR = _readenv("NUMBA_NRT_ALLOCATOR", str, 'cpython')
+
+        # collect the statistics of the Numba runtime memory: 0 disables the
+        # collection, 1 counts the operations and bytes per thread, 2 also
+        # tracks the peak of the live bytes
+        NRT_STATS = _readenv("NUMBA_NRT_STATS", int, 1)
+
         # CUDA Configs
 
         # Force CUDA compute capability to a specific version
@@ -40,9 +40,51 @@ class FastMathOptions(object):
     __nonzero__ = __bool__
 
 
+# Loop schedules understood by the threading layers, the values must match the
+# SCHEDULE_* constants in numba/np/ufunc/gufunc_scheduler.h
+SCHEDULE_KINDS = {'static': 0, 'dynamic': 1, 'guided': 2}
+
+
+def check_schedule(schedule, chunksize):
+    """
+    Validate a loop schedule and its chunk size, raising ValueError if either
+    is not acceptable.
+    """
+    if schedule not in SCHEDULE_KINDS:
+        raise ValueError("Unrecognized schedule %r, expected one of %s"
+                         % (schedule, sorted(SCHEDULE_KINDS)))
+    if (not isinstance(chunksize, int) or isinstance(chunksize, bool)
+            or chunksize < 0):
+        raise ValueError("Expected chunksize to be a non-negative integer, "
+                         "got %r" % (chunksize,))
+
+
+def check_tiling(tiling):
+    """
+    Validate a loop tiling option, either a bool or a tuple of positive tile
+    sizes with one entry per loop of the nest, raising ValueError if it is
+    not acceptable.
+    """
+    if isinstance(tiling, bool):
+        return
+    if (not isinstance(tiling, tuple) or not tiling
+            or not all(isinstance(t, int) and not isinstance(t, bool)
+                       and t > 0 for t in tiling)):
+        raise ValueError("Expected tiling to be a bool or a tuple of "
+                         "positive integers, got %r" % (tiling,))
+
+
 class ParallelOptions(object):
     """
     Options for controlling auto parallelization.
+
+    Besides the transformation switches, a dict value may carry a
+    ``'schedule'`` (one of ``'static'``, ``'dynamic'`` or ``'guided'``) and a
+    ``'chunksize'`` to control how parallel loop iterations are handed out to
+    the threads, an ``'autotune'`` flag to learn the number of threads to
+    use depending on the trip count of parallel loops, and a ``'tiling'``
+    option to run multi-dimensional parallel loops tile by tile, either
+    ``True`` for tiles sized to the caches or a tuple of tile sizes.
     """
 
     def __init__(self, value):
@@ -55,7 +97,14 @@ class ParallelOptions(object):
             self.stencil = value
             self.fusion = value
             self.prange = value
+            self.scratch = value
+            self.schedule = 'static'
+            self.chunksize = 0
+            self.autotune = False
+            self.tiling = False
         elif isinstance(value, dict):
+            # work on a copy, the same dict is reused for every compilation
+            value = value.copy()
             self.enabled = True
             self.comprehension = value.pop('comprehension', True)
             self.reduction = value.pop('reduction', True)
@@ -64,6 +113,13 @@ class ParallelOptions(object):
             self.stencil = value.pop('stencil', True)
             self.fusion = value.pop('fusion', True)
             self.prange = value.pop('prange', True)
+            self.scratch = value.pop('scratch', True)
+            self.schedule = value.pop('schedule', 'static')
+            self.chunksize = value.pop('chunksize', 0)
+            self.autotune = value.pop('autotune', False)
+            self.tiling = value.pop('tiling', False)
+            check_schedule(self.schedule, self.chunksize)
+            check_tiling(self.tiling)
             if value:
                 msg = "Unrecognized parallel options: %s" % value.keys()
                 raise NameError(msg)
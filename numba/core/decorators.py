@@ -189,7 +189,10 @@ def _jit(sigs, locals, target, cache, targetoptions, **dispatcher_args):
                           **dispatcher_args)
         if cache:
             disp.enable_caching()
-        if sigs is not None:
+        if sigs is not None and config.DEFERRED_COMPILE and \
+                hasattr(disp, 'compile_deferred'):
+            disp.compile_deferred(sigs)
+        elif sigs is not None:
             # Register the Dispatcher to the type inference mechanism,
             # even though the decorator hasn't returned yet.
             from numba.core import typeinfer
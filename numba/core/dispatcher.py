@@ -6,9 +6,11 @@ import functools
 import os
 import struct
 import sys
+import threading
 import types as pytypes
 import uuid
 import weakref
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 from numba import _dispatcher
@@ -186,6 +188,32 @@ class _CompilingCounter(object):
     __nonzero__ = __bool__
 
 
+class _DeferredCompiler(object):
+    """
+    The thread running the deferred compilation of the signatures declared
+    to @jit when NUMBA_DEFERRED_COMPILE is set.  This defers compilation,
+    it does not parallelize it: the signatures are compiled one after the
+    other, each holding the global compiler lock for the whole compilation
+    since llvmlite's LLVM context is shared and not thread-safe.  Only the
+    Python code of the application runs meanwhile, as the LLVM work
+    releases the GIL.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='numba-compiler')
+        return self._executor.submit(fn, *args)
+
+
+_deferred_compiler = _DeferredCompiler()
+
+
 class _DispatcherBase(_dispatcher.Dispatcher):
     """
     Common base class for dispatcher Implementations.
@@ -224,6 +252,11 @@ class _DispatcherBase(_dispatcher.Dispatcher):
 
         self.doc = py_func.__doc__
         self._compiling_counter = _CompilingCounter()
+        # A mapping of argument types to the futures of the signatures
+        # whose compilation is deferred, and the future of the end of the
+        # deferred compilation
+        self._pending = {}
+        self._pending_end = None
         weakref.finalize(self, self._make_finalizer())
 
     def _reset_overloads(self):
@@ -274,6 +307,35 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         assert (not val) or len(self.signatures) > 0
         self._can_compile = not val
 
+    def wait_for_compilation(self):
+        """
+        Block until the signatures whose compilation is deferred (see
+        Dispatcher.compile_deferred()) are compiled, re-raising the
+        first compilation error.
+        """
+        if self._pending_end is not None:
+            self._pending_end.result()
+        for future in list(self._pending.values()):
+            future.result()
+
+    def _wait_deferred(self, args):
+        """
+        Wait for the deferred compilation of the argument types *args*,
+        or of all the pending signatures if *args* is not one of them.
+        Re-raise the compilation error of *args* if it failed.
+        """
+        if not self._pending or global_compiler_lock.is_locked():
+            # Waiting for the compiler thread while holding the compiler
+            # lock would deadlock; the caller compiles the signature
+            # itself instead and the compiler thread then finds it compiled.
+            return
+        future = self._pending.get(args)
+        if future is None:
+            # Wait for all the signatures, without raising the errors of
+            # the ones which failed
+            future = self._pending_end
+        future.result()
+
     def add_overload(self, cres):
         args = tuple(cres.signature.args)
         sig = [a._code for a in args]
@@ -296,6 +358,7 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         # Fold keyword arguments and resolve default values
         pysig, args = self._compiler.fold_argument_types(args, kws)
         kws = {}
+        self._wait_deferred(tuple(args))
         # Ensure an overload is available
         if self._can_compile:
             self.compile(tuple(args))
@@ -349,6 +412,12 @@ class _DispatcherBase(_dispatcher.Dispatcher):
                 argtypes.append(types.Omitted(a.value))
             else:
                 argtypes.append(self.typeof_pyval(a))
+        if self._pending:
+            self._wait_deferred(tuple(argtypes))
+            if not self._can_compile:
+                # All the declared signatures are compiled now, re-dispatch
+                # allowing the conversions to them
+                return self
         try:
             return self.compile(tuple(argtypes))
         except errors.ForceLiteralArg as e:
@@ -589,6 +658,10 @@ class _DispatcherBase(_dispatcher.Dispatcher):
         """
         assert not kws, "kwargs not handled"
         args = [self.typeof_pyval(a) for a in args]
+        future = self._pending.get(tuple(args))
+        if future is not None:
+            # The deferred compilation of the signature failed
+            future.result()
         msg = ("No matching definition for argument type(s) %s"
                % ', '.join(map(str, args)))
         raise TypeError(msg)
@@ -780,26 +853,35 @@ class Dispatcher(_DispatcherBase):
                 return existing.entry_point
             # Try to load from disk cache
             cres = self._cache.load_overload(sig, self.targetctx)
-            if cres is not None:
-                self._cache_hits[sig] += 1
-                # XXX fold this in add_overload()? (also see compiler.py)
-                if not cres.objectmode and not cres.interpmode:
-                    self.targetctx.insert_user_function(cres.entry_point,
-                                                        cres.fndesc, [cres.library])
-                self.add_overload(cres)
-                return cres.entry_point
-
-            self._cache_misses[sig] += 1
-            try:
-                cres = self._compiler.compile(args, return_type)
-            except errors.ForceLiteralArg as e:
-                def folded(args, kws):
-                    return self._compiler.fold_argument_types(args, kws)[1]
-                raise e.bind_fold_arguments(folded)
+            if cres is None:
+                with self._cache.compile_lock(sig) as locked:
+                    if locked:
+                        # Another process may have saved the overload
+                        # while we were waiting for the lock
+                        cres = self._cache.load_overload(sig, self.targetctx)
+                    if cres is None:
+                        return self._compile_and_save(sig, args, return_type)
+
+            self._cache_hits[sig] += 1
+            # XXX fold this in add_overload()? (also see compiler.py)
+            if not cres.objectmode and not cres.interpmode:
+                self.targetctx.insert_user_function(cres.entry_point,
+                                                    cres.fndesc, [cres.library])
             self.add_overload(cres)
-            self._cache.save_overload(sig, cres)
             return cres.entry_point
 
+    def _compile_and_save(self, sig, args, return_type):
+        self._cache_misses[sig] += 1
+        try:
+            cres = self._compiler.compile(args, return_type)
+        except errors.ForceLiteralArg as e:
+            def folded(args, kws):
+                return self._compiler.fold_argument_types(args, kws)[1]
+            raise e.bind_fold_arguments(folded)
+        self.add_overload(cres)
+        self._cache.save_overload(sig, cres)
+        return cres.entry_point
+
     def get_compile_result(self, sig):
         """Compile (if needed) and return the compilation result with the
         given signature.
@@ -809,6 +891,45 @@ class Dispatcher(_DispatcherBase):
             self.compile(atypes)
         return self.overloads[atypes]
 
+    def compile_deferred(self, sigs):
+        """
+        Defer the compilation of the given signatures to the compiler
+        thread, which compiles them one by one and then disables
+        the compilation of other signatures like @jit does for its eagerly
+        compiled signatures.  Calls with the argument types of an already
+        compiled signature are dispatched right away, other calls block
+        until the signature they need, or all of them if it isn't one of
+        *sigs*, is compiled.
+        """
+        futures = []
+        for sig in sigs:
+            args, _ = sigutils.normalize_signature(sig)
+            future = _deferred_compiler.submit(self._compile_pending, sig)
+            self._pending[tuple(args)] = future
+            futures.append(future)
+        self._pending_end = _deferred_compiler.submit(
+            self._end_deferred_compile, futures)
+
+    def _compile_pending(self, sig):
+        from numba.core import typeinfer
+        # Allow resolution of recursive calls, as in the eager
+        # compilation of @jit
+        with typeinfer.register_dispatcher(self):
+            return self.compile(sig)
+
+    def _end_deferred_compile(self, futures):
+        # The futures are done since the compiler thread runs the jobs in
+        # order.  Only the signatures which failed stay pending, so that
+        # the calls needing them, and only those, re-raise their error.
+        self._pending = dict((args, future)
+                             for args, future in self._pending.items()
+                             if future.exception() is not None)
+        if any(future.exception() is None for future in futures):
+            # Hold the lock so as not to disable compilation in the middle
+            # of a compilation started by another thread
+            with global_compiler_lock:
+                self.disable_compile()
+
     def recompile(self):
         """
         Recompile all signatures afresh.
@@ -862,6 +983,24 @@ class Dispatcher(_DispatcherBase):
         else:
             return dict((sig, self.overloads[sig].metadata) for sig in self.signatures)
 
+    def get_compile_stats(self, signature=None):
+        """
+        Obtain the compile time breakdown (a
+        numba.core.compile_stats.CompileStats) for a given signature, or a
+        dict of them for all signatures if no signature is given.  The
+        breakdown is None for overloads loaded from the on-disk cache.
+        """
+        def stats(sig):
+            metadata = self.overloads[sig].metadata
+            if metadata is None:
+                return None
+            return metadata.get('compile_stats')
+        if signature is not None:
+            args, _ = sigutils.normalize_signature(signature)
+            return stats(tuple(args))
+        else:
+            return dict((sig, stats(sig)) for sig in self.signatures)
+
     def get_function_type(self):
         """Return unique function type of dispatcher when possible, otherwise
         return None.
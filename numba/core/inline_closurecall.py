@@ -31,6 +31,7 @@ from numba.core.analysis import (
     compute_use_defs,
     compute_live_variables)
 from numba.core import postproc
+from numba.core.cpu_options import check_tiling
 from numba.cpython.rangeobj import range_iter_len
 from numba.np.unsafe.ndarray import empty_inferred as unsafe_empty_inferred
 import numpy as np
@@ -159,7 +160,7 @@ class InlineClosureCallPass(object):
         return True
 
     def _inline_stencil(self, instr, call_name, func_def):
-        from numba.stencils.stencil import StencilFunc
+        from numba.stencils.stencil import StencilFunc, check_stencil_mode
         lhs = instr.target
         expr = instr.value
         # We keep the escaping variables of the stencil kernel
@@ -197,7 +198,19 @@ class InlineClosureCallPass(object):
             if not fixed:
                raise ValueError("stencil index_offsets option should be a tuple"
                         " with constant structure such as (offset, )")
-        sf = StencilFunc(kernel_ir, 'constant', options)
+        if 'tile' in options:
+            fixed = guard(self._fix_stencil_tile, options)
+            if not fixed:
+               raise ValueError("stencil tile option should be a constant"
+                        " bool or tuple of tile sizes such as (1, 16, 512)")
+        mode = 'constant'
+        if 'mode' in options:
+            mode = guard(ir_utils.find_const, self.func_ir, options.pop('mode'))
+            if not isinstance(mode, str):
+                raise ValueError("stencil mode option should be a constant "
+                                 "string such as 'wrap'")
+            check_stencil_mode(mode)
+        sf = StencilFunc(kernel_ir, mode, options)
         sf.kws = expr.kws # hack to keep variables live
         sf_global = ir.Global('stencil', sf, expr.loc)
         self.func_ir._definitions[lhs.name] = [sf_global]
@@ -230,6 +243,21 @@ class InlineClosureCallPass(object):
         options['index_offsets'] = tuple(offset_tuple.items)
         return True
 
+    def _fix_stencil_tile(self, options):
+        """
+        Extract the constant bool or tuple of tile sizes of the stencil tile
+        option from the program IR to provide to StencilFunc.
+        """
+        tile_def = get_definition(self.func_ir, options['tile'])
+        if hasattr(tile_def, 'items'):
+            tile = tuple(ir_utils.find_const(self.func_ir, v)
+                         for v in tile_def.items)
+        else:
+            tile = ir_utils.find_const(self.func_ir, options['tile'])
+        check_tiling(tile)
+        options['tile'] = tile
+        return True
+
     def _inline_closure(self, work_list, block, i, func_def):
         require(isinstance(func_def, ir.Expr) and
                 func_def.op == "make_function")
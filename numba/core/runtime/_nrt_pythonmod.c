@@ -2,6 +2,7 @@
 #define NUMBA_EXPORT_DATA(_vartype) static _vartype
 
 #include "_nrt_python.c"
+#include "nrt_pool.h"
 
 static PyObject *
 memsys_shutdown(PyObject *self, PyObject *args) {
@@ -17,6 +18,25 @@ memsys_use_cpython_allocator(PyObject *self, PyObject *args) {
     Py_RETURN_NONE;
 }
 
+static PyObject *
+memsys_use_libc_allocator(PyObject *self, PyObject *args) {
+    NRT_MemSys_set_allocator(malloc, realloc, free);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_use_pool_allocator(PyObject *self, PyObject *args) {
+    if (NRT_Pool_init(PyMem_RawMalloc, PyMem_RawRealloc, PyMem_RawFree)) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "cannot initialize the pool allocator");
+        return NULL;
+    }
+    NRT_MemSys_set_allocator(NRT_Pool_malloc,
+                             NRT_Pool_realloc,
+                             NRT_Pool_free);
+    Py_RETURN_NONE;
+}
+
 static PyObject *
 memsys_set_atomic_inc_dec(PyObject *self, PyObject *args) {
     PyObject *addr_inc_obj, *addr_dec_obj;
@@ -65,6 +85,76 @@ memsys_get_stats_mi_free(PyObject *self, PyObject *args) {
     return PyLong_FromSize_t(NRT_MemSys_get_stats_mi_free());
 }
 
+static PyObject *
+memsys_set_stats_level(PyObject *self, PyObject *args) {
+    int level;
+    if (!PyArg_ParseTuple(args, "i", &level)) {
+        return NULL;
+    }
+    if (level < NRT_STATS_OFF || level > NRT_STATS_PEAK) {
+        PyErr_Format(PyExc_ValueError, "invalid NRT stats level %d", level);
+        return NULL;
+    }
+    NRT_MemSys_set_stats_level(level);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_get_stats_level(PyObject *self, PyObject *args) {
+    return PyLong_FromLong(NRT_MemSys_get_stats_level());
+}
+
+static PyObject *
+memsys_get_stats(PyObject *self, PyObject *args) {
+    NRT_Stats stats;
+    PyObject *hist;
+    Py_ssize_t i;
+
+    NRT_MemSys_get_stats(&stats);
+    hist = PyTuple_New(NRT_STATS_HIST_SIZE);
+    if (hist == NULL)
+        return NULL;
+    for (i = 0; i < NRT_STATS_HIST_SIZE; i++) {
+        PyObject *count = PyLong_FromSize_t(stats.size_hist[i]);
+        if (count == NULL) {
+            Py_DECREF(hist);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(hist, i, count);
+    }
+    return Py_BuildValue("(nnnnnnnN)",
+                         (Py_ssize_t) stats.alloc,
+                         (Py_ssize_t) stats.free,
+                         (Py_ssize_t) stats.mi_alloc,
+                         (Py_ssize_t) stats.mi_free,
+                         (Py_ssize_t) stats.bytes_alloc,
+                         (Py_ssize_t) stats.bytes_free,
+                         (Py_ssize_t) NRT_MemSys_get_stats_peak_bytes(),
+                         hist);
+}
+
+static PyObject *
+memsys_reset_stats_peak_bytes(PyObject *self, PyObject *args) {
+    NRT_MemSys_reset_stats_peak_bytes();
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+memsys_get_pool_stats(PyObject *self, PyObject *args) {
+    NRT_PoolStats stats;
+    NRT_Pool_get_stats(&stats);
+    return Py_BuildValue("(nnnnnnnnn)",
+                         (Py_ssize_t) stats.alloc,
+                         (Py_ssize_t) stats.free,
+                         (Py_ssize_t) stats.large_alloc,
+                         (Py_ssize_t) stats.large_free,
+                         (Py_ssize_t) stats.refills,
+                         (Py_ssize_t) stats.flushes,
+                         (Py_ssize_t) stats.slabs,
+                         (Py_ssize_t) stats.slab_bytes,
+                         (Py_ssize_t) stats.caches);
+}
+
 
 /*
  * Create a new MemInfo with a owner PyObject
@@ -118,6 +208,8 @@ static PyMethodDef ext_methods[] = {
 #define declmethod(func) { #func , ( PyCFunction )func , METH_VARARGS , NULL }
 #define declmethod_noargs(func) { #func , ( PyCFunction )func , METH_NOARGS, NULL }
     declmethod_noargs(memsys_use_cpython_allocator),
+    declmethod_noargs(memsys_use_libc_allocator),
+    declmethod_noargs(memsys_use_pool_allocator),
     declmethod_noargs(memsys_shutdown),
     declmethod(memsys_set_atomic_inc_dec),
     declmethod(memsys_set_atomic_cas),
@@ -125,6 +217,11 @@ static PyMethodDef ext_methods[] = {
     declmethod_noargs(memsys_get_stats_free),
     declmethod_noargs(memsys_get_stats_mi_alloc),
     declmethod_noargs(memsys_get_stats_mi_free),
+    declmethod(memsys_set_stats_level),
+    declmethod_noargs(memsys_get_stats_level),
+    declmethod_noargs(memsys_get_stats),
+    declmethod_noargs(memsys_reset_stats_peak_bytes),
+    declmethod_noargs(memsys_get_pool_stats),
     declmethod(meminfo_new),
     declmethod(meminfo_alloc),
     declmethod(meminfo_alloc_safe),
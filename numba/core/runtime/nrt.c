@@ -1,6 +1,7 @@
 #include <stdarg.h>
 #include <string.h> /* for memset */
 #include "nrt.h"
+#include "nrt_threads.h"
 #include "assert.h"
 
 #if !defined MIN
@@ -41,6 +42,16 @@ static void nrt_fatal_error(const char *msg)
  * Global resources.
  */
 
+/* The statistics of a thread, only written by that thread so that they are
+   updated without atomic operations nor cache line sharing. */
+typedef struct ThreadStats {
+    NRT_Stats stats;
+    /* Next in the list of all the thread statistics */
+    struct ThreadStats *next;
+    /* Whether the statistics are owned by a live thread */
+    int in_use;
+} NRT_ThreadStats;
+
 struct MemSys {
     /* Atomic increment and decrement function */
     NRT_atomic_inc_dec_func atomic_inc, atomic_dec;
@@ -48,8 +59,14 @@ struct MemSys {
     atomic_meminfo_cas_func atomic_cas;
     /* Shutdown flag */
     int shutting;
-    /* Stats */
-    size_t stats_alloc, stats_free, stats_mi_alloc, stats_mi_free;
+    /* Stats collection, one of the NRT_STATS_* levels */
+    int stats_level;
+    /* Per-thread stats, aggregated on read, protected by stats_lock */
+    NRT_ThreadStats *stats;
+    nrt_spinlock stats_lock;
+    /* Live and peak bytes, only maintained at the NRT_STATS_PEAK level
+       and protected by stats_lock */
+    size_t live_bytes, peak_bytes;
     /* System allocation functions */
     struct {
         NRT_malloc_func malloc;
@@ -61,6 +78,108 @@ struct MemSys {
 /* The Memory System object */
 static NRT_MemSys TheMSys;
 
+/* The statistics of the current thread */
+static NRT_TLS NRT_ThreadStats *nrt_local_stats;
+static nrt_thread_key nrt_stats_key;
+/* Shared by the threads that fail to allocate their own statistics */
+static NRT_ThreadStats nrt_fallback_stats;
+
+
+NRT_THREAD_EXIT_CALLBACK(nrt_stats_release) {
+    NRT_ThreadStats *ts = (NRT_ThreadStats *) arg;
+    if (ts == NULL)
+        return;
+    /* Keep the counts for the aggregates, let another thread reuse them */
+    nrt_local_stats = NULL;
+    NRT_SPIN_LOCK(&TheMSys.stats_lock);
+    ts->in_use = 0;
+    NRT_SPIN_UNLOCK(&TheMSys.stats_lock);
+}
+
+static
+NRT_Stats *nrt_stats_new(void) {
+    NRT_ThreadStats *ts;
+
+    NRT_SPIN_LOCK(&TheMSys.stats_lock);
+    for (ts = TheMSys.stats; ts != NULL; ts = ts->next) {
+        if (!ts->in_use)
+            break;
+    }
+    if (ts == NULL) {
+        /* Not allocated through the NRT allocator, which is counted */
+        ts = (NRT_ThreadStats *) malloc(sizeof(NRT_ThreadStats));
+        if (ts != NULL) {
+            memset(ts, 0, sizeof(NRT_ThreadStats));
+            ts->next = TheMSys.stats;
+            TheMSys.stats = ts;
+        }
+    }
+    if (ts != NULL)
+        ts->in_use = 1;
+    NRT_SPIN_UNLOCK(&TheMSys.stats_lock);
+
+    if (ts == NULL)
+        return &nrt_fallback_stats.stats;
+    nrt_local_stats = ts;
+    NRT_THREAD_KEY_SET(nrt_stats_key, ts);
+    return &ts->stats;
+}
+
+/* Get the statistics of the current thread */
+static
+NRT_Stats *nrt_stats_get(void) {
+    NRT_ThreadStats *ts = nrt_local_stats;
+    if (ts != NULL)
+        return &ts->stats;
+    return nrt_stats_new();
+}
+
+static
+size_t nrt_stats_bucket(size_t size) {
+    size_t bucket = 0;
+    size_t bound = NRT_STATS_HIST_MIN;
+    while (size > bound && bucket < NRT_STATS_HIST_SIZE - 1) {
+        bound <<= 1;
+        bucket++;
+    }
+    return bucket;
+}
+
+/* Account for *alloc_bytes* bytes of MemInfo data allocated and
+   *free_bytes* released. */
+static
+void nrt_stats_bytes(size_t alloc_bytes, size_t free_bytes) {
+    NRT_Stats *stats = nrt_stats_get();
+    stats->bytes_alloc += alloc_bytes;
+    stats->bytes_free += free_bytes;
+    if (TheMSys.stats_level >= NRT_STATS_PEAK) {
+        NRT_SPIN_LOCK(&TheMSys.stats_lock);
+        TheMSys.live_bytes += alloc_bytes;
+        TheMSys.live_bytes -= free_bytes;
+        if (TheMSys.live_bytes > TheMSys.peak_bytes)
+            TheMSys.peak_bytes = TheMSys.live_bytes;
+        NRT_SPIN_UNLOCK(&TheMSys.stats_lock);
+    }
+}
+
+/* Sum the statistics of all the threads, stats_lock must be held */
+static
+void nrt_stats_sum(NRT_Stats *out) {
+    NRT_ThreadStats *ts;
+    size_t i;
+    memset(out, 0, sizeof(NRT_Stats));
+    for (ts = TheMSys.stats; ts != NULL; ts = ts->next) {
+        out->alloc += ts->stats.alloc;
+        out->free += ts->stats.free;
+        out->mi_alloc += ts->stats.mi_alloc;
+        out->mi_free += ts->stats.mi_free;
+        out->bytes_alloc += ts->stats.bytes_alloc;
+        out->bytes_free += ts->stats.bytes_free;
+        for (i = 0; i < NRT_STATS_HIST_SIZE; i++)
+            out->size_hist[i] += ts->stats.size_hist[i];
+    }
+}
+
 
 void NRT_MemSys_init(void) {
     memset(&TheMSys, 0, sizeof(NRT_MemSys));
@@ -68,6 +187,13 @@ void NRT_MemSys_init(void) {
     TheMSys.allocator.malloc = malloc;
     TheMSys.allocator.realloc = realloc;
     TheMSys.allocator.free = free;
+    /* Collect the stats, the fallback stats are always in the list */
+    TheMSys.stats_level = NRT_STATS_COUNT;
+    memset(&nrt_fallback_stats, 0, sizeof(NRT_ThreadStats));
+    nrt_fallback_stats.in_use = 1;
+    TheMSys.stats = &nrt_fallback_stats;
+    if (NRT_THREAD_KEY_CREATE(nrt_stats_key, nrt_stats_release))
+        nrt_fatal_error("cannot create the thread key of the NRT stats");
 }
 
 void NRT_MemSys_shutdown(void) {
@@ -84,11 +210,12 @@ void NRT_MemSys_set_allocator(NRT_malloc_func malloc_func,
                               NRT_realloc_func realloc_func,
                               NRT_free_func free_func)
 {
+    NRT_Stats stats;
+    NRT_MemSys_get_stats(&stats);
     if ((malloc_func != TheMSys.allocator.malloc ||
          realloc_func != TheMSys.allocator.realloc ||
          free_func != TheMSys.allocator.free) &&
-         (TheMSys.stats_alloc != TheMSys.stats_free ||
-          TheMSys.stats_mi_alloc != TheMSys.stats_mi_free)) {
+         (stats.alloc != stats.free || stats.mi_alloc != stats.mi_free)) {
         nrt_fatal_error("cannot change allocator while blocks are allocated");
     }
     TheMSys.allocator.malloc = malloc_func;
@@ -107,20 +234,65 @@ void NRT_MemSys_set_atomic_cas(NRT_atomic_cas_func cas) {
     TheMSys.atomic_cas = (atomic_meminfo_cas_func) cas;
 }
 
+void NRT_MemSys_set_stats_level(int level) {
+    NRT_Stats stats;
+    NRT_SPIN_LOCK(&TheMSys.stats_lock);
+    if (level >= NRT_STATS_PEAK && TheMSys.stats_level < NRT_STATS_PEAK) {
+        /* Start tracking from the bytes live so far */
+        nrt_stats_sum(&stats);
+        TheMSys.live_bytes = stats.bytes_alloc - stats.bytes_free;
+        TheMSys.peak_bytes = TheMSys.live_bytes;
+    }
+    TheMSys.stats_level = level;
+    NRT_SPIN_UNLOCK(&TheMSys.stats_lock);
+}
+
+int NRT_MemSys_get_stats_level(void) {
+    return TheMSys.stats_level;
+}
+
+void NRT_MemSys_get_stats(NRT_Stats *stats) {
+    NRT_SPIN_LOCK(&TheMSys.stats_lock);
+    nrt_stats_sum(stats);
+    NRT_SPIN_UNLOCK(&TheMSys.stats_lock);
+}
+
+size_t NRT_MemSys_get_stats_peak_bytes(void) {
+    size_t peak;
+    NRT_SPIN_LOCK(&TheMSys.stats_lock);
+    peak = TheMSys.peak_bytes;
+    NRT_SPIN_UNLOCK(&TheMSys.stats_lock);
+    return peak;
+}
+
+void NRT_MemSys_reset_stats_peak_bytes(void) {
+    NRT_SPIN_LOCK(&TheMSys.stats_lock);
+    TheMSys.peak_bytes = TheMSys.live_bytes;
+    NRT_SPIN_UNLOCK(&TheMSys.stats_lock);
+}
+
 size_t NRT_MemSys_get_stats_alloc() {
-    return TheMSys.stats_alloc;
+    NRT_Stats stats;
+    NRT_MemSys_get_stats(&stats);
+    return stats.alloc;
 }
 
 size_t NRT_MemSys_get_stats_free() {
-    return TheMSys.stats_free;
+    NRT_Stats stats;
+    NRT_MemSys_get_stats(&stats);
+    return stats.free;
 }
 
 size_t NRT_MemSys_get_stats_mi_alloc() {
-    return TheMSys.stats_mi_alloc;
+    NRT_Stats stats;
+    NRT_MemSys_get_stats(&stats);
+    return stats.mi_alloc;
 }
 
 size_t NRT_MemSys_get_stats_mi_free() {
-    return TheMSys.stats_mi_free;
+    NRT_Stats stats;
+    NRT_MemSys_get_stats(&stats);
+    return stats.mi_free;
 }
 
 static
@@ -178,7 +350,10 @@ void NRT_MemInfo_init(NRT_MemInfo *mi,void *data, size_t size,
     mi->data = data;
     mi->size = size;
     /* Update stats */
-    TheMSys.atomic_inc(&TheMSys.stats_mi_alloc);
+    if (TheMSys.stats_level) {
+        nrt_stats_get()->mi_alloc++;
+        nrt_stats_bytes(size, 0);
+    }
 }
 
 NRT_MemInfo *NRT_MemInfo_new(void *data, size_t size,
@@ -290,8 +465,12 @@ NRT_MemInfo *NRT_MemInfo_alloc_safe_aligned(size_t size, unsigned align) {
 }
 
 void NRT_MemInfo_destroy(NRT_MemInfo *mi) {
+    size_t size = mi->size;
     NRT_Free(mi);
-    TheMSys.atomic_inc(&TheMSys.stats_mi_free);
+    if (TheMSys.stats_level) {
+        nrt_stats_get()->mi_free++;
+        nrt_stats_bytes(0, size);
+    }
 }
 
 void NRT_MemInfo_acquire(NRT_MemInfo *mi) {
@@ -380,6 +559,8 @@ void *NRT_MemInfo_varsize_alloc(NRT_MemInfo *mi, size_t size)
     mi->data = NRT_Allocate(size);
     if (mi->data == NULL)
         return NULL;
+    if (TheMSys.stats_level)
+        nrt_stats_bytes(size, mi->size);
     mi->size = size;
     NRT_Debug(nrt_debug_print("NRT_MemInfo_varsize_alloc %p size=%zu "
                               "-> data=%p\n", mi, size, mi->data));
@@ -396,6 +577,8 @@ void *NRT_MemInfo_varsize_realloc(NRT_MemInfo *mi, size_t size)
     mi->data = NRT_Reallocate(mi->data, size);
     if (mi->data == NULL)
         return NULL;
+    if (TheMSys.stats_level)
+        nrt_stats_bytes(size, mi->size);
     mi->size = size;
     NRT_Debug(nrt_debug_print("NRT_MemInfo_varsize_realloc %p size=%zu "
                               "-> data=%p\n", mi, size, mi->data));
@@ -405,8 +588,12 @@ void *NRT_MemInfo_varsize_realloc(NRT_MemInfo *mi, size_t size)
 void NRT_MemInfo_varsize_free(NRT_MemInfo *mi, void *ptr)
 {
     NRT_Free(ptr);
-    if (ptr == mi->data)
+    if (ptr == mi->data) {
+        if (TheMSys.stats_level)
+            nrt_stats_bytes(0, mi->size);
         mi->data = NULL;
+        mi->size = 0;
+    }
 }
 
 /*
@@ -416,7 +603,11 @@ void NRT_MemInfo_varsize_free(NRT_MemInfo *mi, void *ptr)
 void* NRT_Allocate(size_t size) {
     void *ptr = TheMSys.allocator.malloc(size);
     NRT_Debug(nrt_debug_print("NRT_Allocate bytes=%zu ptr=%p\n", size, ptr));
-    TheMSys.atomic_inc(&TheMSys.stats_alloc);
+    if (TheMSys.stats_level) {
+        NRT_Stats *stats = nrt_stats_get();
+        stats->alloc++;
+        stats->size_hist[nrt_stats_bucket(size)]++;
+    }
     return ptr;
 }
 
@@ -430,7 +621,8 @@ void *NRT_Reallocate(void *ptr, size_t size) {
 void NRT_Free(void *ptr) {
     NRT_Debug(nrt_debug_print("NRT_Free %p\n", ptr));
     TheMSys.allocator.free(ptr);
-    TheMSys.atomic_inc(&TheMSys.stats_free);
+    if (TheMSys.stats_level)
+        nrt_stats_get()->free++;
 }
 
 /*
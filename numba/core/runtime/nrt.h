@@ -32,6 +32,30 @@ typedef void *(*NRT_malloc_func)(size_t size);
 typedef void *(*NRT_realloc_func)(void *ptr, size_t new_size);
 typedef void (*NRT_free_func)(void *ptr);
 
+/* Levels of statistics collection */
+#define NRT_STATS_OFF 0
+/* Count the operations and bytes, without contention between threads */
+#define NRT_STATS_COUNT 1
+/* Also track the peak of the live bytes, in a shared counter */
+#define NRT_STATS_PEAK 2
+
+/* The histogram of allocation sizes has a bucket for sizes up to
+   NRT_STATS_HIST_MIN bytes, then one per power of two, and a last one for
+   all the larger sizes. */
+#define NRT_STATS_HIST_MIN 16
+#define NRT_STATS_HIST_SIZE 24
+
+typedef struct {
+    /* Counts of NRT_Allocate() and NRT_Free() calls */
+    size_t alloc, free;
+    /* Counts of MemInfo created and destroyed */
+    size_t mi_alloc, mi_free;
+    /* Bytes of MemInfo data allocated and released */
+    size_t bytes_alloc, bytes_free;
+    /* Counts of NRT_Allocate() calls by size */
+    size_t size_hist[NRT_STATS_HIST_SIZE];
+} NRT_Stats;
+
 
 /* Memory System API */
 
@@ -75,6 +99,30 @@ void NRT_MemSys_set_atomic_inc_dec_stub(void);
 VISIBILITY_HIDDEN
 void NRT_MemSys_set_atomic_cas_stub(void);
 
+/*
+ * Set and get the level of statistics collection, one of the NRT_STATS_*
+ * values.  The counts are not updated while the collection is off.
+ */
+VISIBILITY_HIDDEN
+void NRT_MemSys_set_stats_level(int level);
+VISIBILITY_HIDDEN
+int NRT_MemSys_get_stats_level(void);
+
+/*
+ * Get the statistics of the memory subsystem, summed over all the threads.
+ */
+VISIBILITY_HIDDEN
+void NRT_MemSys_get_stats(NRT_Stats *stats);
+
+/*
+ * Get the peak of the live MemInfo data bytes, or reset it to the current
+ * live bytes.  Only tracked at the NRT_STATS_PEAK level.
+ */
+VISIBILITY_HIDDEN
+size_t NRT_MemSys_get_stats_peak_bytes(void);
+VISIBILITY_HIDDEN
+void NRT_MemSys_reset_stats_peak_bytes(void);
+
 /*
  * The following functions get internal statistics of the memory subsystem.
  */
@@ -1,3 +1,4 @@
+import warnings
 from collections import namedtuple
 from weakref import finalize as _finalize
 
@@ -6,15 +7,36 @@ from llvmlite import binding as ll
 
 from numba.core.compiler_lock import global_compiler_lock
 from numba.core.typing.typeof import typeof_impl
-from numba.core import types
+from numba.core import config, types
 from numba.core.runtime import _nrt_python as _nrt
 
 _nrt_mstats = namedtuple("nrt_mstats", ["alloc", "free", "mi_alloc", "mi_free"])
 
+_nrt_memstats = namedtuple("nrt_memstats",
+                           ["alloc", "free", "mi_alloc", "mi_free",
+                            "bytes_alloc", "bytes_free", "live_bytes",
+                            "peak_bytes", "size_hist"])
+
+# Levels of statistics collection, see NRT_STATS_* in "nrt.h"
+_STATS_OFF, _STATS_COUNT, _STATS_PEAK = range(3)
+
+_nrt_pool_stats = namedtuple("nrt_pool_stats",
+                             ["alloc", "free", "large_alloc", "large_free",
+                              "refills", "flushes", "slabs", "slab_bytes",
+                              "caches"])
+
+_allocators = {
+    'cpython': _nrt.memsys_use_cpython_allocator,
+    'libc': _nrt.memsys_use_libc_allocator,
+    'pool': _nrt.memsys_use_pool_allocator,
+}
+
 
 class _Runtime(object):
-    def __init__(self):
+    def __init__(self, allocator):
         self._init = False
+        # The name of the allocator in use
+        self.allocator = allocator
 
     @global_compiler_lock
     def initialize(self, ctx):
@@ -94,16 +116,93 @@ class _Runtime(object):
             mi = _nrt.meminfo_alloc(size)
         return MemInfo(mi)
 
+    def memsys_enable_stats(self, peak=False):
+        """
+        Enable the collection of the memory statistics.  If `peak` is True,
+        the peak of the live bytes is tracked as well, which requires a
+        counter shared by all the threads.
+        """
+        _nrt.memsys_set_stats_level(_STATS_PEAK if peak else _STATS_COUNT)
+
+    def memsys_disable_stats(self):
+        """
+        Disable the collection of the memory statistics.  The counts are not
+        updated until the collection is enabled again.
+        """
+        _nrt.memsys_set_stats_level(_STATS_OFF)
+
+    def memsys_stats_enabled(self):
+        """
+        Returns whether the memory statistics are collected.
+        """
+        return _nrt.memsys_get_stats_level() != _STATS_OFF
+
+    def _get_stats(self):
+        if not self.memsys_stats_enabled():
+            raise RuntimeError("NRT stats are disabled.")
+        return _nrt.memsys_get_stats()
+
     def get_allocation_stats(self):
         """
         Returns a namedtuple of (alloc, free, mi_alloc, mi_free) for count of
         each memory operations.
         """
         # No init guard needed to access stats members
-        return _nrt_mstats(alloc=_nrt.memsys_get_stats_alloc(),
-                           free=_nrt.memsys_get_stats_free(),
-                           mi_alloc=_nrt.memsys_get_stats_mi_alloc(),
-                           mi_free=_nrt.memsys_get_stats_mi_free())
+        alloc, free, mi_alloc, mi_free = self._get_stats()[:4]
+        return _nrt_mstats(alloc=alloc, free=free, mi_alloc=mi_alloc,
+                           mi_free=mi_free)
+
+    def get_memory_stats(self):
+        """
+        Returns a namedtuple of detailed memory statistics:
+
+        - alloc, free, mi_alloc, mi_free: as in get_allocation_stats()
+        - bytes_alloc, bytes_free: count of the bytes of MemInfo data
+          allocated and released, the difference is given as live_bytes
+        - peak_bytes: the peak of the live bytes since the last call to
+          reset_peak_bytes(), only tracked if enabled with
+          memsys_enable_stats(peak=True) or NUMBA_NRT_STATS=2
+        - size_hist: a tuple of (max_size, count) pairs counting the
+          allocations by size, the last max_size is None
+
+        The counts are summed over all the threads.
+        """
+        # No init guard needed to access stats members
+        stats = self._get_stats()
+        alloc, free, mi_alloc, mi_free, bytes_alloc, bytes_free = stats[:6]
+        peak_bytes, counts = stats[6:]
+        bounds = [16 << i for i in range(len(counts) - 1)] + [None]
+        return _nrt_memstats(alloc=alloc, free=free, mi_alloc=mi_alloc,
+                             mi_free=mi_free, bytes_alloc=bytes_alloc,
+                             bytes_free=bytes_free,
+                             live_bytes=bytes_alloc - bytes_free,
+                             peak_bytes=peak_bytes,
+                             size_hist=tuple(zip(bounds, counts)))
+
+    def reset_peak_bytes(self):
+        """
+        Reset the peak of the live bytes to the current live bytes.
+        """
+        _nrt.memsys_reset_stats_peak_bytes()
+
+    def get_pool_stats(self):
+        """
+        Returns a namedtuple of the statistics of the pool allocator, which
+        is used when NUMBA_NRT_ALLOCATOR is set to "pool":
+
+        - alloc, free: count of the allocations served from the size classes
+        - large_alloc, large_free: count of the allocations too large for
+          the size classes, forwarded to the CPython allocator
+        - refills, flushes: count of the batches of blocks moved between the
+          thread caches and the global depot
+        - slabs, slab_bytes: count and total size of the slabs the blocks
+          are carved out of
+        - caches: count of the thread caches
+
+        All the counts are zero when the pool allocator is not in use.
+        """
+        # No init guard needed to access stats members
+        return _nrt_pool_stats(*_nrt.memsys_get_pool_stats())
 
 
 # Alias to _nrt_python._MemInfo
@@ -115,9 +214,34 @@ def typeof_meminfo(val, c):
     return types.MemInfoPointer(types.voidptr)
 
 
+def _set_stats_level(level):
+    """
+    Set the level of statistics collection from NUMBA_NRT_STATS.
+    """
+    if level not in (_STATS_OFF, _STATS_COUNT, _STATS_PEAK):
+        msg = ("invalid NUMBA_NRT_STATS value %s, expected 0, 1 or 2, "
+               "using 1" % (level,))
+        warnings.warn(msg, RuntimeWarning)
+        level = _STATS_COUNT
+    _nrt.memsys_set_stats_level(level)
+
+
+def _use_allocator(name):
+    """
+    Install the NRT allocator called *name* and return its name.
+    """
+    if name not in _allocators:
+        msg = ("unknown NRT allocator '%s', expected one of %s, using "
+               "'cpython'" % (name, ", ".join(sorted(_allocators))))
+        warnings.warn(msg, RuntimeWarning)
+        name = 'cpython'
+    _allocators[name]()
+    return name
+
+
 # Create runtime
-_nrt.memsys_use_cpython_allocator()
-rtsys = _Runtime()
+_set_stats_level(config.NRT_STATS)
+rtsys = _Runtime(_use_allocator(config.NRT_ALLOCATOR))
 
 # Install finalizer
 _finalize(rtsys, _Runtime.shutdown)
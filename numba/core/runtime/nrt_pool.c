@@ -0,0 +1,457 @@
+/*
+ * A thread-caching, size-class pool allocator for the NRT.
+ *
+ * Small requests are rounded up to one of a few size classes and served
+ * from a free list private to the calling thread, so that the allocation
+ * and release of short-lived temporaries neither takes a lock nor calls
+ * the system allocator.  Blocks are carved out of slabs obtained from the
+ * backing allocator.  The thread caches exchange blocks with a global
+ * depot, one per size class, in batches: a thread cache is refilled with
+ * a batch when it runs out of blocks of a class, and gives a batch back
+ * when it holds too many.  Larger requests go to the backing allocator.
+ *
+ * Every block starts with a small header recording its size class, so
+ * that a block can be released by any thread.  Slabs are never returned
+ * to the backing allocator.
+ */
+
+#include <string.h> /* for memset, memcpy */
+#include "nrt_pool.h"
+#include "nrt_threads.h"
+
+/* Size of the block header, preserves the alignment of the payload */
+#define POOL_HEADER_SIZE 16
+/* Size classes are multiples of the granule */
+#define POOL_GRANULE 16
+/* The largest size class, header included */
+#define POOL_MAX_BLOCK 1024
+/* The largest request served from the size classes */
+#define POOL_MAX_SIZE (POOL_MAX_BLOCK - POOL_HEADER_SIZE)
+#define POOL_NUM_CLASSES 15
+/* Size class of the blocks obtained from the backing allocator */
+#define POOL_LARGE ((size_t) -1)
+/* Size of the slabs the blocks are carved out of */
+#define POOL_SLAB_SIZE (64 * 1024)
+/* Size of a batch of blocks moved between a thread cache and the depot */
+#define POOL_BATCH_BYTES (8 * 1024)
+
+#define POOL_MIN(a, b) ((a) < (b) ? (a) : (b))
+
+typedef struct block {
+    size_t sclass;
+    union {
+        struct block *next;     /* next free block of the same class */
+        size_t size;            /* requested size of a large block */
+    } u;
+} block_t;
+
+/* A chain of free blocks held by the depot.  It lives in the payload of
+   the first block of the chain. */
+typedef struct {
+    block_t *next;              /* next chain in the depot */
+    size_t count;               /* number of blocks in the chain */
+} chain_t;
+
+typedef char pool_header_fits[sizeof(block_t) <= POOL_HEADER_SIZE ? 1 : -1];
+typedef char pool_chain_fits[sizeof(chain_t) <= POOL_GRANULE ? 1 : -1];
+
+#define BLOCK_PAYLOAD(b) ((void *) ((char *) (b) + POOL_HEADER_SIZE))
+#define BLOCK_HEADER(p) ((block_t *) ((char *) (p) - POOL_HEADER_SIZE))
+#define BLOCK_CHAIN(b) ((chain_t *) BLOCK_PAYLOAD(b))
+
+typedef struct {
+    block_t *head;
+    size_t count;
+} free_list;
+
+typedef struct {
+    nrt_spinlock lock;
+    block_t *chains;
+} depot_t;
+
+typedef struct thread_cache {
+    free_list lists[POOL_NUM_CLASSES];
+    /* Next cache in the registry */
+    struct thread_cache *next;
+    /* Whether the cache is owned by a live thread */
+    int in_use;
+    /* Statistics, only written by the owning thread */
+    size_t alloc, free, large_alloc, large_free, refills, flushes;
+} thread_cache;
+
+
+static const size_t class_size[POOL_NUM_CLASSES] = {
+    32, 48, 64, 80, 96, 112, 128, 160, 192, 256, 320, 384, 512, 768, 1024
+};
+/* Number of blocks in a batch, by size class */
+static size_t class_batch[POOL_NUM_CLASSES];
+/* Size class of a block size, by number of granules */
+static unsigned char class_of_granules[POOL_MAX_BLOCK / POOL_GRANULE + 1];
+
+static struct {
+    NRT_malloc_func malloc;
+    NRT_realloc_func realloc;
+    NRT_free_func free;
+} backing;
+
+static int initialized = 0;
+
+static depot_t depots[POOL_NUM_CLASSES];
+
+/* The registry of thread caches and the slab statistics */
+static nrt_spinlock registry_lock;
+static thread_cache *caches;
+static size_t ncaches, nslabs, slab_bytes;
+
+static NRT_TLS thread_cache *local_cache;
+
+
+/*
+ * Thread caches.
+ */
+
+static void
+cache_release(void *arg) {
+    thread_cache *cache = (thread_cache *) arg;
+    size_t c;
+
+    /* The thread exits, give its blocks back to the depot */
+    for (c = 0; c < POOL_NUM_CLASSES; c++) {
+        free_list *list = &cache->lists[c];
+        if (list->head != NULL) {
+            depot_t *depot = &depots[c];
+            BLOCK_CHAIN(list->head)->count = list->count;
+            NRT_SPIN_LOCK(&depot->lock);
+            BLOCK_CHAIN(list->head)->next = depot->chains;
+            depot->chains = list->head;
+            NRT_SPIN_UNLOCK(&depot->lock);
+            list->head = NULL;
+            list->count = 0;
+            cache->flushes++;
+        }
+    }
+    local_cache = NULL;
+    NRT_SPIN_LOCK(&registry_lock);
+    cache->in_use = 0;
+    NRT_SPIN_UNLOCK(&registry_lock);
+}
+
+static nrt_thread_key cache_key;
+
+NRT_THREAD_EXIT_CALLBACK(cache_release_callback) {
+    if (arg != NULL)
+        cache_release(arg);
+}
+
+/*
+ * Get the cache of the calling thread, creating or recycling one if the
+ * thread doesn't have one yet.  Returns NULL if out of memory.
+ */
+static thread_cache *
+cache_get(void) {
+    thread_cache *cache = local_cache;
+    if (cache != NULL)
+        return cache;
+
+    NRT_SPIN_LOCK(&registry_lock);
+    for (cache = caches; cache != NULL; cache = cache->next) {
+        if (!cache->in_use)
+            break;
+    }
+    if (cache == NULL) {
+        cache = (thread_cache *) backing.malloc(sizeof(thread_cache));
+        if (cache != NULL) {
+            memset(cache, 0, sizeof(thread_cache));
+            cache->next = caches;
+            caches = cache;
+            ncaches++;
+        }
+    }
+    if (cache != NULL)
+        cache->in_use = 1;
+    NRT_SPIN_UNLOCK(&registry_lock);
+
+    if (cache != NULL) {
+        local_cache = cache;
+        NRT_THREAD_KEY_SET(cache_key, cache);
+    }
+    return cache;
+}
+
+/*
+ * Carve a new slab of blocks of size class *c*.  The first batch is
+ * returned, the other ones are added to the depot.
+ */
+static block_t *
+slab_carve(size_t c) {
+    const size_t bsize = class_size[c];
+    const size_t batch = class_batch[c];
+    const size_t n = POOL_SLAB_SIZE / bsize;
+    depot_t *depot = &depots[c];
+    char *slab;
+    block_t *first = NULL, *chains = NULL, *last = NULL;
+    size_t i, j;
+
+    slab = (char *) backing.malloc(n * bsize);
+    if (slab == NULL)
+        return NULL;
+
+    for (i = 0; i < n; i += batch) {
+        size_t count = POOL_MIN(batch, n - i);
+        block_t *head = (block_t *) (slab + i * bsize);
+        for (j = 0; j < count; j++) {
+            block_t *b = (block_t *) (slab + (i + j) * bsize);
+            b->sclass = c;
+            b->u.next = (j + 1 < count) ? (block_t *) ((char *) b + bsize)
+                                        : NULL;
+        }
+        BLOCK_CHAIN(head)->count = count;
+        BLOCK_CHAIN(head)->next = NULL;
+        if (first == NULL) {
+            first = head;
+        } else {
+            if (last == NULL)
+                chains = head;
+            else
+                BLOCK_CHAIN(last)->next = head;
+            last = head;
+        }
+    }
+
+    if (chains != NULL) {
+        NRT_SPIN_LOCK(&depot->lock);
+        BLOCK_CHAIN(last)->next = depot->chains;
+        depot->chains = chains;
+        NRT_SPIN_UNLOCK(&depot->lock);
+    }
+
+    NRT_SPIN_LOCK(&registry_lock);
+    nslabs++;
+    slab_bytes += n * bsize;
+    NRT_SPIN_UNLOCK(&registry_lock);
+    return first;
+}
+
+/*
+ * Refill the empty free list of size class *c* with a batch of blocks.
+ * Returns 0 if out of memory.
+ */
+static int
+cache_refill(thread_cache *cache, size_t c) {
+    depot_t *depot = &depots[c];
+    free_list *list = &cache->lists[c];
+    block_t *chain;
+
+    NRT_SPIN_LOCK(&depot->lock);
+    chain = depot->chains;
+    if (chain != NULL)
+        depot->chains = BLOCK_CHAIN(chain)->next;
+    NRT_SPIN_UNLOCK(&depot->lock);
+
+    if (chain == NULL) {
+        chain = slab_carve(c);
+        if (chain == NULL)
+            return 0;
+    }
+    list->head = chain;
+    list->count = BLOCK_CHAIN(chain)->count;
+    cache->refills++;
+    return 1;
+}
+
+/*
+ * Give a batch of blocks of size class *c* back to the depot.
+ */
+static void
+cache_flush(thread_cache *cache, size_t c) {
+    depot_t *depot = &depots[c];
+    free_list *list = &cache->lists[c];
+    const size_t batch = class_batch[c];
+    block_t *chain = list->head, *tail = list->head;
+    size_t i;
+
+    for (i = 1; i < batch; i++)
+        tail = tail->u.next;
+    list->head = tail->u.next;
+    list->count -= batch;
+    tail->u.next = NULL;
+
+    BLOCK_CHAIN(chain)->count = batch;
+    NRT_SPIN_LOCK(&depot->lock);
+    BLOCK_CHAIN(chain)->next = depot->chains;
+    depot->chains = chain;
+    NRT_SPIN_UNLOCK(&depot->lock);
+    cache->flushes++;
+}
+
+
+/*
+ * Allocation functions.
+ */
+
+static void *
+large_malloc(thread_cache *cache, size_t size) {
+    block_t *b;
+    if (size > (size_t) -1 - POOL_HEADER_SIZE)
+        return NULL;
+    b = (block_t *) backing.malloc(size + POOL_HEADER_SIZE);
+    if (b == NULL)
+        return NULL;
+    b->sclass = POOL_LARGE;
+    b->u.size = size;
+    if (cache != NULL)
+        cache->large_alloc++;
+    return BLOCK_PAYLOAD(b);
+}
+
+static size_t
+size_class(size_t size) {
+    return class_of_granules[(size + POOL_HEADER_SIZE + POOL_GRANULE - 1)
+                             / POOL_GRANULE];
+}
+
+void *
+NRT_Pool_malloc(size_t size) {
+    thread_cache *cache = cache_get();
+    free_list *list;
+    block_t *b;
+    size_t c;
+
+    if (size > POOL_MAX_SIZE || cache == NULL)
+        return large_malloc(cache, size);
+
+    c = size_class(size);
+    list = &cache->lists[c];
+    if (list->head == NULL && !cache_refill(cache, c))
+        return NULL;
+    b = list->head;
+    list->head = b->u.next;
+    list->count--;
+    cache->alloc++;
+    return BLOCK_PAYLOAD(b);
+}
+
+void
+NRT_Pool_free(void *ptr) {
+    thread_cache *cache;
+    free_list *list;
+    block_t *b;
+    size_t c;
+
+    if (ptr == NULL)
+        return;
+    cache = cache_get();
+    b = BLOCK_HEADER(ptr);
+    c = b->sclass;
+
+    if (c == POOL_LARGE) {
+        if (cache != NULL)
+            cache->large_free++;
+        backing.free(b);
+        return;
+    }
+    if (cache == NULL) {
+        /* Out of memory for a thread cache, give the block to the depot */
+        depot_t *depot = &depots[c];
+        b->u.next = NULL;
+        BLOCK_CHAIN(b)->count = 1;
+        NRT_SPIN_LOCK(&depot->lock);
+        BLOCK_CHAIN(b)->next = depot->chains;
+        depot->chains = b;
+        NRT_SPIN_UNLOCK(&depot->lock);
+        return;
+    }
+
+    list = &cache->lists[c];
+    b->u.next = list->head;
+    list->head = b;
+    list->count++;
+    cache->free++;
+    if (list->count >= 2 * class_batch[c])
+        cache_flush(cache, c);
+}
+
+void *
+NRT_Pool_realloc(void *ptr, size_t size) {
+    block_t *b;
+    size_t old_size;
+    void *new_ptr;
+
+    if (ptr == NULL)
+        return NRT_Pool_malloc(size);
+
+    b = BLOCK_HEADER(ptr);
+    if (b->sclass == POOL_LARGE) {
+        if (size > POOL_MAX_SIZE) {
+            if (size > (size_t) -1 - POOL_HEADER_SIZE)
+                return NULL;
+            b = (block_t *) backing.realloc(b, size + POOL_HEADER_SIZE);
+            if (b == NULL)
+                return NULL;
+            b->u.size = size;
+            return BLOCK_PAYLOAD(b);
+        }
+        old_size = b->u.size;
+    } else {
+        if (size <= POOL_MAX_SIZE && size_class(size) == b->sclass)
+            return ptr;
+        old_size = class_size[b->sclass] - POOL_HEADER_SIZE;
+    }
+
+    new_ptr = NRT_Pool_malloc(size);
+    if (new_ptr == NULL)
+        return NULL;
+    memcpy(new_ptr, ptr, POOL_MIN(size, old_size));
+    NRT_Pool_free(ptr);
+    return new_ptr;
+}
+
+
+int
+NRT_Pool_init(NRT_malloc_func malloc_func,
+              NRT_realloc_func realloc_func,
+              NRT_free_func free_func)
+{
+    size_t c, g;
+
+    if (initialized)
+        return 0;
+
+    c = 0;
+    for (g = 0; g <= POOL_MAX_BLOCK / POOL_GRANULE; g++) {
+        while (class_size[c] < g * POOL_GRANULE)
+            c++;
+        class_of_granules[g] = (unsigned char) c;
+    }
+    for (c = 0; c < POOL_NUM_CLASSES; c++)
+        class_batch[c] = POOL_BATCH_BYTES / class_size[c];
+
+    if (NRT_THREAD_KEY_CREATE(cache_key, cache_release_callback))
+        return -1;
+
+    backing.malloc = malloc_func;
+    backing.realloc = realloc_func;
+    backing.free = free_func;
+    initialized = 1;
+    return 0;
+}
+
+void
+NRT_Pool_get_stats(NRT_PoolStats *stats) {
+    thread_cache *cache;
+
+    memset(stats, 0, sizeof(NRT_PoolStats));
+    NRT_SPIN_LOCK(&registry_lock);
+    for (cache = caches; cache != NULL; cache = cache->next) {
+        stats->alloc += cache->alloc;
+        stats->free += cache->free;
+        stats->large_alloc += cache->large_alloc;
+        stats->large_free += cache->large_free;
+        stats->refills += cache->refills;
+        stats->flushes += cache->flushes;
+    }
+    stats->slabs = nslabs;
+    stats->slab_bytes = slab_bytes;
+    stats->caches = ncaches;
+    NRT_SPIN_UNLOCK(&registry_lock);
+}
@@ -0,0 +1,52 @@
+/*
+A thread-caching, size-class pool allocator that can be registered with
+NRT_MemSys_set_allocator().
+
+All functions described here are threadsafe, except NRT_Pool_init().
+*/
+
+#ifndef NUMBA_NRT_POOL_H_
+#define NUMBA_NRT_POOL_H_
+
+#include "nrt.h"
+
+/* Statistics of the pool allocator */
+typedef struct {
+    /* Requests served from the size classes */
+    size_t alloc, free;
+    /* Requests too large for the size classes */
+    size_t large_alloc, large_free;
+    /* Batches of blocks moved from the depot to a thread cache */
+    size_t refills;
+    /* Batches of blocks moved from a thread cache to the depot */
+    size_t flushes;
+    /* Slabs obtained from the backing allocator, and their total size */
+    size_t slabs, slab_bytes;
+    /* Number of thread caches created */
+    size_t caches;
+} NRT_PoolStats;
+
+/*
+ * Initialize the pool on top of the given backing allocation functions.
+ * Must be called once, before the pool functions are registered with
+ * NRT_MemSys_set_allocator(), while no other thread uses the NRT.
+ * Returns 0 on success.
+ */
+VISIBILITY_HIDDEN
+int NRT_Pool_init(NRT_malloc_func, NRT_realloc_func, NRT_free_func);
+
+/*
+ * Pool allocation functions, with the same semantics as the libc ones.
+ */
+VISIBILITY_HIDDEN void *NRT_Pool_malloc(size_t size);
+VISIBILITY_HIDDEN void *NRT_Pool_realloc(void *ptr, size_t size);
+VISIBILITY_HIDDEN void NRT_Pool_free(void *ptr);
+
+/*
+ * Get the statistics of the pool.  The counters of other threads are read
+ * without synchronization, the result is only exact when the NRT is idle.
+ */
+VISIBILITY_HIDDEN
+void NRT_Pool_get_stats(NRT_PoolStats *stats);
+
+#endif /* NUMBA_NRT_POOL_H_ */
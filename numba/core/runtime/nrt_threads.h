@@ -0,0 +1,62 @@
+/*
+Platform helpers for the per-thread state of the NRT: thread-local variables,
+a spin lock for short critical sections and a callback at thread exit.
+*/
+
+#ifndef NUMBA_NRT_THREADS_H_
+#define NUMBA_NRT_THREADS_H_
+
+#if defined(_WIN32)
+#   include <windows.h>
+#else
+#   include <pthread.h>
+#   include <sched.h>
+#endif
+
+/* Storage class of a thread-local variable */
+#if defined(_MSC_VER)
+#   define NRT_TLS __declspec(thread)
+#else
+#   define NRT_TLS __thread
+#endif
+
+/*
+ * A spin lock, yielding while it is held by another thread.
+ */
+#if defined(_WIN32)
+typedef volatile LONG nrt_spinlock;
+#   define NRT_SPIN_TRY_LOCK(l) (InterlockedExchange((l), 1) == 0)
+#   define NRT_SPIN_UNLOCK(l) InterlockedExchange((l), 0)
+#   define NRT_THREAD_YIELD() SwitchToThread()
+#else
+typedef volatile int nrt_spinlock;
+#   define NRT_SPIN_TRY_LOCK(l) (__sync_lock_test_and_set((l), 1) == 0)
+#   define NRT_SPIN_UNLOCK(l) __sync_lock_release(l)
+#   define NRT_THREAD_YIELD() sched_yield()
+#endif
+
+#define NRT_SPIN_LOCK(l) do {               \
+    while (!NRT_SPIN_TRY_LOCK(l))           \
+        NRT_THREAD_YIELD();                 \
+} while (0)
+
+/*
+ * A key whose callback is invoked with the value the exiting thread set,
+ * if not NULL.  The callback is defined with NRT_THREAD_EXIT_CALLBACK(name)
+ * and receives the value as `void *arg`.
+ */
+#if defined(_WIN32)
+typedef DWORD nrt_thread_key;
+#   define NRT_THREAD_EXIT_CALLBACK(name) static VOID WINAPI name(PVOID arg)
+#   define NRT_THREAD_KEY_CREATE(key, callback)                 \
+        (((key) = FlsAlloc(callback)) == FLS_OUT_OF_INDEXES ? -1 : 0)
+#   define NRT_THREAD_KEY_SET(key, value) FlsSetValue((key), (value))
+#else
+typedef pthread_key_t nrt_thread_key;
+#   define NRT_THREAD_EXIT_CALLBACK(name) static void name(void *arg)
+#   define NRT_THREAD_KEY_CREATE(key, callback)                 \
+        pthread_key_create(&(key), (callback))
+#   define NRT_THREAD_KEY_SET(key, value) pthread_setspecific((key), (value))
+#endif
+
+#endif /* NUMBA_NRT_THREADS_H_ */
@@ -13,9 +13,19 @@ _regex_bb = re.compile(
 
 
 def _remove_redundant_nrt_refct(llvmir):
+    return _prune_redundant_nrt_refct(llvmir)[0]
+
+
+def _prune_redundant_nrt_refct(llvmir):
+    """
+    Return a (llvmir, changed) tuple of the pruned IR and whether any
+    refct operation was moved or removed.
+    """
     # Note: As soon as we have better utility in analyzing materialized LLVM
     #       module in llvmlite, we can redo this without so much string
     #       processing.
+    changed = False
+
     def _extract_functions(module):
         cur = []
         for line in str(module).splitlines():
@@ -35,6 +45,9 @@ def _remove_redundant_nrt_refct(llvmir):
                 yield False, [line]
 
     def _process_function(func_lines):
+        if not any('@NRT_' in ln for ln in func_lines):
+            # No refct operation to prune
+            return func_lines
         out = []
         for is_bb, bb_lines in _extract_basic_blocks(func_lines):
             if is_bb and bb_lines:
@@ -62,9 +75,12 @@ def _remove_redundant_nrt_refct(llvmir):
         yield False, [func_lines[-1]]
 
     def _process_basic_block(bb_lines):
-        bb_lines = _move_and_group_decref_after_all_increfs(bb_lines)
-        bb_lines = _prune_redundant_refct_ops(bb_lines)
-        return bb_lines
+        nonlocal changed
+        new_lines = _move_and_group_decref_after_all_increfs(bb_lines)
+        new_lines = _prune_redundant_refct_ops(new_lines)
+        if new_lines != bb_lines:
+            changed = True
+        return new_lines
 
     def _examine_refct_op(bb_lines):
         for num, ln in enumerate(bb_lines):
@@ -143,7 +159,7 @@ def _remove_redundant_nrt_refct(llvmir):
 
         processed += lines
 
-    return '\n'.join(processed)
+    return '\n'.join(processed), changed
 
 
 def remove_redundant_nrt_refct(ll_module):
@@ -163,10 +179,14 @@ def remove_redundant_nrt_refct(ll_module):
     except NameError:
         return ll_module
 
+    newll, changed = _prune_redundant_nrt_refct(str(ll_module))
+    if not changed:
+        # Avoid re-parsing the module if there's nothing to prune
+        return ll_module
+
     # the optimisation pass loses the name of module as it operates on
     # strings, so back it up and reset it on completion
     name = ll_module.name
-    newll = _remove_redundant_nrt_refct(str(ll_module))
     new_mod = ll.parse_assembly(newll)
     new_mod.name = cgutils.normalize_ir_text(name)
     return new_mod
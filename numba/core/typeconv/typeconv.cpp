@@ -70,6 +70,11 @@ inline bool Rating::operator == (const Rating &other) const {
 
 // ------ TypeManager ------
 
+TypeManager::TypeManager()
+    : generation(0)
+{
+}
+
 bool TypeManager::canPromote(Type from, Type to) const {
     return isCompatible(from, to) == TCC_PROMOTE;
 }
@@ -97,6 +102,7 @@ void TypeManager::addSafeConversion(Type from, Type to) {
 void TypeManager::addCompatibility(Type from, Type to, TypeCompatibleCode tcc) {
     TypePair pair(from, to);
     tccmap.insert(pair, tcc);
+    generation++;
 }
 
 TypeCompatibleCode TypeManager::isCompatible(Type from, Type to) const {
@@ -60,6 +60,8 @@ struct Rating {
 
 class TypeManager{
 public:
+    TypeManager();
+
     bool canPromote(Type from, Type to) const;
     bool canUnsafeConvert(Type from, Type to) const;
     bool canSafeConvert(Type from, Type to) const;
@@ -81,6 +83,13 @@ public:
                        bool exact_match_required
                       ) const;
 
+    /**
+    Returns
+        A counter incremented whenever a compatibility is added, so that
+        users can invalidate the overload resolutions they memoized.
+    */
+    unsigned int getGeneration() const { return generation; }
+
 private:
     int _selectOverload(const Type sig[], const Type ovsigs[], int &selected,
                         int sigsz, int ovct, bool allow_unsafe,
@@ -88,6 +97,7 @@ private:
                         Rating ratings[], int candidates[]) const;
 
     TCCMap tccmap;
+    unsigned int generation;
 };
 
 
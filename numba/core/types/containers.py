@@ -3,6 +3,7 @@ from .abstract import (ConstSized, Container, Hashable, MutableSequence,
                        Sequence, Type, TypeRef)
 from .common import Buffer, IterableType, SimpleIterableType, SimpleIteratorType
 from .misc import Undefined, unliteral, Optional, NoneType
+from .scalars import Boolean
 from ..typeconv import Conversion
 from ..errors import TypingError
 from .. import utils
@@ -643,6 +644,59 @@ class DictType(IterableType):
                 return self
 
 
+class SetType(IterableType):
+    """Typed set type.  The items are stored as the keys of a typed
+    dictionary of type ``dict_type``.
+    """
+
+    mutable = True
+
+    def __init__(self, itemty):
+        assert not isinstance(itemty, TypeRef)
+        itemty = unliteral(itemty)
+        if isinstance(itemty, (Optional, NoneType)):
+            fmt = 'Set.item_type cannot be of type {}'
+            raise TypingError(fmt.format(itemty))
+        if isinstance(itemty, (Set, List)):
+            raise TypingError('{} as item is forbidden'.format(itemty))
+        self.item_type = itemty
+        self.dtype = itemty
+        name = '{}[{}]'.format(
+            self.__class__.__name__,
+            itemty,
+        )
+        super(SetType, self).__init__(name)
+
+    @property
+    def dict_type(self):
+        """The typed dictionary type storing the items.
+        """
+        return DictType(self.item_type, Boolean('bool'))
+
+    def is_precise(self):
+        return not isinstance(self.item_type, Undefined)
+
+    @property
+    def iterator_type(self):
+        return DictKeysIterableType(self.dict_type).iterator_type
+
+    @classmethod
+    def refine(cls, itemty):
+        """Refine to a precise set type
+        """
+        res = cls(itemty)
+        assert res.is_precise()
+        return res
+
+    def unify(self, typingctx, other):
+        """
+        Unify this with the *other* set.
+        """
+        if isinstance(other, SetType):
+            if not other.is_precise():
+                return self
+
+
 class DictItemsIterableType(SimpleIterableType):
     """Dictionary iterable type for .items()
     """
@@ -13,6 +13,26 @@ from numba.core.errors import TypingError
 
 Indexing = namedtuple("Indexing", ("index", "result", "advanced"))
 
+# The kinds of sort()/argsort(), 'stable' is an alias of 'radix' for the
+# dtypes radix sort supports and of 'mergesort' otherwise.
+SORT_KINDS = ('quicksort', 'mergesort', 'stable', 'radix')
+
+
+def check_sort_kind(ary, kind):
+    """
+    Raise a TypingError if *kind* isn't a sort kind supported for the
+    array type *ary*.
+    """
+    from numba.misc.radixsort import is_radix_sortable
+
+    if (not isinstance(kind, types.StringLiteral)
+            or kind.literal_value not in SORT_KINDS):
+        raise TypingError("sort kind must be a constant string among %s, "
+                          "got %s" % (', '.join(map(repr, SORT_KINDS)), kind))
+    if kind.literal_value == 'radix' and not is_radix_sortable(ary.dtype):
+        raise TypingError("radix sort is not supported for arrays of %s"
+                          % (ary.dtype,))
+
 
 def get_array_index_type(ary, idx):
     """
@@ -407,9 +427,17 @@ class ArrayAttribute(AttributeTemplate):
     @bound_function("array.sort")
     def resolve_sort(self, ary, args, kws):
         assert not args
-        assert not kws
+        kwargs = dict(kws)
+        kind = kwargs.pop('kind', types.StringLiteral('quicksort'))
+        if kwargs:
+            msg = "Unsupported keywords: {!r}"
+            raise TypingError(msg.format([k for k in kwargs.keys()]))
         if ary.ndim == 1:
-            return signature(types.none)
+            check_sort_kind(ary, kind)
+            def sort_stub(kind='quicksort'):
+                pass
+            pysig = utils.pysignature(sort_stub)
+            return signature(types.none, kind).replace(pysig=pysig)
 
     @bound_function("array.argsort")
     def resolve_argsort(self, ary, args, kws):
@@ -420,6 +448,7 @@ class ArrayAttribute(AttributeTemplate):
             msg = "Unsupported keywords: {!r}"
             raise TypingError(msg.format([k for k in kwargs.keys()]))
         if ary.ndim == 1:
+            check_sort_kind(ary, kind)
             def argsort_stub(kind='quicksort'):
                 pass
             pysig = utils.pysignature(argsort_stub)
@@ -727,6 +756,40 @@ def generic_index(self, args, kws):
     assert not kws
     return signature(types.intp, recvr=self.this)
 
+def axis_reduction(generic, real_only=False):
+    """
+    Extend the typing *generic* of a reduction method to also accept an
+    integer axis, given positionally or as the ``axis`` keyword.  The result
+    has the dtype of the full reduction and one dimension less than the array
+    (a scalar for 1d arrays).  With *real_only*, the axis is only supported
+    for arrays of integers, floats and booleans.
+    """
+    def generic_axis(self, args, kws):
+        if not args and not kws:
+            return generic(self, args, kws)
+        pysig = None
+        if 'axis' in kws:
+            def reduce_stub(axis):
+                pass
+            pysig = utils.pysignature(reduce_stub)
+            kws = dict(kws)
+            args = list(args) + [kws.pop('axis')]
+        if kws or len(args) != 1:
+            return
+        axis, = args
+        dtype_classes = ((types.Integer, types.Float, types.Boolean)
+                         if real_only else (types.Number, types.Boolean))
+        if (not isinstance(axis, types.Integer) or self.this.ndim == 0
+                or not isinstance(self.this.dtype, dtype_classes)):
+            return
+        return_type = generic(self, (), {}).return_type
+        if self.this.ndim > 1:
+            return_type = types.Array(dtype=return_type,
+                                      ndim=self.this.ndim - 1, layout='C')
+        return signature(return_type, *args,
+                         recvr=self.this).replace(pysig=pysig)
+    return generic_axis
+
 def install_array_method(name, generic):
     my_attr = {"key": "array." + name, "generic": generic}
     temp_class = type("Array_" + name, (AbstractTemplate,), my_attr)
@@ -737,10 +800,10 @@ def install_array_method(name, generic):
 
 # Functions that return the same type as the array
 for fname in ["min", "max"]:
-    install_array_method(fname, generic_homog)
+    install_array_method(fname, axis_reduction(generic_homog, real_only=True))
 
 # Functions that return a machine-width type, to avoid overflows
-install_array_method("prod", generic_expand)
+install_array_method("prod", axis_reduction(generic_expand))
 install_array_method("sum", sum_expand)
 
 # Functions that return a machine-width type, to avoid overflows
@@ -749,17 +812,17 @@ for fname in ["cumsum", "cumprod"]:
 
 # Functions that require integer arrays get promoted to float64 return
 for fName in ["mean"]:
-    install_array_method(fName, generic_hetero_real)
+    install_array_method(fName, axis_reduction(generic_hetero_real))
 
 # var and std by definition return in real space and int arrays
 # get promoted to float64 return
 for fName in ["var", "std"]:
-    install_array_method(fName, generic_hetero_always_real)
+    install_array_method(fName, axis_reduction(generic_hetero_always_real))
 
 
 # Functions that return an index (intp)
-install_array_method("argmin", generic_index)
-install_array_method("argmax", generic_index)
+install_array_method("argmin", axis_reduction(generic_index, real_only=True))
+install_array_method("argmax", axis_reduction(generic_index, real_only=True))
 
 
 @infer_global(operator.eq)
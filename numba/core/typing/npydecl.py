@@ -6,6 +6,7 @@ import operator
 from numba.core import types, utils, config
 from numba.core.typing.templates import (AttributeTemplate, AbstractTemplate,
                                          CallableTemplate, Registry, signature)
+from numba.core.typing.arraydecl import check_sort_kind
 
 from numba.np.numpy_support import (ufunc_find_matching_loop,
                              supported_ufunc_loop, as_dtype,
@@ -383,6 +384,12 @@ class Numpy_method_redirection(AbstractTemplate):
                     def sum_stub(arr, axis, dtype):
                         pass
                     pysig = utils.pysignature(sum_stub)
+            elif (self.method_name in ('min', 'max', 'prod', 'mean', 'var',
+                                       'std', 'argmin', 'argmax')
+                  and list(kws) == ['axis']):
+                def reduce_stub(arr, axis):
+                    pass
+                pysig = utils.pysignature(reduce_stub)
             elif self.method_name == 'argsort':
                 def argsort_stub(arr, kind='quicksort'):
                     pass
@@ -669,8 +676,10 @@ class NdFromBuffer(CallableTemplate):
 class NdSort(CallableTemplate):
 
     def generic(self):
-        def typer(a):
+        def typer(a, kind=None):
             if isinstance(a, types.Array) and a.ndim == 1:
+                if kind is not None:
+                    check_sort_kind(a, kind)
                 return a
 
         return typer
@@ -397,6 +397,7 @@ def bool_sequence(x):
         types.UnicodeCharSeq,
         types.DictType,
         types.ListType,
+        types.SetType,
         types.UnicodeType,
         types.Set,
     )
@@ -13,6 +13,8 @@ SMALL_MERGESORT = 20
 
 MergesortImplementation = namedtuple('MergesortImplementation', [
     'run_mergesort',
+    # Merging of sorted runs, used by the parallel sorts
+    'merge_corank', 'merge_runs',
 ])
 
 
@@ -96,6 +98,46 @@ def make_mergesort_impl(wrap, lt=None, is_argsort=False):
                     j -= 1
                 i += 1
 
+    @wrap(**kwargs_lite)
+    def merge_corank(left, right, d, vals):
+        """Return the number of items of *left* among the first *d* items of
+        the stable merge of the sorted runs *left* and *right*.
+        """
+        lo = max(0, d - right.size)
+        hi = min(d, left.size)
+        while lo < hi:
+            i = (lo + hi) // 2
+            if lessthan(right[d - i - 1], left[i], vals):
+                hi = i
+            else:
+                lo = i + 1
+        return lo
+
+    @wrap(**kwargs_lite)
+    def merge_runs(left, right, out, vals):
+        """Stable merge of the sorted runs *left* and *right* into *out*,
+        which must not overlap them.
+        """
+        i = j = k = 0
+        while i < left.size and j < right.size:
+            if not lessthan(right[j], left[i], vals):
+                out[k] = left[i]
+                i += 1
+            else:
+                out[k] = right[j]
+                j += 1
+            k += 1
+
+        while i < left.size:
+            out[k] = left[i]
+            i += 1
+            k += 1
+
+        while j < right.size:
+            out[k] = right[j]
+            j += 1
+            k += 1
+
     # The top-level entry points
 
     @wrap(no_cpython_wrapper=True)
@@ -115,7 +157,9 @@ def make_mergesort_impl(wrap, lt=None, is_argsort=False):
         return idxs
 
     return MergesortImplementation(
-        run_mergesort=(argmergesort if is_argsort else mergesort)
+        run_mergesort=(argmergesort if is_argsort else mergesort),
+        merge_corank=merge_corank,
+        merge_runs=merge_runs,
         )
 
 
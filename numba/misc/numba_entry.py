@@ -382,7 +382,85 @@ def make_parser():
     return parser
 
 
+def make_cache_parser():
+    parser = argparse.ArgumentParser(
+        prog='numba cache',
+        description='Inspect or prune the compilation cache directories')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--stats', action='store_true',
+                       help='Print statistics about the cache (default)')
+    group.add_argument('--prune', action='store_true',
+                       help='Remove stale cache files, and the least '
+                            'recently used ones beyond --max-size')
+    parser.add_argument('--max-size', default=None,
+                        help='Maximum size of each cache directory when '
+                             'pruning, e.g. 500M (default: '
+                             'NUMBA_CACHE_MAX_SIZE)')
+    parser.add_argument('paths', nargs='*',
+                        help='Cache directories, searched recursively '
+                             '(default: NUMBA_CACHE_DIR or the user-wide '
+                             'cache directory)')
+    return parser
+
+
+def cache_main(argv):
+    from numba.core import caching, config
+    from numba.misc.appdirs import AppDirs
+
+    parser = make_cache_parser()
+    args = parser.parse_args(argv)
+
+    if args.max_size is not None and not args.prune:
+        parser.error("--max-size can only be used with --prune")
+    if args.max_size is None:
+        max_size = config.CACHE_MAX_SIZE
+    else:
+        try:
+            max_size = config._parse_size(args.max_size)
+        except ValueError as e:
+            parser.error("--max-size: %s" % (e,))
+
+    roots = args.paths
+    if not roots:
+        if config.CACHE_DIR:
+            roots = [config.CACHE_DIR]
+        else:
+            appdirs = AppDirs(appname="numba", appauthor=False)
+            roots = [appdirs.user_cache_dir]
+
+    fmt = "%-60s %8s %8s %8s %8s %12s %12s"
+    if not args.prune:
+        print(fmt % ("Directory", "Indices", "Data", "Stores", "Locks",
+                     "Size", "Stale size"))
+    total_size = 0
+    total_removed = 0
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            if args.prune:
+                removed = caching.prune_cache(dirpath, max_size)
+                for name in removed:
+                    print("removed %s" % os.path.join(dirpath, name))
+                total_removed += len(removed)
+            else:
+                st = caching.get_cache_stats(dirpath)
+                if not (st.index_files or st.data_files or st.store_files
+                        or st.lock_files):
+                    continue
+                print(fmt % (dirpath, st.index_files, st.data_files,
+                             st.store_files, st.lock_files, st.total_size,
+                             st.stale_size))
+                total_size += st.total_size
+    if args.prune:
+        print("%d file(s) removed" % (total_removed,))
+    else:
+        print("Total size: %d bytes" % (total_size,))
+    return 0
+
+
 def main():
+    if sys.argv[1:2] == ['cache']:
+        sys.exit(cache_main(sys.argv[2:]))
+
     parser = make_parser()
     args = parser.parse_args()
 
@@ -0,0 +1,245 @@
+"""
+LSD radix sort of boolean, integer, floating point and datetime keys.
+
+The values are first mapped to unsigned 64-bit keys sorting in the same
+order as the values do in NumPy (see radix_keys()), which are then sorted
+one byte at a time, starting from the least significant one, with a stable
+counting sort.  The passes over a byte that is the same for all the keys are
+skipped, so that e.g. small integers only take one or two passes.
+The sort is stable.
+"""
+import numpy as np
+from collections import namedtuple
+
+from numba.core import types
+from numba.core.extending import overload
+
+# Array size smaller than this will be sorted by insertion sort
+SMALL_RADIXSORT = 16
+
+RadixsortImplementation = namedtuple('RadixsortImplementation', [
+    'run_radixsort',
+])
+
+
+def is_radix_sortable(dtype):
+    """
+    Whether arrays of the Numba type *dtype* can be radix sorted.
+    """
+    return isinstance(dtype, (types.Boolean, types.Integer, types.Float,
+                              types.NPDatetime, types.NPTimedelta))
+
+
+def radix_keys(arr):
+    """
+    Return the unsigned 64-bit keys of the items of the 1d array *arr*,
+    ordered as the items are ordered by np.sort().
+
+    This is the pure Python version, compiled code uses the overload below.
+    """
+    max_key = np.uint64(0xFFFFFFFFFFFFFFFF)
+    kind = arr.dtype.kind
+    if kind in 'bu':
+        return arr.astype(np.uint64)
+    elif kind == 'i':
+        bitwidth = 8 * arr.dtype.itemsize
+        sign = np.uint64(1 << (bitwidth - 1))
+        mask = np.uint64((1 << bitwidth) - 1)
+        return (arr.astype(np.int64).view(np.uint64) & mask) ^ sign
+    elif kind == 'f':
+        bitwidth = 8 * arr.dtype.itemsize
+        sign = np.uint64(1 << (bitwidth - 1))
+        mask = np.uint64((1 << bitwidth) - 1)
+        bits = arr.view('uint%d' % bitwidth).astype(np.uint64)
+        keys = np.where(bits & sign, ~bits & mask, bits | sign)
+        # -0.0 and 0.0 compare equal, NaNs are sorted last
+        keys[arr == 0] = sign
+        keys[np.isnan(arr)] = max_key
+        return keys
+    elif kind in 'mM':
+        ints = arr.view(np.int64)
+        keys = ints.view(np.uint64) ^ np.uint64(1 << 63)
+        # NaTs are sorted last
+        keys[ints == np.iinfo(np.int64).min] = max_key
+        return keys
+    raise TypeError("radix sort is not supported for arrays of %s"
+                    % (arr.dtype,))
+
+
+@overload(radix_keys)
+def ol_radix_keys(arr):
+    dtype = arr.dtype
+    max_key = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+    if isinstance(dtype, types.Boolean):
+        def impl(arr):
+            keys = np.empty(arr.size, np.uint64)
+            for i in range(arr.size):
+                keys[i] = np.uint64(1) if arr[i] else np.uint64(0)
+            return keys
+
+    elif isinstance(dtype, types.Integer):
+        if dtype.signed:
+            # Flip the sign bit so that negative values come first
+            sign = np.uint64(1 << (dtype.bitwidth - 1))
+            mask = np.uint64((1 << dtype.bitwidth) - 1)
+        else:
+            sign = np.uint64(0)
+            mask = max_key
+
+        def impl(arr):
+            keys = np.empty(arr.size, np.uint64)
+            for i in range(arr.size):
+                keys[i] = (np.uint64(arr[i]) & mask) ^ sign
+            return keys
+
+    elif isinstance(dtype, types.Float):
+        uint_dtype = np.dtype('uint%d' % dtype.bitwidth)
+        sign = np.uint64(1 << (dtype.bitwidth - 1))
+        mask = np.uint64((1 << dtype.bitwidth) - 1)
+
+        def impl(arr):
+            bits = arr.view(uint_dtype)
+            keys = np.empty(arr.size, np.uint64)
+            for i in range(arr.size):
+                x = arr[i]
+                if np.isnan(x):
+                    # NaNs are sorted last
+                    keys[i] = max_key
+                elif x == 0:
+                    # -0.0 and 0.0 compare equal
+                    keys[i] = sign
+                else:
+                    b = np.uint64(bits[i])
+                    if b & sign:
+                        keys[i] = ~b & mask
+                    else:
+                        keys[i] = b | sign
+            return keys
+
+    elif isinstance(dtype, (types.NPDatetime, types.NPTimedelta)):
+        sign = np.uint64(1 << 63)
+        nat = np.iinfo(np.int64).min
+
+        def impl(arr):
+            ints = arr.view(np.int64)
+            keys = np.empty(arr.size, np.uint64)
+            for i in range(arr.size):
+                v = ints[i]
+                if v == nat:
+                    # NaTs are sorted last
+                    keys[i] = max_key
+                else:
+                    keys[i] = np.uint64(v) ^ sign
+            return keys
+
+    else:
+        return None
+
+    return impl
+
+
+def make_radixsort_impl(wrap, is_argsort=False):
+    kwargs_lite = dict(no_cpython_wrapper=True, _nrt=False)
+
+    mask = np.uint64(0xFF)
+
+    @wrap(**kwargs_lite)
+    def insertion_sort(keys, vals):
+        i = 1
+        while i < keys.size:
+            k = keys[i]
+            v = vals[i]
+            j = i
+            while j > 0 and k < keys[j - 1]:
+                keys[j] = keys[j - 1]
+                vals[j] = vals[j - 1]
+                j -= 1
+            keys[j] = k
+            vals[j] = v
+            i += 1
+
+    @wrap(no_cpython_wrapper=True)
+    def radixsort_pairs(keys, vals):
+        """The actual radix sort function
+
+        Parameters
+        ----------
+        keys : array [read+write]
+            The unsigned 64-bit keys, sorted inplace.
+        vals : array [read+write]
+            Permuted inplace along with the keys.  For argsort, these are
+            the indices.
+        """
+        n = keys.size
+        if n < SMALL_RADIXSORT:
+            insertion_sort(keys, vals)
+            return
+
+        # Histograms of all the bytes in a single pass over the keys
+        counts = np.zeros((8, 256), np.intp)
+        for i in range(n):
+            k = keys[i]
+            for b in range(8):
+                counts[b, (k >> np.uint64(8 * b)) & mask] += 1
+
+        keys_ws = np.empty_like(keys)
+        vals_ws = np.empty_like(vals)
+        src_keys, dst_keys = keys, keys_ws
+        src_vals, dst_vals = vals, vals_ws
+        swapped = False
+        for b in range(8):
+            shift = np.uint64(8 * b)
+            count = counts[b]
+            if count[(keys[0] >> shift) & mask] == n:
+                # All the keys have the same byte
+                continue
+            # Starting position of every byte value
+            pos = 0
+            for d in range(256):
+                c = count[d]
+                count[d] = pos
+                pos += c
+            for i in range(n):
+                k = src_keys[i]
+                d = (k >> shift) & mask
+                j = count[d]
+                count[d] = j + 1
+                dst_keys[j] = k
+                dst_vals[j] = src_vals[i]
+            src_keys, dst_keys = dst_keys, src_keys
+            src_vals, dst_vals = dst_vals, src_vals
+            swapped = not swapped
+
+        if swapped:
+            keys[:] = src_keys
+            vals[:] = src_vals
+
+    # The top-level entry points
+
+    @wrap(no_cpython_wrapper=True)
+    def radixsort(arr):
+        "Inplace"
+        radixsort_pairs(radix_keys(arr), arr)
+        return arr
+
+    @wrap(no_cpython_wrapper=True)
+    def argradixsort(arr):
+        "Out-of-place"
+        idxs = np.arange(arr.size)
+        radixsort_pairs(radix_keys(arr), idxs)
+        return idxs
+
+    return RadixsortImplementation(
+        run_radixsort=(argradixsort if is_argsort else radixsort)
+    )
+
+
+def make_py_radixsort(*args, **kwargs):
+    return make_radixsort_impl((lambda **options: (lambda f: f)),
+                               *args, **kwargs)
+
+
+def make_jit_radixsort(*args, **kwargs):
+    from numba import njit
+    return make_radixsort_impl(njit, *args, **kwargs)
@@ -4,6 +4,7 @@ Implementation of math operations on Array objects.
 
 
 import math
+import operator
 from collections import namedtuple
 from enum import IntEnum
 from functools import partial
@@ -632,6 +633,224 @@ def array_argmax(context, builder, sig, args):
     return impl_ret_untracked(context, builder, sig.return_type, res)
 
 
+# ----------------------------------------------------------------------------
+# Reductions along an axis
+#
+# The array is viewed as 3d with the reduced axis in the middle, so that the
+# same kernels serve any number of dimensions and any (runtime) axis.
+
+@register_jitable
+def reduction_axis_sizes(shape, axis):
+    """
+    Normalize the reduction *axis* of an array of the given *shape* and
+    return it with the sizes (outer, n, inner) of the array viewed as 3d,
+    n being the size of the reduced axis.
+    """
+    ndim = len(shape)
+    if axis < 0:
+        axis += ndim
+    if axis < 0 or axis >= ndim:
+        raise ValueError("axis is out of bounds for array")
+    outer = 1
+    for i in range(axis):
+        outer *= shape[i]
+    inner = 1
+    for i in range(axis + 1, ndim):
+        inner *= shape[i]
+    return axis, outer, shape[axis], inner
+
+
+@register_jitable
+def reduction_result_shape(shape, axis):
+    # *shape* without the normalized *axis*
+    ashape = list(shape)
+    ashape.pop(axis)
+    return _create_tuple_result_shape(ashape, shape)
+
+
+def _gen_axis_fold(dtype, identity, combine):
+    def fold(a):
+        outer, n, inner = a.shape
+        out = np.full((outer, inner), identity, dtype)
+        for o in range(outer):
+            for k in range(n):
+                for i in range(inner):
+                    out[o, i] = combine(out[o, i], a[o, k, i])
+        return out
+    return register_jitable(fold)
+
+
+def _gen_axis_extremum(better, msg):
+    def extremum(a):
+        outer, n, inner = a.shape
+        if n == 0:
+            raise ValueError(msg)
+        out = a[:, 0, :].copy()
+        for o in range(outer):
+            for k in range(1, n):
+                for i in range(inner):
+                    v = a[o, k, i]
+                    if better(v, out[o, i]):
+                        out[o, i] = v
+        return out
+    return register_jitable(extremum)
+
+
+def _gen_axis_arg_extremum(better, msg):
+    def arg_extremum(a):
+        outer, n, inner = a.shape
+        if n == 0:
+            raise ValueError(msg)
+        best = a[:, 0, :].copy()
+        out = np.zeros((outer, inner), np.intp)
+        for o in range(outer):
+            for k in range(1, n):
+                for i in range(inner):
+                    v = a[o, k, i]
+                    if better(v, best[o, i]):
+                        best[o, i] = v
+                        out[o, i] = k
+        return out
+    return register_jitable(arg_extremum)
+
+
+def _gen_axis_mean(dtype):
+    axis_sum = _gen_axis_fold(dtype, dtype.type(0), operator.add)
+
+    def mean(a):
+        n = a.shape[1]
+        out = axis_sum(a)
+        for o in range(out.shape[0]):
+            for i in range(out.shape[1]):
+                out[o, i] = out[o, i] / n
+        return out
+    return register_jitable(mean)
+
+
+def _gen_axis_var(dtype, mean_dtype):
+    axis_mean = _gen_axis_mean(mean_dtype)
+
+    def var(a):
+        outer, n, inner = a.shape
+        m = axis_mean(a)
+        out = np.zeros((outer, inner), dtype)
+        for o in range(outer):
+            for k in range(n):
+                for i in range(inner):
+                    val = a[o, k, i] - m[o, i]
+                    out[o, i] += np.real(val * np.conj(val))
+        for o in range(outer):
+            for i in range(inner):
+                out[o, i] = out[o, i] / n
+        return out
+    return register_jitable(var)
+
+
+def _lower_axis_reduction(context, builder, sig, args, reduce_axis,
+                          reduce_all):
+    """
+    Lower the reduction of an array along an axis.  *reduce_axis* is a
+    jitted function reducing the middle axis of a 3d array to a 2d array,
+    *reduce_all* the full reduction used for 1d arrays.
+    """
+    # the axis is always passed as an intp, so that constant axes don't
+    # specialize the implementation
+    [ty_array, ty_axis] = sig.args
+    args = args[0], context.cast(builder, args[1], ty_axis, types.intp)
+    sig = sig.replace(args=[ty_array, types.intp])
+    if ty_array.ndim == 1:
+        def array_reduce_axis_impl(arr, axis):
+            reduction_axis_sizes(arr.shape, axis)
+            return reduce_all(arr)
+    else:
+        def array_reduce_axis_impl(arr, axis):
+            ax, outer, n, inner = reduction_axis_sizes(arr.shape, axis)
+            a = np.ascontiguousarray(arr).reshape((outer, n, inner))
+            res = reduce_axis(a)
+            return res.reshape(reduction_result_shape(arr.shape, ax))
+
+    res = context.compile_internal(builder, array_reduce_axis_impl, sig,
+                                   args)
+    return impl_ret_new_ref(context, builder, sig.return_type, res)
+
+
+def _result_dtype(sig):
+    return as_dtype(getattr(sig.return_type, 'dtype', sig.return_type))
+
+
+@lower_builtin(np.prod, types.Array, types.Integer)
+@lower_builtin("array.prod", types.Array, types.Integer)
+def array_prod_axis(context, builder, sig, args):
+    dtype = _result_dtype(sig)
+    reduce_axis = _gen_axis_fold(dtype, dtype.type(1), operator.mul)
+    return _lower_axis_reduction(context, builder, sig, args, reduce_axis,
+                                 np.prod)
+
+
+@lower_builtin(np.mean, types.Array, types.Integer)
+@lower_builtin("array.mean", types.Array, types.Integer)
+def array_mean_axis(context, builder, sig, args):
+    reduce_axis = _gen_axis_mean(_result_dtype(sig))
+    return _lower_axis_reduction(context, builder, sig, args, reduce_axis,
+                                 np.mean)
+
+
+@lower_builtin(np.var, types.Array, types.Integer)
+@lower_builtin("array.var", types.Array, types.Integer)
+def array_var_axis(context, builder, sig, args):
+    # the mean is computed in the dtype of the full mean
+    ty = sig.args[0].dtype
+    mean_dtype = as_dtype(types.float64 if isinstance(
+        ty, (types.Integer, types.Boolean)) else ty)
+    reduce_axis = _gen_axis_var(_result_dtype(sig), mean_dtype)
+    return _lower_axis_reduction(context, builder, sig, args, reduce_axis,
+                                 np.var)
+
+
+@lower_builtin(np.std, types.Array, types.Integer)
+@lower_builtin("array.std", types.Array, types.Integer)
+def array_std_axis(context, builder, sig, args):
+    def std_axis(arr, axis):
+        return np.sqrt(np.var(arr, axis))
+
+    res = context.compile_internal(builder, std_axis, sig, args)
+    return impl_ret_new_ref(context, builder, sig.return_type, res)
+
+
+@lower_builtin(np.min, types.Array, types.Integer)
+@lower_builtin("array.min", types.Array, types.Integer)
+def array_min_axis(context, builder, sig, args):
+    reduce_axis = _gen_axis_extremum(less_than, zero_dim_msg('minimum'))
+    return _lower_axis_reduction(context, builder, sig, args, reduce_axis,
+                                 np.min)
+
+
+@lower_builtin(np.max, types.Array, types.Integer)
+@lower_builtin("array.max", types.Array, types.Integer)
+def array_max_axis(context, builder, sig, args):
+    reduce_axis = _gen_axis_extremum(greater_than, zero_dim_msg('maximum'))
+    return _lower_axis_reduction(context, builder, sig, args, reduce_axis,
+                                 np.max)
+
+
+@lower_builtin(np.argmin, types.Array, types.Integer)
+@lower_builtin("array.argmin", types.Array, types.Integer)
+def array_argmin_axis(context, builder, sig, args):
+    reduce_axis = _gen_axis_arg_extremum(
+        less_than, "attempt to get argmin of an empty sequence")
+    return _lower_axis_reduction(context, builder, sig, args, reduce_axis,
+                                 np.argmin)
+
+
+@lower_builtin(np.argmax, types.Array, types.Integer)
+@lower_builtin("array.argmax", types.Array, types.Integer)
+def array_argmax_axis(context, builder, sig, args):
+    reduce_axis = _gen_axis_arg_extremum(
+        greater_than, "attempt to get argmax of an empty sequence")
+    return _lower_axis_reduction(context, builder, sig, args, reduce_axis,
+                                 np.argmax)
+
+
 @overload(np.all)
 @overload_method(types.Array, "all")
 def np_all(a):
@@ -29,7 +29,7 @@ from numba.core.imputils import (lower_builtin, lower_getattr,
 from numba.core.typing import signature
 from numba.core.extending import (register_jitable, overload, overload_method,
                                   intrinsic)
-from numba.misc import quicksort, mergesort
+from numba.misc import quicksort, mergesort, radixsort
 from numba.cpython import slicing
 from numba.cpython.unsafe.tuple import tuple_setitem
 
@@ -4992,39 +4992,93 @@ def get_sort_func(kind, is_float, is_argsort=False):
                 lt=lt_floats if is_float else None,
                 is_argsort=is_argsort)
             func = sort.run_mergesort
+        elif kind == 'radix':
+            # keys are derived from the dtype, floats need no special case
+            sort = radixsort.make_jit_radixsort(is_argsort=is_argsort)
+            func = sort.run_radixsort
+        else:
+            raise ValueError("unsupported sort kind %r" % (kind,))
         _sorts[key] = func
         return func
 
 
-@lower_builtin("array.sort", types.Array)
+def resolve_sort_kind(kind, dtype):
+    """
+    Resolve the 'stable' sort kind to the stable kind used for *dtype*.
+    """
+    if kind == 'stable':
+        return 'radix' if radixsort.is_radix_sortable(dtype) else 'mergesort'
+    return kind
+
+
+_merges = {}
+
+
+def get_merge_funcs(is_float, is_argsort=False):
+    """
+    Get the (merge_corank, merge_runs) functions merging sorted runs the
+    way the mergesort implementation does.
+    """
+    key = is_float, is_argsort
+    try:
+        return _merges[key]
+    except KeyError:
+        sort = mergesort.make_jit_mergesort(
+            lt=lt_floats if is_float else None,
+            is_argsort=is_argsort)
+        funcs = sort.merge_corank, sort.merge_runs
+        _merges[key] = funcs
+        return funcs
+
+
+def _sort_kind(sig):
+    # The kind of a sort() or argsort() call, the optional second argument
+    if len(sig.args) > 1:
+        kind = sig.args[1].literal_value
+    else:
+        kind = 'quicksort'
+    return resolve_sort_kind(kind, sig.args[0].dtype)
+
+
+@lower_builtin("array.sort", types.Array, types.StringLiteral)
 def array_sort(context, builder, sig, args):
     arytype = sig.args[0]
-    sort_func = get_sort_func(kind='quicksort',
+    sort_func = get_sort_func(kind=_sort_kind(sig),
                               is_float=isinstance(arytype.dtype, types.Float))
 
     def array_sort_impl(arr):
         # Note we clobber the return value
         sort_func(arr)
 
-    return context.compile_internal(builder, array_sort_impl, sig, args)
+    innersig = sig.replace(args=sig.args[:1])
+    innerargs = args[:1]
+    return context.compile_internal(builder, array_sort_impl,
+                                    innersig, innerargs)
 
 
 @lower_builtin(np.sort, types.Array)
+@lower_builtin(np.sort, types.Array, types.StringLiteral)
 def np_sort(context, builder, sig, args):
+    arytype = sig.args[0]
+    sort_func = get_sort_func(kind=_sort_kind(sig),
+                              is_float=isinstance(arytype.dtype, types.Float))
 
     def np_sort_impl(a):
         res = a.copy()
-        res.sort()
+        sort_func(res)
         return res
 
-    return context.compile_internal(builder, np_sort_impl, sig, args)
+    innersig = sig.replace(args=sig.args[:1])
+    innerargs = args[:1]
+    return context.compile_internal(builder, np_sort_impl,
+                                    innersig, innerargs)
 
 
 @lower_builtin("array.argsort", types.Array, types.StringLiteral)
 @lower_builtin(np.argsort, types.Array, types.StringLiteral)
 def array_argsort(context, builder, sig, args):
     arytype, kind = sig.args
-    sort_func = get_sort_func(kind=kind.literal_value,
+    sort_func = get_sort_func(kind=_sort_kind(sig),
                               is_float=isinstance(arytype.dtype, types.Float),
                               is_argsort=True)
 
@@ -4,6 +4,10 @@
  */
 
 #include <vector>
+#include <string>
+#include <chrono>
+#include <atomic>
+#include <mutex>
 #include <assert.h>
 #include <algorithm>
 #include <cmath>
@@ -360,3 +364,275 @@ extern "C" void do_scheduling_unsigned(uintp num_dim, intp *starts, intp *ends,
     std::vector<RangeActual> ret = create_schedule(full_space, num_threads);
     flatten_schedule(ret, sched);
 }
+
+#if defined(_MSC_VER)
+#include <intrin.h>
+#endif
+
+static uintp atomic_fetch_add_uintp(uintp *ptr, uintp value) {
+#if defined(_MSC_VER) && defined(_WIN64)
+    return (uintp)_InterlockedExchangeAdd64((volatile __int64 *)ptr, (__int64)value);
+#elif defined(_MSC_VER)
+    return (uintp)_InterlockedExchangeAdd((volatile long *)ptr, (long)value);
+#else
+    return __sync_fetch_and_add(ptr, value);
+#endif
+}
+
+static bool atomic_cas_uintp(uintp *ptr, uintp expected, uintp desired) {
+#if defined(_MSC_VER) && defined(_WIN64)
+    return (uintp)_InterlockedCompareExchange64((volatile __int64 *)ptr, (__int64)desired, (__int64)expected) == expected;
+#elif defined(_MSC_VER)
+    return (uintp)_InterlockedCompareExchange((volatile long *)ptr, (long)desired, (long)expected) == expected;
+#else
+    return __sync_bool_compare_and_swap(ptr, expected, desired);
+#endif
+}
+
+static uintp atomic_load_uintp(uintp *ptr) {
+    return atomic_fetch_add_uintp(ptr, 0);
+}
+
+/*
+    Claims the next chunk of a dynamically scheduled iteration space [0, total).
+    next is the shared counter of the first unclaimed iteration, it must start at 0.
+    chunksize is the minimum number of iterations to claim, 0 is taken to mean 1.
+    kind is SCHEDULE_DYNAMIC (fixed size chunks) or SCHEDULE_GUIDED (chunks
+    proportional to the remaining work divided among num_threads, but no smaller
+    than chunksize).
+    Returns the offset of the claimed chunk and stores its length in count, a
+    count of 0 means the iteration space is exhausted.
+*/
+extern "C" uintp claim_chunk(uintp *next, uintp total, uintp chunksize, intp kind, uintp num_threads, uintp *count) {
+    if (chunksize == 0) chunksize = 1;
+    if (num_threads == 0) num_threads = 1;
+
+    if (kind == SCHEDULE_GUIDED) {
+        while (true) {
+            uintp start = atomic_load_uintp(next);
+            if (start >= total) {
+                *count = 0;
+                return start;
+            }
+            uintp remaining = total - start;
+            uintp size = remaining / (2 * num_threads);
+            if (size < chunksize) size = chunksize;
+            if (size > remaining) size = remaining;
+            if (atomic_cas_uintp(next, start, start + size)) {
+                *count = size;
+                return start;
+            }
+        }
+    }
+
+    uintp start = atomic_fetch_add_uintp(next, chunksize);
+    if (start >= total) {
+        *count = 0;
+    } else {
+        *count = std::min(chunksize, total - start);
+    }
+    return start;
+}
+
+/*
+    Trip count autotuning of parallel loops.
+
+    Every parfor compiled with the 'autotune' parallel option has a slot (a
+    pointer-sized global of its module, initially NULL) and a name that
+    identifies it across processes.  Its calls are bucketed by the base-2
+    logarithm of their trip count.  While a bucket is being learned, its
+    calls cycle through the candidate thread counts 1, 2, 4, ... up to the
+    number of threads, timing each of them AUTOTUNE_SAMPLES times, after
+    which the fastest candidate is used for all the calls in that bucket.
+    Sites are shared by name, so that decisions can be inspected and preset
+    from Python (see numba/parfors/autotune.py) before the code runs.
+*/
+
+#define AUTOTUNE_BUCKETS 64
+#define AUTOTUNE_CANDIDATES 16
+#define AUTOTUNE_SAMPLES 3
+
+/* Layout of the token array passed from autotune_begin() to autotune_end() */
+#define TOKEN_SITE 0
+#define TOKEN_BUCKET 1
+#define TOKEN_CANDIDATE 2
+#define TOKEN_START 3
+#define TOKEN_THREADS 4
+
+struct autotune_site {
+    std::string name;
+    /* Guards samples and best, and the writes of decision */
+    std::mutex lock;
+    /* The chosen thread count, 0 while learning, read without the lock */
+    std::atomic<intp> decision[AUTOTUNE_BUCKETS];
+    intp samples[AUTOTUNE_BUCKETS][AUTOTUNE_CANDIDATES];
+    /* The best time in nanoseconds */
+    intp best[AUTOTUNE_BUCKETS][AUTOTUNE_CANDIDATES];
+};
+
+static std::vector<autotune_site*> autotune_sites;
+static std::mutex autotune_registry_lock;
+
+static void autotune_clear_bucket(autotune_site *site, intp bucket) {
+    site->decision[bucket] = 0;
+    for (intp k = 0; k < AUTOTUNE_CANDIDATES; ++k) {
+        site->samples[bucket][k] = 0;
+        site->best[bucket][k] = 0;
+    }
+}
+
+/* Find the site called name, creating it if needed.  The registry lock must be held. */
+static autotune_site *autotune_lookup(const char *name) {
+    for (uintp i = 0; i < autotune_sites.size(); ++i) {
+        if (autotune_sites[i]->name == name)
+            return autotune_sites[i];
+    }
+    autotune_site *site = new autotune_site();
+    site->name = name;
+    for (intp b = 0; b < AUTOTUNE_BUCKETS; ++b)
+        autotune_clear_bucket(site, b);
+    autotune_sites.push_back(site);
+    return site;
+}
+
+static intp autotune_now(void) {
+    return (intp) std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count();
+}
+
+static intp autotune_bucket(uintp trip_count) {
+    intp bucket = 0;
+    while (trip_count > 1) {
+        trip_count >>= 1;
+        ++bucket;
+    }
+    return bucket;
+}
+
+/* The number of candidate thread counts for num_threads threads */
+static intp autotune_num_candidates(intp num_threads) {
+    intp n = 1;
+    while (n < AUTOTUNE_CANDIDATES && ((intp) 1 << (n - 1)) < num_threads)
+        ++n;
+    return n;
+}
+
+static intp autotune_candidate_threads(intp candidate, intp num_threads) {
+    intp n = (intp) 1 << candidate;
+    return n < num_threads ? n : num_threads;
+}
+
+/*
+    Returns the number of threads to run a call of trip_count iterations
+    with, at most num_threads.  token must be an array of 5 intp which is to
+    be passed to autotune_end() once the call is done.
+*/
+extern "C" intp autotune_begin(void **slot, const char *name, uintp trip_count, intp num_threads, intp *token) {
+    autotune_site *site = (autotune_site *) *slot;
+    if (site == NULL) {
+        std::lock_guard<std::mutex> guard(autotune_registry_lock);
+        site = autotune_lookup(name);
+        *slot = (void *) site;
+    }
+    intp bucket = autotune_bucket(trip_count);
+    token[TOKEN_CANDIDATE] = -1;
+
+    intp decision = site->decision[bucket].load(std::memory_order_acquire);
+    if (decision > 0)
+        return decision < num_threads ? decision : num_threads;
+    if (num_threads <= 1)
+        return num_threads;
+
+    /* Learning: try the candidate with the fewest samples */
+    intp ncand = autotune_num_candidates(num_threads);
+    intp candidate = 0;
+    {
+        std::lock_guard<std::mutex> guard(site->lock);
+        for (intp k = 1; k < ncand; ++k) {
+            if (site->samples[bucket][k] < site->samples[bucket][candidate])
+                candidate = k;
+        }
+    }
+
+    token[TOKEN_SITE] = (intp) site;
+    token[TOKEN_BUCKET] = bucket;
+    token[TOKEN_CANDIDATE] = candidate;
+    token[TOKEN_THREADS] = num_threads;
+    token[TOKEN_START] = autotune_now();
+    return autotune_candidate_threads(candidate, num_threads);
+}
+
+extern "C" void autotune_end(intp *token) {
+    intp candidate = token[TOKEN_CANDIDATE];
+    if (candidate < 0)
+        return;
+    intp elapsed = autotune_now() - token[TOKEN_START];
+    autotune_site *site = (autotune_site *) token[TOKEN_SITE];
+    intp bucket = token[TOKEN_BUCKET];
+    intp num_threads = token[TOKEN_THREADS];
+    intp ncand = autotune_num_candidates(num_threads);
+
+    std::lock_guard<std::mutex> guard(site->lock);
+    intp *samples = site->samples[bucket];
+    intp *best = site->best[bucket];
+    if (samples[candidate] == 0 || elapsed < best[candidate])
+        best[candidate] = elapsed;
+    ++samples[candidate];
+    if (site->decision[bucket] == 0) {
+        intp fastest = 0;
+        bool done = true;
+        for (intp k = 0; k < ncand; ++k) {
+            if (samples[k] < AUTOTUNE_SAMPLES)
+                done = false;
+            else if (best[k] < best[fastest])
+                fastest = k;
+        }
+        if (done)
+            site->decision[bucket].store(
+                autotune_candidate_threads(fastest, num_threads),
+                std::memory_order_release);
+    }
+}
+
+extern "C" intp autotune_num_sites(void) {
+    std::lock_guard<std::mutex> guard(autotune_registry_lock);
+    return (intp) autotune_sites.size();
+}
+
+extern "C" const char *autotune_site_name(intp index) {
+    std::lock_guard<std::mutex> guard(autotune_registry_lock);
+    return autotune_sites[index]->name.c_str();
+}
+
+/* Returns the thread count chosen for a bucket of a site, 0 if none yet */
+extern "C" intp autotune_site_decision(intp index, intp bucket) {
+    autotune_site *site;
+    {
+        std::lock_guard<std::mutex> guard(autotune_registry_lock);
+        site = autotune_sites[index];
+    }
+    return site->decision[bucket];
+}
+
+/* Sets the thread count of a bucket of the site called name, 0 to learn it again */
+extern "C" void autotune_set_decision(const char *name, intp bucket, intp num_threads) {
+    autotune_site *site;
+    {
+        std::lock_guard<std::mutex> guard(autotune_registry_lock);
+        site = autotune_lookup(name);
+    }
+    std::lock_guard<std::mutex> guard(site->lock);
+    autotune_clear_bucket(site, bucket);
+    site->decision[bucket] = num_threads;
+}
+
+/* Forgets everything learned so far */
+extern "C" void autotune_reset(void) {
+    std::lock_guard<std::mutex> guard(autotune_registry_lock);
+    for (uintp i = 0; i < autotune_sites.size(); ++i) {
+        autotune_site *site = autotune_sites[i];
+        std::lock_guard<std::mutex> site_guard(site->lock);
+        for (intp b = 0; b < AUTOTUNE_BUCKETS; ++b)
+            autotune_clear_bucket(site, b);
+    }
+}
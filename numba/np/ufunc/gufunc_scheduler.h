@@ -33,6 +33,13 @@
     #define uintp unsigned
 #endif
 
+/* Loop schedule kinds accepted by the threading layers' parallel_for().
+ * These values are mirrored in numba/core/cpu_options.py.
+ */
+#define SCHEDULE_STATIC  0
+#define SCHEDULE_DYNAMIC 1
+#define SCHEDULE_GUIDED  2
+
 #ifdef __cplusplus
 extern "C"
 {
@@ -40,6 +47,16 @@ extern "C"
 
 void do_scheduling_signed(uintp num_dim, intp *starts, intp *ends, uintp num_threads, intp *sched, intp debug);
 void do_scheduling_unsigned(uintp num_dim, intp *starts, intp *ends, uintp num_threads, uintp *sched, intp debug);
+uintp claim_chunk(uintp *next, uintp total, uintp chunksize, intp kind, uintp num_threads, uintp *count);
+
+/* Trip count autotuning of parallel loops, see gufunc_scheduler.cpp */
+intp autotune_begin(void **slot, const char *name, uintp trip_count, intp num_threads, intp *token);
+void autotune_end(intp *token);
+intp autotune_num_sites(void);
+const char *autotune_site_name(intp index);
+intp autotune_site_decision(intp index, intp bucket);
+void autotune_set_decision(const char *name, intp bucket, intp num_threads);
+void autotune_reset(void);
 
 #ifdef __cplusplus
 }
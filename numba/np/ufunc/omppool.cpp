@@ -92,7 +92,8 @@ add_task(void *fn, void *args, void *dims, void *steps, void *data)
 
 static void
 parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *data,
-             size_t inner_ndim, size_t array_count, int num_threads)
+             size_t inner_ndim, size_t array_count, int num_threads,
+             intp sched_kind, intp chunksize)
 {
     typedef void (*func_ptr_t)(char **args, size_t *dims, size_t *steps, void *data);
     func_ptr_t func = reinterpret_cast<func_ptr_t>(fn);
@@ -152,6 +153,20 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
         printf("\n");
     }
 
+    // The loop below uses schedule(runtime), the run-sched-var ICV of this
+    // (the encountering) thread is inherited by the team it starts.
+    switch(sched_kind)
+    {
+        case SCHEDULE_DYNAMIC:
+            omp_set_schedule(omp_sched_dynamic, (int)chunksize);
+            break;
+        case SCHEDULE_GUIDED:
+            omp_set_schedule(omp_sched_guided, (int)chunksize);
+            break;
+        default:
+            omp_set_schedule(omp_sched_static, 0);
+    }
+
     // Set the thread mask on the pragma such that the state is scope limited
     // and passed via a register on the OMP region call site, this limiting
     // global state and racing
@@ -163,7 +178,7 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
         // tell the active thread team about the number of threads
         set_num_threads(agreed_nthreads);
 
-        #pragma omp for
+        #pragma omp for schedule(runtime)
         for(ptrdiff_t r = 0; r < size; r++)
         {
             memcpy(count_space, dimensions, arg_len * sizeof(size_t));
@@ -257,6 +272,22 @@ MOD_INIT(omppool)
                            PyLong_FromVoidPtr((void*)&do_scheduling_signed));
     PyObject_SetAttrString(m, "do_scheduling_unsigned",
                            PyLong_FromVoidPtr((void*)&do_scheduling_unsigned));
+    PyObject_SetAttrString(m, "claim_chunk",
+                           PyLong_FromVoidPtr((void*)&claim_chunk));
+    PyObject_SetAttrString(m, "autotune_begin",
+                           PyLong_FromVoidPtr((void*)&autotune_begin));
+    PyObject_SetAttrString(m, "autotune_end",
+                           PyLong_FromVoidPtr((void*)&autotune_end));
+    PyObject_SetAttrString(m, "autotune_num_sites",
+                           PyLong_FromVoidPtr((void*)&autotune_num_sites));
+    PyObject_SetAttrString(m, "autotune_site_name",
+                           PyLong_FromVoidPtr((void*)&autotune_site_name));
+    PyObject_SetAttrString(m, "autotune_site_decision",
+                           PyLong_FromVoidPtr((void*)&autotune_site_decision));
+    PyObject_SetAttrString(m, "autotune_set_decision",
+                           PyLong_FromVoidPtr((void*)&autotune_set_decision));
+    PyObject_SetAttrString(m, "autotune_reset",
+                           PyLong_FromVoidPtr((void*)&autotune_reset));
     PyObject_SetAttrString(m, "openmp_vendor",
                            PyString_FromString(_OMP_VENDOR));
     PyObject_SetAttrString(m, "set_num_threads",
@@ -24,6 +24,7 @@ import llvmlite.binding as ll
 
 from numba.np.numpy_support import as_dtype
 from numba.core import types, config, errors
+from numba.core.cpu_options import SCHEDULE_KINDS, check_schedule
 from numba.np.ufunc.wrappers import _wrapper_info
 from numba.np.ufunc import ufuncbuilder
 from numba.extending import overload
@@ -47,7 +48,22 @@ def get_thread_count():
 NUM_THREADS = get_thread_count()
 
 
-def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
+def _pop_schedule(targetoptions):
+    """Remove the loop schedule options from *targetoptions* and return them
+    as a ``(schedule kind, chunksize)`` pair suitable for
+    build_gufunc_kernel().
+    """
+    schedule = targetoptions.pop('schedule', 'static')
+    chunksize = targetoptions.pop('chunksize', 0)
+    check_schedule(schedule, chunksize)
+    return SCHEDULE_KINDS[schedule], chunksize
+
+
+_static_schedule = (SCHEDULE_KINDS['static'], 0)
+
+
+def build_gufunc_kernel(library, ctx, info, sig, inner_ndim,
+                        schedule=_static_schedule):
     """Wrap the original CPU ufunc/gufunc with a parallel dispatcher.
     This function will wrap gufuncs and ufuncs something like.
 
@@ -66,6 +82,10 @@ def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
         inner dimension of the gufunc (this is len(sig.args) in the case of a
         ufunc)
 
+    schedule: (kind, chunksize)
+        how the backend hands out the outer loop to the threads, kind is one
+        of the values of numba.core.cpu_options.SCHEDULE_KINDS
+
     Returns
     -------
     wrapper_info : (library, env, name)
@@ -134,7 +154,7 @@ def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
     array_count = len(sig.args) + 1
 
     parallel_for_ty = lc.Type.function(lc.Type.void(),
-                                       [byte_ptr_t] * 5 + [intp_t, ] * 3)
+                                       [byte_ptr_t] * 5 + [intp_t, ] * 5)
     parallel_for = mod.get_or_insert_function(parallel_for_ty,
                                               name='numba_parallel_for')
 
@@ -152,14 +172,33 @@ def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
         lc.Type.function(lc.Type.int(types.intp.bitwidth), []),
         name="get_num_threads")
 
-    num_threads = builder.call(get_num_threads, [])
+    set_num_threads = builder.module.get_or_insert_function(
+        lc.Type.function(lc.Type.void(), [lc.Type.int(types.intp.bitwidth)]),
+        name="set_num_threads")
+
+    caller_num_threads = builder.call(get_num_threads, [])
+    # Never ask for more threads than there are items of work (at least one),
+    # a parfor scheduled on fewer threads (e.g. by the autotuner) then runs
+    # on exactly that many.
+    total = builder.load(dimensions)
+    num_threads = builder.select(
+        builder.icmp_signed('<', total, caller_num_threads),
+        total, caller_num_threads)
+    num_threads = builder.select(builder.icmp_signed('<', num_threads,
+                                                     intp_t(1)),
+                                 intp_t(1), num_threads)
 
     # Prepare call
     fnptr = builder.bitcast(tmp_voidptr, byte_ptr_t)
     innerargs = [as_void_ptr(x) for x
                  in [args, dimensions, steps, data]]
+    sched_kind, chunksize = schedule
     builder.call(parallel_for, [fnptr] + innerargs +
-                 [intp_t(x) for x in (inner_ndim, array_count)] + [num_threads])
+                 [intp_t(x) for x in (inner_ndim, array_count)] +
+                 [num_threads] + [intp_t(x) for x in (sched_kind, chunksize)])
+    # The threading layer tells the threads it ran on, which may include this
+    # one, how many threads there are, restore the caller's own setting.
+    builder.call(set_num_threads, [caller_num_threads])
 
     # Release the GIL
     pyapi.restore_thread(thread_state)
@@ -175,6 +214,15 @@ def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
 # ------------------------------------------------------------------------------
 
 class ParallelUFuncBuilder(ufuncbuilder.UFuncBuilder):
+    def __init__(self, py_func, identity=None, cache=False, targetoptions={}):
+        targetoptions = targetoptions.copy()
+        self.schedule = _pop_schedule(targetoptions)
+        super(ParallelUFuncBuilder, self).__init__(
+            py_func=py_func,
+            identity=identity,
+            cache=cache,
+            targetoptions=targetoptions)
+
     def build(self, cres, sig):
         _launch_threads()
 
@@ -184,7 +232,8 @@ class ParallelUFuncBuilder(ufuncbuilder.UFuncBuilder):
         library = cres.library
         fname = cres.fndesc.llvm_func_name
 
-        info = build_ufunc_wrapper(library, ctx, fname, signature, cres)
+        info = build_ufunc_wrapper(library, ctx, fname, signature, cres,
+                                   schedule=self.schedule)
         ptr = info.library.get_pointer_to_function(info.name)
         # Get dtypes
         dtypenums = [np.dtype(a.name).num for a in signature.args]
@@ -193,12 +242,13 @@ class ParallelUFuncBuilder(ufuncbuilder.UFuncBuilder):
         return dtypenums, ptr, keepalive
 
 
-def build_ufunc_wrapper(library, ctx, fname, signature, cres):
+def build_ufunc_wrapper(library, ctx, fname, signature, cres,
+                        schedule=_static_schedule):
     innerfunc = ufuncbuilder.build_ufunc_wrapper(library, ctx, fname,
                                                  signature, objmode=False,
                                                  cres=cres)
     info = build_gufunc_kernel(library, ctx, innerfunc, signature,
-                               len(signature.args))
+                               len(signature.args), schedule=schedule)
     return info
 
 # ---------------------------------------------------------------------------
@@ -208,7 +258,9 @@ class ParallelGUFuncBuilder(ufuncbuilder.GUFuncBuilder):
     def __init__(self, py_func, signature, identity=None, cache=False,
                  targetoptions={}):
         # Force nopython mode
+        targetoptions = targetoptions.copy()
         targetoptions.update(dict(nopython=True))
+        self.schedule = _pop_schedule(targetoptions)
         super(
             ParallelGUFuncBuilder,
             self).__init__(
@@ -227,7 +279,7 @@ class ParallelGUFuncBuilder(ufuncbuilder.GUFuncBuilder):
         # Build wrapper for ufunc entry point
         info = build_gufunc_wrapper(
             self.py_func, cres, self.sin, self.sout, cache=self.cache,
-            is_parfors=False,
+            is_parfors=False, schedule=self.schedule,
         )
         ptr = info.library.get_pointer_to_function(info.name)
         env = info.env
@@ -247,11 +299,12 @@ class ParallelGUFuncBuilder(ufuncbuilder.GUFuncBuilder):
 # This is not a member of the ParallelGUFuncBuilder function because it is
 # called without an enclosing instance from parfors
 
-def build_gufunc_wrapper(py_func, cres, sin, sout, cache, is_parfors):
+def build_gufunc_wrapper(py_func, cres, sin, sout, cache, is_parfors,
+                         schedule=_static_schedule):
     """Build gufunc wrapper for the given arguments.
     The *is_parfors* is a boolean indicating whether the gufunc is being
     built for use as a ParFors kernel. This changes codegen and caching
-    behavior.
+    behavior. The *schedule* is passed on to build_gufunc_kernel().
     """
     library = cres.library
     ctx = cres.target_context
@@ -264,7 +317,7 @@ def build_gufunc_wrapper(py_func, cres, sin, sout, cache, is_parfors):
     inner_ndim = len(sym_in | sym_out)
 
     info = build_gufunc_kernel(
-        library, ctx, innerinfo, signature, inner_ndim,
+        library, ctx, innerinfo, signature, inner_ndim, schedule=schedule,
     )
     return info
 
@@ -488,12 +541,16 @@ def _launch_threads():
             ll.add_symbol('numba_parallel_for', lib.parallel_for)
             ll.add_symbol('do_scheduling_signed', lib.do_scheduling_signed)
             ll.add_symbol('do_scheduling_unsigned', lib.do_scheduling_unsigned)
+            ll.add_symbol('claim_chunk', lib.claim_chunk)
 
             launch_threads = CFUNCTYPE(None, c_int)(lib.launch_threads)
             launch_threads(NUM_THREADS)
 
             _load_num_threads_funcs(lib)  # load late
 
+            from numba.parfors import autotune
+            autotune._load_funcs(lib)
+
             # set library name so it can be queried
             global _threading_layer
             _threading_layer = libname
@@ -108,7 +108,8 @@ add_task(void *fn, void *args, void *dims, void *steps, void *data)
 
 static void
 parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *data,
-             size_t inner_ndim, size_t array_count, int num_threads)
+             size_t inner_ndim, size_t array_count, int num_threads,
+             intp sched_kind, intp chunksize)
 {
     static bool printed = false;
     if(!printed && _DEBUG)
@@ -157,7 +158,7 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
 
     limited.execute([&]{
         using range_t = tbb::blocked_range<size_t>;
-        tbb::parallel_for(range_t(0, dimensions[0]), [=](const range_t &range)
+        auto body = [=](const range_t &range)
         {
             size_t * count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
             char ** array_arg_space = (char**)alloca(sizeof(char*) * array_count);
@@ -198,7 +199,26 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
             }
             auto func = reinterpret_cast<void (*)(char **args, size_t *dims, size_t *steps, void *data)>(fn);
             func(array_arg_space, count_space, steps, data);
-        });
+        };
+
+        // TBB work stealing balances load regardless of the schedule, the
+        // schedule decides how the range is split: dynamic splits it down to
+        // chunks of at most chunksize iterations, guided lets the partitioner
+        // adapt chunk sizes but never below chunksize.
+        size_t grainsize = chunksize > 0 ? (size_t)chunksize : 1;
+        switch(sched_kind)
+        {
+            case SCHEDULE_DYNAMIC:
+                tbb::parallel_for(range_t(0, dimensions[0], grainsize), body,
+                                  tbb::simple_partitioner());
+                break;
+            case SCHEDULE_GUIDED:
+                tbb::parallel_for(range_t(0, dimensions[0], grainsize), body,
+                                  tbb::auto_partitioner());
+                break;
+            default:
+                tbb::parallel_for(range_t(0, dimensions[0]), body);
+        }
     });
 }
 
@@ -311,6 +331,22 @@ MOD_INIT(tbbpool)
                            PyLong_FromVoidPtr((void*)&do_scheduling_signed));
     PyObject_SetAttrString(m, "do_scheduling_unsigned",
                            PyLong_FromVoidPtr((void*)&do_scheduling_unsigned));
+    PyObject_SetAttrString(m, "claim_chunk",
+                           PyLong_FromVoidPtr((void*)&claim_chunk));
+    PyObject_SetAttrString(m, "autotune_begin",
+                           PyLong_FromVoidPtr((void*)&autotune_begin));
+    PyObject_SetAttrString(m, "autotune_end",
+                           PyLong_FromVoidPtr((void*)&autotune_end));
+    PyObject_SetAttrString(m, "autotune_num_sites",
+                           PyLong_FromVoidPtr((void*)&autotune_num_sites));
+    PyObject_SetAttrString(m, "autotune_site_name",
+                           PyLong_FromVoidPtr((void*)&autotune_site_name));
+    PyObject_SetAttrString(m, "autotune_site_decision",
+                           PyLong_FromVoidPtr((void*)&autotune_site_decision));
+    PyObject_SetAttrString(m, "autotune_set_decision",
+                           PyLong_FromVoidPtr((void*)&autotune_set_decision));
+    PyObject_SetAttrString(m, "autotune_reset",
+                           PyLong_FromVoidPtr((void*)&autotune_reset));
     PyObject_SetAttrString(m, "set_num_threads",
                            PyLong_FromVoidPtr((void*)&set_num_threads));
     PyObject_SetAttrString(m, "get_num_threads",
@@ -316,9 +316,54 @@ static void sync_tls(void *args, void *dims, void *steps, void *data) {
 };
 
 
+/* Shared state of a dynamically scheduled parallel_for, each worker task
+ * repeatedly claims chunks of the outer dimension until it is exhausted.
+ */
+typedef struct
+{
+    void (*func)(char **args, size_t *dims, size_t *steps, void *data);
+    char **args;
+    size_t *dimensions;
+    size_t *steps;
+    void *data;
+    size_t arg_len;
+    size_t array_count;
+    intp sched_kind;
+    uintp chunksize;
+    uintp num_threads;
+    uintp next;
+} dynamic_loop_t;
+
+static void
+dynamic_worker(void *args, void *dims, void *steps, void *data)
+{
+    dynamic_loop_t *loop = (dynamic_loop_t *)args;
+    size_t *count_space = alloca(sizeof(size_t) * loop->arg_len);
+    char **array_arg_space = alloca(sizeof(char*) * loop->array_count);
+    uintp total = (uintp)loop->dimensions[0];
+    uintp start, count;
+    size_t j;
+
+    memcpy(count_space, loop->dimensions, loop->arg_len * sizeof(size_t));
+    while (1)
+    {
+        start = claim_chunk(&loop->next, total, loop->chunksize,
+                            loop->sched_kind, loop->num_threads, &count);
+        if (count == 0)
+            break;
+        count_space[0] = count;
+        for (j = 0; j < loop->array_count; j++)
+        {
+            array_arg_space[j] = loop->args[j] + loop->steps[j] * start;
+        }
+        loop->func(array_arg_space, count_space, loop->steps, loop->data);
+    }
+}
+
 static void
 parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *data,
-             size_t inner_ndim, size_t array_count, int num_threads)
+             size_t inner_ndim, size_t array_count, int num_threads,
+             intp sched_kind, intp chunksize)
 {
 
     //     args = <ir.Argument '.1' of type i8**>,
@@ -351,6 +396,7 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     int old_queue_count = -1;
 
     size_t step;
+    dynamic_loop_t dynamic_loop;
 
     debug_marker();
 
@@ -399,60 +445,82 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     old_queue_count = queue_count;
     queue_count = num_threads;
 
-    for (i = 0; i < num_threads; i++)
+    if (sched_kind != SCHEDULE_STATIC)
     {
-        count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
-        memcpy(count_space, dimensions, arg_len * sizeof(size_t));
-        if(i == num_threads - 1)
-        {
-            // Last thread takes all leftover
-            count_space[0] = remain;
-        }
-        else
+        // every worker pulls chunks from a shared counter
+        dynamic_loop.func = fn;
+        dynamic_loop.args = args;
+        dynamic_loop.dimensions = dimensions;
+        dynamic_loop.steps = steps;
+        dynamic_loop.data = data;
+        dynamic_loop.arg_len = arg_len;
+        dynamic_loop.array_count = array_count;
+        dynamic_loop.sched_kind = sched_kind;
+        dynamic_loop.chunksize = (uintp)chunksize;
+        dynamic_loop.num_threads = (uintp)num_threads;
+        dynamic_loop.next = 0;
+        for (i = 0; i < num_threads; i++)
         {
-            count_space[0] = count;
-            remain = remain - count;
+            add_task(dynamic_worker, (void *)&dynamic_loop, NULL, NULL, NULL);
         }
-
-        if(_DEBUG)
+    }
+    else
+    {
+        for (i = 0; i < num_threads; i++)
         {
-            printf("\n=================== THREAD %d ===================\n", i);
-            printf("\ncount_space: ");
-            for(j = 0; j < arg_len; j++)
+            count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
+            memcpy(count_space, dimensions, arg_len * sizeof(size_t));
+            if(i == num_threads - 1)
             {
-                printf("%ld, ", count_space[j]);
+                // Last thread takes all leftover
+                count_space[0] = remain;
+            }
+            else
+            {
+                count_space[0] = count;
+                remain = remain - count;
             }
-            printf("\n");
-        }
-
-        array_arg_space = alloca(sizeof(char*) * array_count);
-
-        for(j = 0; j < array_count; j++)
-        {
-            base = args[j];
-            step = steps[j];
-            offset = step * count * i;
-            array_arg_space[j] = (char *)(base + offset);
 
             if(_DEBUG)
             {
-                printf("Index %ld\n", j);
-                printf("-->Got base %p\n", (void *)base);
-                printf("-->Got step %ld\n", step);
-                printf("-->Got offset %ld\n", offset);
-                printf("-->Got addr %p\n", (void *)array_arg_space[j]);
+                printf("\n=================== THREAD %d ===================\n", i);
+                printf("\ncount_space: ");
+                for(j = 0; j < arg_len; j++)
+                {
+                    printf("%ld, ", count_space[j]);
+                }
+                printf("\n");
             }
-        }
 
-        if(_DEBUG)
-        {
-            printf("\narray_arg_space: ");
+            array_arg_space = alloca(sizeof(char*) * array_count);
+
             for(j = 0; j < array_count; j++)
             {
-                printf("%p, ", (void *)array_arg_space[j]);
+                base = args[j];
+                step = steps[j];
+                offset = step * count * i;
+                array_arg_space[j] = (char *)(base + offset);
+
+                if(_DEBUG)
+                {
+                    printf("Index %ld\n", j);
+                    printf("-->Got base %p\n", (void *)base);
+                    printf("-->Got step %ld\n", step);
+                    printf("-->Got offset %ld\n", offset);
+                    printf("-->Got addr %p\n", (void *)array_arg_space[j]);
+                }
+            }
+
+            if(_DEBUG)
+            {
+                printf("\narray_arg_space: ");
+                for(j = 0; j < array_count; j++)
+                {
+                    printf("%p, ", (void *)array_arg_space[j]);
+                }
             }
+            add_task(fn, (void *)array_arg_space, (void *)count_space, steps, data);
         }
-        add_task(fn, (void *)array_arg_space, (void *)count_space, steps, data);
     }
 
     ready();
@@ -579,6 +647,22 @@ MOD_INIT(workqueue)
                            PyLong_FromVoidPtr(&do_scheduling_signed));
     PyObject_SetAttrString(m, "do_scheduling_unsigned",
                            PyLong_FromVoidPtr(&do_scheduling_unsigned));
+    PyObject_SetAttrString(m, "claim_chunk",
+                           PyLong_FromVoidPtr(&claim_chunk));
+    PyObject_SetAttrString(m, "autotune_begin",
+                           PyLong_FromVoidPtr((void*)&autotune_begin));
+    PyObject_SetAttrString(m, "autotune_end",
+                           PyLong_FromVoidPtr((void*)&autotune_end));
+    PyObject_SetAttrString(m, "autotune_num_sites",
+                           PyLong_FromVoidPtr((void*)&autotune_num_sites));
+    PyObject_SetAttrString(m, "autotune_site_name",
+                           PyLong_FromVoidPtr((void*)&autotune_site_name));
+    PyObject_SetAttrString(m, "autotune_site_decision",
+                           PyLong_FromVoidPtr((void*)&autotune_site_decision));
+    PyObject_SetAttrString(m, "autotune_set_decision",
+                           PyLong_FromVoidPtr((void*)&autotune_set_decision));
+    PyObject_SetAttrString(m, "autotune_reset",
+                           PyLong_FromVoidPtr((void*)&autotune_reset));
     PyObject_SetAttrString(m, "set_num_threads",
                            PyLong_FromVoidPtr((void*)&set_num_threads));
     PyObject_SetAttrString(m, "get_num_threads",
@@ -1,3 +1,5 @@
+#include "gufunc_scheduler.h"
+
 typedef struct opaque_thread * thread_pointer;
 
 enum QUEUE_STATE
@@ -49,11 +51,18 @@ void ready(void);
  inner_ndim - inner dimension of the gufunc
  array_count - the number of arrays in the signature (Python: len(sig.args) + 1)
  the +1 is for the output array.
+ num_threads - the number of threads to run the loop on
+ sched_kind - how the outer dimension is split across the threads, one of
+ SCHEDULE_STATIC (equal contiguous blocks), SCHEDULE_DYNAMIC (threads claim
+ chunks of chunksize iterations as they go) or SCHEDULE_GUIDED (as dynamic,
+ but chunks shrink with the remaining work, down to chunksize).
+ chunksize - the (minimum) chunk size for the dynamic and guided schedules
 
  */
 static void
 parallel_for(void *fn, char **args, size_t *dims, size_t *steps, void *data,\
-             size_t inner_ndim, size_t array_count, int num_threads);
+             size_t inner_ndim, size_t array_count, int num_threads,\
+             intp sched_kind, intp chunksize);
 
 
 /* Masking API cf. OpenMP */
@@ -0,0 +1,136 @@
+"""
+Trip count autotuning of parallel loops.
+
+Parallel loops compiled with ``parallel={'autotune': True}`` learn, for each
+range of trip counts between consecutive powers of two, the number of
+threads they run fastest with: the first calls in a range try 1, 2, 4, ...
+threads up to the number of threads in use, then the fastest choice is kept
+for the range.  Small loops thereby end up running serially or on a few
+threads, where waking up all the threads would cost more than the loop
+itself.
+
+The thread counts are kept per loop, identified by the name of the function,
+its argument types and the line of the loop, so that they can be saved and
+loaded in another process (see save_tuning(), load_tuning() and the
+NUMBA_PARFOR_AUTOTUNE_FILE environment variable).
+"""
+
+import atexit
+import json
+import os
+from collections import OrderedDict, namedtuple
+from ctypes import CFUNCTYPE, c_char_p, c_ssize_t
+
+import llvmlite.binding as ll
+
+from numba.core import config
+
+
+# Mirrors AUTOTUNE_BUCKETS in gufunc_scheduler.cpp
+NUM_BUCKETS = 64
+
+FORMAT_VERSION = 1
+
+_AutotuneFuncs = namedtuple('_AutotuneFuncs',
+                            ['num_sites', 'site_name', 'site_decision',
+                             'set_decision', 'reset'])
+
+_funcs = None
+
+
+def _load_funcs(lib):
+    """Called by the threading layer initialization with the loaded backend
+    *lib*.
+    """
+    ll.add_symbol('autotune_begin', lib.autotune_begin)
+    ll.add_symbol('autotune_end', lib.autotune_end)
+
+    global _funcs
+    _funcs = _AutotuneFuncs(
+        num_sites=CFUNCTYPE(c_ssize_t)(lib.autotune_num_sites),
+        site_name=CFUNCTYPE(c_char_p, c_ssize_t)(lib.autotune_site_name),
+        site_decision=CFUNCTYPE(c_ssize_t, c_ssize_t, c_ssize_t)(
+            lib.autotune_site_decision),
+        set_decision=CFUNCTYPE(None, c_char_p, c_ssize_t, c_ssize_t)(
+            lib.autotune_set_decision),
+        reset=CFUNCTYPE(None)(lib.autotune_reset))
+
+    path = config.PARFOR_AUTOTUNE_FILE
+    if path:
+        if os.path.exists(path):
+            load_tuning(path)
+        atexit.register(save_tuning, path)
+
+
+def _get_funcs():
+    from numba.np.ufunc.parallel import _launch_threads
+    _launch_threads()
+    return _funcs
+
+
+def _bucket(trip_count):
+    return max(int(trip_count), 1).bit_length() - 1
+
+
+def get_tuning():
+    """
+    Return the thread counts learned so far by the autotuned parallel loops,
+    as a dict mapping the name of each loop to a dict mapping the smallest
+    trip count of every learned range of trip counts to the number of
+    threads used for the range.  Each range extends up to the next power of
+    two (the range starting at 1 also includes 0).
+    """
+    funcs = _get_funcs()
+    tuning = OrderedDict()
+    for i in range(funcs.num_sites()):
+        name = funcs.site_name(i).decode('utf-8')
+        ranges = OrderedDict()
+        for bucket in range(NUM_BUCKETS):
+            nthreads = funcs.site_decision(i, bucket)
+            if nthreads > 0:
+                ranges[1 << bucket] = nthreads
+        tuning[name] = ranges
+    return tuning
+
+
+def set_tuning(tuning):
+    """
+    Set thread counts for the autotuned parallel loops, given in the format
+    returned by get_tuning().  A thread count of 0 makes the loop learn the
+    thread count of that range again.  Loops that aren't compiled yet use
+    these thread counts once they are.
+    """
+    funcs = _get_funcs()
+    for name, ranges in tuning.items():
+        for trip_count, nthreads in ranges.items():
+            funcs.set_decision(name.encode('utf-8'), _bucket(trip_count),
+                               int(nthreads))
+
+
+def reset_tuning():
+    """Forget the thread counts learned by all the autotuned parallel loops.
+    """
+    _get_funcs().reset()
+
+
+def save_tuning(path):
+    """Write the thread counts returned by get_tuning() to *path* as JSON.
+    """
+    sites = OrderedDict((name, OrderedDict((str(k), v)
+                                           for k, v in ranges.items()))
+                        for name, ranges in get_tuning().items())
+    with open(path, 'w') as fout:
+        json.dump({'version': FORMAT_VERSION, 'sites': sites}, fout,
+                  indent=2)
+
+
+def load_tuning(path):
+    """Set the thread counts saved to *path* by save_tuning().
+    """
+    with open(path) as fin:
+        data = json.load(fin)
+    if data.get('version') != FORMAT_VERSION:
+        raise ValueError("unsupported autotuning file version: %r"
+                         % (data.get('version'),))
+    set_tuning({name: {int(k): v for k, v in ranges.items()}
+                for name, ranges in data['sites'].items()})
@@ -120,7 +120,9 @@ class internal_prange(object):
     def __new__(cls, *args):
         return range(*args)
 
-def min_parallel_impl(return_type, arg):
+def min_parallel_impl(return_type, arg, axis=None):
+    if axis is not None:
+        return min_axis_parallel_impl(return_type, arg, axis)
     # XXX: use prange for 1D arrays since pndindex returns a 1-tuple instead of
     # integer. This causes type and fusion issues.
     if arg.ndim == 0:
@@ -144,7 +146,9 @@ def min_parallel_impl(return_type, arg):
             return val
     return min_1
 
-def max_parallel_impl(return_type, arg):
+def max_parallel_impl(return_type, arg, axis=None):
+    if axis is not None:
+        return max_axis_parallel_impl(return_type, arg, axis)
     if arg.ndim == 0:
         def max_1(in_arr):
             return in_arr[()]
@@ -242,7 +246,9 @@ def dot_parallel_impl(return_type, atyp, btyp):
         elif atyp.ndim == 2 and btyp.ndim == 1:
             return dotmv_parallel_impl
 
-def sum_parallel_impl(return_type, arg):
+def sum_parallel_impl(return_type, arg, axis=None):
+    if axis is not None:
+        return sum_axis_parallel_impl(return_type, arg, axis)
     zero = return_type(0)
 
     if arg.ndim == 0:
@@ -264,7 +270,9 @@ def sum_parallel_impl(return_type, arg):
             return val
     return sum_1
 
-def prod_parallel_impl(return_type, arg):
+def prod_parallel_impl(return_type, arg, axis=None):
+    if axis is not None:
+        return prod_axis_parallel_impl(return_type, arg, axis)
     one = return_type(1)
 
     if arg.ndim == 0:
@@ -287,7 +295,9 @@ def prod_parallel_impl(return_type, arg):
     return prod_1
 
 
-def mean_parallel_impl(return_type, arg):
+def mean_parallel_impl(return_type, arg, axis=None):
+    if axis is not None:
+        return mean_axis_parallel_impl(return_type, arg, axis)
     # can't reuse sum since output type is different
     zero = return_type(0)
 
@@ -310,7 +320,9 @@ def mean_parallel_impl(return_type, arg):
             return val/in_arr.size
     return mean_1
 
-def var_parallel_impl(return_type, arg):
+def var_parallel_impl(return_type, arg, axis=None):
+    if axis is not None:
+        return var_axis_parallel_impl(return_type, arg, axis)
     if arg.ndim == 0:
         def var_1(in_arr):
             return 0
@@ -338,11 +350,223 @@ def var_parallel_impl(return_type, arg):
             return ssd / in_arr.size
     return var_1
 
-def std_parallel_impl(return_type, arg):
+def std_parallel_impl(return_type, arg, axis=None):
+    if axis is not None:
+        return std_axis_parallel_impl(return_type, arg, axis)
     def std_1(in_arr):
         return in_arr.var() ** 0.5
     return std_1
 
+# Reductions along an axis view the array as 3d with the reduced axis in the
+# middle (see numba.np.arraymath.reduction_axis_sizes).  The items of the
+# result are reduced in parallel, each scanning the reduced axis, unless an
+# axis other than the innermost is long enough to be split in blocks: the
+# blocks are then reduced in parallel to partial results, with contiguous
+# inner loops, and the partial results are combined in a second parallel
+# pass.
+
+def _axis_fold_parallel_impl(return_type, arg, axis, identity, combine,
+                             finish, msg=''):
+    # identity None starts every reduction from its first item
+    if not (arg.ndim > 1 and isinstance(axis, types.Integer)):
+        return None
+    dtype = as_dtype(return_type.dtype)
+    from_first = identity is None
+    identity = return_type.dtype(0 if from_first else identity)
+
+    def fold_axis(in_arr, axis):
+        numba.parfors.parfor.init_prange()
+        ax, outer, n, inner = numba.np.arraymath.reduction_axis_sizes(
+            in_arr.shape, axis)
+        if from_first and n == 0:
+            raise ValueError(msg)
+        A = np.ascontiguousarray(in_arr).reshape((outer, n, inner))
+        out = np.empty((outer, inner), dtype)
+        nblocks = numba.parfors.parfor.axis_reduction_num_blocks(n, inner)
+        if nblocks == 1:
+            for j in numba.parfors.parfor.internal_prange(outer * inner):
+                o = j // inner
+                i = j - o * inner
+                acc = A[o, 0, i] if from_first else identity
+                for k in range(1 if from_first else 0, n):
+                    acc = combine(acc, A[o, k, i])
+                out[o, i] = finish(acc, n)
+        else:
+            block_size = (n + nblocks - 1) // nblocks
+            partial = np.empty((nblocks, outer, inner), dtype)
+            for b in numba.parfors.parfor.internal_prange(nblocks):
+                block_start = b * block_size
+                block_stop = min(block_start + block_size, n)
+                for o in range(outer):
+                    for i in range(inner):
+                        partial[b, o, i] = (A[o, block_start, i] if from_first
+                                            else identity)
+                    for k in range(block_start + (1 if from_first else 0),
+                                   block_stop):
+                        for i in range(inner):
+                            partial[b, o, i] = combine(partial[b, o, i],
+                                                       A[o, k, i])
+            for j in numba.parfors.parfor.internal_prange(outer * inner):
+                o = j // inner
+                i = j - o * inner
+                acc = partial[0, o, i]
+                for b in range(1, nblocks):
+                    acc = combine(acc, partial[b, o, i])
+                out[o, i] = finish(acc, n)
+        return out.reshape(numba.np.arraymath.reduction_result_shape(
+            in_arr.shape, ax))
+    return fold_axis
+
+def _axis_arg_extremum_parallel_impl(return_type, arg, axis, better, msg):
+    if not (arg.ndim > 1 and isinstance(axis, types.Integer)):
+        return None
+
+    def arg_extremum_axis(in_arr, axis):
+        numba.parfors.parfor.init_prange()
+        ax, outer, n, inner = numba.np.arraymath.reduction_axis_sizes(
+            in_arr.shape, axis)
+        if n == 0:
+            raise ValueError(msg)
+        A = np.ascontiguousarray(in_arr).reshape((outer, n, inner))
+        out = np.empty((outer, inner), np.intp)
+        nblocks = numba.parfors.parfor.axis_reduction_num_blocks(n, inner)
+        if nblocks == 1:
+            for j in numba.parfors.parfor.internal_prange(outer * inner):
+                o = j // inner
+                i = j - o * inner
+                best = A[o, 0, i]
+                best_k = 0
+                for k in range(1, n):
+                    v = A[o, k, i]
+                    if better(v, best):
+                        best = v
+                        best_k = k
+                out[o, i] = best_k
+        else:
+            block_size = (n + nblocks - 1) // nblocks
+            partial = np.empty((nblocks, outer, inner), A.dtype)
+            partial_k = np.empty((nblocks, outer, inner), np.intp)
+            for b in numba.parfors.parfor.internal_prange(nblocks):
+                block_start = b * block_size
+                block_stop = min(block_start + block_size, n)
+                for o in range(outer):
+                    for i in range(inner):
+                        partial[b, o, i] = A[o, block_start, i]
+                        partial_k[b, o, i] = block_start
+                    for k in range(block_start + 1, block_stop):
+                        for i in range(inner):
+                            v = A[o, k, i]
+                            if better(v, partial[b, o, i]):
+                                partial[b, o, i] = v
+                                partial_k[b, o, i] = k
+            # the blocks are combined in order so that the first extremum
+            # wins ties
+            for j in numba.parfors.parfor.internal_prange(outer * inner):
+                o = j // inner
+                i = j - o * inner
+                best = partial[0, o, i]
+                best_k = partial_k[0, o, i]
+                for b in range(1, nblocks):
+                    v = partial[b, o, i]
+                    if better(v, best):
+                        best = v
+                        best_k = partial_k[b, o, i]
+                out[o, i] = best_k
+        return out.reshape(numba.np.arraymath.reduction_result_shape(
+            in_arr.shape, ax))
+    return arg_extremum_axis
+
+def _axis_var_parallel_impl(return_type, arg, axis):
+    if not (arg.ndim > 1 and isinstance(axis, types.Integer)):
+        return None
+    dtype = as_dtype(return_type.dtype)
+
+    # the mean along the axis is replaced in turn
+    def var_axis(in_arr, axis):
+        numba.parfors.parfor.init_prange()
+        m = np.mean(in_arr, axis)
+        ax, outer, n, inner = numba.np.arraymath.reduction_axis_sizes(
+            in_arr.shape, axis)
+        M = m.reshape((outer, inner))
+        A = np.ascontiguousarray(in_arr).reshape((outer, n, inner))
+        out = np.empty((outer, inner), dtype)
+        nblocks = numba.parfors.parfor.axis_reduction_num_blocks(n, inner)
+        if nblocks == 1:
+            for j in numba.parfors.parfor.internal_prange(outer * inner):
+                o = j // inner
+                i = j - o * inner
+                center = M[o, i]
+                ssd = 0
+                for k in range(n):
+                    val = A[o, k, i] - center
+                    ssd += np.real(val * np.conj(val))
+                out[o, i] = ssd / n
+        else:
+            block_size = (n + nblocks - 1) // nblocks
+            partial = np.zeros((nblocks, outer, inner), dtype)
+            for b in numba.parfors.parfor.internal_prange(nblocks):
+                block_start = b * block_size
+                block_stop = min(block_start + block_size, n)
+                for o in range(outer):
+                    for k in range(block_start, block_stop):
+                        for i in range(inner):
+                            val = A[o, k, i] - M[o, i]
+                            partial[b, o, i] += np.real(val * np.conj(val))
+            for j in numba.parfors.parfor.internal_prange(outer * inner):
+                o = j // inner
+                i = j - o * inner
+                ssd = partial[0, o, i]
+                for b in range(1, nblocks):
+                    ssd += partial[b, o, i]
+                out[o, i] = ssd / n
+        return out.reshape(numba.np.arraymath.reduction_result_shape(
+            in_arr.shape, ax))
+    return var_axis
+
+def sum_axis_parallel_impl(return_type, arg, axis):
+    return _axis_fold_parallel_impl(return_type, arg, axis, 0, scan_add,
+                                    axis_reduce_value)
+
+def prod_axis_parallel_impl(return_type, arg, axis):
+    return _axis_fold_parallel_impl(return_type, arg, axis, 1, scan_mul,
+                                    axis_reduce_value)
+
+def mean_axis_parallel_impl(return_type, arg, axis):
+    return _axis_fold_parallel_impl(return_type, arg, axis, 0, scan_add,
+                                    axis_reduce_mean)
+
+def min_axis_parallel_impl(return_type, arg, axis):
+    return _axis_fold_parallel_impl(
+        return_type, arg, axis, None, axis_reduce_min, axis_reduce_value,
+        numba.np.arraymath.zero_dim_msg('minimum'))
+
+def max_axis_parallel_impl(return_type, arg, axis):
+    return _axis_fold_parallel_impl(
+        return_type, arg, axis, None, axis_reduce_max, axis_reduce_value,
+        numba.np.arraymath.zero_dim_msg('maximum'))
+
+def argmin_axis_parallel_impl(return_type, arg, axis):
+    return _axis_arg_extremum_parallel_impl(
+        return_type, arg, axis, numba.np.arraymath.less_than,
+        "attempt to get argmin of an empty sequence")
+
+def argmax_axis_parallel_impl(return_type, arg, axis):
+    return _axis_arg_extremum_parallel_impl(
+        return_type, arg, axis, numba.np.arraymath.greater_than,
+        "attempt to get argmax of an empty sequence")
+
+def var_axis_parallel_impl(return_type, arg, axis):
+    return _axis_var_parallel_impl(return_type, arg, axis)
+
+def std_axis_parallel_impl(return_type, arg, axis):
+    if var_axis_parallel_impl(return_type, arg, axis) is None:
+        return None
+
+    # the variance along the axis is replaced in turn
+    def std_axis(in_arr, axis):
+        return np.sqrt(np.var(in_arr, axis))
+    return std_axis
+
 def arange_parallel_impl(return_type, *args):
     dtype = as_dtype(return_type.dtype)
 
@@ -411,9 +635,484 @@ def linspace_parallel_impl(return_type, *args):
     else:
         raise ValueError("parallel linspace with types {}".format(args))
 
+def _scan_parallel_impl(return_type, arg, init, combine, skip_nan):
+    # A two-pass blocked scan: every block of the (flattened) input is
+    # scanned in parallel, then the scanned totals of the preceding blocks
+    # are combined into each block in a second parallel pass.
+    if arg.ndim == 0:
+        return None
+    dtype = as_dtype(return_type.dtype)
+    init = return_type.dtype(init)
+    # get_isnan() is trivially False for the integer dtypes
+    is_nan = numba.np.arraymath.get_isnan(arg.dtype if skip_nan
+                                          else types.intp)
+
+    def scan_1(in_arr):
+        numba.parfors.parfor.init_prange()
+        A = in_arr.ravel()
+        n = len(A)
+        out = np.empty(n, dtype)
+        nblocks = numba.parfors.parfor.scan_num_blocks(n)
+        block_size = (n + nblocks - 1) // nblocks
+        totals = np.empty(nblocks, dtype)
+        for b in numba.parfors.parfor.internal_prange(nblocks):
+            block_start = b * block_size
+            block_stop = min(block_start + block_size, n)
+            acc = init
+            for j in range(block_start, block_stop):
+                if not is_nan(A[j]):
+                    acc = combine(acc, A[j])
+                out[j] = acc
+            totals[b] = acc
+        # exclusive scan of the block totals
+        running = init
+        for k in range(nblocks):
+            total = totals[k]
+            totals[k] = running
+            running = combine(running, total)
+        for b in numba.parfors.parfor.internal_prange(nblocks):
+            if b > 0:
+                offset = totals[b]
+                block_start = b * block_size
+                block_stop = min(block_start + block_size, n)
+                for j in range(block_start, block_stop):
+                    out[j] = combine(offset, out[j])
+        return out
+    return scan_1
+
+def cumsum_parallel_impl(return_type, arg):
+    return _scan_parallel_impl(return_type, arg, 0, scan_add, False)
+
+def cumprod_parallel_impl(return_type, arg):
+    return _scan_parallel_impl(return_type, arg, 1, scan_mul, False)
+
+def nancumsum_parallel_impl(return_type, arg):
+    return _scan_parallel_impl(return_type, arg, 0, scan_add, True)
+
+def nancumprod_parallel_impl(return_type, arg):
+    return _scan_parallel_impl(return_type, arg, 1, scan_mul, True)
+
+def merge_sorted_blocks(src, dst, vals, nblocks, block_size):
+    """Merge the *nblocks* sorted blocks of *block_size* items of *src*
+    pairwise, using *dst* as the other buffer, until a single sorted run is
+    left.  *vals* are the values the indices in *src* refer to for an
+    argsort, None otherwise.  Returns whether the sorted run ends up in
+    *dst*.  Parallel functions merge with merge_sorted_blocks_parallel_impl.
+    """
+    return
+
+def _merge_sorted_blocks_impl(src, vals):
+    # Every merge is split at co-ranks of its output so that all the threads
+    # take part even in the last rounds.
+    is_argsort = not isinstance(vals, types.NoneType)
+    keys = vals if is_argsort else src
+    corank, merge = numba.np.arrayobj.get_merge_funcs(
+        isinstance(keys.dtype, types.Float), is_argsort)
+
+    def merge_blocks(src, dst, vals, nblocks, block_size):
+        n = len(src)
+        in_dst = False
+        width = block_size
+        while width < n:
+            npairs = (n + 2 * width - 1) // (2 * width)
+            nsplit = max(nblocks // npairs, 1)
+            for t in numba.parfors.parfor.internal_prange(npairs * nsplit):
+                lo = (t // nsplit) * 2 * width
+                mid = min(lo + width, n)
+                hi = min(lo + 2 * width, n)
+                part = t % nsplit
+                d0 = part * (hi - lo) // nsplit
+                d1 = (part + 1) * (hi - lo) // nsplit
+                left = src[lo:mid]
+                right = src[mid:hi]
+                i0 = corank(left, right, d0, vals)
+                i1 = corank(left, right, d1, vals)
+                merge(left[i0:i1], right[d0 - i0:d1 - i1],
+                      dst[lo + d0:lo + d1], vals)
+            src, dst = dst, src
+            in_dst = not in_dst
+            width *= 2
+        return in_dst
+    return merge_blocks
+
+@overload(merge_sorted_blocks)
+def merge_sorted_blocks_overload(src, dst, vals, nblocks, block_size):
+    return _merge_sorted_blocks_impl(src, vals)
+
+def merge_sorted_blocks_parallel_impl(return_type, src, dst, vals, nblocks,
+                                      block_size):
+    return _merge_sorted_blocks_impl(src, vals)
+
+def _parallel_sort_kind(arg, kind):
+    # The kind the blocks of a parallel sort are sorted with, None if the
+    # sort isn't parallelized.
+    if arg.ndim != 1:
+        return None
+    if kind is None:
+        return 'quicksort'
+    if not isinstance(kind, types.StringLiteral):
+        return None
+    kind = numba.np.arrayobj.resolve_sort_kind(kind.literal_value, arg.dtype)
+    # The merges order NaT as the comparison operators do, unlike radix sort
+    if kind == 'radix' and isinstance(arg.dtype, (types.NPDatetime,
+                                                  types.NPTimedelta)):
+        return None
+    return kind
+
+def sort_parallel_impl(return_type, arg, kind=None):
+    # In-place array.sort(): the blocks are sorted in parallel, then merged.
+    kind = _parallel_sort_kind(arg, kind)
+    if kind is None:
+        return None
+    is_float = isinstance(arg.dtype, types.Float)
+    block_sort = numba.np.arrayobj.get_sort_func(kind, is_float)
+
+    def sort_1(in_arr, kind='quicksort'):
+        n = len(in_arr)
+        nblocks = numba.parfors.parfor.sort_num_blocks(n)
+        if nblocks == 1:
+            block_sort(in_arr)
+        else:
+            block_size = (n + nblocks - 1) // nblocks
+            for b in numba.parfors.parfor.internal_prange(nblocks):
+                block_start = b * block_size
+                block_stop = min(block_start + block_size, n)
+                block_sort(in_arr[block_start:block_stop])
+            buf = np.empty(n, in_arr.dtype)
+            if numba.parfors.parfor.merge_sorted_blocks(in_arr, buf, None,
+                                                        nblocks, block_size):
+                in_arr[:] = buf
+        return None
+    return sort_1
+
+def np_sort_parallel_impl(return_type, arg, kind=None):
+    if _parallel_sort_kind(arg, kind) is None:
+        return None
+
+    # res.sort() is replaced by sort_parallel_impl in turn
+    if kind is None:
+        def sort_1(in_arr):
+            res = in_arr.copy()
+            res.sort()
+            return res
+        return sort_1
+    else:
+        def sort_2(in_arr, kind):
+            res = in_arr.copy()
+            res.sort(kind=kind)
+            return res
+        return sort_2
+
+def argsort_parallel_impl(return_type, arg, kind=None):
+    kind = _parallel_sort_kind(arg, kind)
+    if kind is None:
+        return None
+    is_float = isinstance(arg.dtype, types.Float)
+    # Merging keeps the relative order of the blocks, the argsort is thus
+    # stable if the blocks are sorted with a stable kind.
+    block_sort = numba.np.arrayobj.get_sort_func(kind, is_float,
+                                                 is_argsort=True)
+
+    def argsort_1(in_arr, kind='quicksort'):
+        n = len(in_arr)
+        nblocks = numba.parfors.parfor.sort_num_blocks(n)
+        if nblocks == 1:
+            return block_sort(in_arr)
+        block_size = (n + nblocks - 1) // nblocks
+        idx = np.empty(n, np.intp)
+        for b in numba.parfors.parfor.internal_prange(nblocks):
+            block_start = b * block_size
+            block_stop = min(block_start + block_size, n)
+            block_idx = block_sort(in_arr[block_start:block_stop])
+            for j in range(block_stop - block_start):
+                idx[block_start + j] = block_idx[j] + block_start
+        buf = np.empty(n, np.intp)
+        if numba.parfors.parfor.merge_sorted_blocks(idx, buf, in_arr,
+                                                    nblocks, block_size):
+            return buf
+        return idx
+    return argsort_1
+
+def bincount_parallel_impl(return_type, a, weights=None):
+    # The counts are indexed reductions: every thread counts into a private
+    # copy of the output, the copies are added up after the loop.
+    if not (isinstance(a, types.Array) and a.ndim == 1
+            and isinstance(a.dtype, types.Integer)):
+        return None
+    zero = a.dtype(0)
+
+    if weights is None or isinstance(weights, (types.NoneType, types.Omitted)):
+        def bincount_1(a, weights=None):
+            numba.parfors.parfor.init_prange()
+            n = len(a)
+            a_min = zero
+            a_max = zero
+            for i in numba.parfors.parfor.internal_prange(n):
+                a_min = min(a_min, a[i])
+                a_max = max(a_max, a[i])
+            if a_min < 0:
+                raise ValueError("bincount(): first argument must be "
+                                 "non-negative")
+            out = np.zeros(np.intp(a_max) + 1 if n > 0 else 0, np.intp)
+            for i in numba.parfors.parfor.internal_prange(n):
+                out[a[i]] += 1
+            return out
+        return bincount_1
+
+    if not (isinstance(weights, types.Array) and weights.ndim == 1):
+        return None
+
+    def bincount_2(a, weights):
+        numba.parfors.parfor.init_prange()
+        n = len(a)
+        if n != len(weights):
+            raise ValueError("bincount(): weights and list don't have "
+                             "the same length")
+        a_min = zero
+        a_max = zero
+        for i in numba.parfors.parfor.internal_prange(n):
+            a_min = min(a_min, a[i])
+            a_max = max(a_max, a[i])
+        if a_min < 0:
+            raise ValueError("bincount(): first argument must be "
+                             "non-negative")
+        out = np.zeros(np.intp(a_max) + 1 if n > 0 else 0, np.float64)
+        for i in numba.parfors.parfor.internal_prange(n):
+            out[a[i]] += weights[i]
+        return out
+    return bincount_2
+
+def histogram_parallel_impl(return_type, a, bins=None, range=None):
+    if not isinstance(a, types.Array):
+        return None
+
+    if isinstance(bins, (types.Integer, types.Omitted)) or bins is None:
+        if range is None or isinstance(range, (types.NoneType, types.Omitted)):
+            inf = float('inf')
+
+            # The histogram of the range is replaced in turn
+            def histogram_1(a, bins=10, range=None):
+                numba.parfors.parfor.init_prange()
+                A = a.ravel()
+                bin_min = inf
+                bin_max = -inf
+                for i in numba.parfors.parfor.internal_prange(len(A)):
+                    bin_min = min(bin_min, A[i])
+                    bin_max = max(bin_max, A[i])
+                return np.histogram(a, bins, (bin_min, bin_max))
+            return histogram_1
+
+        def histogram_2(a, bins=10, range=None):
+            numba.parfors.parfor.init_prange()
+            if bins <= 0:
+                raise ValueError("histogram(): `bins` should be a "
+                                 "positive integer")
+            bin_min, bin_max = range
+            if not bin_min <= bin_max:
+                raise ValueError("histogram(): max must be larger than "
+                                 "min in range parameter")
+            hist = np.zeros(bins, np.intp)
+            if bin_max > bin_min:
+                A = a.ravel()
+                bin_ratio = bins / (bin_max - bin_min)
+                for i in numba.parfors.parfor.internal_prange(len(A)):
+                    v = A[i]
+                    b = math.floor((v - bin_min) * bin_ratio)
+                    if 0 <= b < bins:
+                        hist[int(b)] += 1
+                    elif v == bin_max:
+                        hist[bins - 1] += 1
+            return hist, np.linspace(bin_min, bin_max, bins + 1)
+        return histogram_2
+
+    if not (isinstance(bins, types.Array) and bins.ndim == 1):
+        return None
+
+    def histogram_3(a, bins=10, range=None):
+        numba.parfors.parfor.init_prange()
+        nbins = len(bins) - 1
+        k = 0
+        while k < nbins:
+            # Note this also catches NaNs
+            if not bins[k] <= bins[k + 1]:
+                raise ValueError("histogram(): bins must increase "
+                                 "monotonically")
+            k += 1
+        bin_min = bins[0]
+        bin_max = bins[nbins]
+        hist = np.zeros(nbins, np.intp)
+        if nbins > 0:
+            A = a.ravel()
+            for i in numba.parfors.parfor.internal_prange(len(A)):
+                v = A[i]
+                # Values out of bounds (and NaNs) are ignored
+                if bin_min <= v <= bin_max:
+                    # Bisect in bins[:-1]
+                    lo = 0
+                    hi = nbins - 1
+                    while lo < hi:
+                        mid = (lo + hi + 1) >> 1
+                        if v < bins[mid]:
+                            hi = mid - 1
+                        else:
+                            lo = mid
+                    hist[lo] += 1
+        return hist, bins
+    return histogram_3
+
+def mask_compress(arr, mask):
+    """Return the items of the 1d array *arr* where the boolean array *mask*
+    is True, i.e. arr[mask].  PreParforPass rewrites boolean mask indexing to
+    calls of this function so that it is replaced with
+    mask_compress_parallel_impl.
+    """
+    return arr[mask]
+
+@overload(mask_compress)
+def mask_compress_overload(arr, mask):
+    def mask_compress_impl(arr, mask):
+        return arr[mask]
+    return mask_compress_impl
+
+# The compactions below are done in blocks: the selected items of every
+# block are counted in parallel, the counts are turned into the offsets of
+# the blocks in the output, then every block is copied to its offset in a
+# second parallel pass.
+
+def mask_compress_parallel_impl(return_type, arr, mask):
+    if not (isinstance(arr, types.Array) and arr.ndim == 1
+            and isinstance(mask, types.Array) and mask.ndim == 1
+            and isinstance(mask.dtype, types.Boolean)):
+        return None
+
+    def compress_1(arr, mask):
+        numba.parfors.parfor.init_prange()
+        n = len(arr)
+        if len(mask) != n:
+            raise IndexError("boolean index did not match indexed array")
+        nblocks = numba.parfors.parfor.scan_num_blocks(n)
+        block_size = (n + nblocks - 1) // nblocks
+        offsets = np.empty(nblocks, np.intp)
+        for b in numba.parfors.parfor.internal_prange(nblocks):
+            block_start = b * block_size
+            block_stop = min(block_start + block_size, n)
+            count = 0
+            for j in range(block_start, block_stop):
+                if mask[j]:
+                    count += 1
+            offsets[b] = count
+        total = numba.parfors.parfor.compress_offsets(offsets)
+        out = np.empty(total, arr.dtype)
+        for b in numba.parfors.parfor.internal_prange(nblocks):
+            block_start = b * block_size
+            block_stop = min(block_start + block_size, n)
+            k = offsets[b]
+            for j in range(block_start, block_stop):
+                if mask[j]:
+                    out[k] = arr[j]
+                    k += 1
+        return out
+    return compress_1
+
+def nonzero_parallel_impl(return_type, arg):
+    if not isinstance(arg, types.Array):
+        return None
+
+    if arg.ndim == 1:
+        def nonzero_1(in_arr):
+            numba.parfors.parfor.init_prange()
+            n = len(in_arr)
+            nblocks = numba.parfors.parfor.scan_num_blocks(n)
+            block_size = (n + nblocks - 1) // nblocks
+            offsets = np.empty(nblocks, np.intp)
+            for b in numba.parfors.parfor.internal_prange(nblocks):
+                block_start = b * block_size
+                block_stop = min(block_start + block_size, n)
+                count = 0
+                for j in range(block_start, block_stop):
+                    if in_arr[j]:
+                        count += 1
+                offsets[b] = count
+            total = numba.parfors.parfor.compress_offsets(offsets)
+            out = np.empty(total, np.intp)
+            for b in numba.parfors.parfor.internal_prange(nblocks):
+                block_start = b * block_size
+                block_stop = min(block_start + block_size, n)
+                k = offsets[b]
+                for j in range(block_start, block_stop):
+                    if in_arr[j]:
+                        out[k] = j
+                        k += 1
+            return (out,)
+        return nonzero_1
+
+    if arg.ndim == 2:
+        # blocks of rows
+        def nonzero_2(in_arr):
+            numba.parfors.parfor.init_prange()
+            nrows, ncols = in_arr.shape
+            nblocks = max(min(numba.parfors.parfor.scan_num_blocks(in_arr.size),
+                              nrows), 1)
+            block_size = (nrows + nblocks - 1) // nblocks
+            offsets = np.empty(nblocks, np.intp)
+            for b in numba.parfors.parfor.internal_prange(nblocks):
+                block_start = b * block_size
+                block_stop = min(block_start + block_size, nrows)
+                count = 0
+                for r in range(block_start, block_stop):
+                    for c in range(ncols):
+                        if in_arr[r, c]:
+                            count += 1
+                offsets[b] = count
+            total = numba.parfors.parfor.compress_offsets(offsets)
+            rows = np.empty(total, np.intp)
+            cols = np.empty(total, np.intp)
+            for b in numba.parfors.parfor.internal_prange(nblocks):
+                block_start = b * block_size
+                block_stop = min(block_start + block_size, nrows)
+                k = offsets[b]
+                for r in range(block_start, block_stop):
+                    for c in range(ncols):
+                        if in_arr[r, c]:
+                            rows[k] = r
+                            cols[k] = c
+                            k += 1
+            return (rows, cols)
+        return nonzero_2
+
+    return None
+
+def where_parallel_impl(return_type, *args):
+    # only np.where(cond), which is np.nonzero(cond)
+    if len(args) != 1:
+        return None
+    return nonzero_parallel_impl(return_type, args[0])
+
+def flatnonzero_parallel_impl(return_type, arg):
+    if not isinstance(arg, types.Array):
+        return None
+
+    # np.nonzero() is replaced in turn
+    def flatnonzero_1(a):
+        return np.nonzero(np.ravel(a))[0]
+    return flatnonzero_1
+
+def argwhere_parallel_impl(return_type, arg):
+    if nonzero_parallel_impl(return_type, arg) is None:
+        return None
+
+    # np.nonzero() is replaced in turn
+    def argwhere_1(a):
+        return np.transpose(np.vstack(np.nonzero(a)))
+    return argwhere_1
+
 replace_functions_map = {
-    ('argmin', 'numpy'): lambda r,a: argmin_parallel_impl,
-    ('argmax', 'numpy'): lambda r,a: argmax_parallel_impl,
+    ('argmin', 'numpy'): lambda r,a,axis=None: (
+        argmin_parallel_impl if axis is None
+        else argmin_axis_parallel_impl(r, a, axis)),
+    ('argmax', 'numpy'): lambda r,a,axis=None: (
+        argmax_parallel_impl if axis is None
+        else argmax_axis_parallel_impl(r, a, axis)),
     ('min', 'numpy'): min_parallel_impl,
     ('max', 'numpy'): max_parallel_impl,
     ('amin', 'numpy'): min_parallel_impl,
@@ -426,6 +1125,21 @@ replace_functions_map = {
     ('dot', 'numpy'): dot_parallel_impl,
     ('arange', 'numpy'): arange_parallel_impl,
     ('linspace', 'numpy'): linspace_parallel_impl,
+    ('cumsum', 'numpy'): cumsum_parallel_impl,
+    ('cumprod', 'numpy'): cumprod_parallel_impl,
+    ('nancumsum', 'numpy'): nancumsum_parallel_impl,
+    ('nancumprod', 'numpy'): nancumprod_parallel_impl,
+    ('sort', 'numpy'): np_sort_parallel_impl,
+    ('argsort', 'numpy'): argsort_parallel_impl,
+    ('bincount', 'numpy'): bincount_parallel_impl,
+    ('histogram', 'numpy'): histogram_parallel_impl,
+    ('nonzero', 'numpy'): nonzero_parallel_impl,
+    ('where', 'numpy'): where_parallel_impl,
+    ('flatnonzero', 'numpy'): flatnonzero_parallel_impl,
+    ('argwhere', 'numpy'): argwhere_parallel_impl,
+    ('mask_compress', 'numba.parfors.parfor'): mask_compress_parallel_impl,
+    ('merge_sorted_blocks', 'numba.parfors.parfor'):
+        merge_sorted_blocks_parallel_impl,
 }
 
 def fill_parallel_impl(return_type, arr, val):
@@ -447,8 +1161,27 @@ def fill_parallel_impl(return_type, arr, val):
             return None
     return fill_1
 
+def _axis_method_parallel_impl(axis_impl):
+    # reduction methods of arrays are only replaced along an axis
+    def method_impl(return_type, arg, axis=None):
+        if axis is None:
+            return None
+        return axis_impl(return_type, arg, axis)
+    return method_impl
+
 replace_functions_ndarray = {
     'fill': fill_parallel_impl,
+    'nonzero': nonzero_parallel_impl,
+    'sort': sort_parallel_impl,
+    'sum': _axis_method_parallel_impl(sum_axis_parallel_impl),
+    'prod': _axis_method_parallel_impl(prod_axis_parallel_impl),
+    'mean': _axis_method_parallel_impl(mean_axis_parallel_impl),
+    'var': _axis_method_parallel_impl(var_axis_parallel_impl),
+    'std': _axis_method_parallel_impl(std_axis_parallel_impl),
+    'min': _axis_method_parallel_impl(min_axis_parallel_impl),
+    'max': _axis_method_parallel_impl(max_axis_parallel_impl),
+    'argmin': _axis_method_parallel_impl(argmin_axis_parallel_impl),
+    'argmax': _axis_method_parallel_impl(argmax_axis_parallel_impl),
 }
 
 @register_jitable
@@ -473,6 +1206,66 @@ def argmax_checker(arr_size):
     if arr_size == 0:
         raise ValueError("attempt to get argmax of an empty sequence")
 
+# Smallest number of elements a scan block is given, blocks are otherwise
+# spread evenly over the threads.
+SCAN_MIN_BLOCK_SIZE = 4096
+
+@register_jitable
+def scan_num_blocks(n):
+    nthreads = numba.np.ufunc.parallel.get_num_threads()
+    return max(min(nthreads, n // SCAN_MIN_BLOCK_SIZE), 1)
+
+# Arrays smaller than this are sorted serially
+PARALLEL_SORT_MIN_SIZE = 1 << 16
+
+@register_jitable
+def sort_num_blocks(n):
+    if n < PARALLEL_SORT_MIN_SIZE:
+        return 1
+    return numba.np.ufunc.parallel.get_num_threads()
+
+@register_jitable
+def scan_add(a, b):
+    return a + b
+
+@register_jitable
+def scan_mul(a, b):
+    return a * b
+
+@register_jitable
+def axis_reduction_num_blocks(n, inner):
+    # the innermost axis is contiguous and never split
+    if inner == 1:
+        return 1
+    return scan_num_blocks(n)
+
+@register_jitable
+def axis_reduce_min(a, b):
+    return b if b < a else a
+
+@register_jitable
+def axis_reduce_max(a, b):
+    return b if b > a else a
+
+@register_jitable
+def axis_reduce_value(acc, n):
+    return acc
+
+@register_jitable
+def axis_reduce_mean(acc, n):
+    return acc / n
+
+@register_jitable
+def compress_offsets(counts):
+    # Turn the counts of the blocks of a compaction into their offsets in
+    # the output, in place, and return the size of the output.
+    total = 0
+    for b in range(len(counts)):
+        count = counts[b]
+        counts[b] = total
+        total += count
+    return total
+
 checker_impl = namedtuple('checker_impl', ['name', 'func'])
 
 replace_functions_checkers_map = {
@@ -555,6 +1348,9 @@ class Parfor(ir.Expr, ir.Stmt):
         # sequential lowering option
         self.no_sequential_lowering = no_sequential_lowering
         self.races = races
+        # tile sizes of the loop nest, True for tiles sized to the caches,
+        # False to run untiled or None to follow the 'tiling' parallel option
+        self.tile = None
         if config.DEBUG_ARRAY_OPT_STATS:
             fmt = 'Parallel for-loop #{} is produced from pattern \'{}\' at {}'
             print(fmt.format(
@@ -676,6 +1472,7 @@ class ParforDiagnostics(object):
         self.nested_fusion_info = defaultdict(list)
         self.fusion_reports = []
         self.hoist_info = {}
+        self.scratch_info = []
         self.has_setup = False
 
     def setup(self, func_ir, fusion_enabled):
@@ -733,6 +1530,13 @@ class ParforDiagnostics(object):
                             allocs.append(inst)
         return allocs
 
+    def scratch_buffers(self):
+        """
+        returns the allocations of buffers reused by all the iterations of a
+        sequential loop
+        """
+        return [inst for inst, _ in self.scratch_info]
+
     def compute_graph_info(self, _a):
         """
         compute adjacency list of the fused loops
@@ -1304,6 +2108,22 @@ class ParforDiagnostics(object):
                                     found = True
                             except (KeyError, AttributeError):
                                 pass
+                for inst, loop_loc in self.scratch_info:
+                    msg = ("The temporary array allocated by the instruction "
+                           "at %s is replaced by a single buffer allocated "
+                           "before the sequential loop at %s (it is reused "
+                           "by every iteration of the loop):")
+                    loc = inst.loc
+                    print_wrapped(msg % (loc, loop_loc))
+                    try:
+                        path = os.path.relpath(loc.filename)
+                    except ValueError:
+                        path = os.path.abspath(loc.filename)
+                    lines = linecache.getlines(path)
+                    if lines and loc.line:
+                        print_wrapped("   Allocation:: " + lines[0 if loc.line < 2 else loc.line - 1].strip())
+                    print_wrapped("    - numpy.empty() is used for the allocation.\n")
+                    found = True
                 if not found:
                     print_wrapped('No allocation hoisting found')
             if print_instruction_hoist:
@@ -1395,6 +2215,7 @@ class PreParforPass(object):
                             func_def = get_definition(self.func_ir, expr.func)
                             callname = find_callname(self.func_ir, expr)
                             repl_func = replace_functions_map.get(callname, None)
+                            self_args = []
                             # Handle method on array type
                             if (repl_func is None and
                                 len(callname) == 2 and
@@ -1402,17 +2223,24 @@ class PreParforPass(object):
                                 isinstance(self.typemap[callname[1].name],
                                            types.npytypes.Array)):
                                 repl_func = replace_functions_ndarray.get(callname[0], None)
-                                if repl_func is not None:
-                                    # Add the array that the method is on to the arg list.
-                                    expr.args.insert(0, callname[1])
+                                self_args = [callname[1]]
 
                             require(repl_func is not None)
-                            typs = tuple(self.typemap[x.name] for x in expr.args)
+                            typs = tuple(self.typemap[x.name]
+                                         for x in self_args + expr.args)
+                            sig = self.calltypes.get(expr)
+                            if sig is not None and len(sig.args) > len(expr.args):
+                                # keyword and omitted arguments are folded
+                                # into the signature
+                                typs = (typs[:len(self_args)] +
+                                        tuple(sig.args))
                             try:
                                 new_func =  repl_func(lhs_typ, *typs)
                             except:
                                 new_func = None
                             require(new_func is not None)
+                            # Add the array that the method is on to the arg list.
+                            expr.args[:0] = self_args
                             g = copy.copy(self.func_ir.func_id.func.__globals__)
                             g['numba'] = numba
                             g['np'] = numpy
@@ -1439,6 +2267,11 @@ class PreParforPass(object):
                         if guard(replace_func):
                             self.stats['replaced_func'] += 1
                             break
+                    elif (isinstance(expr, ir.Expr) and expr.op == 'getitem'
+                          and guard(self._replace_mask_getitem, block, i)):
+                        # the block is scanned again to replace the call
+                        work_list.append((label, block))
+                        break
                     elif (isinstance(expr, ir.Expr) and expr.op == 'getattr' and
                           expr.attr == 'dtype'):
                         # Replace getattr call "A.dtype" with numpy.dtype(<actual type>).
@@ -1500,6 +2333,34 @@ class PreParforPass(object):
                             self.stats['replaced_dtype'] += 1
                             break
 
+    def _replace_mask_getitem(self, block, i):
+        """Rewrite the boolean mask indexing A[M] that is the value of the
+        i-th statement of the block to mask_compress(A, M), which has a
+        parallel implementation.
+        """
+        instr = block.body[i]
+        expr = instr.value
+        arr_typ = self.typemap[expr.value.name]
+        mask_typ = self.typemap[expr.index.name]
+        require(mask_compress_parallel_impl(self.typemap[instr.target.name],
+                                            arr_typ, mask_typ) is not None)
+        scope = block.scope
+        loc = instr.loc
+        func_var = ir.Var(scope, mk_unique_var("$mask_compress_var"), loc)
+        func_typ = self.typingctx.resolve_value_type(mask_compress)
+        self.typemap[func_var.name] = func_typ
+        func_global = ir.Global('mask_compress', mask_compress, loc)
+        call = ir.Expr.call(func_var, [expr.value, expr.index], (), loc)
+        self.calltypes[call] = func_typ.get_call_type(
+            self.typingctx, (arr_typ, mask_typ), {})
+        self.func_ir._definitions[func_var.name] = [func_global]
+        target_defs = self.func_ir._definitions[instr.target.name]
+        if expr in target_defs:
+            target_defs[target_defs.index(expr)] = call
+        instr.value = call
+        block.body.insert(i, ir.Assign(func_global, func_var, loc))
+        return True
+
 def find_template(op):
     for ft in numba.core.typing.templates.builtin_registry.functions:
         if ft.key == op:
@@ -2521,6 +3382,285 @@ class ConvertLoopPass:
                               for v in ind_def_node.items]
 
 
+class ScratchBufferPass:
+    """Reuse a single buffer for the temporary arrays allocated by every
+    iteration of a sequential loop.
+
+    An ``np.empty`` call inside a loop whose shape and dtype are loop
+    invariant, and whose result does not outlive the iteration that
+    allocated it, is moved to the block that enters the loop so that the
+    same buffer is reused by all iterations.  Parfor conversion turns the
+    array expressions in a loop body into such allocations.
+    """
+    # attributes of a buffer that do not expose it
+    _safe_attrs = ('shape', 'size', 'ndim', 'dtype', 'itemsize', 'nbytes',
+                   'sum', 'prod', 'min', 'max', 'mean', 'var', 'std',
+                   'argmin', 'argmax', 'all', 'any', 'copy')
+    # functions that read a buffer without keeping a reference to it
+    _safe_calls = {('len', 'builtins'), ('sum', 'numpy'), ('prod', 'numpy'),
+                   ('min', 'numpy'), ('max', 'numpy'), ('amin', 'numpy'),
+                   ('amax', 'numpy'), ('mean', 'numpy'), ('var', 'numpy'),
+                   ('std', 'numpy'), ('argmin', 'numpy'),
+                   ('argmax', 'numpy'), ('all', 'numpy'), ('any', 'numpy'),
+                   ('copy', 'numpy'), ('dot', 'numpy'), ('vdot', 'numpy')}
+
+    def __init__(self, pass_states):
+        self.pass_states = pass_states
+        self.rewritten = []
+
+    def run(self, blocks):
+        func_ir = self.pass_states.func_ir
+        if func_ir.is_generator:
+            return
+        # each rewrite changes the CFG and liveness, so handle one loop at a
+        # time, innermost first, until nothing changes.  An allocation hoisted
+        # out of an inner loop can then be hoisted out of the outer one.
+        changed = True
+        while changed:
+            changed = False
+            func_ir._definitions = build_definitions(blocks)
+            cfg = compute_cfg_from_blocks(blocks)
+            loops = cfg.loops()
+            usedefs = compute_use_defs(blocks)
+            live_map = compute_live_map(cfg, blocks, usedefs.usemap,
+                                        usedefs.defmap)
+            for loop in sorted(loops.values(), key=lambda l: len(l.body)):
+                if self._hoist_loop(blocks, loop, loops, live_map):
+                    changed = True
+                    break
+
+    def _hoist_loop(self, blocks, loop, loops, live_map):
+        """Hoist the scratch buffer allocations of a loop, return True if
+        the IR changed.
+        """
+        pass_states = self.pass_states
+        if len(loop.entries) != 1:
+            return False
+        entry = blocks[next(iter(loop.entries))]
+        if not (isinstance(entry.terminator, ir.Jump)
+                and entry.terminator.target == loop.header):
+            return False
+        # allocations of nested loops are handled by their own preheader
+        inner = set()
+        for l in loops.values():
+            if l.header != loop.header and l.header in loop.body:
+                inner |= l.body
+        loop_defs = set()
+        for label in loop.body:
+            for stmt in _scratch_walk(blocks[label].body):
+                if isinstance(stmt, ir.Assign):
+                    loop_defs.add(stmt.target.name)
+        # variables that are not carried from one iteration to the next
+        # and do not survive the loop
+        live = set(live_map[loop.header])
+        for e in loop.exits:
+            live |= live_map[e]
+
+        hoisted = []
+        for label in sorted(loop.body - inner):
+            block = blocks[label]
+            for i, stmt in enumerate(block.body):
+                buf_stmts = guard(self._hoist_alloc, blocks, loop, stmt,
+                                  loop_defs, live)
+                if buf_stmts is None:
+                    continue
+                buf_var = buf_stmts[-1].target
+                block.body[i] = ir.Assign(buf_var, stmt.target, stmt.loc)
+                hoisted.extend(buf_stmts)
+                loc = blocks[loop.header].loc
+                self.rewritten.append((stmt, loc))
+                pass_states.diagnostics.scratch_info.append(
+                    (buf_stmts[-1], loc))
+                if config.DEBUG_ARRAY_OPT >= 1:
+                    print("scratch buffer", buf_var.name, "for",
+                          stmt.target.name, "hoisted out of loop at", loc)
+        if hoisted:
+            entry.body = entry.body[:-1] + hoisted + entry.body[-1:]
+        return bool(hoisted)
+
+    def _hoist_alloc(self, blocks, loop, stmt, loop_defs, live):
+        """Return the statements allocating a buffer that can replace the
+        allocation `stmt` of the loop, or raise GuardException.
+        """
+        func_ir = self.pass_states.func_ir
+        typemap = self.pass_states.typemap
+        calltypes = self.pass_states.calltypes
+        require(isinstance(stmt, ir.Assign)
+                and isinstance(stmt.value, ir.Expr)
+                and stmt.value.op == 'call')
+        call = stmt.value
+        lhs = stmt.target
+        require(isinstance(typemap[lhs.name], types.Array))
+        require(find_callname(func_ir, call) == ('empty', 'numpy'))
+        require(not call.kws and call.vararg is None
+                and 1 <= len(call.args) <= 2 and call in calltypes)
+        require(len(func_ir._definitions[lhs.name]) == 1)
+        # a zero trip loop could have raised on a negative size, don't
+        # move the allocation if it can't be proven to succeed
+        require(self._is_size(call.args[0]))
+
+        aliases = self._find_aliases(blocks, loop, lhs.name)
+        require(not (aliases & live))
+        for name in aliases:
+            require(len(func_ir._definitions[name]) == 1)
+        for label in loop.body:
+            for s in _scratch_walk(blocks[label].body):
+                require(self._is_safe_use(s, aliases))
+
+        # rebuild the callee and arguments before the loop
+        out = []
+        memo = {}
+        func = self._clone_invariant(call.func, loop_defs, out, memo)
+        args = [self._clone_invariant(a, loop_defs, out, memo)
+                for a in call.args]
+        scope = lhs.scope
+        buf_var = ir.Var(scope, mk_unique_var("$scratch_buf"), stmt.loc)
+        typemap[buf_var.name] = typemap[lhs.name]
+        new_call = ir.Expr.call(func, args, (), call.loc)
+        calltypes[new_call] = calltypes[call]
+        out.append(ir.Assign(new_call, buf_var, stmt.loc))
+        return out
+
+    def _is_size(self, var):
+        """Check that `var` is an array size or a shape made of them, hence
+        never negative.
+        """
+        func_ir = self.pass_states.func_ir
+        typ = self.pass_states.typemap[var.name]
+        defn = guard(get_definition, func_ir, var)
+        if isinstance(defn, ir.Const):
+            return isinstance(defn.value, int) and defn.value >= 0
+        if not isinstance(defn, ir.Expr):
+            return False
+        if isinstance(typ, types.BaseTuple):
+            if defn.op == 'build_tuple':
+                return all(self._is_size(v) for v in defn.items)
+            return defn.op == 'getattr' and defn.attr == 'shape'
+        if defn.op in ('getitem', 'static_getitem'):
+            shape = guard(get_definition, func_ir, defn.value)
+            return (isinstance(shape, ir.Expr) and shape.op == 'getattr'
+                    and shape.attr == 'shape')
+        if defn.op == 'getattr':
+            return defn.attr == 'size'
+        if defn.op == 'call':
+            return guard(find_callname, func_ir, defn) == ('len', 'builtins')
+        return False
+
+    def _find_aliases(self, blocks, loop, name):
+        """Return the variables of the loop that refer to the array `name`.
+        """
+        aliases = {name}
+        changed = True
+        while changed:
+            changed = False
+            for label in loop.body:
+                for stmt in _scratch_walk(blocks[label].body):
+                    if not isinstance(stmt, ir.Assign):
+                        continue
+                    rhs = stmt.value
+                    if isinstance(rhs, ir.Var):
+                        src = rhs
+                    elif (isinstance(rhs, ir.Expr)
+                          and rhs.op == 'inplace_binop'):
+                        src = rhs.lhs
+                    else:
+                        continue
+                    if (src.name in aliases
+                            and stmt.target.name not in aliases):
+                        aliases.add(stmt.target.name)
+                        changed = True
+        return aliases
+
+    def _is_safe_use(self, stmt, aliases):
+        """Check that `stmt` does not let the arrays in `aliases` escape.
+        """
+        func_ir = self.pass_states.func_ir
+        typemap = self.pass_states.typemap
+        if isinstance(stmt, (Parfor, ir.Del, ir.Print)):
+            # the statements of parfors are checked on their own
+            return True
+        if not {v.name for v in stmt.list_vars()} & aliases:
+            return True
+        if isinstance(stmt, (ir.SetItem, ir.StaticSetItem)):
+            # storing the buffer into an array copies the data
+            return (stmt.value.name not in aliases
+                    or isinstance(typemap[stmt.target.name], types.Array))
+        if not isinstance(stmt, ir.Assign):
+            return False
+        rhs = stmt.value
+        if isinstance(rhs, ir.Var):
+            return True
+        if not isinstance(rhs, ir.Expr):
+            return False
+        if rhs.op in ('getitem', 'static_getitem'):
+            # element reads only, slices and records would be views
+            return (rhs.value.name not in aliases
+                    or isinstance(typemap[stmt.target.name],
+                                  (types.Number, types.Boolean)))
+        if rhs.op == 'getattr':
+            return rhs.attr in self._safe_attrs
+        if rhs.op in ('binop', 'inplace_binop', 'unary', 'arrayexpr'):
+            return True
+        if rhs.op == 'call':
+            return (rhs.func.name not in aliases
+                    and guard(find_callname, func_ir, rhs) in self._safe_calls)
+        return False
+
+    def _clone_invariant(self, var, loop_defs, out, memo):
+        """Return a variable holding the value of `var` before the loop,
+        appending the statements computing it to `out`.  Raise
+        GuardException if the value of `var` is not loop invariant.
+        """
+        if var.name not in loop_defs:
+            return var
+        if var.name in memo:
+            return memo[var.name]
+        func_ir = self.pass_states.func_ir
+        typemap = self.pass_states.typemap
+        defs = func_ir._definitions[var.name]
+        require(len(defs) == 1)
+        defn = defs[0]
+        loc = var.loc
+        if isinstance(defn, (ir.Global, ir.FreeVar, ir.Const)):
+            value = copy.copy(defn)
+        elif isinstance(defn, ir.Var):
+            return self._clone_invariant(defn, loop_defs, out, memo)
+        elif isinstance(defn, ir.Expr) and defn.op == 'getattr':
+            value = ir.Expr.getattr(
+                self._clone_invariant(defn.value, loop_defs, out, memo),
+                defn.attr, loc)
+        elif isinstance(defn, ir.Expr) and defn.op == 'static_getitem':
+            index_var = defn.index_var
+            if index_var is not None:
+                index_var = self._clone_invariant(index_var, loop_defs, out,
+                                                  memo)
+            value = ir.Expr.static_getitem(
+                self._clone_invariant(defn.value, loop_defs, out, memo),
+                defn.index, index_var, loc)
+        elif isinstance(defn, ir.Expr) and defn.op == 'build_tuple':
+            value = ir.Expr.build_tuple(
+                [self._clone_invariant(v, loop_defs, out, memo)
+                 for v in defn.items], loc)
+        else:
+            raise GuardException
+        new_var = ir.Var(var.scope, mk_unique_var(var.name), loc)
+        typemap[new_var.name] = typemap[var.name]
+        out.append(ir.Assign(value, new_var, loc))
+        memo[var.name] = new_var
+        return new_var
+
+
+def _scratch_walk(body):
+    """Yield the statements of `body` and of the parfors nested in it.
+    """
+    for stmt in body:
+        yield stmt
+        if isinstance(stmt, Parfor):
+            yield from _scratch_walk(stmt.init_block.body)
+            for block in stmt.loop_body.values():
+                yield from _scratch_walk(block.body)
+
+
 def _find_mask(typemap, func_ir, arr_def):
     """check if an array is of B[...M...], where M is a
     boolean array, and other indices (if available) are ints.
@@ -2635,6 +3775,10 @@ class ParforPass(ParforPassStates):
             dprint_func_ir(self.func_ir, "after fusion")
         # simplify again
         simplify(self.func_ir, self.typemap, self.calltypes)
+        if self.options.scratch:
+            # reuse buffers for the temporaries of sequential loops
+            ScratchBufferPass(self).run(self.func_ir.blocks)
+            dprint_func_ir(self.func_ir, "after scratch buffer hoisting")
         # push function call variables inside parfors so gufunc function
         # wouldn't need function variables as argument
         push_call_vars(self.func_ir.blocks, {}, {}, self.typemap)
@@ -3230,8 +4374,12 @@ def get_parfor_reductions(func_ir, parfor, parfor_params, calltypes, reductions=
         reduce_varnames=None, param_uses=None, param_nodes=None,
         var_to_param=None):
     """find variables that are updated using their previous values and an array
-    item accessed with parfor index, e.g. s = s+A[i]
+    item accessed with parfor index, e.g. s = s+A[i], and arrays that are
+    updated in place at other indices, e.g. h[B[i]] += 1
     """
+    # indexed reductions are found once for the outermost parfor since uses
+    # of the array anywhere in the loop nest matter
+    outermost = reductions is None
     if reductions is None:
         reductions = {}
     if reduce_varnames is None:
@@ -3295,8 +4443,210 @@ def get_parfor_reductions(func_ir, parfor, parfor_params, calltypes, reductions=
                 redop = None
             reductions[param_name] = (init_val, reduce_nodes, redop)
 
+    if outermost:
+        indexed = get_parfor_indexed_reductions(parfor, parfor_params,
+                                                calltypes)
+        for param_name, (redop, init_val, arrtyp) in sorted(indexed.items()):
+            if param_name in reduce_varnames:
+                continue
+            reduce_varnames.append(param_name)
+            # the private copies are combined into the array with e.g. A += B
+            loc = parfor.loc
+            redvar = ir.Var(parfor.init_block.scope, param_name, loc)
+            init_var = ir.Var(redvar.scope, param_name + "#init", loc)
+            acc_expr = ir.Expr.inplace_binop(
+                redop, _indexed_reduction_ops[redop][0], redvar, init_var, loc)
+            calltypes[acc_expr] = signature(arrtyp, arrtyp, arrtyp)
+            reduce_nodes = [ir.Assign(acc_expr, redvar, loc)]
+            reductions[param_name] = (init_val, reduce_nodes, redop)
+
     return reduce_varnames, reductions
 
+# In-place operator and identity of the operators of indexed reductions
+_indexed_reduction_ops = {
+    operator.iadd: (operator.add, 0),
+    operator.isub: (operator.sub, 0),
+    operator.imul: (operator.mul, 1),
+}
+
+_indexed_reduction_inplace_ops = {
+    operator.add: operator.iadd,
+    operator.iadd: operator.iadd,
+    operator.sub: operator.isub,
+    operator.isub: operator.isub,
+    operator.mul: operator.imul,
+    operator.imul: operator.imul,
+}
+
+def _get_parfor_stmts(parfor):
+    """get the statements of the parfor body, including those of nested
+    parfors instead of the nested parfors themselves.
+    """
+    stmts = []
+    for block in parfor.loop_body.values():
+        for stmt in block.body:
+            if isinstance(stmt, Parfor):
+                stmts.extend(stmt.init_block.body)
+                stmts.extend(_get_parfor_stmts(stmt))
+            else:
+                stmts.append(stmt)
+    return stmts
+
+def _item_index(node):
+    # the index of a getitem/setitem, for comparison
+    if isinstance(node, ir.SetItem):
+        return node.index.name
+    if isinstance(node, ir.StaticSetItem):
+        return (node.index,)
+    if isinstance(node, ir.Expr) and node.op == 'getitem':
+        return node.index.name
+    if isinstance(node, ir.Expr) and node.op == 'static_getitem':
+        return (node.index,)
+    return None
+
+def _uses_parfor_index(index, defs, loop_indices):
+    # whether the parfor indices are (part of) the setitem index
+    index_vars = [index]
+    index_def = defs.get(index.name, None)
+    if isinstance(index_def, ir.Expr) and index_def.op == 'build_tuple':
+        index_vars += index_def.items
+    return not loop_indices.isdisjoint(v.name for v in index_vars)
+
+def _is_loop_invariant(var, defs, loop_indices, seen=None):
+    # whether var is defined outside of the parfor body, is a constant or
+    # is computed from such variables with arithmetic
+    seen = seen or frozenset()
+    if var.name in loop_indices or var.name in seen:
+        # seen variables are updated in the loop, e.g. k = k + 1
+        return False
+    seen = seen | {var.name}
+    var_def = defs.get(var.name, None)
+    if var_def is None or isinstance(var_def, (ir.Const, ir.Global,
+                                               ir.FreeVar)):
+        return True
+    if isinstance(var_def, ir.Var):
+        return _is_loop_invariant(var_def, defs, loop_indices, seen)
+    if isinstance(var_def, ir.Expr) and var_def.op in ('binop',
+                                                       'inplace_binop'):
+        return (_is_loop_invariant(var_def.lhs, defs, loop_indices, seen)
+                and _is_loop_invariant(var_def.rhs, defs, loop_indices, seen))
+    if (isinstance(var_def, ir.Expr) and var_def.op == 'unary'
+            and isinstance(var_def.value, ir.Var)):
+        return _is_loop_invariant(var_def.value, defs, loop_indices, seen)
+    return False
+
+def _is_shifted_parfor_index(index, defs, loop_indices):
+    """whether *index* is a parfor index plus or minus loop invariant values
+    (e.g. i + 1 or n - i), which is different in every iteration so that
+    the setitems at *index* do not collide.
+    """
+    seen = set()
+    while index.name not in seen:
+        if index.name in loop_indices:
+            return True
+        seen.add(index.name)
+        index_def = defs.get(index.name, None)
+        if isinstance(index_def, ir.Var):
+            index = index_def
+        elif (isinstance(index_def, ir.Expr) and index_def.op == 'unary'
+                and index_def.fn in (operator.neg, operator.pos)
+                and isinstance(index_def.value, ir.Var)):
+            index = index_def.value
+        elif (isinstance(index_def, ir.Expr)
+                and index_def.op in ('binop', 'inplace_binop')
+                and index_def.fn in (operator.add, operator.iadd,
+                                     operator.sub, operator.isub)):
+            if _is_loop_invariant(index_def.rhs, defs, loop_indices):
+                index = index_def.lhs
+            elif _is_loop_invariant(index_def.lhs, defs, loop_indices):
+                index = index_def.rhs
+            else:
+                return False
+        else:
+            return False
+    return False
+
+def _get_indexed_update(stmt, defs, loop_indices):
+    """match the setitem *stmt* against A[j] = A[j] <op> x, where j is not
+    the parfor index or a shift of it (the updates of different iterations
+    could then write the same item), and return the in-place operator, the
+    A[j] getitem and the A[j] <op> x variables.
+    """
+    require(isinstance(stmt, ir.StaticSetItem)
+            or not (_uses_parfor_index(stmt.index, defs, loop_indices)
+                    or _is_shifted_parfor_index(stmt.index, defs,
+                                                loop_indices)))
+    update = defs.get(stmt.value.name, None)
+    require(isinstance(update, ir.Expr)
+            and update.op in ('binop', 'inplace_binop')
+            and update.fn in _indexed_reduction_inplace_ops)
+    redop = _indexed_reduction_inplace_ops[update.fn]
+    operands = [update.lhs]
+    if redop != operator.isub:
+        operands.append(update.rhs)
+    items = []
+    for v in operands:
+        item = defs.get(v.name, None)
+        if (isinstance(item, ir.Expr)
+                and item.op in ('getitem', 'static_getitem')
+                and item.value.name == stmt.target.name
+                and _item_index(item) == _item_index(stmt)):
+            items.append(v.name)
+    require(len(items) == 1)
+    return redop, items[0], stmt.value.name
+
+def get_parfor_indexed_reductions(parfor, parfor_params, calltypes):
+    """find arrays that are only updated in place using their items at
+    indices other than the parfor index, e.g. h[B[i]] += C[i].  These are
+    reduced like array reduction variables: every thread accumulates into a
+    private copy initialized to the identity and the copies are combined
+    into the array after the parfor.  Returns a dictionary of array name to
+    (in-place operator, identity, array type).
+    """
+    loop_indices = {l.index_variable.name for l in parfor.loop_nests}
+    loop_indices.add(parfor.index_var.name)
+    stmts = _get_parfor_stmts(parfor)
+    defs = {}
+    uses = defaultdict(int)
+    for stmt in stmts:
+        if isinstance(stmt, ir.Assign):
+            defs[stmt.target.name] = stmt.value
+        for v in stmt.list_vars():
+            uses[v.name] += 1
+
+    candidates = {}
+    rejected = set()
+    for stmt in stmts:
+        if not isinstance(stmt, (ir.SetItem, ir.StaticSetItem)):
+            continue
+        name = stmt.target.name
+        if name not in parfor_params or name in rejected:
+            continue
+        update = guard(_get_indexed_update, stmt, defs, loop_indices)
+        sig = calltypes.get(stmt, None)
+        if (update is None or sig is None
+                or not isinstance(sig.args[0], types.npytypes.Array)
+                or (name in candidates
+                    and candidates[name][0] != update[0])):
+            rejected.add(name)
+            continue
+        redop, item, value = update
+        # the item and the updated value must not be used otherwise since
+        # they only hold the thread's partial result (the definitions count
+        # as uses too)
+        if uses[item] != 2 or uses[value] != 2:
+            rejected.add(name)
+            continue
+        cand = candidates.setdefault(name, [redop, sig.args[0], 0])
+        cand[2] += 2
+
+    indexed = {}
+    for name, (redop, arrtyp, nuses) in candidates.items():
+        # the array must not be used other than in the updates
+        if name not in rejected and uses[name] == nuses:
+            indexed[name] = (redop, _indexed_reduction_ops[redop][1], arrtyp)
+    return indexed
+
 def check_conflicting_reduction_operators(param, nodes):
     """In prange, a user could theoretically specify conflicting
        reduction operators.  For example, in one spot it is += and
@@ -3698,9 +5048,44 @@ def try_fuse(equiv_set, parfor1, parfor2):
                                 msg % (parfor1.id, parfor2.id))
         return None, report
 
+    # arrays written at other indices than the parfor index, e.g. in indexed
+    # reductions like h[B[i]] += 1, are complete after the parfor only
+    p1_uses = set()
+    for uses in p1_body_usedefs.usemap.values():
+        p1_uses |= uses
+    if (not get_parfor_scattered_writes(parfor1).isdisjoint(p2_uses) or
+            not get_parfor_scattered_writes(parfor2).isdisjoint(p1_uses)):
+        dprint("try_fuse: arrays written at arbitrary indices shared")
+        msg = ("- fusion failed: parallel loops %s and %s share arrays "
+                "written at arbitrary indices. ")
+        report = FusionReport(parfor1.id, parfor2.id,
+                                msg % (parfor1.id, parfor2.id))
+        return None, report
+
     return fuse_parfors_inner(parfor1, parfor2)
 
 
+def get_parfor_scattered_writes(parfor):
+    """get the arrays that are written to at indices not involving the
+    parfor indices in the parfor body.
+    """
+    loop_indices = {l.index_variable.name for l in parfor.loop_nests}
+    loop_indices.add(parfor.index_var.name)
+    stmts = _get_parfor_stmts(parfor)
+    defs = {}
+    for stmt in stmts:
+        if isinstance(stmt, ir.Assign):
+            defs[stmt.target.name] = stmt.value
+    arrays = set()
+    for stmt in stmts:
+        if isinstance(stmt, ir.StaticSetItem):
+            arrays.add(stmt.target.name)
+        elif (isinstance(stmt, ir.SetItem)
+                and not _uses_parfor_index(stmt.index, defs, loop_indices)):
+            arrays.add(stmt.target.name)
+    return arrays
+
+
 def fuse_parfors_inner(parfor1, parfor2):
     # fuse parfor2 into parfor1
     # append parfor2's init block on parfor1's
@@ -20,9 +20,12 @@ from numba.core import types, ir, config, compiler, lowering, sigutils, cgutils
 from numba.core.ir_utils import add_offset_to_labels, replace_var_names, remove_dels, legalize_names, mk_unique_var, rename_labels, get_name_var_table, visit_vars_inner, get_definition, guard, find_callname, get_call_table, is_pure, get_np_ufunc_typ, get_unused_var_name, find_potential_aliases, is_const_call
 from numba.core.analysis import compute_use_defs, compute_live_map, compute_dead_maps, compute_cfg_from_blocks
 from numba.core.typing import signature
-from numba.parfors.parfor import print_wrapped, ensure_parallel_support
+from numba.parfors.parfor import (print_wrapped, ensure_parallel_support,
+                                  Parfor)
 from numba.core.errors import NumbaParallelSafetyWarning, NotDefinedError, CompilerError
 from numba.parfors.parfor_lowering_utils import ParforLoweringBuilder
+from numba.core.cpu_options import SCHEDULE_KINDS
+from numba.core.extending import intrinsic
 
 
 def _lower_parfor_parallel(lowerer, parfor):
@@ -282,7 +285,10 @@ def _lower_parfor_parallel(lowerer, parfor):
         parfor.init_block,
         index_var_typ,
         parfor.races,
-        exp_name_to_tuple_var)
+        exp_name_to_tuple_var,
+        flags,
+        autotune_site=(_autotune_site_name(lowerer, parfor)
+                       if flags.auto_parallel.autotune else None))
     if config.DEBUG_ARRAY_OPT:
         sys.stdout.flush()
 
@@ -806,6 +812,105 @@ def to_scalar_from_0d(x):
             return x.dtype
     return x
 
+def _is_dynamic_schedule(flags):
+    """Whether the parfor loops compiled with *flags* hand out their
+    iterations dynamically (the 'dynamic' and 'guided' schedules).
+    """
+    return flags.auto_parallel.schedule != 'static'
+
+
+def _default_tile_shape(ndim, itemsize, narrays=1, extents=None):
+    """Tile sizes for a nest of *ndim* loops over *narrays* arrays of
+    *itemsize* byte elements, None for a loop that is not tiled. *extents*
+    are the numbers of neighbouring items a stencil reads along every loop,
+    1 by default. The rows of the tiles of every array, times the rows a
+    stencil reads at once, fill the L1 cache and the loops in between split
+    the L2 cache likewise. The outermost loop is streamed through every
+    tile so that the neighbouring planes of a stencil stay cached while it
+    advances.
+    """
+    if extents is None:
+        extents = (1,) * ndim
+    row_bytes = itemsize * max(narrays, 1)
+    inner = max(config.PARFOR_TILE_L1_SIZE // (row_bytes * extents[-2]), 1)
+    if ndim == 2:
+        return (None, inner)
+    rows = config.PARFOR_TILE_L2_SIZE // (inner * row_bytes * extents[0])
+    middle = max(int(rows ** (1.0 / (ndim - 2))), 1)
+    return (None,) + (middle,) * (ndim - 2) + (inner,)
+
+
+def _get_stencil_extents(parfor, ndim):
+    """The numbers of neighbouring items read along every loop of *parfor*
+    by the stencils it computes, 1 for the loops of other parfors.
+    """
+    extents = [1] * ndim
+    for pattern in parfor.patterns:
+        if pattern[0] != 'stencil' or len(pattern[1][0]) != ndim:
+            continue
+        for i, (start, end) in enumerate(zip(*pattern[1])):
+            # variable neighbourhoods are not known until run time
+            if isinstance(start, int) and isinstance(end, int):
+                extents[i] = max(extents[i], end - start + 1)
+    return tuple(extents)
+
+
+def _get_tile_shape(parfor, flags, param_types):
+    """The tile sizes of the loops of *parfor* compiled with *flags*, or None
+    if the loops run untiled. The default tiles are sized for the arrays
+    among *param_types*, their widest element and the stencil read by
+    *parfor* if any. The tile sizes of the
+    'tiling' parallel option apply to the loop nests of as many loops, the
+    others run untiled, whereas the tiles of a stencil must match it.
+    """
+    tile = parfor.tile
+    from_options = tile is None
+    if from_options:
+        tile = flags.auto_parallel.tiling
+    ndim = len(parfor.loop_nests)
+    if tile is False or ndim < 2:
+        return None
+    if tile is True:
+        itemsizes = [t.dtype.bitwidth // 8 for t in param_types
+                     if isinstance(t, types.Array) and
+                     isinstance(t.dtype, types.Number)]
+        return _default_tile_shape(ndim, max(itemsizes, default=8),
+                                   len(itemsizes),
+                                   _get_stencil_extents(parfor, ndim))
+    if len(tile) != ndim:
+        if from_options:
+            return None
+        raise ValueError("Expected %d tile sizes for parallel loop #%d, got "
+                         "%r" % (ndim, parfor.id, tile))
+    return tile
+
+
+@intrinsic
+def _claim_chunk(typingctx, next_addr, total, chunksize, kind, nthreads):
+    """Claim the next chunk of a dynamically scheduled parfor loop of *total*
+    iterations from the shared counter at *next_addr*. Returns the offset and
+    the length of the chunk, the length is 0 once the loop is exhausted.
+    """
+    restype = types.UniTuple(total, 2)
+    sig = restype(next_addr, total, chunksize, kind, nthreads)
+
+    def codegen(context, builder, sig, args):
+        intp_t = context.get_value_type(types.intp)
+        uintp_t = context.get_value_type(types.uintp)
+        uintp_ptr_t = lc.Type.pointer(uintp_t)
+        fnty = lc.Type.function(uintp_t, [uintp_ptr_t, uintp_t, uintp_t,
+                                          intp_t, uintp_t, uintp_ptr_t])
+        fn = builder.module.get_or_insert_function(fnty, name="claim_chunk")
+        next_addr, total, chunksize, kind, nthreads = args
+        count = cgutils.alloca_once(builder, uintp_t)
+        start = builder.call(fn, [builder.inttoptr(next_addr, uintp_ptr_t),
+                                  total, chunksize, kind, nthreads, count])
+        return context.make_tuple(builder, sig.return_type,
+                                  [start, builder.load(count)])
+
+    return sig, codegen
+
+
 def _create_gufunc_for_parfor_body(
         lowerer,
         parfor,
@@ -1119,21 +1224,62 @@ def _create_gufunc_for_parfor_body(
     # Iterate across the proper values extracted from the schedule.
     # The form of the schedule is start_dim0, start_dim1, ..., start_dimN, end_dim0,
     # end_dim1, ..., end_dimN
+    # For the dynamic and guided schedules every row of the schedule spans the
+    # whole iteration space and is followed by the address of the shared chunk
+    # counter, the length of dimension 0, the chunk size, the schedule kind and
+    # the number of threads. The outermost loop then repeatedly claims chunks of
+    # dimension 0 until there are none left.
+    # Tiled loops first iterate over the tiles of the range of the thread,
+    # then over the points of each tile.
+    loop_indent = 1
+    loop_bounds = [("sched[%d]" % eachdim,
+                    "sched[%d] + np.uint8(1)" % (eachdim + parfor_dim))
+                   for eachdim in range(parfor_dim)]
+    if _is_dynamic_schedule(flags):
+        # The threading layer provides the claim_chunk symbol.
+        from numba.np.ufunc.parallel import _launch_threads
+        _launch_threads()
+        claim_name = get_unused_var_name("__claim_chunk", loop_body_var_table)
+        chunk_start = get_unused_var_name("chunk_start", loop_body_var_table)
+        chunk_count = get_unused_var_name("chunk_count", loop_body_var_table)
+        globls[claim_name] = _claim_chunk
+        gufunc_txt += "    while True:\n"
+        gufunc_txt += ("        " + chunk_start + ", " + chunk_count + " = " +
+                       claim_name + "(" +
+                       ", ".join("sched[%d]" % (2 * parfor_dim + i)
+                                 for i in range(5)) + ")\n")
+        gufunc_txt += "        if " + chunk_count + " == 0:\n"
+        gufunc_txt += "            break\n"
+        gufunc_txt += "        " + chunk_start + " += sched[0]\n"
+        loop_indent = 2
+        loop_bounds[0] = (chunk_start, chunk_start + " + " + chunk_count)
+    tile_shape = _get_tile_shape(parfor, flags, param_types)
+    if tile_shape is not None:
+        # The tile size has the type of the bounds, a signed start plus an
+        # unsigned size would be a float.
+        size_type = "np.intp" if index_var_typ.signed else "np.uintp"
+        for eachdim, tile_size in enumerate(tile_shape):
+            if tile_size is None:
+                continue
+            start, stop = loop_bounds[eachdim]
+            tile_start = get_unused_var_name("tile_start%d" % eachdim,
+                                             loop_body_var_table)
+            size = "%s(%d)" % (size_type, tile_size)
+            gufunc_txt += ("    " * loop_indent + "for " + tile_start +
+                           " in range(" + start + ", " + stop + ", " + size +
+                           "):\n")
+            loop_indent += 1
+            loop_bounds[eachdim] = (tile_start, "min(" + tile_start + " + " +
+                                    size + ", " + stop + ")")
     for eachdim in range(parfor_dim):
-        for indent in range(eachdim + 1):
+        for indent in range(eachdim + loop_indent):
             gufunc_txt += "    "
-        sched_dim = eachdim
-        gufunc_txt += ("for " +
-                       legal_loop_indices[eachdim] +
-                       " in range(sched[" +
-                       str(sched_dim) +
-                       "], sched[" +
-                       str(sched_dim +
-                           parfor_dim) +
-                       "] + np.uint8(1)):\n")
+        start, stop = loop_bounds[eachdim]
+        gufunc_txt += ("for " + legal_loop_indices[eachdim] + " in range(" +
+                       start + ", " + stop + "):\n")
 
     if config.DEBUG_ARRAY_OPT_RUNTIME:
-        for indent in range(parfor_dim + 1):
+        for indent in range(parfor_dim + loop_indent):
             gufunc_txt += "    "
         gufunc_txt += "print("
         for eachdim in range(parfor_dim):
@@ -1142,7 +1288,7 @@ def _create_gufunc_for_parfor_body(
 
     # Add the sentinel assignment so that we can find the loop body position
     # in the IR.
-    for indent in range(parfor_dim + 1):
+    for indent in range(parfor_dim + loop_indent):
         gufunc_txt += "    "
     gufunc_txt += sentinel_name + " = 0\n"
     # Add assignments of reduction variables (for returning the value)
@@ -1367,11 +1513,74 @@ def replace_var_with_array(vars, loop_body, typemap, calltypes):
         typemap.pop(v, None)
         typemap[v] = types.npytypes.Array(el_typ, 1, "C")
 
+def _autotune_site_name(lowerer, parfor):
+    """The name of *parfor* for the autotuner: the function, its argument
+    types and the line of the parfor, plus an index if several parfors of the
+    function share the line.
+    """
+    fndesc = lowerer.fndesc
+    line = parfor.loc.line
+    name = "%s(%s) line %d" % (fndesc.qualname,
+                               ", ".join(str(a) for a in fndesc.argtypes),
+                               line)
+    same_line = [inst.id for _, block in sorted(lowerer.func_ir.blocks.items())
+                 for inst in block.body
+                 if isinstance(inst, Parfor)
+                 and inst.loc.line == line]
+    if parfor.id in same_line and same_line.index(parfor.id) > 0:
+        name = "%s #%d" % (name, same_line.index(parfor.id) + 1)
+    return name
+
+
+def _autotune_begin(lowerer, loop_ranges, num_threads, site_name):
+    """
+    Emit the call choosing the number of threads of a parfor from its trip
+    count, see numba.parfors.autotune.  Returns the number of threads and the
+    token to pass to autotune_end once the parfor has run.
+    """
+    context = lowerer.context
+    builder = lowerer.builder
+    byte_ptr_t = lc.Type.pointer(lc.Type.int(8))
+    intp_t = context.get_value_type(types.intp)
+    uintp_t = context.get_value_type(types.uintp)
+
+    # The trip count is the product of the (clamped) dimension lengths
+    trip_count = context.get_constant(types.uintp, 1)
+    for start, stop, _ in loop_ranges:
+        if start.type != uintp_t:
+            start = builder.sext(start, uintp_t)
+        if stop.type != uintp_t:
+            stop = builder.sext(stop, uintp_t)
+        length = builder.select(builder.icmp_signed('<', start, stop),
+                                builder.sub(stop, start),
+                                context.get_constant(types.uintp, 0))
+        trip_count = builder.mul(trip_count, length)
+
+    module = builder.module
+    slot = module.add_global_variable(
+        byte_ptr_t, name=module.get_unique_name("parfor_autotune_site"))
+    slot.linkage = 'internal'
+    slot.initializer = cgutils.get_null_value(byte_ptr_t)
+    name = context.insert_const_string(module,
+                                       site_name)
+    token = cgutils.alloca_once(builder, intp_t, size=5,
+                                name="autotune_token")
+
+    autotune_begin = module.get_or_insert_function(
+        lc.Type.function(intp_t, [lc.Type.pointer(byte_ptr_t), byte_ptr_t,
+                                  uintp_t, intp_t, lc.Type.pointer(intp_t)]),
+        name="autotune_begin")
+    num_threads = builder.call(autotune_begin, [slot, name, trip_count,
+                                                num_threads, token])
+    return num_threads, token
+
+
 def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr_arg_types,
                          loop_ranges, redvars, reddict, redarrdict, init_block, index_var_typ, races,
-                         exp_name_to_tuple_var):
+                         exp_name_to_tuple_var, flags, autotune_site=None):
     '''
     Adds the call to the gufunc function from the main function.
+    autotune_site is the name of the parfor for the autotuner, if enabled.
     '''
     context = lowerer.context
     builder = lowerer.builder
@@ -1479,7 +1688,11 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
         builder.store(stop, builder.gep(dim_stops,
                                         [context.get_constant(types.uintp, i)]))
 
-    sched_size = get_thread_count() * num_dim * 2
+    dynamic = _is_dynamic_schedule(flags)
+    # A dynamic schedule row is followed by the address of the chunk counter,
+    # the length of dimension 0, the chunk size, the kind and the thread count.
+    sched_row_len = num_dim * 2 + (5 if dynamic else 0)
+    sched_size = get_thread_count() * sched_row_len
     sched = cgutils.alloca_once(
         builder, sched_type, size=context.get_constant(
             types.uintp, sched_size), name="sched")
@@ -1506,12 +1719,56 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
                                                   ("Invalid number of threads. "
                                                    "This likely indicates a bug in Numba.",))
 
-    builder.call(
-        do_scheduling, [
-            context.get_constant(
-                types.uintp, num_dim), dim_starts, dim_stops, num_threads,
-            sched, context.get_constant(
-                    types.intp, debug_flag)])
+    autotune_token = None
+    if autotune_site is not None:
+        num_threads, autotune_token = _autotune_begin(
+            lowerer, loop_ranges, num_threads, autotune_site)
+
+    if dynamic:
+        # Every row spans the whole iteration space, the gufunc claims chunks
+        # of dimension 0 from the shared counter as it goes.
+        next_chunk = cgutils.alloca_once_value(builder, zero)
+        # An empty dimension anywhere leaves nothing to claim.
+        total = zero
+        nonempty = cgutils.true_bit
+        for i in range(num_dim):
+            start, stop, _ = loop_ranges[i]
+            if start.type != one_type:
+                start = builder.sext(start, one_type)
+            if stop.type != one_type:
+                stop = builder.sext(stop, one_type)
+            nonempty = builder.and_(nonempty,
+                                    builder.icmp_signed('<', start, stop))
+            if i == 0:
+                total = builder.sub(stop, start)
+        total = builder.select(nonempty, total, zero)
+        trailer = [builder.ptrtoint(next_chunk, sched_type),
+                   total,
+                   context.get_constant(types.uintp,
+                                        flags.auto_parallel.chunksize),
+                   context.get_constant(
+                       types.uintp,
+                       SCHEDULE_KINDS[flags.auto_parallel.schedule]),
+                   num_threads]
+        row = ([builder.load(builder.gep(dim_starts, [
+                    context.get_constant(types.uintp, i)]))
+                for i in range(num_dim)] +
+               [builder.load(builder.gep(dim_stops, [
+                    context.get_constant(types.uintp, i)]))
+                for i in range(num_dim)] +
+               trailer)
+        for i in range(get_thread_count()):
+            for j, val in enumerate(row):
+                builder.store(val, builder.gep(sched, [
+                    context.get_constant(types.uintp,
+                                         i * sched_row_len + j)]))
+    else:
+        builder.call(
+            do_scheduling, [
+                context.get_constant(
+                    types.uintp, num_dim), dim_starts, dim_stops, num_threads,
+                sched, context.get_constant(
+                        types.intp, debug_flag)])
 
     # Get the LLVM vars for the Numba IR reduction array vars.
     redarrs = [lowerer.loadvar(redarrdict[x].name) for x in redvars]
@@ -1522,13 +1779,13 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     if config.DEBUG_ARRAY_OPT:
         for i in range(get_thread_count()):
             cgutils.printf(builder, "sched[" + str(i) + "] = ")
-            for j in range(num_dim * 2):
+            for j in range(sched_row_len):
                 cgutils.printf(
                     builder, "%d ", builder.load(
                         builder.gep(
                             sched, [
                                 context.get_constant(
-                                    types.intp, i * num_dim * 2 + j)])))
+                                    types.intp, i * sched_row_len + j)])))
             cgutils.printf(builder, "\n")
 
     def load_potential_tuple_var(x):
@@ -1618,7 +1875,7 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     sig_dim_dict = {}
     occurances = []
     occurances = [sched_sig[0]]
-    sig_dim_dict[sched_sig[0]] = context.get_constant(types.intp, 2 * num_dim)
+    sig_dim_dict[sched_sig[0]] = context.get_constant(types.intp, sched_row_len)
     assert len(expr_args) == len(all_args)
     assert len(expr_args) == len(expr_arg_types)
     assert len(expr_args) == len(sin + sout)
@@ -1675,8 +1932,9 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     steps = cgutils.alloca_once(
         builder, intp_t, size=context.get_constant(
             types.intp, num_steps), name="psteps")
-    # First goes the step size for sched, which is 2 * num_dim
-    builder.store(context.get_constant(types.intp, 2 * num_dim * sizeof_intp),
+    # First goes the step size for sched, which is the length of a row
+    builder.store(context.get_constant(types.intp,
+                                       sched_row_len * sizeof_intp),
                   steps)
     # The steps for all others are 0, except for reduction results.
     for i in range(num_args):
@@ -1722,6 +1980,11 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     builder.call(fn, [args, shapes, steps, data])
     if config.DEBUG_ARRAY_OPT:
         cgutils.printf(builder, "after calling kernel %p\n", fn)
+    if autotune_token is not None:
+        autotune_end = builder.module.get_or_insert_function(
+            lc.Type.function(lc.Type.void(), [intp_ptr_t]),
+            name="autotune_end")
+        builder.call(autotune_end, [autotune_token])
 
     for k, v in rv_to_arg_dict.items():
         arg, rv_arg = v
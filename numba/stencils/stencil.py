@@ -13,6 +13,7 @@ from numba.core.typing.templates import (CallableTemplate, signature,
                                          infer_global, AbstractTemplate)
 from numba.core.imputils import lower_builtin
 from numba.core.extending import register_jitable
+from numba.core.cpu_options import check_tiling
 import numba
 
 import operator
@@ -51,6 +52,55 @@ def slice_addition(the_slice, addend):
     """
     return slice(the_slice.start + addend, the_slice.stop + addend)
 
+# The supported ways of handling the border of the output array.
+stencil_modes = ('constant', 'wrap', 'reflect', 'nearest', 'mirror')
+
+def _boundary_wrap(index, size):
+    # a b c d | a b c d | a b c d
+    return index % size
+
+def _boundary_reflect(index, size):
+    # d c b a | a b c d | d c b a
+    index = index % (2 * size)
+    if index >= size:
+        index = 2 * size - 1 - index
+    return index
+
+def _boundary_nearest(index, size):
+    # a a a a | a b c d | d d d d
+    return min(max(index, 0), size - 1)
+
+def _boundary_mirror(index, size):
+    # d c b | a b c d | c b a
+    if size == 1:
+        return 0
+    index = index % (2 * size - 2)
+    if index >= size:
+        index = 2 * size - 2 - index
+    return index
+
+_boundary_index_funcs = {
+    'wrap': _boundary_wrap,
+    'reflect': _boundary_reflect,
+    'nearest': _boundary_nearest,
+    'mirror': _boundary_mirror,
+}
+_boundary_index_dispatchers = {}
+
+def get_boundary_index_func(mode):
+    """ Returns the jitted function that maps an index outside of an array
+        dimension of the given size back into it for the given border mode.
+    """
+    func = _boundary_index_dispatchers.get(mode)
+    if func is None:
+        func = numba.njit(_boundary_index_funcs[mode])
+        _boundary_index_dispatchers[mode] = func
+    return func
+
+def check_stencil_mode(mode):
+    if mode not in stencil_modes:
+        raise ValueError("Unsupported mode style " + mode)
+
 class StencilFunc(object):
     """
     A special type to hold stencil information for the IR.
@@ -119,12 +169,39 @@ class StencilFunc(object):
             block.body = new_body
         return ret_blocks
 
+    def _fold_index(self, index_var, shape_name, dim, new_body, scope, loc):
+        """
+        Map index_var into dimension dim of the array whose shape is held
+        by the variable shape_name according to the border mode.  Returns
+        the variable holding the new index.
+        """
+        const_var = ir.Var(scope, ir_utils.mk_unique_var("const_index"), loc)
+        new_body.append(ir.Assign(ir.Const(dim, loc), const_var, loc))
+        size_var = ir.Var(scope, ir_utils.mk_unique_var("dim_size"), loc)
+        shape_var = ir.Var(scope, shape_name, loc)
+        new_body.append(ir.Assign(ir.Expr.getitem(shape_var, const_var, loc),
+                                  size_var, loc))
+        func_var = ir.Var(scope, ir_utils.mk_unique_var("boundary_index"), loc)
+        func = get_boundary_index_func(self.mode)
+        new_body.append(ir.Assign(ir.Global("boundary_index", func, loc),
+                                  func_var, loc))
+        folded_var = ir.Var(scope, ir_utils.mk_unique_var("stencil_index"), loc)
+        new_body.append(ir.Assign(
+                        ir.Expr.call(func_var, [index_var, size_var], (), loc),
+                        folded_var, loc))
+        return folded_var
+
     def add_indices_to_kernel(self, kernel, index_names, ndim,
-                              neighborhood, standard_indexed, typemap, calltypes):
+                              neighborhood, standard_indexed, typemap, calltypes,
+                              boundary_shape=None):
         """
         Transforms the stencil kernel as specified by the user into one
         that includes each dimension's index variable as part of the getitem
         calls.  So, in effect array[-1] becomes array[index0-1].
+        If boundary_shape, the name of the variable holding the shape of the
+        first input array, is given then the indices are also mapped back
+        into that shape according to the border mode, for use in the border
+        regions of the output array.
         """
         const_dict = {}
         kernel_consts = []
@@ -206,6 +283,9 @@ class StencilFunc(object):
                         # have to add the index value with a call to
                         # slice_addition.
                         if isinstance(stmt_index_var_typ, types.misc.SliceType):
+                            if boundary_shape is not None:
+                                raise ValueError("Slices in stencil kernels "
+                                    "are only supported in 'constant' mode.")
                             sa_var = ir.Var(scope, ir_utils.mk_unique_var("slice_addition"), loc)
                             sa_func = numba.njit(slice_addition)
                             sa_func_typ = types.functions.Dispatcher(sa_func)
@@ -222,6 +302,9 @@ class StencilFunc(object):
                             acc_call = ir.Expr.binop(operator.add, stmt_index_var,
                                                      index_var, loc)
                             new_body.append(ir.Assign(acc_call, tmpvar, loc))
+                            if boundary_shape is not None:
+                                tmpvar = self._fold_index(tmpvar,
+                                    boundary_shape, 0, new_body, scope, loc)
                             new_body.append(ir.Assign(
                                            ir.Expr.getitem(stmt.value.value, tmpvar, loc),
                                            stmt.target, loc))
@@ -262,6 +345,9 @@ class StencilFunc(object):
                             # have to add the index value with a call to
                             # slice_addition.
                             if isinstance(one_index_typ, types.misc.SliceType):
+                                if boundary_shape is not None:
+                                    raise ValueError("Slices in stencil kernels "
+                                        "are only supported in 'constant' mode.")
                                 sa_var = ir.Var(scope, ir_utils.mk_unique_var("slice_addition"), loc)
                                 sa_func = numba.njit(slice_addition)
                                 sa_func_typ = types.functions.Dispatcher(sa_func)
@@ -275,6 +361,10 @@ class StencilFunc(object):
                                 acc_call = ir.Expr.binop(operator.add, getitemvar,
                                                          index_vars[dim], loc)
                                 new_body.append(ir.Assign(acc_call, tmpvar, loc))
+                                if boundary_shape is not None:
+                                    ind_stencils[dim] = self._fold_index(tmpvar,
+                                        boundary_shape, dim, new_body, scope,
+                                        loc)
 
                         tuple_call = ir.Expr.build_tuple(ind_stencils, loc)
                         new_body.append(ir.Assign(tuple_call, s_index_var, loc))
@@ -513,6 +603,16 @@ class StencilFunc(object):
             raise ValueError("Standard indexing requested for an array name "
                              "not present in the stencil kernel definition.")
 
+        # The name of the shape of the first input array.
+        shape_name = ir_utils.get_unused_var_name("full_shape", name_var_table)
+
+        # In the modes other than constant, the border of the output array is
+        # computed by another copy of the kernel whose accesses are mapped back
+        # into the input arrays.
+        if self.mode != 'constant':
+            border_kernel = kernel_copy.copy()
+            border_kernel.blocks = copy.deepcopy(kernel_copy.blocks)
+
         # Add index variables to getitems in the IR to transition the accesses
         # in the kernel from relative to regular Python indexing.  Returns the
         # computed size of the stencil kernel and a list of the relatively indexed
@@ -536,6 +636,17 @@ class StencilFunc(object):
             print("After replace_return_with_setitem", ret_blocks)
             ir_utils.dump_blocks(kernel_copy.blocks)
 
+        if self.mode != 'constant':
+            self.add_indices_to_kernel(border_kernel, index_vars,
+                    the_array.ndim, self.neighborhood, standard_indexed,
+                    typemap, copy_calltypes, boundary_shape=shape_name)
+            border_ret_blocks = self.replace_return_with_setitem(
+                    border_kernel.blocks, index_vars, out_name)
+
+            if config.DEBUG_ARRAY_OPT >= 1:
+                print("Border kernel", border_ret_blocks)
+                ir_utils.dump_blocks(border_kernel.blocks)
+
         # Start to form the new function to execute the stencil kernel.
         func_text = "def {}({}{}):\n".format(stencil_func_name,
                         ",".join(kernel_copy.arg_names), sig_extra)
@@ -564,7 +675,6 @@ class StencilFunc(object):
             func_text += ")\n"
 
         # Get the shape of the first input array.
-        shape_name = ir_utils.get_unused_var_name("full_shape", name_var_table)
         func_text += "    {} = {}.shape\n".format(shape_name, first_arg)
 
 
@@ -574,7 +684,11 @@ class StencilFunc(object):
         if result is None:
             return_type_name = numpy_support.as_dtype(
                                return_type.dtype).type.__name__
-            if "cval" in self.options:
+            if self.mode != 'constant':
+                # every element is written by the interior or a border loop
+                out_init ="{} = np.empty({}, dtype=np.{})\n".format(
+                            out_name, shape_name, return_type_name)
+            elif "cval" in self.options:
                 cval = self.options["cval"]
                 if return_type.dtype != typing.typeof.typeof(cval):
                     raise ValueError(
@@ -586,7 +700,7 @@ class StencilFunc(object):
                             out_name, shape_name, return_type_name)
             func_text += "    " + out_init
         else: # result is present, if cval is set then use it
-            if "cval" in self.options:
+            if "cval" in self.options and self.mode == 'constant':
                 cval = self.options["cval"]
                 cval_ty = typing.typeof.typeof(cval)
                 if not self._typingctx.can_convert(cval_ty, return_type.dtype):
@@ -624,6 +738,45 @@ class StencilFunc(object):
         # remove this sentinel assignment and replace it with the IR for the
         # stencil kernel body.
         func_text += "{} = 0\n".format(sentinel_name)
+        kernels = [(sentinel_name, kernel_copy.blocks, ret_blocks)]
+
+        # In the other modes than constant, add loop nests over the border of
+        # the output array, running the border copy of the kernel.  For each
+        # dimension, there is a loop nest over the elements before and one
+        # over the elements after the interior in that dimension, which are
+        # in the interior of the previous dimensions, so that every element
+        # is computed once.
+        if self.mode != 'constant':
+            for i in range(the_array.ndim):
+                start = "-min(0,{})".format(ranges[i][0])
+                stop = "{}[{}]-max(0,{})".format(shape_name, i, ranges[i][1])
+                low_stop = "min({},{}[{}])".format(start, shape_name, i)
+                high_start = "max({},{})".format(stop, low_stop)
+                for border in [(0, low_stop),
+                               (high_start, "{}[{}]".format(shape_name, i))]:
+                    offset = 1
+                    for j in range(the_array.ndim):
+                        if j < i:
+                            border_range = ("-min(0,{})".format(ranges[j][0]),
+                                            "{}[{}]-max(0,{})".format(
+                                                shape_name, j, ranges[j][1]))
+                        elif j == i:
+                            border_range = border
+                        else:
+                            border_range = (0, "{}[{}]".format(shape_name, j))
+                        func_text += "    " * offset
+                        func_text += "for {} in range({},{}):\n".format(
+                                        index_vars[j], *border_range)
+                        offset += 1
+                    border_sentinel = ir_utils.get_unused_var_name(
+                        "__sentinel_border{}__".format(len(kernels)),
+                        name_var_table)
+                    func_text += "    " * offset
+                    func_text += "{} = 0\n".format(border_sentinel)
+                    kernels.append((border_sentinel,
+                                    copy.deepcopy(border_kernel.blocks),
+                                    border_ret_blocks))
+
         func_text += "    return {}\n".format(out_name)
 
         if config.DEBUG_ARRAY_OPT >= 1:
@@ -644,69 +797,74 @@ class StencilFunc(object):
         # rename all variables in stencil_ir afresh
         var_table = ir_utils.get_name_var_table(stencil_ir.blocks)
         new_var_dict = {}
-        reserved_names = ([sentinel_name, out_name, neighborhood_name,
-                           shape_name] + kernel_copy.arg_names + index_vars)
+        reserved_names = ([x[0] for x in kernels] +
+                          [out_name, neighborhood_name, shape_name] +
+                          kernel_copy.arg_names + index_vars)
         for name, var in var_table.items():
             if not name in reserved_names:
                 new_var_dict[name] = ir_utils.mk_unique_var(name)
         ir_utils.replace_var_names(stencil_ir.blocks, new_var_dict)
 
-        stencil_stub_last_label = max(stencil_ir.blocks.keys()) + 1
-
-        # Shift labels in the kernel copy so they are guaranteed unique
-        # and don't conflict with any labels in the stencil_ir.
-        kernel_copy.blocks = ir_utils.add_offset_to_labels(
-                                kernel_copy.blocks, stencil_stub_last_label)
-        new_label = max(kernel_copy.blocks.keys()) + 1
-        # Adjust ret_blocks to account for addition of the offset.
-        ret_blocks = [x + stencil_stub_last_label for x in ret_blocks]
-
-        if config.DEBUG_ARRAY_OPT >= 1:
-            print("ret_blocks w/ offsets", ret_blocks, stencil_stub_last_label)
-            print("before replace sentinel stencil_ir")
-            ir_utils.dump_blocks(stencil_ir.blocks)
-            print("before replace sentinel kernel_copy")
-            ir_utils.dump_blocks(kernel_copy.blocks)
-
-        # Search all the block in the stencil outline for the sentinel.
-        for label, block in stencil_ir.blocks.items():
-            for i, inst in enumerate(block.body):
-                if (isinstance( inst, ir.Assign) and
-                    inst.target.name == sentinel_name):
-                    # We found the sentinel assignment.
-                    loc = inst.loc
-                    scope = block.scope
-                    # split block across __sentinel__
-                    # A new block is allocated for the statements prior to the
-                    # sentinel but the new block maintains the current block
-                    # label.
-                    prev_block = ir.Block(scope, loc)
-                    prev_block.body = block.body[:i]
-                    # The current block is used for statements after sentinel.
-                    block.body = block.body[i + 1:]
-                    # But the current block gets a new label.
-                    body_first_label = min(kernel_copy.blocks.keys())
-
-                    # The previous block jumps to the minimum labelled block of
-                    # the parfor body.
-                    prev_block.append(ir.Jump(body_first_label, loc))
-                    # Add all the parfor loop body blocks to the gufunc
-                    # function's IR.
-                    for (l, b) in kernel_copy.blocks.items():
-                        stencil_ir.blocks[l] = b
-
-                    stencil_ir.blocks[new_label] = block
-                    stencil_ir.blocks[label] = prev_block
-                    # Add a jump from all the blocks that previously contained
-                    # a return in the stencil kernel to the block
-                    # containing statements after the sentinel.
-                    for ret_block in ret_blocks:
-                        stencil_ir.blocks[ret_block].append(
-                            ir.Jump(new_label, loc))
-                    break
-            else:
-                continue
-            break
+        for sentinel, kernel_blocks, kernel_ret_blocks in kernels:
+            stencil_stub_last_label = max(stencil_ir.blocks.keys()) + 1
+
+            # Shift labels in the kernel copy so they are guaranteed unique
+            # and don't conflict with any labels in the stencil_ir.
+            kernel_blocks = ir_utils.add_offset_to_labels(
+                                    kernel_blocks, stencil_stub_last_label)
+            new_label = max(kernel_blocks.keys()) + 1
+            # Adjust ret_blocks to account for addition of the offset.
+            kernel_ret_blocks = [x + stencil_stub_last_label
+                                 for x in kernel_ret_blocks]
+
+            if config.DEBUG_ARRAY_OPT >= 1:
+                print("ret_blocks w/ offsets", kernel_ret_blocks,
+                      stencil_stub_last_label)
+                print("before replace sentinel stencil_ir")
+                ir_utils.dump_blocks(stencil_ir.blocks)
+                print("before replace sentinel kernel_copy")
+                ir_utils.dump_blocks(kernel_blocks)
+
+            # Search all the block in the stencil outline for the sentinel.
+            for label, block in stencil_ir.blocks.items():
+                for i, inst in enumerate(block.body):
+                    if (isinstance( inst, ir.Assign) and
+                        inst.target.name == sentinel):
+                        # We found the sentinel assignment.
+                        loc = inst.loc
+                        scope = block.scope
+                        # split block across __sentinel__
+                        # A new block is allocated for the statements prior to
+                        # the sentinel but the new block maintains the current
+                        # block label.
+                        prev_block = ir.Block(scope, loc)
+                        prev_block.body = block.body[:i]
+                        # The current block is used for statements after
+                        # sentinel.
+                        block.body = block.body[i + 1:]
+                        # But the current block gets a new label.
+                        body_first_label = min(kernel_blocks.keys())
+
+                        # The previous block jumps to the minimum labelled block
+                        # of the parfor body.
+                        prev_block.append(ir.Jump(body_first_label, loc))
+                        # Add all the parfor loop body blocks to the gufunc
+                        # function's IR.
+                        for (l, b) in kernel_blocks.items():
+                            stencil_ir.blocks[l] = b
+
+                        stencil_ir.blocks[new_label] = block
+                        stencil_ir.blocks[label] = prev_block
+                        # Add a jump from all the blocks that previously
+                        # contained a return in the stencil kernel to the block
+                        # containing statements after the sentinel.
+                        for ret_block in kernel_ret_blocks:
+                            stencil_ir.blocks[ret_block].append(
+                                ir.Jump(new_label, loc))
+                        break
+                else:
+                    continue
+                break
 
         stencil_ir.blocks = ir_utils.rename_labels(stencil_ir.blocks)
         ir_utils.remove_dels(stencil_ir.blocks)
@@ -773,10 +931,15 @@ def stencil(func_or_mode='constant', **options):
     else:
         mode = func_or_mode
         func = None
+    # the mode may also be given by keyword
+    mode = options.pop("mode", mode)
 
     for option in options:
-        if option not in ["cval", "standard_indexing", "neighborhood"]:
+        if option not in ["cval", "standard_indexing", "neighborhood",
+                          "tile"]:
             raise ValueError("Unknown stencil option " + option)
+    if "tile" in options:
+        check_tiling(options["tile"])
 
     wrapper = _stencil(mode, options)
     if func is not None:
@@ -784,8 +947,7 @@ def stencil(func_or_mode='constant', **options):
     return wrapper
 
 def _stencil(mode, options):
-    if mode != 'constant':
-        raise ValueError("Unsupported mode style " + mode)
+    check_stencil_mode(mode)
 
     def decorated(func):
         from numba.core import compiler
@@ -28,6 +28,12 @@ def _compute_last_ind(dim_size, index_const):
     else:
         return dim_size
 
+def _compute_border_low_stop(start_ind, dim_size):
+    return min(start_ind, dim_size)
+
+def _compute_border_high_start(start_ind, last_ind, dim_size):
+    return max(last_ind, min(start_ind, dim_size))
+
 class StencilPass(object):
     def __init__(self, func_ir, typemap, calltypes, array_analysis, typingctx, flags):
         self.func_ir = func_ir
@@ -87,6 +93,24 @@ class StencilPass(object):
                     gen_nodes = self._mk_stencil_parfor(label, in_args, out_arr,
                             stencil_ir, index_offsets, stmt.target, rt, sf,
                             arg_to_arr_dict)
+                    if sf.mode != 'constant':
+                        # The interior parfor is followed by one parfor for
+                        # each side of each dimension of the border, each
+                        # with its own copy of the kernel.
+                        out_arr = gen_nodes[-1].value
+                        border_nodes = []
+                        for dim in range(arg_typemap[0].ndim):
+                            for high in (False, True):
+                                stencil_ir, rt, arg_to_arr_dict = \
+                                    get_stencil_ir(sf, self.typingctx,
+                                        arg_typemap, block.scope, block.loc,
+                                        input_dict, self.typemap,
+                                        self.calltypes)
+                                border_nodes += self._mk_stencil_parfor(
+                                    label, in_args, out_arr, stencil_ir,
+                                    index_offsets, None, rt, sf,
+                                    arg_to_arr_dict, border=(dim, high))
+                        gen_nodes = gen_nodes[:-1] + border_nodes + gen_nodes[-1:]
                     block.body = block.body[:i] + gen_nodes + block.body[i+1:]
                 # Found a call to a stencil via numba.stencil().
                 elif (isinstance(stmt, ir.Assign)
@@ -124,8 +148,16 @@ class StencilPass(object):
 
     def _mk_stencil_parfor(self, label, in_args, out_arr, stencil_ir,
                            index_offsets, target, return_type, stencil_func,
-                           arg_to_arr_dict):
+                           arg_to_arr_dict, border=None):
         """ Converts a set of stencil kernel blocks to a parfor.
+            By default the parfor covers the interior of the output array,
+            where the kernel only accesses elements inside the input arrays.
+            If border is given as a (dimension, high) tuple then the parfor
+            covers the elements of the output array that are before (or after
+            if high is true) the interior in that dimension, and inside it
+            in the previous dimensions, with the accesses of the kernel mapped
+            back into the input arrays according to the border mode.  In that
+            case, out_arr must be given and target is None.
         """
         gen_nodes = []
         stencil_blocks = stencil_ir.blocks
@@ -167,9 +199,14 @@ class StencilPass(object):
             self.typemap[parfor_var.name] = types.intp
             parfor_vars.append(parfor_var)
 
+        equiv_set = self.array_analysis.get_equiv_set(label)
+        in_arr_dim_sizes = equiv_set.get_shape(in_arr)
+        assert ndims == len(in_arr_dim_sizes)
+
         start_lengths, end_lengths = self._replace_stencil_accesses(
              stencil_ir, parfor_vars, in_args, index_offsets, stencil_func,
-             arg_to_arr_dict)
+             arg_to_arr_dict,
+             boundary_sizes=None if border is None else in_arr_dim_sizes)
 
         if config.DEBUG_ARRAY_OPT >= 1:
             print("stencil_blocks after replace stencil accesses")
@@ -177,15 +214,29 @@ class StencilPass(object):
 
         # create parfor loop nests
         loopnests = []
-        equiv_set = self.array_analysis.get_equiv_set(label)
-        in_arr_dim_sizes = equiv_set.get_shape(in_arr)
-
-        assert ndims == len(in_arr_dim_sizes)
         for i in range(ndims):
             last_ind = self._get_stencil_last_ind(in_arr_dim_sizes[i],
                                         end_lengths[i], gen_nodes, scope, loc)
             start_ind = self._get_stencil_start_ind(
                                         start_lengths[i], gen_nodes, scope, loc)
+            if border is not None and i == border[0]:
+                # the elements before or after the interior
+                if border[1]:
+                    start_ind = self._mk_stencil_call(
+                        _compute_border_high_start,
+                        [start_ind, last_ind, in_arr_dim_sizes[i]],
+                        gen_nodes, scope, loc)
+                    last_ind = in_arr_dim_sizes[i]
+                else:
+                    last_ind = self._mk_stencil_call(
+                        _compute_border_low_stop,
+                        [start_ind, in_arr_dim_sizes[i]],
+                        gen_nodes, scope, loc)
+                    start_ind = 0
+            elif border is not None and i > border[0]:
+                # the whole dimension
+                start_ind = 0
+                last_ind = in_arr_dim_sizes[i]
             # start from stencil size to avoid invalid array access
             loopnests.append(numba.parfors.parfor.LoopNest(parfor_vars[i],
                                 start_ind, last_ind, 1))
@@ -217,7 +268,44 @@ class StencilPass(object):
 
         # empty init block
         init_block = ir.Block(scope, loc)
-        if out_arr is None:
+        if border is not None:
+            # the output array is allocated by the interior parfor
+            pass
+        elif out_arr is None and stencil_func.mode != 'constant':
+            # every element is written by the interior or a border parfor
+            shape_var = ir.Var(scope, mk_unique_var("in_arr_shape"), loc)
+            self.typemap[shape_var.name] = types.containers.UniTuple(
+                                                types.intp, in_arr_typ.ndim)
+            init_block.body.append(ir.Assign(
+                ir.Expr.getattr(in_arr, "shape", loc), shape_var, loc))
+
+            so_name = ir_utils.mk_unique_var("stencil_output")
+            out_arr = ir.Var(scope, so_name, loc)
+            self.typemap[out_arr.name] = numba.core.types.npytypes.Array(
+                                                           return_type.dtype,
+                                                           in_arr_typ.ndim,
+                                                           in_arr_typ.layout)
+            dtype_g_np_var = ir.Var(scope, mk_unique_var("$np_g_var"), loc)
+            self.typemap[dtype_g_np_var.name] = types.misc.Module(np)
+            init_block.body.append(ir.Assign(ir.Global('np', np, loc),
+                                             dtype_g_np_var, loc))
+            dtype_attr_var = ir.Var(scope, mk_unique_var("$np_attr_attr"), loc)
+            self.typemap[dtype_attr_var.name] = types.functions.NumberClass(
+                                                            return_type.dtype)
+            init_block.body.append(ir.Assign(
+                ir.Expr.getattr(dtype_g_np_var, return_type.dtype.name, loc),
+                dtype_attr_var, loc))
+
+            stmts = ir_utils.gen_np_call("empty",
+                                       np.empty,
+                                       out_arr,
+                                       [shape_var, dtype_attr_var],
+                                       self.typingctx,
+                                       self.typemap,
+                                       self.calltypes)
+            equiv_set.insert_equiv(out_arr, in_arr_dim_sizes)
+            init_block.body.extend(stmts)
+        elif out_arr is None:
             in_arr_typ = self.typemap[in_arr.name]
 
             shape_name = ir_utils.mk_unique_var("in_arr_shape")
@@ -270,7 +358,8 @@ class StencilPass(object):
             equiv_set.insert_equiv(out_arr, in_arr_dim_sizes)
             init_block.body.extend(stmts)
         else: # out is present
-            if "cval" in stencil_func.options: # do out[:] = cval
+            if ("cval" in stencil_func.options and
+                    stencil_func.mode == 'constant'): # do out[:] = cval
                 cval = stencil_func.options["cval"]
                 # TODO: Loosen this restriction to adhere to casting rules.
                 cval_ty = typing.typeof.typeof(cval)
@@ -356,10 +445,73 @@ class StencilPass(object):
         pattern = ('stencil', [start_lengths, end_lengths])
         parfor = numba.parfors.parfor.Parfor(loopnests, init_block, stencil_blocks,
                                      loc, parfor_ind_var, equiv_set, pattern, self.flags)
+        if border is None:
+            parfor.tile = stencil_func.options.get("tile")
+        else:
+            # the border regions are thin, only the main region is tiled
+            parfor.tile = False
         gen_nodes.append(parfor)
-        gen_nodes.append(ir.Assign(out_arr, target, loc))
+        if target is not None:
+            gen_nodes.append(ir.Assign(out_arr, target, loc))
         return gen_nodes
 
+    def _mk_stencil_call(self, func, args, gen_nodes, scope, loc):
+        """ Calls func, an integer function of the integer args, appending
+            the call to gen_nodes and returning the variable of the result.
+        """
+        arg_vars = []
+        for arg in args:
+            if isinstance(arg, numbers.Number):
+                arg_var = ir.Var(scope, mk_unique_var("stencil_const_var"),
+                                 loc)
+                self.typemap[arg_var.name] = types.intp
+                gen_nodes.append(ir.Assign(ir.Const(arg, loc), arg_var, loc))
+                arg = arg_var
+            arg_vars.append(arg)
+        res = ir.Var(scope, mk_unique_var(func.__name__.lstrip('_')), loc)
+        self.typemap[res.name] = types.intp
+        g_var = ir.Var(scope, mk_unique_var(func.__name__ + "_var"), loc)
+        check_func = numba.njit(func)
+        func_typ = types.functions.Dispatcher(check_func)
+        self.typemap[g_var.name] = func_typ
+        gen_nodes.append(ir.Assign(ir.Global(func.__name__, check_func, loc),
+                                   g_var, loc))
+        call = ir.Expr.call(g_var, arg_vars, (), loc)
+        self.calltypes[call] = func_typ.get_call_type(
+            self.typingctx, [types.intp] * len(arg_vars), {})
+        gen_nodes.append(ir.Assign(call, res, loc))
+        return res
+
+    def _fold_index(self, index_var, dim_size, mode, new_body, scope, loc):
+        """ Maps index_var into an array dimension of size dim_size according
+            to the border mode, appending the nodes to new_body.  Returns the
+            variable holding the new index.
+        """
+        from numba.stencils.stencil import get_boundary_index_func
+
+        if isinstance(self.typemap[index_var.name], types.misc.SliceType):
+            raise ValueError("Slices in stencil kernels are only supported "
+                             "in 'constant' mode.")
+        if isinstance(dim_size, numbers.Number):
+            size_var = ir.Var(scope, mk_unique_var("stencil_dim_size"), loc)
+            self.typemap[size_var.name] = types.intp
+            new_body.append(ir.Assign(ir.Const(dim_size, loc), size_var, loc))
+            dim_size = size_var
+        g_var = ir.Var(scope, mk_unique_var("boundary_index_var"), loc)
+        func = get_boundary_index_func(mode)
+        func_typ = types.functions.Dispatcher(func)
+        self.typemap[g_var.name] = func_typ
+        new_body.append(ir.Assign(ir.Global("boundary_index", func, loc),
+                                  g_var, loc))
+        call = ir.Expr.call(g_var, [index_var, dim_size], (), loc)
+        self.calltypes[call] = func_typ.get_call_type(
+            self.typingctx, [self.typemap[index_var.name], types.intp], {})
+        folded_var = ir.Var(scope, mk_unique_var("boundary_stencil_index"),
+                            loc)
+        self.typemap[folded_var.name] = types.intp
+        new_body.append(ir.Assign(call, folded_var, loc))
+        return folded_var
+
     def _get_stencil_last_ind(self, dim_size, end_length, gen_nodes, scope,
                                                                         loc):
         last_ind = dim_size
@@ -409,10 +561,13 @@ class StencilPass(object):
         return ret_var
 
     def _replace_stencil_accesses(self, stencil_ir, parfor_vars, in_args,
-                                  index_offsets, stencil_func, arg_to_arr_dict):
+                                  index_offsets, stencil_func, arg_to_arr_dict,
+                                  boundary_sizes=None):
         """ Convert relative indexing in the stencil kernel to standard indexing
             by adding the loop index variables to the corresponding dimensions
-            of the array index tuples.
+            of the array index tuples.  If the sizes of the dimensions of the
+            first input array are given in boundary_sizes then the indices
+            are also mapped back into those according to the border mode.
         """
         stencil_blocks = stencil_ir.blocks
         in_arr = in_args[0]
@@ -511,6 +666,11 @@ class StencilPass(object):
                     # update access indices
                     index_vars = self._add_index_offsets(parfor_vars,
                                 list(index_list), new_body, scope, loc)
+                    if boundary_sizes is not None:
+                        index_vars = [self._fold_index(v, size,
+                                        stencil_func.mode, new_body, scope, loc)
+                                      for v, size in zip(index_vars,
+                                                         boundary_sizes)]
 
                     # new access index tuple
                     if ndims == 1:
@@ -675,6 +675,9 @@ class MemoryLeak(object):
     def memory_leak_setup(self):
         # Clean up any NRT-backed objects hanging in a dead reference cycle
         gc.collect()
+        # The leak check relies on the NRT stats, which may be disabled
+        if not rtsys.memsys_stats_enabled():
+            rtsys.memsys_enable_stats()
         self.__init_stats = rtsys.get_allocation_stats()
 
     def memory_leak_teardown(self):
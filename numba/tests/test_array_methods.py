@@ -1183,6 +1183,59 @@ class TestArrayMethods(MemoryLeakMixin, TestCase):
             foo.py_func(a)
         self.assertIn("out of bounds", str(raises.exception))
 
+    def test_reductions_axis(self):
+        # Exceptions leak references
+        self.disable_leak_check()
+
+        def pyfunc_global(fname):
+            ns = {'np': np}
+            exec("def f(a, axis):\n    return np.%s(a, axis)" % fname, ns)
+            return ns['f']
+
+        def pyfunc_method(fname):
+            ns = {}
+            exec("def f(a, axis):\n    return a.%s(axis=axis)" % fname, ns)
+            return ns['f']
+
+        arrays = [np.random.random((5, 6, 7)),
+                  np.random.randint(-10, 10, size=(4, 9)),
+                  np.random.random((8, 3)).astype(np.float32),
+                  np.random.random(7),
+                  # non-contiguous
+                  np.random.random((6, 8, 3))[:, ::2, 1:],
+                  np.random.random((5, 6)).T]
+        for fname in ('prod', 'mean', 'var', 'std', 'min', 'max', 'argmin',
+                      'argmax'):
+            for pyfunc in (pyfunc_global(fname), pyfunc_method(fname)):
+                cfunc = jit(nopython=True)(pyfunc)
+                for a in arrays:
+                    for axis in range(-a.ndim, a.ndim):
+                        with self.subTest(fname=fname, shape=a.shape,
+                                          axis=axis):
+                            expected = pyfunc(a, axis)
+                            got = cfunc(a, axis)
+                            if fname in ('argmin', 'argmax'):
+                                np.testing.assert_equal(got, expected)
+                            else:
+                                np.testing.assert_allclose(got, expected,
+                                                           rtol=1e-5)
+                with self.assertRaises(ValueError) as raises:
+                    cfunc(arrays[0], 3)
+                self.assertIn("out of bounds", str(raises.exception))
+
+        # complex arrays are supported by the arithmetic reductions
+        a = np.random.random((4, 5)) + 1j * np.random.random((4, 5))
+        for fname in ('prod', 'mean', 'var', 'std'):
+            pyfunc = pyfunc_global(fname)
+            cfunc = jit(nopython=True)(pyfunc)
+            np.testing.assert_allclose(cfunc(a, 1), pyfunc(a, 1))
+
+        # empty reduced axis
+        cfunc = jit(nopython=True)(pyfunc_global('min'))
+        with self.assertRaises(ValueError) as raises:
+            cfunc(np.ones((3, 0)), 1)
+        self.assertIn("zero-size array", str(raises.exception))
+
     def test_cumsum(self):
         pyfunc = array_cumsum
         cfunc = jit(nopython=True)(pyfunc)
@@ -1016,6 +1016,129 @@ class TestTypedDict(MemoryLeakMixin, TestCase):
         val = consumer(d)
         self.assertEqual(val, 1.23)
 
+    def test_empty_n_keys(self):
+        d = Dict.empty(int64, float64, n_keys=1000)
+        small = Dict.empty(int64, float64)
+        self.assertGreater(sys.getsizeof(d), sys.getsizeof(small))
+        size = sys.getsizeof(d)
+        for i in range(1000):
+            d[i] = i
+        # no resize happened
+        self.assertEqual(sys.getsizeof(d), size)
+        self.assertEqual(len(d), 1000)
+
+        # disable leak check for exception test
+        self.disable_leak_check()
+        with self.assertRaises(ValueError) as raises:
+            Dict.empty(int64, float64, n_keys=-1)
+        self.assertIn("expecting *n_keys* to be >= 0", str(raises.exception))
+
+    def test_reserve(self):
+        d = Dict.empty(int64, float64)
+        d[1] = 1.
+        size = sys.getsizeof(d)
+        d.reserve(1)
+        self.assertEqual(sys.getsizeof(d), size)
+        d.reserve(500)
+        reserved = sys.getsizeof(d)
+        self.assertGreater(reserved, size)
+        for i in range(500):
+            d[i] = i
+        self.assertEqual(sys.getsizeof(d), reserved)
+        self.assertEqual(d[1], 1.)
+
+        # reserving in an untyped dictionary applies when it gets typed
+        d = Dict()
+        d.reserve(500)
+        d[1] = 1.
+        self.assertEqual(sys.getsizeof(d), reserved)
+
+        # also when it gets typed by update_from_arrays()
+        d = Dict()
+        d.reserve(500)
+        d.update_from_arrays(np.array([1]), np.array([1.]))
+        self.assertEqual(sys.getsizeof(d), reserved)
+        d.update_from_arrays(np.arange(500), np.arange(500.))
+        self.assertEqual(sys.getsizeof(d), reserved)
+        self.assertEqual(len(d), 500)
+
+    def test_reserve_compiled(self):
+        @njit
+        def foo(n):
+            d = Dict.empty(int64, int64, n_keys=n)
+            a = dictobject._dict_sizeof(d)
+            for i in range(n):
+                d[i] = i
+            b = dictobject._dict_sizeof(d)
+            d.reserve(4 * n)
+            c = dictobject._dict_sizeof(d)
+            return a, b, c, len(d)
+
+        a, b, c, n = foo(100)
+        self.assertEqual(a, b)
+        self.assertGreater(c, b)
+        self.assertEqual(n, 100)
+
+        # disable leak check for exception test
+        self.disable_leak_check()
+
+        @njit
+        def bar():
+            d = Dict.empty(int64, int64)
+            d.reserve(-1)
+
+        with self.assertRaises(ValueError) as raises:
+            bar()
+        self.assertIn("expecting *n_keys* to be >= 0", str(raises.exception))
+
+    def test_from_arrays(self):
+        keys = np.arange(10, dtype=np.int64) * 3
+        values = np.linspace(0, 1, 10)
+        d = Dict.from_arrays(keys, values)
+        self.assertEqual(typeof(d), types.DictType(types.int64, types.float64))
+        self.assertEqual(dict(d), dict(zip(keys.tolist(), values.tolist())))
+        np.testing.assert_equal(d.keys_array(), keys)
+        np.testing.assert_equal(d.values_array(), values)
+
+        d.update_from_arrays(np.array([[0, 100]]), np.array([[-1., -2.]]))
+        self.assertEqual(d[0], -1.)
+        self.assertEqual(d[100], -2.)
+        self.assertEqual(len(d), 11)
+
+        with self.assertRaises(ValueError) as raises:
+            d.update_from_arrays(keys, values[:3])
+        self.assertIn('keys and values must have the same size',
+                      str(raises.exception))
+
+    def test_lookup_array(self):
+        d = Dict.from_arrays(np.array([1, 2, 3]), np.array([10, 20, 30]))
+        query = np.array([[3, 4], [1, 2]])
+        np.testing.assert_equal(d.lookup_array(query, -1),
+                                np.array([[30, -1], [10, 20]]))
+        with self.assertRaises(KeyError):
+            d.lookup_array(query)
+        np.testing.assert_equal(d.lookup_array(query[1]), np.array([10, 20]))
+
+    def test_from_arrays_compiled(self):
+        @njit
+        def foo(keys, values, query):
+            d = Dict.from_arrays(keys, values)
+            return d, d.lookup_array(query, 0.), d.keys_array()
+
+        d, looked_up, keys = foo(np.array([4, 5]), np.array([.5, 1.5]),
+                                 np.array([5, 6]))
+        self.assertEqual(dict(d), {4: .5, 5: 1.5})
+        np.testing.assert_equal(looked_up, np.array([1.5, 0.]))
+        np.testing.assert_equal(keys, np.array([4, 5]))
+
+    def test_keys_array_unsupported_type(self):
+        d = Dict.empty(types.unicode_type, int64)
+        d['a'] = 1
+        with self.assertRaises(TypingError) as raises:
+            d.keys_array()
+        self.assertIn('cannot be stored in an array', str(raises.exception))
+        np.testing.assert_equal(d.values_array(), np.array([1]))
+
     def check_stringify(self, strfn, prefix=False):
         nbd = Dict.empty(int32, int32)
         d = {}
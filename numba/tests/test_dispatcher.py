@@ -8,6 +8,7 @@ import sys
 import threading
 import warnings
 import inspect
+import json
 import pickle
 import weakref
 from itertools import chain
@@ -16,13 +17,15 @@ from io import StringIO
 import numpy as np
 
 from numba import jit, generated_jit, typeof
-from numba.core import types, errors, codegen
+from numba.core import (types, errors, codegen, config, caching,
+                        compile_stats)
 from numba import _dispatcher
 from numba.core.compiler import compile_isolated
 from numba.core.errors import NumbaWarning
 from numba.tests.support import (TestCase, temp_directory, import_dynamic,
-                                 override_env_config, capture_cache_log,
-                                 captured_stdout)
+                                 override_env_config, override_config,
+                                 capture_cache_log, captured_stdout,
+                                 captured_stderr)
 from numba.np.numpy_support import as_dtype
 from numba.core.caching import _UserWideCacheLocator
 from numba.core.dispatcher import Dispatcher
@@ -578,6 +581,42 @@ class TestDispatcher(BaseTest):
         expected_sigs = [(types.complex128,)]
         self.assertEqual(jitfoo.signatures, expected_sigs)
 
+    def test_many_specializations(self):
+        # Exact matches are found among many specializations
+        @jit(nopython=True)
+        def foo(a, b):
+            return a.sum() + b
+
+        dtypes = [np.int8, np.int16, np.int32, np.int64, np.uint8,
+                  np.uint16, np.uint32, np.uint64, np.float32, np.float64]
+        arrays = [np.arange(4, dtype=dt) for dt in dtypes]
+        arrays += [a.reshape((2, 2)) for a in arrays]
+        arrays += [a.T for a in arrays[len(dtypes):]]
+        for a in arrays:
+            self.assertPreciseEqual(foo(a, 1), a.sum() + 1)
+        nsigs = len(foo.signatures)
+        self.assertEqual(nsigs, len(arrays))
+        for i in range(2):
+            for a in arrays:
+                self.assertPreciseEqual(foo(a, 1), a.sum() + 1)
+        self.assertEqual(len(foo.signatures), nsigs)
+
+    def test_resolution_after_new_overload(self):
+        # Memoized conversion-based resolutions are invalidated when a
+        # better overload is added
+        @jit(nopython=True)
+        def foo(x):
+            return x
+
+        foo.compile("(float64,)")
+        foo.disable_compile()
+        self.assertPreciseEqual(foo(np.int32(1)), 1.0)
+        self.assertPreciseEqual(foo(np.int32(1)), 1.0)
+        foo._can_compile = True
+        foo.compile("(int32,)")
+        foo.disable_compile()
+        self.assertPreciseEqual(foo(np.int32(1)), 1)
+
 
 class TestSignatureHandling(BaseTest):
     """
@@ -959,6 +998,128 @@ class TestDispatcherMethods(TestCase):
         self.assertEqual(exp_c, got_c)
         self.assertEqual(exp_f, got_f)
 
+    def test_get_compile_stats(self):
+        @jit(nopython=True)
+        def foo(a):
+            return a + 1
+
+        before = compile_stats.get_compile_stats()
+        foo(1)
+        foo(1.5)
+        after = compile_stats.get_compile_stats()
+        self.assertGreaterEqual(after.compilations - before.compilations, 2)
+
+        all_stats = foo.get_compile_stats()
+        self.assertEqual(set(all_stats), set(foo.signatures))
+        stats = foo.get_compile_stats((types.int64,))
+        self.assertIs(stats, all_stats[(types.int64,)])
+        self.assertIn('test_get_compile_stats.<locals>.foo', stats.function)
+        self.assertEqual(stats.signature, (types.int64,))
+        self.assertIn('nopython.nopython_type_inference', stats.passes)
+        self.assertIn('nopython.native_lowering', stats.passes)
+        self.assertEqual(set(stats.llvm), set(compile_stats.LLVM_STAGES))
+        self.assertGreater(stats.llvm['codegen'], 0)
+        self.assertGreater(stats.typing, 0)
+        self.assertGreaterEqual(stats.total, sum(stats.passes.values()))
+        self.assertGreaterEqual(stats.passes['nopython.native_lowering'],
+                                sum(stats.llvm.values()))
+        self.assertEqual(stats.as_dict()['function'], stats.function)
+        self.assertIn(stats.function, after.functions)
+
+    def test_compile_profile_trace(self):
+        tempdir = temp_directory('test_compile_profile')
+        path = os.path.join(tempdir, 'trace.json')
+        code = """if 1:
+            from numba import njit
+
+            @njit
+            def foo(x):
+                return x * 2
+
+            foo(1)
+            """
+        env = dict(os.environ, NUMBA_COMPILE_PROFILE=path)
+        subprocess.check_call([sys.executable, "-c", code], env=env)
+        with open(path) as f:
+            trace = json.load(f)
+        events = trace['traceEvents']
+        cats = set(ev['cat'] for ev in events)
+        self.assertEqual(cats, {'compile', 'pass', 'llvm'})
+        [compile_event] = [ev for ev in events
+                           if ev['cat'] == 'compile' and
+                           ev['name'] == '__main__.foo']
+        for ev in events:
+            self.assertEqual(ev['ph'], 'X')
+            self.assertGreaterEqual(ev['dur'], 0)
+        passes = [ev for ev in events if ev['cat'] == 'pass' and
+                  ev['args']['function'] == '__main__.foo']
+        self.assertIn('nopython_type_inference',
+                      [ev['name'] for ev in passes])
+        for ev in passes:
+            self.assertGreaterEqual(ev['ts'], compile_event['ts'])
+
+    def test_compile_deferred(self):
+        with override_config('DEFERRED_COMPILE', 1):
+            @jit(["int64(int64)", "float64(float64)"], nopython=True)
+            def foo(x):
+                return x + 1
+
+        self.assertEqual(foo(1), 2)
+        self.assertPreciseEqual(foo(1.5), 2.5)
+        foo.wait_for_compilation()
+        self.assertEqual(len(foo.signatures), 2)
+        self.assertFalse(foo._can_compile)
+        # Conversions to the declared signatures are allowed as usual
+        self.assertPreciseEqual(foo(np.int32(3)), 4)
+        with self.assertRaises(TypeError):
+            foo(1j)
+
+    def test_compile_deferred_callers(self):
+        with override_config('DEFERRED_COMPILE', 1):
+            @jit(["int64(int64)"], nopython=True)
+            def fact(n):
+                return 1 if n <= 1 else n * fact(n - 1)
+
+            @jit(["int64(int64)"], nopython=True)
+            def bar(x):
+                return fact(x) + 1
+
+        self.assertEqual(bar(5), 121)
+        self.assertEqual(fact(5), 120)
+        bar.wait_for_compilation()
+        self.assertEqual(len(fact.signatures), 1)
+
+    def test_compile_deferred_error(self):
+        with override_config('DEFERRED_COMPILE', 1):
+            @jit(["int64(int64)"], nopython=True)
+            def foo(x):
+                return x.no_such_attribute
+
+        with self.assertRaises(errors.TypingError):
+            foo.wait_for_compilation()
+        # The error is raised again when calling the function
+        with self.assertRaises(errors.TypingError):
+            foo(1)
+
+    def test_compile_deferred_partial_error(self):
+        with override_config('DEFERRED_COMPILE', 1):
+            @jit(["int64(int64)", "int64(unicode_type)"], nopython=True)
+            def foo(x):
+                return x + 1
+
+        self.assertEqual(foo(1), 2)
+        with self.assertRaises(errors.TypingError):
+            foo.wait_for_compilation()
+        self.assertEqual(len(foo.signatures), 1)
+        self.assertFalse(foo._can_compile)
+        # Only the calls needing the failed signature raise its error
+        self.assertEqual(foo(2), 3)
+        with self.assertRaises(errors.TypingError):
+            foo("a")
+        with self.assertRaises(TypeError) as raises:
+            foo(1j)
+        self.assertIn("No matching definition", str(raises.exception))
+
 
 class BaseCacheTest(TestCase):
     # This class is also used in test_cfunc.py.
@@ -1421,6 +1582,168 @@ class TestCache(BaseCacheUsecasesTest):
         self.assertIn("cache hits = 1", err.strip())
 
 
+class TestMappedCache(BaseCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    def setUp(self):
+        super(TestMappedCache, self).setUp()
+        os.environ['NUMBA_CACHE_STORE'] = 'mmap'
+        config.reload_config()
+
+    def tearDown(self):
+        del os.environ['NUMBA_CACHE_STORE']
+        config.reload_config()
+        super(TestMappedCache, self).tearDown()
+
+    def test_caching(self):
+        self.check_pycache(0)
+        mod = self.import_module()
+        self.check_pycache(0)
+
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_pycache(1)  # 1 store
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_pycache(1)
+        self.check_hits(f, 0, 2)
+
+        f = mod.add_objmode_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_pycache(1)
+        self.check_hits(f, 0, 2)
+        [store] = self.cache_contents()
+        self.assertTrue(store.endswith('.nbs'))
+
+        # Check the code runs ok from another process
+        self.run_in_separate_process()
+
+    def test_cache_reuse(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3.5)
+        mod.add_objmode_usecase(2, 3)
+        mod.outer(2, 3)
+        mtimes = self.get_cache_mtimes()
+
+        mod2 = self.import_module()
+        f = mod2.add_usecase
+        f(2, 3)
+        self.check_hits(f, 1, 0)
+        f(2.5, 3.5)
+        self.check_hits(f, 2, 0)
+        f = mod2.add_objmode_usecase
+        f(2, 3)
+        self.check_hits(f, 1, 0)
+        f = mod2.outer
+        f(2, 3)
+        self.check_hits(f, 1, 0)
+
+        # The store hasn't changed
+        self.assertEqual(self.get_cache_mtimes(), mtimes)
+
+        self.run_in_separate_process()
+        self.assertEqual(self.get_cache_mtimes(), mtimes)
+
+    def test_cache_invalidate(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+
+        # This should change the functions' results
+        with open(self.modfile, "a") as f:
+            f.write("\nZ = 10\n")
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 15)
+        self.check_hits(f, 0, 1)
+
+    def test_recompile(self):
+        # Explicit call to recompile() should supersede the cached entry
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        mod.Z = 10
+        self.assertPreciseEqual(f(2, 3), 6)
+        f.recompile()
+        self.assertPreciseEqual(f(2, 3), 15)
+
+        # Freshly recompiled version is re-used from other imports
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 15)
+
+    def test_flush(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        f._cache.flush()
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_hits(f, 0, 1)
+
+    def test_truncated_store(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3.5)
+        [store] = self.cache_contents()
+        path = os.path.join(self.cache_dir, store)
+        # Simulate a record cut short by a crashed writer
+        with open(path, "ab") as f:
+            f.write(b'NBSR\x01')
+
+        def reload_module():
+            # Forget the store indexed by this process
+            caching._MappedStore._stores.clear()
+            return self.import_module()
+
+        # The damaged bytes are skipped and dropped, entries saved after
+        # them can still be loaded
+        mod = reload_module()
+        f = mod.add_usecase
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always', NumbaWarning)
+            self.assertPreciseEqual(f(2, 3), 6)
+            self.assertPreciseEqual(f(1j, 2), 3 + 1j)
+        self.check_hits(f, 1, 1)
+        self.assertTrue(any("damaged bytes" in str(x.message) for x in w))
+
+        mod = reload_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2.5, 3.5), 7.0)
+        self.assertPreciseEqual(f(1j, 2), 3 + 1j)
+        self.check_hits(f, 2, 0)
+
+        self.run_in_separate_process()
+
+    def test_compact(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        f(2, 3)
+        for _ in range(3):
+            f.recompile()
+        [store] = self.cache_contents()
+        path = os.path.join(self.cache_dir, store)
+        size = os.path.getsize(path)
+
+        # Only the last of the superseded records is kept
+        reclaimed = caching._MappedStore.for_directory(self.cache_dir).compact()
+        self.assertGreater(reclaimed, 0)
+        self.assertEqual(os.path.getsize(path), size - reclaimed)
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_hits(f, 1, 0)
+
+
 @skip_parfors_unsupported
 class TestSequentialParForsCache(BaseCacheUsecasesTest):
     def setUp(self):
@@ -1550,6 +1873,147 @@ class TestMultiprocessCache(BaseCacheTest):
         self.assertEqual(res, n * (n - 1) // 2)
 
 
+class TestCacheLocking(BaseCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    def test_compile_once(self):
+        # Several processes needing the same function compile it once
+        code = """if 1:
+            import sys
+
+            sys.path.insert(0, %(tempdir)r)
+            mod = __import__(%(modname)r)
+            f = mod.simple_usecase
+            f(1)
+            print(sum(f.stats.cache_misses.values()))
+            """ % dict(tempdir=self.tempdir, modname=self.modname)
+
+        n = 4
+        with override_env_config('NUMBA_CACHE_LOCKING', '1'):
+            popens = [subprocess.Popen([sys.executable, "-c", code],
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+                      for i in range(n)]
+            misses = 0
+            for popen in popens:
+                out, err = popen.communicate()
+                if popen.returncode != 0:
+                    raise AssertionError("process failed with code %s: "
+                                         "stderr follows\n%s\n"
+                                         % (popen.returncode, err.decode()))
+                misses += int(out.decode().strip())
+        self.assertEqual(misses, 1)
+        # 1 index, 1 data, 1 lock
+        self.check_pycache(3)
+
+    def test_nested_compile(self):
+        # Locks are re-entrant within a process
+        with override_env_config('NUMBA_CACHE_LOCKING', '1'):
+            mod = self.import_module()
+            self.assertPreciseEqual(mod.outer(3, 2), 2)
+            self.assertPreciseEqual(mod.outer(3.5, 2), 2.5)
+
+            mod = self.import_module()
+            f = mod.outer
+            self.assertPreciseEqual(f(3, 2), 2)
+            self.check_hits(f, 1, 0)
+
+
+class TestCacheEviction(BaseCacheUsecasesTest):
+    # Disable parallel testing due to envvars modification
+    _numba_parallel_test_ = False
+
+    def test_stats_and_prune(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3)
+        self.check_pycache(3)  # 1 index, 2 data
+        st = caching.get_cache_stats(self.cache_dir)
+        self.assertEqual((st.index_files, st.data_files, st.store_files,
+                          st.lock_files), (1, 2, 0, 0))
+        self.assertEqual(st.stale_files, 0)
+        self.assertGreater(st.total_size, 0)
+
+        # A data file without any index referring to it, and the lock
+        # files of a function with and without cache entries
+        orphan = os.path.join(self.cache_dir, "foo-1.py00.1.nbc")
+        with open(orphan, "wb") as f:
+            f.write(b"x" * 10)
+        [index] = [fn for fn in self.cache_contents() if fn.endswith('.nbi')]
+        used_lock = index[:-len('.nbi')] + '.nbl'
+        for name in (used_lock, "foo-1.py00.nbl"):
+            open(os.path.join(self.cache_dir, name), "wb").close()
+        st = caching.get_cache_stats(self.cache_dir)
+        self.assertEqual(st.lock_files, 2)
+        self.assertEqual(st.stale_files, 2)
+        self.assertEqual(st.stale_size, 10)
+
+        removed = caching.prune_cache(self.cache_dir)
+        self.assertEqual(removed, ["foo-1.py00.1.nbc", "foo-1.py00.nbl"])
+        self.check_pycache(4)
+
+        # The remaining entries are still usable
+        mod = self.import_module()
+        f = mod.add_usecase
+        f(2, 3)
+        f(2.5, 3)
+        self.check_hits(f, 2, 0)
+
+    def test_evict_lru(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3)
+        mtimes = self.get_cache_mtimes()
+        data_files = sorted(fn for fn in mtimes if fn.endswith('.nbc'))
+        # Make the first entry the least recently used
+        older = os.path.join(self.cache_dir, data_files[0])
+        newer = os.path.join(self.cache_dir, data_files[1])
+        os.utime(older, (1, 1))
+        max_size = sum(os.path.getsize(os.path.join(self.cache_dir, fn))
+                       for fn in mtimes) - 1
+        removed = caching.evict_cache_files(self.cache_dir, max_size)
+        self.assertEqual(removed, [data_files[0]])
+        self.assertTrue(os.path.exists(newer))
+
+        # The evicted entry is recompiled, the other one is loaded
+        mod = self.import_module()
+        f = mod.add_usecase
+        f(2, 3)
+        f(2.5, 3)
+        self.check_hits(f, 1, 1)
+
+    def test_evict_store(self):
+        with override_env_config('NUMBA_CACHE_STORE', 'mmap'):
+            mod = self.import_module()
+            f = mod.add_usecase
+            f(2, 3)
+            f.recompile()
+            [store] = self.cache_contents()
+            size = os.path.getsize(os.path.join(self.cache_dir, store))
+
+            # The shared store is compacted but never removed
+            removed = caching.evict_cache_files(self.cache_dir, 1)
+            self.assertEqual(removed, [])
+            self.assertEqual(self.cache_contents(), [store])
+            self.assertLess(
+                os.path.getsize(os.path.join(self.cache_dir, store)), size)
+
+            mod = self.import_module()
+            f = mod.add_usecase
+            f(2, 3)
+            self.check_hits(f, 1, 0)
+
+
+class TestCacheCommand(TestCase):
+
+    def test_max_size_requires_prune(self):
+        from numba.misc.numba_entry import cache_main
+        with captured_stderr():
+            with self.assertRaises(SystemExit):
+                cache_main(['--stats', '--max-size', '1M'])
+
+
 class TestCacheFileCollision(unittest.TestCase):
     _numba_parallel_test_ = False
 
@@ -1,12 +1,13 @@
 import math
 import os
 import platform
+import subprocess
 import sys
 import re
 
 import numpy as np
 
-from numba import njit
+from numba import njit, prange
 from numba.core import typing, types
 from numba.core.compiler import compile_isolated, Flags
 from numba.core.runtime import (
@@ -482,6 +483,36 @@ br i1 %.294, label %B42, label %B160
         # no other lines
         self.assertEqual(len(list(pruned_lines.splitlines())), len(combined))
 
+    def test_refct_pruning_unchanged_module(self):
+        # A module without any prunable refct operation is returned as is,
+        # instead of being printed and parsed again
+        input_ir = '''
+declare void @NRT_incref(i8*)
+
+declare void @NRT_decref(i8*)
+
+define void @foo(i8* %a, i8* %b) {
+entry:
+  tail call void @NRT_incref(i8* %a)
+  br label %exit
+
+exit:
+  tail call void @NRT_decref(i8* %b)
+  ret void
+}
+'''
+        output_ir, changed = nrtopt._prune_redundant_nrt_refct(input_ir)
+        self.assertFalse(changed)
+        ll_module = llvm.parse_assembly(input_ir)
+        self.assertIs(nrtopt.remove_redundant_nrt_refct(ll_module), ll_module)
+
+        # Pruning a pair does produce a new module
+        input_ir = input_ir.replace('br label %exit\n\nexit:\n', '')
+        input_ir = input_ir.replace('NRT_decref(i8* %b)', 'NRT_decref(i8* %a)')
+        output_ir, changed = nrtopt._prune_redundant_nrt_refct(input_ir)
+        self.assertTrue(changed)
+        self.assertNotIn('NRT_incref(i8* %a)', output_ir)
+
     @unittest.skip("Pass removed as it was buggy. Re-enable when fixed.")
     def test_refct_pruning_with_branches(self):
         '''testcase from #2350'''
@@ -665,5 +696,191 @@ NRT_MemInfo* test_nrt_api(NRT_api_functions *nrt, size_t n) {
         self.assertEqual(expect, got)
 
 
+class TestNrtStats(TestCase):
+    """
+    Test the memory statistics of the NRT.
+    """
+
+    _numba_parallel_test_ = False
+
+    def setUp(self):
+        # initialize the NRT (in case the tests are run in isolation)
+        cpu.CPUContext(typing.Context())
+        self.addCleanup(_nrt_python.memsys_set_stats_level,
+                        _nrt_python.memsys_get_stats_level())
+        rtsys.memsys_enable_stats()
+
+    def test_memory_stats(self):
+        @njit
+        def foo(n):
+            acc = 0.
+            for i in range(n):
+                acc += np.ones(i % 10 + 1).sum()
+            return acc
+
+        foo(1)
+        before = rtsys.get_memory_stats()
+        foo(1000)
+        after = rtsys.get_memory_stats()
+        self.assertEqual(after.alloc - before.alloc, 1000)
+        self.assertEqual(after.free - before.free, 1000)
+        self.assertEqual(after.mi_alloc - before.mi_alloc, 1000)
+        self.assertEqual(after.mi_free - before.mi_free, 1000)
+        # 100 arrays of each size from 1 to 10 doubles
+        nbytes = 100 * 8 * sum(range(1, 11))
+        self.assertEqual(after.bytes_alloc - before.bytes_alloc, nbytes)
+        self.assertEqual(after.bytes_free - before.bytes_free, nbytes)
+        self.assertEqual(after.live_bytes, before.live_bytes)
+
+        bounds = [b for b, _ in after.size_hist]
+        self.assertEqual(bounds[:3], [16, 32, 64])
+        self.assertIsNone(bounds[-1])
+        counts = [a - b for (_, a), (_, b)
+                  in zip(after.size_hist, before.size_hist)]
+        self.assertEqual(sum(counts), 1000)
+
+    def test_disable_stats(self):
+        @njit
+        def foo():
+            return np.ones(10)
+
+        foo()
+        before = rtsys.get_allocation_stats()
+        rtsys.memsys_disable_stats()
+        self.assertFalse(rtsys.memsys_stats_enabled())
+        with self.assertRaises(RuntimeError) as raises:
+            rtsys.get_allocation_stats()
+        self.assertIn("NRT stats are disabled", str(raises.exception))
+        for _ in range(10):
+            foo()
+        rtsys.memsys_enable_stats()
+        self.assertTrue(rtsys.memsys_stats_enabled())
+        self.assertEqual(rtsys.get_allocation_stats(), before)
+
+    def test_peak_bytes(self):
+        n = 100000
+
+        @njit
+        def foo(n):
+            a = np.ones(n)
+            b = np.ones(n)
+            return a.sum() + b.sum()
+
+        foo(1)
+        rtsys.memsys_enable_stats(peak=True)
+        rtsys.reset_peak_bytes()
+        before = rtsys.get_memory_stats()
+        self.assertEqual(before.peak_bytes, before.live_bytes)
+        foo(n)
+        after = rtsys.get_memory_stats()
+        self.assertGreaterEqual(after.peak_bytes - before.live_bytes,
+                                2 * n * 8)
+        rtsys.reset_peak_bytes()
+        self.assertEqual(rtsys.get_memory_stats().peak_bytes,
+                         rtsys.get_memory_stats().live_bytes)
+
+    def test_threads(self):
+        @njit(parallel=True)
+        def foo(n):
+            out = np.empty(n)
+            for i in prange(n):
+                out[i] = np.arange(i % 7 + 1.0).sum()
+            return out
+
+        foo(10)
+        before = rtsys.get_memory_stats()
+        foo(10000)
+        after = rtsys.get_memory_stats()
+        self.assertGreaterEqual(after.mi_alloc - before.mi_alloc, 10000)
+        self.assertEqual(after.alloc - before.alloc,
+                         after.free - before.free)
+        self.assertEqual(after.mi_alloc - before.mi_alloc,
+                         after.mi_free - before.mi_free)
+        self.assertEqual(after.bytes_alloc - before.bytes_alloc,
+                         after.bytes_free - before.bytes_free)
+
+
+class TestNrtAllocator(TestCase):
+    """
+    Test the allocators selected with NUMBA_NRT_ALLOCATOR.  This is done in
+    subprocesses as the allocator is installed when numba is imported.
+    """
+
+    _numba_parallel_test_ = False
+
+    def run_with_allocator(self, allocator, cmdline):
+        env = os.environ.copy()
+        env['NUMBA_NRT_ALLOCATOR'] = allocator
+        popen = subprocess.Popen([sys.executable] + cmdline,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 env=env)
+        out, err = popen.communicate()
+        msg = "process failed with code %s: stderr follows\n%s\n"
+        self.assertEqual(popen.returncode, 0,
+                         msg=msg % (popen.returncode, err.decode()))
+        return out.decode(), err.decode()
+
+    def test_pool_small_arrays(self):
+        runme = """if 1:
+            import numpy as np
+            from numba import njit, prange
+            from numba.core.runtime import rtsys
+
+            @njit(parallel=True)
+            def foo(n):
+                out = np.empty(n)
+                for i in prange(n):
+                    tmp = np.arange(i % 50 + 1.0)
+                    out[i] = tmp.sum()
+                return out
+
+            n = 10000
+            k = np.arange(n) % 50
+            expected = k * (k + 1) / 2.
+            foo(1)
+            before = rtsys.get_pool_stats()
+            np.testing.assert_equal(foo(n), expected)
+            after = rtsys.get_pool_stats()
+            print(rtsys.allocator)
+            print(after.alloc - before.alloc >= n)
+            print(after.alloc - before.alloc == after.free - before.free)
+            print(after.large_alloc - before.large_alloc ==
+                  after.large_free - before.large_free)
+            print(after.slab_bytes > 0)
+        """
+        out, _ = self.run_with_allocator('pool', ['-c', runme])
+        self.assertEqual(out.split(), ['pool'] + ['True'] * 4)
+
+    def test_pool_refcount(self):
+        # The reference counting tests check for leaks with the NRT stats
+        test = 'numba.tests.test_nrt_refct'
+        self.run_with_allocator('pool', ['-m', 'numba.runtests', test])
+
+    def test_libc(self):
+        runme = """if 1:
+            import numpy as np
+            from numba import njit
+            from numba.core.runtime import rtsys
+
+            @njit
+            def foo(n):
+                return np.arange(n).sum()
+
+            print(rtsys.allocator, foo(10), rtsys.get_pool_stats().alloc)
+        """
+        out, _ = self.run_with_allocator('libc', ['-c', runme])
+        self.assertEqual(out.split(), ['libc', '45', '0'])
+
+    def test_unknown(self):
+        runme = """if 1:
+            from numba.core.runtime import rtsys
+            print(rtsys.allocator)
+        """
+        out, err = self.run_with_allocator('nonexistent', ['-c', runme])
+        self.assertEqual(out.strip(), 'cpython')
+        self.assertIn("unknown NRT allocator 'nonexistent'", err)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,6 +6,7 @@
 
 from math import sqrt
 import numbers
+import os
 import re
 import sys
 import dis
@@ -19,6 +20,7 @@ import operator
 from collections import defaultdict, namedtuple
 
 import numba.parfors.parfor
+from numba.parfors import autotune
 from numba import njit, prange, set_num_threads, get_num_threads
 from numba.core import (types, utils, typing, errors, ir, rewrites,
                         typed_passes, inline_closurecall, config, compiler, cpu)
@@ -36,9 +38,9 @@ from numba.core.compiler import (compile_isolated, Flags, CompilerBase,
 from numba.core.compiler_machinery import register_pass, AnalysisPass
 from numba.core.typed_passes import IRLegalization
 from numba.tests.support import (TestCase, captured_stdout, MemoryLeakMixin,
-                      override_env_config, linux_only, tag,
+                      override_env_config, override_config, linux_only, tag,
                       skip_parfors_unsupported, _32bit, needs_blas,
-                      needs_lapack, disabled_test)
+                      needs_lapack, disabled_test, temp_directory)
 import cmath
 import unittest
 
@@ -1126,6 +1128,224 @@ class TestParfors(TestParforsBase):
                 pcfunc.entry_point(np.array([], dtype=np.int64))
             self.assertIn(msg, str(e.exception))
 
+    @skip_parfors_unsupported
+    def test_cumsum(self):
+        def test_impl1(A):
+            return A.cumsum()
+
+        def test_impl2(A):
+            return np.cumsum(A)
+
+        def test_impl3(A):
+            return np.nancumsum(A)
+
+        # large enough to be scanned in several blocks
+        n = 100003
+        A = np.random.ranf(n) * 1e-3
+        A[::7] = np.nan
+        B = np.random.randint(10, size=n).astype(np.int32)
+        C = np.random.ranf((211, 211))  # test multi-dimensional array
+        D = np.array([True, False, True])
+        for impl in (test_impl1, test_impl2, test_impl3):
+            self.check(impl, A)
+            self.check(impl, B)
+            self.check(impl, C)
+            self.check(impl, D)
+            self.check(impl, A[:0])
+            self.assertEqual(countParfors(impl, (types.float64[:],)), 2)
+
+    @skip_parfors_unsupported
+    def test_cumprod(self):
+        def test_impl1(A):
+            return A.cumprod()
+
+        def test_impl2(A):
+            return np.cumprod(A)
+
+        def test_impl3(A):
+            return np.nancumprod(A)
+
+        n = 100003
+        A = 1.0 + (np.random.ranf(n) - 0.5) * 1e-5
+        A[::7] = np.nan
+        B = np.random.randint(1, 3, size=n).astype(np.int32)
+        B[::3] = -1
+        C = np.random.ranf((10, 10))  # test multi-dimensional array
+        for impl in (test_impl1, test_impl2, test_impl3):
+            self.check(impl, A)
+            self.check(impl, B)
+            self.check(impl, C)
+            self.check(impl, A[:0])
+            self.assertEqual(countParfors(impl, (types.float64[:],)), 2)
+
+    @skip_parfors_unsupported
+    def test_sort(self):
+        def test_impl1(A):
+            return np.sort(A)
+
+        def test_impl2(A):
+            A.sort()
+            return A
+
+        def test_impl3(A):
+            # radix sorted blocks
+            return np.sort(A, kind='stable')
+
+        # large enough to be sorted in parallel
+        n = numba.parfors.parfor.PARALLEL_SORT_MIN_SIZE * 3 + 17
+        A = np.random.ranf(n)
+        A[::11] = np.nan
+        B = np.random.randint(100, size=n).astype(np.int32)
+        C = np.random.ranf(100)
+        for impl in (test_impl1, test_impl2, test_impl3):
+            self.check(impl, A)
+            self.check(impl, B)
+            self.check(impl, C)
+            self.check(impl, A[::2])
+            self.assertGreaterEqual(countParfors(impl, (types.float64[:],)), 1)
+
+    @skip_parfors_unsupported
+    def test_argsort(self):
+        def test_impl1(A):
+            return A.argsort()
+
+        def test_impl2(A):
+            return np.argsort(A, kind='mergesort')
+
+        n = numba.parfors.parfor.PARALLEL_SORT_MIN_SIZE * 3 + 17
+        # unique keys for the unstable kind
+        A = np.random.permutation(n).astype(np.float64)
+        B = np.random.randint(100, size=n).astype(np.int32)
+        self.check(test_impl1, A)
+        A[::11] = np.nan
+        self.check(test_impl2, A)
+        # the stable kind must keep the order of the duplicated keys
+        self.check(test_impl2, B)
+        self.check(test_impl2, B[:100])
+        for impl in (test_impl1, test_impl2):
+            self.assertGreaterEqual(countParfors(impl, (types.float64[:],)), 1)
+
+    @skip_parfors_unsupported
+    def test_bincount(self):
+        def test_impl1(A):
+            return np.bincount(A)
+
+        def test_impl2(A, W):
+            return np.bincount(A, W)
+
+        n = 100003
+        A = np.random.randint(100, size=n)
+        B = A.astype(np.uint8)
+        W = np.random.ranf(n)
+        self.check(test_impl1, A)
+        self.check(test_impl1, B)
+        self.check(test_impl1, A[:0])
+        self.check(test_impl2, A, W)
+        self.check(test_impl2, B[::3], W[::3])
+        self.assertEqual(countParfors(test_impl1, (types.intp[::1],)), 3)
+
+    @skip_parfors_unsupported
+    def test_histogram(self):
+        def test_impl1(A):
+            return np.histogram(A)
+
+        def test_impl2(A):
+            return np.histogram(A, 25, (0.1, 0.9))
+
+        def test_impl3(A, bins):
+            return np.histogram(A, bins)
+
+        n = 100003
+        A = np.random.ranf(n)
+        B = np.random.randint(1000, size=(101, 103))
+        bins = np.array([0., 0.05, 0.3, 0.31, 0.5, 0.99])
+        for impl in (test_impl1, test_impl2):
+            self.check(impl, A)
+            self.check(impl, B)
+        self.check(test_impl3, A, bins)
+        self.check(test_impl3, B, bins * 1000)
+        self.assertGreaterEqual(
+            countParfors(test_impl3, (types.float64[::1],
+                                      types.float64[::1])), 2)
+
+    @skip_parfors_unsupported
+    def test_reductions_axis(self):
+        def test_impl1(A, axis):
+            return (np.sum(A, axis), np.prod(A, axis), np.mean(A, axis),
+                    np.min(A, axis), np.max(A, axis))
+
+        def test_impl2(A, axis):
+            return (np.var(A, axis=axis), np.std(A, axis=axis),
+                    np.argmin(A, axis=axis), np.argmax(A, axis=axis))
+
+        def test_impl3(A, axis):
+            return (A.sum(axis=axis), A.mean(axis=axis), A.max(axis),
+                    A.argmin(axis))
+
+        # the columns are long enough to be split in blocks
+        A = np.random.ranf((20011, 5))
+        B = np.random.ranf((3, 7, 11))
+        C = np.random.randint(10, size=(41, 13))
+        for impl in (test_impl1, test_impl2, test_impl3):
+            for arr in (A, B, C, A.T, B[:, ::2, :]):
+                for axis in range(-1, arr.ndim):
+                    self.check(impl, arr, axis)
+        # every reduction is parallelized
+        self.assertGreaterEqual(
+            countParfors(test_impl1, (types.float64[:, ::1], types.intp)), 5)
+
+    @skip_parfors_unsupported
+    def test_mask_compress(self):
+        def test_impl1(A):
+            return A[A > 0.5]
+
+        def test_impl2(A, M):
+            return A[M]
+
+        # large enough to be compacted in several blocks
+        n = 100003
+        A = np.random.ranf(n)
+        B = np.arange(n)
+        M = np.random.ranf(n) > 0.9
+        self.check(test_impl1, A)
+        self.check(test_impl1, A[::3])
+        self.check(test_impl1, A[:0])
+        self.check(test_impl2, B, M)
+        self.check(test_impl2, B, np.zeros(n, np.bool_))
+        self.assertEqual(countParfors(test_impl2, (types.intp[::1],
+                                                   types.bool_[::1])), 2)
+
+    @skip_parfors_unsupported
+    def test_nonzero(self):
+        def test_impl1(A):
+            return np.nonzero(A)
+
+        def test_impl2(A):
+            return np.where(A > 0.5)
+
+        def test_impl3(A):
+            return A.nonzero()
+
+        def test_impl4(A):
+            return np.flatnonzero(A)
+
+        def test_impl5(A):
+            return np.argwhere(A)
+
+        n = 100003
+        A = np.random.ranf(n)
+        A[np.random.ranf(n) > 0.3] = 0
+        B = A.reshape((1, n))
+        C = np.random.randint(3, size=(211, 197))
+        for impl in (test_impl1, test_impl2, test_impl3, test_impl4,
+                     test_impl5):
+            self.check(impl, A)
+            self.check(impl, B)
+            self.check(impl, C)
+            self.check(impl, C.T)
+            self.check(impl, A[:0])
+        self.assertEqual(countParfors(test_impl1, (types.float64[::1],)), 2)
+
     @skip_parfors_unsupported
     def test_parfor_array_access1(self):
         # signed index of the prange generated by sum() should be replaced
@@ -2215,6 +2435,66 @@ class TestPrange(TestPrangeBase):
                'operators.')
         self.assertIn(msg, str(raises.exception))
 
+    @skip_parfors_unsupported
+    def test_prange_indexed_reduction(self):
+        # every thread accumulates into a private copy of hist
+        def test_impl1(A, nbins):
+            hist = np.zeros(nbins)
+            for i in range(len(A)):
+                hist[A[i] % nbins] += 1.0
+            return hist
+
+        def test_impl2(A, nbins):
+            hist = np.arange(nbins)
+            for i in range(len(A)):
+                b = A[i] % nbins
+                if b > 3:
+                    hist[b] = hist[b] - A[i]
+                else:
+                    hist[b] -= 1
+            return hist
+
+        def test_impl3(A, nbins):
+            hist = np.ones((nbins, 2))
+            for i in range(len(A)):
+                hist[A[i] % nbins, A[i] % 2] *= 1.25
+            return hist
+
+        A = np.random.randint(1000, size=10000)
+        self.prange_tester(test_impl1, A, 17)
+        self.prange_tester(test_impl2, A, 17)
+        self.prange_tester(test_impl3, A[:60], 3)
+
+    @skip_parfors_unsupported
+    def test_prange_shifted_update(self):
+        # updates at shifted loop indices write different elements in every
+        # iteration, they are not indexed reductions
+        def test_impl1(x):
+            y = np.ones(len(x) + 1)
+            for i in range(len(x)):
+                y[i + 1] += x[i]
+            return y
+
+        def test_impl2(x):
+            n = len(x)
+            y = np.arange(n) * 0.5
+            for i in range(n):
+                y[n - 1 - i] *= x[i]
+            return y
+
+        x = np.arange(100.)
+        for test_impl in (test_impl1, test_impl2):
+            self.prange_tester(test_impl, x)
+            pfunc = self.generate_prange_func(test_impl, None)
+            test_ir, tp = get_optimized_numba_ir(pfunc, (types.float64[::1],))
+            _, parfors = numba.parfors.parfor.get_parfor_params(
+                test_ir.blocks, True, defaultdict(list))
+            self.assertTrue(parfors)
+            for parfor in parfors:
+                indexed = numba.parfors.parfor.get_parfor_indexed_reductions(
+                    parfor, parfor.params, tp.state.calltypes)
+                self.assertEqual(indexed, {})
+
 #    @skip_parfors_unsupported
     @disabled_test
     def test_check_error_model(self):
@@ -3025,6 +3305,282 @@ class TestParforsOptions(TestParforsBase):
                          reduction=False, numpy=False), 0)
 
 
+class TestParforsSchedule(TestParforsBase):
+
+    schedules = [('dynamic', 0), ('dynamic', 7), ('guided', 0),
+                 ('guided', 3)]
+
+    def compile_schedule(self, pyfunc, schedule, chunksize):
+        return njit(parallel={'schedule': schedule,
+                              'chunksize': chunksize})(pyfunc)
+
+    @skip_parfors_unsupported
+    def test_prange_reduction(self):
+        def test_impl(n):
+            acc = 0
+            for i in prange(n):
+                # irregular cost per iteration
+                for j in range(i % 17):
+                    acc += i * j
+            return acc
+
+        for schedule, chunksize in self.schedules:
+            cfunc = self.compile_schedule(test_impl, schedule, chunksize)
+            for n in (0, 1, 5, 1000):
+                self.assertEqual(cfunc(n), test_impl(n))
+
+    @skip_parfors_unsupported
+    def test_prange_offset_and_array_reduction(self):
+        def test_impl(a):
+            acc = np.zeros(3)
+            out = np.empty(a.shape[0] - 3)
+            for i in prange(3, a.shape[0]):
+                out[i - 3] = a[i] * 2
+                acc += a[i]
+            return out, acc
+
+        a = np.arange(101.)
+        for schedule, chunksize in self.schedules:
+            cfunc = self.compile_schedule(test_impl, schedule, chunksize)
+            expected = test_impl(a)
+            got = cfunc(a)
+            np.testing.assert_almost_equal(got[0], expected[0])
+            np.testing.assert_almost_equal(got[1], expected[1])
+
+    @skip_parfors_unsupported
+    def test_multidim(self):
+        def test_impl(a):
+            return a * 2 + 1
+
+        def test_nested(m, n):
+            out = np.zeros((m, n))
+            for i in prange(m):
+                for j in prange(n):
+                    out[i, j] = i * n + j
+            return out
+
+        a = np.arange(60.).reshape(3, 4, 5)
+        for schedule, chunksize in self.schedules:
+            cfunc = self.compile_schedule(test_impl, schedule, chunksize)
+            np.testing.assert_almost_equal(cfunc(a), test_impl(a))
+            cfunc = self.compile_schedule(test_nested, schedule, chunksize)
+            for m, n in ((13, 7), (0, 3), (3, 0)):
+                np.testing.assert_almost_equal(cfunc(m, n), test_nested(m, n))
+
+    @skip_parfors_unsupported
+    def test_parallel_ufunc(self):
+        def add(a, b):
+            return a + b
+
+        def gufunc(a, out):
+            out[0] = a.sum()
+
+        a = np.arange(1000.)
+        b = np.arange(1000.).reshape(100, 10)
+        for schedule, chunksize in self.schedules:
+            ufunc = numba.vectorize(['float64(float64, float64)'],
+                                    target='parallel', schedule=schedule,
+                                    chunksize=chunksize)(add)
+            np.testing.assert_almost_equal(ufunc(a, a), a + a)
+            gu = numba.guvectorize(['void(float64[:], float64[:])'],
+                                   '(n)->()', target='parallel',
+                                   schedule=schedule,
+                                   chunksize=chunksize)(gufunc)
+            np.testing.assert_almost_equal(gu(b), b.sum(axis=1))
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError) as raises:
+            cpu.ParallelOptions({'schedule': 'eager'})
+        self.assertIn("Unrecognized schedule 'eager'", str(raises.exception))
+        with self.assertRaises(ValueError) as raises:
+            cpu.ParallelOptions({'schedule': 'dynamic', 'chunksize': -1})
+        self.assertIn("non-negative integer", str(raises.exception))
+
+    def test_options_not_consumed(self):
+        options = {'schedule': 'guided', 'chunksize': 4}
+        cpu.ParallelOptions(options)
+        popt = cpu.ParallelOptions(options)
+        self.assertEqual(popt.schedule, 'guided')
+        self.assertEqual(popt.chunksize, 4)
+
+
+class TestParforsAutotune(TestParforsBase):
+
+    def learn(self, cfunc, *args):
+        # Enough calls to try every candidate thread count a few times
+        for _ in range(3 * (get_num_threads().bit_length() + 1)):
+            cfunc(*args)
+
+    @skip_parfors_unsupported
+    def test_results(self):
+        def test_impl(a):
+            acc = 0.
+            for i in prange(a.shape[0]):
+                acc += a[i] * 2
+            return a + 1, acc
+
+        cfunc = njit(parallel={'autotune': True})(test_impl)
+        for n in (0, 1, 10, 1000):
+            a = np.arange(float(n))
+            for _ in range(20):
+                got = cfunc(a)
+                expected = test_impl(a)
+                np.testing.assert_almost_equal(got[0], expected[0])
+                self.assertAlmostEqual(got[1], expected[1])
+
+    @skip_parfors_unsupported
+    def test_tuning(self):
+        def test_impl(a):
+            return a * 2
+
+        autotune.reset_tuning()
+        cfunc = njit(parallel={'autotune': True})(test_impl)
+        a = np.arange(100.)
+        self.learn(cfunc, a)
+        [(name, ranges)] = [(k, v) for k, v in autotune.get_tuning().items()
+                            if k.startswith(test_impl.__qualname__)]
+        self.assertIn('array(float64, 1d, C)', name)
+        if get_num_threads() > 1:
+            # 100 iterations fall in the [64, 128) range
+            self.assertEqual(list(ranges), [64])
+            self.assertGreaterEqual(ranges[64], 1)
+            self.assertLessEqual(ranges[64], get_num_threads())
+
+        # Thread counts can be preset, saved and loaded
+        autotune.set_tuning({name: {64: 1, 1 << 20: 2}})
+        self.assertEqual(autotune.get_tuning()[name], {64: 1, 1 << 20: 2})
+        path = os.path.join(temp_directory('test_parfors_autotune'),
+                            'tuning.json')
+        autotune.save_tuning(path)
+        autotune.reset_tuning()
+        self.assertEqual(autotune.get_tuning()[name], {})
+        autotune.load_tuning(path)
+        self.assertEqual(autotune.get_tuning()[name], {64: 1, 1 << 20: 2})
+        np.testing.assert_almost_equal(cfunc(a), test_impl(a))
+
+    @skip_parfors_unsupported
+    def test_tuned_threads(self):
+        def test_impl(a):
+            for i in prange(a.shape[0]):
+                a[i] = get_num_threads()
+            return a
+
+        autotune.reset_tuning()
+        cfunc = njit(parallel={'autotune': True})(test_impl)
+        a = np.zeros(100, dtype=np.int64)
+        cfunc(a)
+        [name] = [k for k in autotune.get_tuning()
+                  if k.startswith(test_impl.__qualname__)]
+        # The loop runs on the tuned number of threads only, and the caller
+        # keeps its own thread count
+        nthreads = get_num_threads()
+        for tuned in sorted({1, min(2, nthreads), nthreads}):
+            autotune.set_tuning({name: {64: tuned}})
+            np.testing.assert_equal(cfunc(a), tuned)
+            self.assertEqual(get_num_threads(), nthreads)
+
+    def test_options(self):
+        self.assertFalse(cpu.ParallelOptions(True).autotune)
+        self.assertTrue(cpu.ParallelOptions({'autotune': True}).autotune)
+
+
+class TestParforsTiling(TestParforsBase):
+
+    @skip_parfors_unsupported
+    def test_multidim(self):
+        def test_2d(a):
+            return a * 2 + 1
+
+        def test_3d(m, n, k):
+            out = np.zeros((m, n, k))
+            for i in prange(m):
+                for j in prange(n):
+                    for l in prange(k):
+                        out[i, j, l] = (i * n + j) * k + l
+            return out
+
+        a = np.arange(391.).reshape(17, 23)
+        for tiling in (True, (1, 1), (4, 5), (100, 100)):
+            cfunc = njit(parallel={'tiling': tiling})(test_2d)
+            np.testing.assert_almost_equal(cfunc(a), test_2d(a))
+        for tiling in (True, (1, 2, 3), (3, 4, 5)):
+            for schedule in ('static', 'dynamic'):
+                cfunc = njit(parallel={'tiling': tiling,
+                                       'schedule': schedule})(test_3d)
+                for shape in ((7, 9, 11), (0, 3, 4), (5, 1, 64)):
+                    np.testing.assert_almost_equal(cfunc(*shape),
+                                                   test_3d(*shape))
+
+    @skip_parfors_unsupported
+    def test_reduction(self):
+        def test_impl(a):
+            acc = 0.
+            for i in prange(a.shape[0]):
+                for j in prange(a.shape[1]):
+                    acc += a[i, j]
+            return acc
+
+        a = np.arange(391.).reshape(17, 23)
+        cfunc = njit(parallel={'tiling': (4, 5)})(test_impl)
+        self.assertAlmostEqual(cfunc(a), test_impl(a))
+
+    @skip_parfors_unsupported
+    def test_signed_bounds(self):
+        def test_impl(m, n):
+            out = np.zeros((m, n))
+            for i in prange(-2, m - 2):
+                for j in prange(n):
+                    out[i + 2, j] = i * n + j
+            return out
+
+        cfunc = njit(parallel={'tiling': (3, 4)})(test_impl)
+        np.testing.assert_almost_equal(cfunc(11, 13), test_impl(11, 13))
+
+    @skip_parfors_unsupported
+    def test_other_dims(self):
+        # The tile sizes of the option only apply to the 2D loop, the 3D
+        # and 1D loops run untiled
+        def test_impl(a):
+            out = np.zeros((3, 4, 5))
+            for i in prange(3):
+                for j in prange(4):
+                    for k in prange(5):
+                        out[i, j, k] = i + j + k
+            return a * 2 + 1, out, a[0] + 1
+
+        a = np.arange(391.).reshape(17, 23)
+        cfunc = njit(parallel={'tiling': (4, 5)})(test_impl)
+        for got, expected in zip(cfunc(a), test_impl(a)):
+            np.testing.assert_almost_equal(got, expected)
+
+    def test_default_tile_shape(self):
+        from numba.parfors.parfor_lowering import _default_tile_shape
+        with override_config('PARFOR_TILE_L1_SIZE', 32 * 1024), \
+                override_config('PARFOR_TILE_L2_SIZE', 1024 * 1024):
+            self.assertEqual(_default_tile_shape(2, 8), (None, 4096))
+            self.assertEqual(_default_tile_shape(3, 8), (None, 32, 4096))
+            self.assertEqual(_default_tile_shape(3, 4), (None, 32, 8192))
+            # The input and output of a 7-point Laplacian, of which three
+            # rows and planes are in use at once
+            self.assertEqual(_default_tile_shape(2, 8, 2, (3, 3)),
+                             (None, 682))
+            self.assertEqual(_default_tile_shape(3, 8, 2, (3, 3, 3)),
+                             (None, 32, 682))
+            # Four arrays of a plain 3D loop
+            self.assertEqual(_default_tile_shape(3, 8, 4), (None, 32, 1024))
+
+    def test_options(self):
+        self.assertFalse(cpu.ParallelOptions(True).tiling)
+        self.assertTrue(cpu.ParallelOptions({'tiling': True}).tiling)
+        self.assertEqual(cpu.ParallelOptions({'tiling': (4, 64)}).tiling,
+                         (4, 64))
+        for tiling in ((), (4, 0), [4, 64], 16):
+            with self.assertRaises(ValueError) as raises:
+                cpu.ParallelOptions({'tiling': tiling})
+            self.assertIn("Expected tiling to be a bool or a tuple",
+                          str(raises.exception))
+
+
 class TestParforsBitMask(TestParforsBase):
 
     def check(self, pyfunc, *args, **kwargs):
@@ -3457,7 +4013,8 @@ class TestParforsDiagnostics(TestParforsBase):
 
     def assert_diagnostics(self, diagnostics, parfors_count=None,
                            fusion_info=None, nested_fusion_info=None,
-                           replaced_fns=None, hoisted_allocations=None):
+                           replaced_fns=None, hoisted_allocations=None,
+                           scratch_buffers=None):
         if parfors_count is not None:
             self.assertEqual(parfors_count, diagnostics.count_parfors())
         if fusion_info is not None:
@@ -3479,6 +4036,10 @@ class TestParforsDiagnostics(TestParforsBase):
             hoisted_allocs = diagnostics.hoisted_allocations()
             self.assertEqual(hoisted_allocations, len(hoisted_allocs))
 
+        if scratch_buffers is not None:
+            scratch = diagnostics.scratch_buffers()
+            self.assertEqual(scratch_buffers, len(scratch))
+
         # just make sure that the dump() function doesn't have an issue!
         with captured_stdout():
             for x in range(1, 5):
@@ -3582,6 +4143,41 @@ class TestParforsDiagnostics(TestParforsBase):
         diagnostics = cpfunc.metadata['parfor_diagnostics']
         self.assert_diagnostics(diagnostics, hoisted_allocations=1)
 
+    def test_scratch_buffer_hoisting(self):
+        def test_impl(a, b, c):
+            out = np.zeros(a.shape[0])
+            for i in range(a.shape[0]):
+                tmp = a[i] * b + c # allocated once, before the loop
+                for j in range(tmp.shape[0]):
+                    out[i] += tmp[j]
+            return out
+
+        a = np.arange(20.).reshape(4, 5)
+        b = np.arange(5.)
+        c = np.ones(5)
+        self.check(test_impl, a, b, c)
+        argtys = tuple(numba.typeof(x) for x in (a, b, c))
+        cpfunc = self.compile_parallel(test_impl, argtys)
+        diagnostics = cpfunc.metadata['parfor_diagnostics']
+        self.assert_diagnostics(diagnostics, scratch_buffers=1)
+
+    def test_scratch_buffer_carried(self):
+        def test_impl(a, b):
+            acc = a[0] * b
+            for i in range(1, a.shape[0]):
+                prev = acc
+                acc = a[i] * b # must not overwrite prev
+                acc += prev
+            return acc
+
+        a = np.arange(20.).reshape(4, 5)
+        b = np.arange(5.)
+        self.check(test_impl, a, b)
+        argtys = tuple(numba.typeof(x) for x in (a, b))
+        cpfunc = self.compile_parallel(test_impl, argtys)
+        diagnostics = cpfunc.metadata['parfor_diagnostics']
+        self.assert_diagnostics(diagnostics, scratch_buffers=0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,7 @@ from numba.tests.support import TestCase, MemoryLeakMixin, tag
 from numba.misc.quicksort import make_py_quicksort, make_jit_quicksort
 from numba.misc.mergesort import make_jit_mergesort
 from numba.misc.timsort import make_py_timsort, make_jit_timsort, MergeRun
+from numba.misc.radixsort import make_py_radixsort, radix_keys
 
 
 def make_temp_list(keys, n):
@@ -845,6 +846,83 @@ class TestNumpySort(TestCase):
         check(np_argsort_kind_usecase, is_stable=False)
 
 
+class TestRadixSort(TestCase):
+
+    def setUp(self):
+        np.random.seed(42)
+
+    def arrays(self):
+        for size in (0, 1, 5, 20, 500):
+            yield np.random.randint(-50, 50, size=size)
+            yield np.random.randint(0, 2 ** 40, size=size).astype(np.uint64)
+            yield np.random.randint(-128, 127, size=size).astype(np.int8)
+            yield np.random.randint(0, 2, size=size).astype(np.bool_)
+            yield (np.random.random(size=size) - 0.5) * 1e6
+            yield ((np.random.random(size=size) - 0.5) * 10).astype(np.float32)
+        # Special floating point values
+        yield np.array([np.nan, -np.inf, 0.0, -0.0, np.inf, -1.5, 1.5,
+                        -np.nan, 5e-324, -5e-324] * 3)
+        # Datetimes and NaTs, few distinct days
+        days = np.random.randint(0, 100, size=500)
+        arr = np.datetime64('2000-01-01') + days.astype('m8[D]')
+        arr[::17] = np.datetime64('NaT')
+        yield arr
+        yield days.astype('m8[s]')
+
+    def check(self, cfunc, arr, stable_func):
+        # The sorted keys must follow NumPy's order and the ties the original
+        # order, as the stable NumPy kind does
+        expected = np.argsort(arr, kind='mergesort')
+        got = stable_func(arr)
+        self.assertPreciseEqual(got, expected)
+        expected = arr[expected]
+        got = cfunc(arr)
+        np.testing.assert_equal(got, expected)
+
+    def test_np_sort(self):
+        cfunc = njit(lambda arr: np.sort(arr, kind='radix'))
+        argsort = njit(lambda arr: np.argsort(arr, kind='radix'))
+        for arr in self.arrays():
+            self.check(cfunc, arr, argsort)
+
+    def test_array_sort(self):
+        @njit
+        def cfunc(arr):
+            res = arr.copy()
+            res.sort(kind='radix')
+            return res
+        argsort = njit(lambda arr: arr.argsort(kind='radix'))
+        for arr in self.arrays():
+            self.check(cfunc, arr, argsort)
+
+    def test_stable(self):
+        cfunc = njit(lambda arr: np.sort(arr, kind='stable'))
+        argsort = njit(lambda arr: np.argsort(arr, kind='stable'))
+        for arr in self.arrays():
+            self.check(cfunc, arr, argsort)
+
+    def test_pure_python(self):
+        sort = make_py_radixsort().run_radixsort
+        argsort = make_py_radixsort(is_argsort=True).run_radixsort
+        jit_radix_keys = njit(lambda arr: radix_keys(arr))
+        for arr in self.arrays():
+            self.assertPreciseEqual(radix_keys(arr), jit_radix_keys(arr))
+            self.check(lambda arr: sort(arr.copy()), arr, argsort)
+
+    def test_errors(self):
+        cfunc = njit(lambda arr: np.argsort(arr, kind='radix'))
+        with self.assertRaises(errors.TypingError) as raises:
+            cfunc(np.zeros(3, np.complex128))
+        self.assertIn("radix sort is not supported for arrays of complex128",
+                      str(raises.exception))
+
+        cfunc = njit(lambda arr: np.sort(arr, kind='heapsort'))
+        with self.assertRaises(errors.TypingError) as raises:
+            cfunc(np.zeros(3))
+        self.assertIn("sort kind must be a constant string",
+                      str(raises.exception))
+
+
 class TestPythonSort(TestCase):
 
     def test_list_sort(self):
@@ -914,6 +992,37 @@ class TestMergeSort(TestCase):
         for args in arglist:
             self.check_argsort_stable(sorter, *args)
 
+    def test_merge_runs(self):
+        imp = make_jit_mergesort(is_argsort=True)
+        corank = imp.merge_corank
+        merge = imp.merge_runs
+
+        @njit
+        def split_merge(idxs, mid, vals, parts):
+            # merge the two sorted runs of idxs in independent parts
+            left = idxs[:mid]
+            right = idxs[mid:]
+            out = np.empty_like(idxs)
+            n = idxs.size
+            for p in range(parts):
+                d0 = p * n // parts
+                d1 = (p + 1) * n // parts
+                i0 = corank(left, right, d0, vals)
+                i1 = corank(left, right, d1, vals)
+                merge(left[i0:i1], right[d0 - i0:d1 - i1], out[d0:d1], vals)
+            return out
+
+        for count in (0, 1, 7, 101, 1003):
+            vals = np.random.randint(0, 10, count)
+            mid = count // 3
+            idxs = np.arange(count)
+            idxs[:mid] = np.argsort(vals[:mid], kind='mergesort')
+            idxs[mid:] = mid + np.argsort(vals[mid:], kind='mergesort')
+            expect = np.argsort(vals, kind='mergesort')
+            for parts in (1, 2, 5):
+                got = split_merge(idxs, mid, vals, parts)
+                np.testing.assert_equal(expect, got)
+
 
 nop_compiler = lambda x:x
 
@@ -582,6 +582,90 @@ class TestStencil(TestStencilBase):
             else:
                 raise AssertionError("Expected error was not raised")
 
+    @skip_unsupported
+    def test_stencil_modes(self):
+        """Tests the border modes against stencils of padded arrays."""
+        np_modes = {'wrap': 'wrap', 'reflect': 'symmetric',
+                    'nearest': 'edge', 'mirror': 'reflect'}
+
+        for mode, np_mode in np_modes.items():
+            kernel_2d = stencil(lambda a: 0.25 * (a[0, 1] + a[1, 0] +
+                                                  a[0, -1] + a[-2, 0]),
+                                mode=mode)
+            kernel_1d = stencil(mode)(lambda a: a[-3] + 2 * a[2])
+
+            def test_impl_2d(A):
+                return kernel_2d(A)
+
+            def test_impl_2d_seq(A):
+                P = np.pad(A, 2, mode=np_mode)
+                n, m = A.shape
+                def s(i, j):
+                    return P[2 + i:2 + i + n, 2 + j:2 + j + m]
+                return 0.25 * (s(0, 1) + s(1, 0) + s(0, -1) + s(-2, 0))
+
+            def test_impl_1d(A):
+                return kernel_1d(A)
+
+            def test_impl_1d_seq(A):
+                P = np.pad(A, 3, mode=np_mode)
+                n = A.shape[0]
+                return P[:n] + 2 * P[5:5 + n]
+
+            A = np.arange(30.).reshape((5, 6))
+            self.check(test_impl_2d_seq, test_impl_2d, A)
+            # the kernel is wider than the array
+            for n in (4, 12):
+                self.check(test_impl_1d_seq, test_impl_1d, np.arange(n) ** 2)
+
+    @skip_unsupported
+    def test_stencil_tile(self):
+        """Tests tiled parallel stencils against a numpy 7-point Laplacian.
+        """
+        def laplace(a):
+            return (a[-1, 0, 0] + a[1, 0, 0] + a[0, -1, 0] + a[0, 1, 0] +
+                    a[0, 0, -1] + a[0, 0, 1] - 6 * a[0, 0, 0])
+
+        def test_impl_seq(A):
+            B = np.zeros_like(A)
+            B[1:-1, 1:-1, 1:-1] = (A[:-2, 1:-1, 1:-1] + A[2:, 1:-1, 1:-1] +
+                                   A[1:-1, :-2, 1:-1] + A[1:-1, 2:, 1:-1] +
+                                   A[1:-1, 1:-1, :-2] + A[1:-1, 1:-1, 2:] -
+                                   6 * A[1:-1, 1:-1, 1:-1])
+            return B
+
+        A = np.arange(1716.).reshape((11, 12, 13)) ** 2
+        for tile in (True, (1, 2, 3), (4, 5, 64)):
+            kernel = stencil(laplace, tile=tile)
+
+            def test_impl(A):
+                return kernel(A)
+
+            self.check(test_impl_seq, test_impl, A)
+
+        # Only the main region follows the 'tiling' option, the border
+        # regions of the modes are not tiled
+        kernel = stencil(laplace, mode='wrap')
+
+        def test_impl_wrap(A):
+            return kernel(A)
+
+        P = np.pad(A, 1, mode='wrap')
+        expected = test_impl_seq(P)[1:-1, 1:-1, 1:-1]
+        cfunc = njit(parallel={'tiling': (2, 3, 4)})(test_impl_wrap)
+        np.testing.assert_almost_equal(cfunc(A), expected)
+
+        with self.assertRaises(ValueError) as raises:
+            stencil(laplace, tile=(0, 4, 4))
+        self.assertIn("Expected tiling to be a bool or a tuple",
+                      str(raises.exception))
+
+    def test_stencil_mode_unsupported(self):
+        with self.assertRaises(ValueError) as raises:
+            stencil(mode='grid-wrap')(lambda a: a[-1] + a[1])
+        self.assertIn("Unsupported mode style grid-wrap",
+                      str(raises.exception))
+
 
 class pyStencilGenerator:
     """
@@ -1516,3 +1516,66 @@ class TestListFromIter(MemoryLeakMixin, TestCase):
             "List() takes no keyword arguments",
             str(raises.exception),
         )
+
+
+class TestArrayConversion(MemoryLeakMixin, TestCase):
+
+    def test_from_array(self):
+        for arr in (np.arange(10), np.linspace(0, 1, 7),
+                    np.array([True, False, True]), np.arange(10)[::3]):
+            l = List.from_array(arr)
+            self.assertEqual(l._dtype, typeof(arr).dtype)
+            self.assertEqual(list(l), arr.tolist())
+
+        with self.assertRaises(ValueError) as raises:
+            List.from_array(np.zeros((2, 2)))
+        self.assertIn("expects a 1D array", str(raises.exception))
+
+    def test_extend_from_array(self):
+        l = List([1, 2])
+        l.extend(np.arange(3, 6))
+        self.assertEqual(list(l), [1, 2, 3, 4, 5])
+        l._make_immutable()
+        with self.assertRaises(ValueError) as raises:
+            l.extend(np.arange(3))
+        self.assertIn("list is immutable", str(raises.exception))
+
+    def test_asarray(self):
+        l = List.from_array(np.arange(5.))
+        arr = l.asarray()
+        np.testing.assert_equal(arr, np.arange(5.))
+        # the array views the storage of the list
+        arr[0] = 10.
+        self.assertEqual(l[0], 10.)
+        # the list is immutable while the array is alive
+        self.assertFalse(l._is_mutable())
+        view = arr[1:]
+        del arr
+        self.assertFalse(l._is_mutable())
+        del view
+        self.assertTrue(l._is_mutable())
+        l.append(5.)
+        self.assertEqual(len(l.asarray()), 6)
+
+    def test_asarray_keeps_list_alive(self):
+        arr = List.from_array(np.arange(4)).asarray()
+        np.testing.assert_equal(arr, np.arange(4))
+
+    def test_compiled(self):
+        @njit
+        def foo(arr):
+            l = List.from_array(arr)
+            l.append(-1)
+            view = l.asarray()
+            return l, view.sum(), l._is_mutable()
+
+        l, total, mutable = foo(np.arange(5))
+        self.assertEqual(list(l), [0, 1, 2, 3, 4, -1])
+        self.assertEqual(total, 9)
+        self.assertFalse(mutable)
+
+    def test_asarray_unsupported_type(self):
+        l = List(['a', 'b'])
+        with self.assertRaises(TypingError) as raises:
+            l.asarray()
+        self.assertIn("cannot be viewed as an array", str(raises.exception))
@@ -0,0 +1,185 @@
+import numpy as np
+
+from numba import njit, typeof
+from numba import int32, float64
+from numba.core import types
+from numba.typed import Set
+from numba.core.errors import TypingError
+from numba.tests.support import TestCase, MemoryLeakMixin, override_config
+
+
+class TestTypedSet(MemoryLeakMixin, TestCase):
+    def test_basic(self):
+        s = Set.empty(int32)
+        # len
+        self.assertEqual(len(s), 0)
+        # add
+        s.add(1)
+        s.add(2)
+        s.add(1)
+        self.assertEqual(len(s), 2)
+        # contains
+        self.assertIn(1, s)
+        self.assertNotIn(3, s)
+        # __iter__
+        self.assertEqual(sorted(s), [1, 2])
+        # discard
+        s.discard(3)
+        s.discard(2)
+        self.assertEqual(sorted(s), [1])
+        # remove
+        with self.assertRaises(KeyError):
+            s.remove(3)
+        s.remove(1)
+        self.assertEqual(len(s), 0)
+        # pop
+        with self.assertRaises(KeyError):
+            s.pop()
+        s.add(4)
+        self.assertEqual(s.pop(), 4)
+        # clear
+        s.update([1, 2, 3])
+        s.clear()
+        self.assertEqual(len(s), 0)
+
+    def test_inferred_type(self):
+        s = Set()
+        s.add(1.5)
+        s.add(2)
+        self.assertEqual(typeof(s), types.SetType(types.float64))
+        self.assertEqual(sorted(s), [1.5, 2.0])
+
+        s = Set([1, 2, 2, 3])
+        self.assertEqual(sorted(s), [1, 2, 3])
+
+    def test_set_operations(self):
+        a = Set([1, 2, 3, 4])
+        b = Set([3, 4, 5])
+        self.assertEqual(sorted(a.union(b)), [1, 2, 3, 4, 5])
+        self.assertEqual(sorted(a.intersection(b)), [3, 4])
+        self.assertEqual(sorted(a.difference(b)), [1, 2])
+        self.assertEqual(sorted(a.symmetric_difference(b)), [1, 2, 5])
+        self.assertFalse(a.isdisjoint(b))
+        self.assertTrue(a.isdisjoint([7, 8]))
+        self.assertTrue(Set([3, 4]).issubset(a))
+        self.assertTrue(a.issuperset([1, 2]))
+        self.assertEqual(a, Set([4, 3, 2, 1]))
+        self.assertNotEqual(a, b)
+        # the operands are unchanged
+        self.assertEqual(sorted(a), [1, 2, 3, 4])
+        self.assertEqual(sorted(b), [3, 4, 5])
+
+    def test_array_operations(self):
+        arr = np.arange(12).reshape(3, 4) % 5
+        s = Set.empty(types.int64)
+        s.update(arr)
+        self.assertEqual(sorted(s), [0, 1, 2, 3, 4])
+
+        s = Set(np.array([1.5, 2.5, 1.5]))
+        self.assertEqual(sorted(s), [1.5, 2.5])
+
+        s = Set(np.arange(6))
+        s.difference_update(np.array([0, 2, 4]))
+        self.assertEqual(sorted(s), [1, 3, 5])
+        s.intersection_update(np.array([[1, 3], [7, 9]]))
+        self.assertEqual(sorted(s), [1, 3])
+        s.symmetric_difference_update(np.array([3, 4]))
+        self.assertEqual(sorted(s), [1, 4])
+        self.assertTrue(s.isdisjoint(np.array([2, 3])))
+
+        query = np.array([[1, 2], [3, 4]])
+        np.testing.assert_equal(s.contains(query),
+                                np.isin(query, [1, 4]))
+
+    def test_njit_basic(self):
+        @njit
+        def foo(n):
+            s = Set.empty(int32)
+            for i in range(n):
+                s.add(i % 3)
+            t = s.copy()
+            t.discard(0)
+            return len(s), len(t), 1 in t, 0 in t
+
+        self.assertEqual(foo(10), (3, 2, True, False))
+
+    def test_njit_iterate(self):
+        @njit
+        def foo(s):
+            total = 0
+            for item in s:
+                total += item
+            return total
+
+        s = Set([1, 2, 3, 4])
+        self.assertEqual(foo(s), 10)
+
+    def test_njit_ctor(self):
+        @njit
+        def foo(arr):
+            return Set(arr)
+
+        s = foo(np.array([[3, 1], [3, 2]]))
+        self.assertIsInstance(s, Set)
+        self.assertEqual(sorted(s), [1, 2, 3])
+
+    def test_njit_untyped_ctor(self):
+        @njit
+        def foo():
+            return Set()
+
+        with self.assertRaises(TypingError) as raises:
+            foo()
+        self.assertIn("use Set.empty() to create an empty set",
+                      str(raises.exception))
+
+    def test_njit_operators(self):
+        @njit
+        def foo(a, b):
+            c = a.copy()
+            c |= b
+            d = a.copy()
+            d -= b
+            return (a | b, a & b, a - b, a ^ b, c, d,
+                    a <= b, a == b, a != b)
+
+        a = Set([1, 2, 3])
+        b = Set([2, 3, 4])
+        union, inter, diff, symdiff, c, d, le, eq, ne = foo(a, b)
+        self.assertEqual(sorted(union), [1, 2, 3, 4])
+        self.assertEqual(sorted(inter), [2, 3])
+        self.assertEqual(sorted(diff), [1])
+        self.assertEqual(sorted(symdiff), [1, 4])
+        self.assertEqual(sorted(c), [1, 2, 3, 4])
+        self.assertEqual(sorted(d), [1])
+        self.assertFalse(le)
+        self.assertFalse(eq)
+        self.assertTrue(ne)
+
+    def test_njit_array_contains(self):
+        @njit
+        def foo(s, arr):
+            s.update(arr[:2])
+            return s.contains(arr)
+
+        s = Set.empty(float64)
+        arr = np.array([1.0, 2.0, 3.0, 4.0])
+        np.testing.assert_equal(foo(s, arr),
+                                np.array([True, True, False, False]))
+        # the set is mutated in place
+        self.assertEqual(sorted(s), [1.0, 2.0])
+
+    def test_unboxed_set_is_shared(self):
+        @njit
+        def foo(s):
+            s.add(10)
+
+        s = Set([1])
+        foo(s)
+        self.assertEqual(sorted(s), [1, 10])
+
+    def test_disable_jit(self):
+        with override_config('DISABLE_JIT', True):
+            s = Set([1, 2])
+            self.assertIsInstance(s, set)
+            self.assertIsInstance(Set.empty(int32), set)
@@ -541,6 +541,46 @@ class TestFingerprint(TestCase):
         distinct.add(compute_fingerprint(0.0))
         distinct.add(compute_fingerprint(1))
 
+    def test_numba_type(self):
+        # Values whose class defines _numba_type_ are fingerprinted with the
+        # typecode of their type, also when nested in a tuple
+        from numba.typed import Dict, List
+        distinct = DistinctChecker()
+
+        d1 = Dict.empty(types.int64, types.float64)
+        d2 = Dict.empty(types.int64, types.float64)
+        d3 = Dict.empty(types.int64, types.int64)
+        s = compute_fingerprint(d1)
+        self.assertEqual(compute_fingerprint(d2), s)
+        distinct.add(s)
+        distinct.add(compute_fingerprint(d3))
+        distinct.add(compute_fingerprint(Custom()))
+
+        l1 = List.empty_list(types.float64)
+        l2 = List.empty_list(types.float64)
+        s = compute_fingerprint(l1)
+        self.assertEqual(compute_fingerprint(l2), s)
+        distinct.add(s)
+
+        a = np.arange(3)
+        s = compute_fingerprint((a, d1, l1))
+        self.assertEqual(compute_fingerprint((a, d2, l2)), s)
+        distinct.add(s)
+        distinct.add(compute_fingerprint((a, d3, l1)))
+
+        # An untyped container can't be typed
+        with self.assertRaises(TypeError):
+            compute_fingerprint(Dict())
+
+        # A _numba_type_ that isn't a Numba type is left to typeof()
+        class NotAType(object):
+            _numba_type_ = 42
+
+        with self.assertRaises(NotImplementedError):
+            compute_fingerprint(NotAType())
+        with self.assertRaises(NotImplementedError):
+            compute_fingerprint((1, NotAType()))
+
     def test_complicated_type(self):
         # Generating a large fingerprint
         t = None
@@ -1,2 +1,3 @@
 from .typeddict import Dict
 from .typedlist import List
+from .typedset import Set
@@ -6,6 +6,7 @@ import operator
 from enum import IntEnum
 
 from llvmlite import ir
+import numpy as np
 
 from numba import _helperlib
 
@@ -30,6 +31,7 @@ from numba.core.types import (
 from numba.core.imputils import impl_ret_borrowed, RefType
 from numba.core.errors import TypingError
 from numba.core import typing
+from numba.np.numpy_support import as_dtype
 from numba.typed.typedobjectutils import (_as_bytes, _cast, _nonoptional,
                                           _sentry_safe_cast_default,
                                           _get_incref_decref,
@@ -68,13 +70,16 @@ class Status(IntEnum):
     ERR_CMP_FAILED = -5
 
 
-def new_dict(key, value):
+def new_dict(key, value, n_keys=0):
     """Construct a new dict.
 
     Parameters
     ----------
     key, value : TypeRef
         Key type and value type of the new dict.
+    n_keys : int; optional
+        The number of keys to make room for, so that inserting them does not
+        resize the dict.
     """
     # With JIT disabled, ignore all arguments and return a Python dict.
     return dict()
@@ -245,6 +250,52 @@ def _dict_new_minsize(typingctx, keyty, valty):
     return sig, codegen
 
 
+@intrinsic
+def _dict_new_sized(typingctx, n_keys, keyty, valty):
+    """Wrap numba_dict_new_sized.
+
+    Allocate a new dictionary object with enough space to hold
+    *n_keys* keys without needing a resize.
+
+    Parameters
+    ----------
+    n_keys: int
+        The number of keys to insert without needing a resize.
+    keyty, valty: Type
+        Type of the key and value, respectively.
+
+    """
+    resty = types.voidptr
+    sig = resty(types.intp, keyty, valty)
+
+    def codegen(context, builder, sig, args):
+        n_keys = args[0]
+        fnty = ir.FunctionType(
+            ll_status,
+            [ll_dict_type.as_pointer(), ll_ssize_t, ll_ssize_t, ll_ssize_t],
+        )
+        fn = builder.module.get_or_insert_function(
+            fnty, name='numba_dict_new_sized')
+        # Determine sizeof key and value types
+        ll_key = context.get_data_type(keyty.instance_type)
+        ll_val = context.get_data_type(valty.instance_type)
+        sz_key = context.get_abi_sizeof(ll_key)
+        sz_val = context.get_abi_sizeof(ll_val)
+        refdp = cgutils.alloca_once(builder, ll_dict_type, zfill=True)
+        status = builder.call(
+            fn,
+            [refdp, n_keys, ll_ssize_t(sz_key), ll_ssize_t(sz_val)],
+        )
+        _raise_if_error(
+            context, builder, status,
+            msg="Failed to allocate dictionary",
+        )
+        dp = builder.load(refdp)
+        return dp
+
+    return sig, codegen
+
+
 @intrinsic
 def _dict_set_method_table(typingctx, dp, keyty, valty):
     """Wrap numba_dict_set_method_table
@@ -386,6 +437,57 @@ def _dict_length(typingctx, d):
     return sig, codegen
 
 
+@intrinsic
+def _dict_reserve(typingctx, d, n_keys):
+    """Wrap numba_dict_reserve
+
+    Resizes the dictionary, if needed, to hold *n_keys* keys without
+    further resizing.
+    """
+    resty = types.int32
+    sig = resty(d, types.intp)
+
+    def codegen(context, builder, sig, args):
+        fnty = ir.FunctionType(
+            ll_status,
+            [ll_dict_type, ll_ssize_t],
+        )
+        fn = builder.module.get_or_insert_function(fnty,
+                                                   name='numba_dict_reserve')
+        [d, n_keys] = args
+        [td, _] = sig.args
+        dp = _container_get_data(context, builder, td, d)
+        status = builder.call(fn, [dp, n_keys])
+        return status
+
+    return sig, codegen
+
+
+@intrinsic
+def _dict_sizeof(typingctx, d):
+    """Wrap numba_dict_sizeof
+
+    Returns the number of bytes allocated for the dictionary and its hash
+    table.
+    """
+    resty = types.intp
+    sig = resty(d)
+
+    def codegen(context, builder, sig, args):
+        fnty = ir.FunctionType(
+            ll_ssize_t,
+            [ll_dict_type],
+        )
+        fn = builder.module.get_or_insert_function(fnty,
+                                                   name='numba_dict_sizeof')
+        [d] = args
+        [td] = sig.args
+        dp = _container_get_data(context, builder, td, d)
+        return builder.call(fn, [dp])
+
+    return sig, codegen
+
+
 @intrinsic
 def _dict_dump(typingctx, d):
     """Dump the dictionary keys and values.
@@ -632,7 +734,7 @@ def _make_dict(typingctx, keyty, valty, ptr):
 
 
 @overload(new_dict)
-def impl_new_dict(key, value):
+def impl_new_dict(key, value, n_keys=0):
     """Creates a new dictionary with *key* and *value* as the type
     of the dictionary key and value, respectively.
     """
@@ -644,8 +746,10 @@ def impl_new_dict(key, value):
 
     keyty, valty = key, value
 
-    def imp(key, value):
-        dp = _dict_new_minsize(keyty, valty)
+    def imp(key, value, n_keys=0):
+        if n_keys < 0:
+            raise ValueError("expecting *n_keys* to be >= 0")
+        dp = _dict_new_sized(n_keys, keyty, valty)
         _dict_set_method_table(dp, keyty, valty)
         d = _make_dict(keyty, valty, dp)
         return d
@@ -851,6 +955,26 @@ def impl_setdefault(dct, key, default=None):
     return impl
 
 
+@overload_method(types.DictType, 'reserve')
+def impl_reserve(d, n_keys):
+    """Makes room for *n_keys* keys in total, so that inserting them does
+    not resize the dictionary.
+    """
+    if not isinstance(d, types.DictType):
+        return
+
+    def impl(d, n_keys):
+        if n_keys < 0:
+            raise ValueError("expecting *n_keys* to be >= 0")
+        status = _dict_reserve(d, n_keys)
+        if status == Status.ERR_NO_MEMORY:
+            raise MemoryError('Unable to allocate memory to reserve keys')
+        elif status != Status.OK:
+            raise RuntimeError('dict.reserve failed unexpectedly')
+
+    return impl
+
+
 @overload_method(types.DictType, 'items')
 def impl_items(d):
     if not isinstance(d, types.DictType):
@@ -885,6 +1009,124 @@ def impl_values(d):
     return impl
 
 
+def _sentry_array(arr, name):
+    if not isinstance(arr, types.Array):
+        raise TypingError('expected *{}* to be an array, got {}'
+                          .format(name, arr))
+
+
+def _array_dtype(ty, what):
+    """Returns the NumPy dtype of arrays of dictionary keys or values of
+    type *ty*.
+    """
+    try:
+        return as_dtype(ty)
+    except NotImplementedError:
+        raise TypingError('dictionary {} of type {} cannot be stored in an '
+                          'array'.format(what, ty))
+
+
+@overload_method(types.DictType, 'update_from_arrays')
+def impl_update_from_arrays(d, keys, values):
+    """Insert the items of the array *keys* with the matching items of the
+    array *values* in a single loop.
+    """
+    if not isinstance(d, types.DictType):
+        return
+    _sentry_array(keys, 'keys')
+    _sentry_array(values, 'values')
+
+    def impl(d, keys, values):
+        if keys.size != values.size:
+            raise ValueError('keys and values must have the same size')
+        ks = keys.ravel()
+        vs = values.ravel()
+        for i in range(ks.size):
+            d[ks[i]] = vs[i]
+
+    return impl
+
+
+@overload_method(types.DictType, 'keys_array')
+def impl_keys_array(d):
+    """Returns the keys of the dictionary, in insertion order, in a new
+    1D array.
+    """
+    if not isinstance(d, types.DictType):
+        return
+    dtype = _array_dtype(d.key_type, 'keys')
+
+    def impl(d):
+        out = np.empty(len(d), dtype)
+        i = 0
+        for k in d.keys():
+            out[i] = k
+            i += 1
+        return out
+
+    return impl
+
+
+@overload_method(types.DictType, 'values_array')
+def impl_values_array(d):
+    """Returns the values of the dictionary, in insertion order, in a new
+    1D array.
+    """
+    if not isinstance(d, types.DictType):
+        return
+    dtype = _array_dtype(d.value_type, 'values')
+
+    def impl(d):
+        out = np.empty(len(d), dtype)
+        i = 0
+        for v in d.values():
+            out[i] = v
+            i += 1
+        return out
+
+    return impl
+
+
+@overload_method(types.DictType, 'lookup_array')
+def impl_lookup_array(d, keys, default=None):
+    """Returns an array of the shape of the array *keys* holding the value
+    of each key.  Missing keys get *default*, or raise a KeyError when no
+    default is given.
+    """
+    if not isinstance(d, types.DictType):
+        return
+    _sentry_array(keys, 'keys')
+    keyty = d.key_type
+    dtype = _array_dtype(d.value_type, 'values')
+    _sentry_safe_cast_default(default, d.value_type)
+
+    if default is None or isinstance(default, (types.Omitted, types.NoneType)):
+        def impl(d, keys, default=None):
+            out = np.empty(keys.shape, dtype)
+            out_flat = out.reshape(out.size)
+            ks = keys.ravel()
+            for i in range(ks.size):
+                out_flat[i] = d[ks[i]]
+            return out
+    else:
+        def impl(d, keys, default=None):
+            out = np.empty(keys.shape, dtype)
+            out_flat = out.reshape(out.size)
+            ks = keys.ravel()
+            for i in range(ks.size):
+                k = _cast(ks[i], keyty)
+                ix, val = _dict_lookup(d, k, hash(k))
+                if ix > DKIX.EMPTY:
+                    out_flat[i] = _nonoptional(val)
+                elif ix == DKIX.EMPTY:
+                    out_flat[i] = default
+                else:
+                    raise AssertionError("internal dict error during lookup")
+            return out
+
+    return impl
+
+
 @overload(operator.eq)
 def impl_equal(da, db):
     if not isinstance(da, types.DictType):
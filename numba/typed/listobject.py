@@ -6,6 +6,7 @@ import operator
 from enum import IntEnum
 
 from llvmlite import ir
+import numpy as np
 
 from numba import _helperlib
 
@@ -550,6 +551,97 @@ def _list_set_is_mutable(typingctx, l, is_mutable):
     return sig, codegen
 
 
+def _is_array_item_type(itemty):
+    """Returns True if items of type *itemty* are stored in the list like in
+    a NumPy array, so that the storage of the list can be used as an array.
+    """
+    return isinstance(itemty, (types.Number, types.Boolean,
+                               types.NPDatetime, types.NPTimedelta))
+
+
+@intrinsic
+def _list_append_array(typingctx, l, arr):
+    """Wrap numba_list_append_n
+
+    Appends all the items of the 1D C-contiguous array *arr*, whose dtype
+    must be the item type of the list, with a single copy.
+    """
+    if not (isinstance(arr, types.Array) and arr.ndim == 1
+            and arr.layout == 'C' and arr.dtype == l.item_type):
+        raise TypingError('expected a 1D C-contiguous array of {}'
+                          .format(l.item_type))
+    resty = types.int32
+    sig = resty(l, arr)
+
+    def codegen(context, builder, sig, args):
+        fnty = ir.FunctionType(
+            ll_status,
+            [ll_list_type, ll_bytes, ll_ssize_t],
+        )
+        fn = builder.module.get_or_insert_function(fnty,
+                                                   name='numba_list_append_n')
+        [l, arr] = args
+        [tl, tarr] = sig.args
+        ary = context.make_array(tarr)(context, builder, arr)
+        lp = _container_get_data(context, builder, tl, l)
+        status = builder.call(
+            fn,
+            [
+                lp,
+                _as_bytes(builder, ary.data),
+                ary.nitems,
+            ],
+        )
+        return status
+
+    return sig, codegen
+
+
+@intrinsic
+def _list_as_array(typingctx, l):
+    """Returns a 1D array viewing the storage of the list.
+
+    The array shares the meminfo of the list and so keeps it alive, but it is
+    invalidated by any operation resizing the list.
+    """
+    if not _is_array_item_type(l.item_type):
+        raise TypingError('items of type {} cannot be viewed as an array'
+                          .format(l.item_type))
+    resty = types.Array(l.item_type, 1, 'C')
+    sig = resty(l)
+
+    def codegen(context, builder, sig, args):
+        from numba.np.arrayobj import populate_array
+
+        [l] = args
+        [tl] = sig.args
+        arrty = sig.return_type
+        lp = _container_get_data(context, builder, tl, l)
+
+        fnty = ir.FunctionType(ll_bytes, [ll_list_type])
+        base_ptr = builder.module.get_or_insert_function(
+            fnty, name='numba_list_base_ptr')
+        fnty = ir.FunctionType(ll_ssize_t, [ll_list_type])
+        length = builder.module.get_or_insert_function(
+            fnty, name='numba_list_length')
+
+        ary = context.make_array(arrty)(context, builder)
+        itemsize = context.get_constant(
+            types.intp, context.get_abi_sizeof(ary.data.type.pointee),
+        )
+        populate_array(
+            ary,
+            data=builder.bitcast(builder.call(base_ptr, [lp]), ary.data.type),
+            shape=[builder.call(length, [lp])],
+            strides=[itemsize],
+            itemsize=itemsize,
+            meminfo=_container_get_meminfo(context, builder, tl, l),
+        )
+        return impl_ret_borrowed(context, builder, arrty, ary._getvalue())
+
+    return sig, codegen
+
+
 @intrinsic
 def _list_append(typingctx, l, item):
     """Wrap numba_list_append
@@ -1012,6 +1104,22 @@ def impl_count(l, item):
     return impl
 
 
+@register_jitable
+def _append_items(l, items):
+    """Append the items of the 1D C-contiguous array *items* with a single
+    copy.
+    """
+    status = _list_append_array(l, items)
+    if status == ListStatus.LIST_OK:
+        return
+    elif status == ListStatus.LIST_ERR_IMMUTABLE:
+        raise ValueError('list is immutable')
+    elif status == ListStatus.LIST_ERR_NO_MEMORY:
+        raise MemoryError('Unable to allocate memory to extend list')
+    else:
+        raise RuntimeError('list.extend failed unexpectedly')
+
+
 @overload_method(types.ListType, 'extend')
 def impl_extend(l, iterable):
     if not isinstance(l, types.ListType):
@@ -1032,6 +1140,14 @@ def impl_extend(l, iterable):
                 for i in iterable:
                     l.append(i)
 
+            return impl
+        elif (isinstance(iterable, types.Array) and iterable.ndim == 1 and
+              iterable.dtype == l.item_type and
+              _is_array_item_type(l.item_type)):
+            # copy the items of the array in a single block
+            def impl(l, iterable):
+                _append_items(l, np.ascontiguousarray(iterable))
+
             return impl
         else:
             def impl(l, iterable):
@@ -1063,6 +1179,24 @@ def impl_extend(l, iterable):
         return sig, select_impl()
 
 
+@overload_method(types.ListType, 'asarray')
+def impl_asarray(l):
+    """list.asarray()
+
+    Returns a 1D array viewing the items of the list without copying them.
+    The list is made immutable so that the view stays valid; it can be made
+    mutable again with ``_make_mutable()`` once the array is not used anymore.
+    """
+    if not isinstance(l, types.ListType):
+        return
+
+    def impl(l):
+        l._make_immutable()
+        return _list_as_array(l)
+
+    return impl
+
+
 @overload_method(types.ListType, 'insert')
 def impl_insert(l, index, item):
     if not isinstance(l, types.ListType):
@@ -0,0 +1,538 @@
+"""
+Compiler-side implementation of the typed set.
+
+A typed set is stored as a typed dictionary (see dictobject.py) whose keys
+are the items of the set, so that it shares its C hash table.  The two have
+the same data model and a set is converted to its dictionary and back at no
+cost.
+"""
+import operator
+
+import numpy as np
+
+from numba.core.extending import (
+    overload,
+    overload_method,
+    intrinsic,
+    register_model,
+    lower_builtin,
+)
+from numba.core import types, typing
+from numba.core.types import SetType, Type
+from numba.core.imputils import impl_ret_borrowed
+from numba.core.errors import TypingError
+from numba.typed import dictobject
+from numba.typed.dictobject import DictModel, new_dict
+
+
+def new_set(item):
+    """Construct a new set.
+
+    Parameters
+    ----------
+    item : TypeRef
+        Item type of the new set.
+    """
+    # With JIT disabled, ignore all arguments and return a Python set.
+    return set()
+
+
+# The set is its dictionary
+register_model(SetType)(DictModel)
+
+
+@intrinsic
+def _as_dict(typingctx, setobj):
+    """Returns the typed dictionary storing the items of a set.
+    """
+    if not isinstance(setobj, types.SetType):
+        raise TypingError('expected *setobj* to be a SetType')
+
+    def codegen(context, builder, sig, args):
+        [s] = args
+        return impl_ret_borrowed(context, builder, sig.return_type, s)
+
+    sig = setobj.dict_type(setobj)
+    return sig, codegen
+
+
+@intrinsic
+def _from_dict(typingctx, dctobj):
+    """Returns the set of the keys of a typed dictionary storing a set.
+    """
+    if not (isinstance(dctobj, types.DictType)
+            and dctobj.value_type == types.boolean):
+        raise TypingError('expected *dctobj* to be a DictType with '
+                          'boolean values')
+
+    def codegen(context, builder, sig, args):
+        [d] = args
+        return impl_ret_borrowed(context, builder, sig.return_type, d)
+
+    sig = types.SetType(dctobj.key_type)(dctobj)
+    return sig, codegen
+
+
+@overload(new_set)
+def impl_new_set(item):
+    """Creates a new set with *item* as the type of its items.
+    """
+    if not isinstance(item, Type):
+        raise TypeError("expecting *item* to be a numba Type")
+
+    def imp(item):
+        return _from_dict(new_dict(item, types.boolean))
+
+    return imp
+
+
+def _sentry_set(s):
+    if not isinstance(s, types.SetType):
+        raise TypingError('expected a SetType, got {}'.format(s))
+
+
+@overload(len)
+def impl_len(s):
+    """len(set)
+    """
+    if not isinstance(s, types.SetType):
+        return
+
+    def impl(s):
+        return len(_as_dict(s))
+
+    return impl
+
+
+@overload(operator.contains)
+def impl_contains(s, item):
+    if not isinstance(s, types.SetType):
+        return
+
+    def impl(s, item):
+        return item in _as_dict(s)
+
+    return impl
+
+
+@overload_method(types.SetType, 'add')
+def impl_add(s, item):
+    _sentry_set(s)
+
+    def impl(s, item):
+        _as_dict(s)[item] = True
+
+    return impl
+
+
+@overload_method(types.SetType, 'discard')
+def impl_discard(s, item):
+    _sentry_set(s)
+
+    def impl(s, item):
+        _as_dict(s).pop(item, False)
+
+    return impl
+
+
+@overload_method(types.SetType, 'remove')
+def impl_remove(s, item):
+    _sentry_set(s)
+
+    def impl(s, item):
+        _as_dict(s).pop(item)
+
+    return impl
+
+
+@overload_method(types.SetType, 'pop')
+def impl_pop(s):
+    _sentry_set(s)
+
+    def impl(s):
+        item, _ = _as_dict(s).popitem()
+        return item
+
+    return impl
+
+
+@overload_method(types.SetType, 'clear')
+def impl_clear(s):
+    _sentry_set(s)
+
+    def impl(s):
+        _as_dict(s).clear()
+
+    return impl
+
+
+@overload_method(types.SetType, 'copy')
+def impl_copy(s):
+    _sentry_set(s)
+
+    def impl(s):
+        return _from_dict(_as_dict(s).copy())
+
+    return impl
+
+
+def _sentry_items(items):
+    if not isinstance(items, (types.SetType, types.IterableType)):
+        raise TypingError('expected a set or an iterable, got {}'
+                          .format(items))
+
+
+@overload_method(types.SetType, 'update')
+def impl_update(s, items):
+    """Add the items of a set or an iterable.  All the items of arrays are
+    added, whatever their number of dimensions.
+    """
+    _sentry_set(s)
+    _sentry_items(items)
+
+    if isinstance(items, types.Array):
+        def impl(s, items):
+            d = _as_dict(s)
+            for item in items.flat:
+                d[item] = True
+    else:
+        def impl(s, items):
+            d = _as_dict(s)
+            for item in items:
+                d[item] = True
+
+    return impl
+
+
+@overload_method(types.SetType, 'difference_update')
+def impl_difference_update(s, items):
+    _sentry_set(s)
+    _sentry_items(items)
+
+    if isinstance(items, types.Array):
+        def impl(s, items):
+            d = _as_dict(s)
+            for item in items.flat:
+                d.pop(item, False)
+    else:
+        def impl(s, items):
+            d = _as_dict(s)
+            for item in items:
+                d.pop(item, False)
+
+    return impl
+
+
+@overload_method(types.SetType, 'intersection')
+def impl_intersection(s, items):
+    _sentry_set(s)
+    _sentry_items(items)
+    item_type = s.item_type
+
+    if isinstance(items, types.SetType):
+        def impl(s, items):
+            res = new_set(item_type)
+            # look up the items of the smaller set in the larger one
+            if len(s) <= len(items):
+                for item in s:
+                    if item in items:
+                        res.add(item)
+            else:
+                for item in items:
+                    if item in s:
+                        res.add(item)
+            return res
+    elif isinstance(items, types.Array):
+        def impl(s, items):
+            res = new_set(item_type)
+            for item in items.flat:
+                if item in s:
+                    res.add(item)
+            return res
+    else:
+        def impl(s, items):
+            res = new_set(item_type)
+            for item in items:
+                if item in s:
+                    res.add(item)
+            return res
+
+    return impl
+
+
+@overload_method(types.SetType, 'intersection_update')
+def impl_intersection_update(s, items):
+    _sentry_set(s)
+    _sentry_items(items)
+
+    def impl(s, items):
+        keep = s.intersection(items)
+        if len(keep) != len(s):
+            s.clear()
+            s.update(keep)
+
+    return impl
+
+
+@overload_method(types.SetType, 'union')
+def impl_union(s, items):
+    _sentry_set(s)
+    _sentry_items(items)
+
+    def impl(s, items):
+        res = s.copy()
+        res.update(items)
+        return res
+
+    return impl
+
+
+@overload_method(types.SetType, 'difference')
+def impl_difference(s, items):
+    _sentry_set(s)
+    _sentry_items(items)
+    item_type = s.item_type
+
+    if isinstance(items, types.SetType):
+        def impl(s, items):
+            res = new_set(item_type)
+            for item in s:
+                if item not in items:
+                    res.add(item)
+            return res
+    else:
+        def impl(s, items):
+            res = s.copy()
+            res.difference_update(items)
+            return res
+
+    return impl
+
+
+@overload_method(types.SetType, 'symmetric_difference')
+def impl_symmetric_difference(s, items):
+    _sentry_set(s)
+    _sentry_items(items)
+
+    if isinstance(items, types.SetType):
+        def impl(s, items):
+            res = s.difference(items)
+            for item in items:
+                if item not in s:
+                    res.add(item)
+            return res
+    else:
+        # the items are collected in a set of the same type first
+        item_type = s.item_type
+
+        def impl(s, items):
+            other = new_set(item_type)
+            other.update(items)
+            return s.symmetric_difference(other)
+
+    return impl
+
+
+@overload_method(types.SetType, 'symmetric_difference_update')
+def impl_symmetric_difference_update(s, items):
+    _sentry_set(s)
+    _sentry_items(items)
+
+    def impl(s, items):
+        res = s.symmetric_difference(items)
+        s.clear()
+        s.update(res)
+
+    return impl
+
+
+@overload_method(types.SetType, 'issubset')
+def impl_issubset(s, items):
+    _sentry_set(s)
+    if not isinstance(items, types.SetType):
+        raise TypingError('expected a SetType, got {}'.format(items))
+
+    def impl(s, items):
+        if len(s) > len(items):
+            return False
+        for item in s:
+            if item not in items:
+                return False
+        return True
+
+    return impl
+
+
+@overload_method(types.SetType, 'issuperset')
+def impl_issuperset(s, items):
+    _sentry_set(s)
+    if not isinstance(items, types.SetType):
+        raise TypingError('expected a SetType, got {}'.format(items))
+
+    def impl(s, items):
+        return items.issubset(s)
+
+    return impl
+
+
+@overload_method(types.SetType, 'isdisjoint')
+def impl_isdisjoint(s, items):
+    _sentry_set(s)
+    _sentry_items(items)
+
+    if isinstance(items, types.Array):
+        def impl(s, items):
+            for item in items.flat:
+                if item in s:
+                    return False
+            return True
+    else:
+        def impl(s, items):
+            for item in items:
+                if item in s:
+                    return False
+            return True
+
+    return impl
+
+
+@overload_method(types.SetType, 'contains')
+def impl_contains_array(s, items):
+    """Returns a boolean array of the shape of the array *items* telling
+    which of its items are in the set.
+    """
+    _sentry_set(s)
+    if not isinstance(items, types.Array):
+        raise TypingError('expected an array, got {}'.format(items))
+
+    def impl(s, items):
+        d = _as_dict(s)
+        out = np.empty(items.shape, np.bool_)
+        out_flat = out.ravel()
+        i = 0
+        for item in items.flat:
+            out_flat[i] = item in d
+            i += 1
+        return out
+
+    return impl
+
+
+@overload(operator.eq)
+def impl_equal(sa, sb):
+    if not isinstance(sa, types.SetType):
+        return
+    if not isinstance(sb, types.SetType):
+        # If RHS is not a set, always returns False
+        def impl_type_mismatch(sa, sb):
+            return False
+        return impl_type_mismatch
+
+    def impl_type_matched(sa, sb):
+        return len(sa) == len(sb) and sa.issubset(sb)
+
+    return impl_type_matched
+
+
+@overload(operator.ne)
+def impl_not_equal(sa, sb):
+    if not isinstance(sa, types.SetType):
+        return
+
+    def impl(sa, sb):
+        return not (sa == sb)
+
+    return impl
+
+
+@overload(operator.le)
+def impl_le(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            return sa.issubset(sb)
+        return impl
+
+
+@overload(operator.ge)
+def impl_ge(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            return sa.issuperset(sb)
+        return impl
+
+
+@overload(operator.or_)
+def impl_or(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            return sa.union(sb)
+        return impl
+
+
+@overload(operator.and_)
+def impl_and(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            return sa.intersection(sb)
+        return impl
+
+
+@overload(operator.sub)
+def impl_sub(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            return sa.difference(sb)
+        return impl
+
+
+@overload(operator.xor)
+def impl_xor(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            return sa.symmetric_difference(sb)
+        return impl
+
+
+@overload(operator.ior)
+def impl_ior(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            sa.update(sb)
+            return sa
+        return impl
+
+
+@overload(operator.iand)
+def impl_iand(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            sa.intersection_update(sb)
+            return sa
+        return impl
+
+
+@overload(operator.isub)
+def impl_isub(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            sa.difference_update(sb)
+            return sa
+        return impl
+
+
+@overload(operator.ixor)
+def impl_ixor(sa, sb):
+    if isinstance(sa, types.SetType) and isinstance(sb, types.SetType):
+        def impl(sa, sb):
+            sa.symmetric_difference_update(sb)
+            return sa
+        return impl
+
+
+@lower_builtin('getiter', types.SetType)
+def impl_set_getiter(context, builder, sig, args):
+    """Implement iter(Set), iterating over the keys of its dictionary
+    """
+    [ts] = sig.args
+    sig = typing.signature(sig.return_type, ts.dict_type)
+    return dictobject.impl_dict_getiter(context, builder, sig, args)
@@ -3,6 +3,8 @@ Python wrapper that connects CPython interpreter to the numba dictobject.
 """
 from collections.abc import MutableMapping
 
+import numpy as np
+
 from numba.core.types import DictType, TypeRef
 from numba.core.imputils import numba_typeref_ctor
 from numba import njit, typeof
@@ -17,11 +19,13 @@ from numba.core.extending import (
 )
 from numba.typed import dictobject
 from numba.core.typing import signature
+from numba.np.numpy_support import from_dtype
 
 
 @njit
-def _make_dict(keyty, valty):
-    return dictobject._as_meminfo(dictobject.new_dict(keyty, valty))
+def _make_dict(keyty, valty, n_keys=0):
+    return dictobject._as_meminfo(dictobject.new_dict(keyty, valty,
+                                                      n_keys=n_keys))
 
 
 @njit
@@ -74,6 +78,36 @@ def _copy(d):
     return d.copy()
 
 
+@njit
+def _reserve(d, n_keys):
+    d.reserve(n_keys)
+
+
+@njit
+def _sizeof(d):
+    return dictobject._dict_sizeof(d)
+
+
+@njit
+def _update_from_arrays(d, keys, values):
+    d.update_from_arrays(keys, values)
+
+
+@njit
+def _keys_array(d):
+    return d.keys_array()
+
+
+@njit
+def _values_array(d):
+    return d.values_array()
+
+
+@njit
+def _lookup_array(d, keys, default):
+    return d.lookup_array(keys, default)
+
+
 def _from_meminfo_ptr(ptr, dicttype):
     d = Dict(meminfo=ptr, dcttype=dicttype)
     return d
@@ -92,14 +126,32 @@ class Dict(MutableMapping):
             return object.__new__(cls)
 
     @classmethod
-    def empty(cls, key_type, value_type):
+    def empty(cls, key_type, value_type, n_keys=0):
         """Create a new empty Dict with *key_type* and *value_type*
         as the types for the keys and values of the dictionary respectively.
+
+        Optionally, allocate enough memory to hold *n_keys* without requiring
+        resizes. The default value of 0 returns a dict with minimum size.
         """
         if config.DISABLE_JIT:
             return dict()
         else:
-            return cls(dcttype=DictType(key_type, value_type))
+            return cls(dcttype=DictType(key_type, value_type), n_keys=n_keys)
+
+    @classmethod
+    def from_arrays(cls, keys, values):
+        """Create a new Dict mapping the items of the array *keys* to the
+        matching items of the array *values*.  The key and value types are
+        the dtypes of the arrays.
+        """
+        keys = np.asarray(keys)
+        values = np.asarray(values)
+        if config.DISABLE_JIT:
+            return dict(zip(keys.ravel().tolist(), values.ravel().tolist()))
+        d = cls.empty(from_dtype(keys.dtype), from_dtype(values.dtype),
+                      n_keys=keys.size)
+        d.update_from_arrays(keys, values)
+        return d
 
     def __init__(self, **kwargs):
         """
@@ -112,20 +164,24 @@ class Dict(MutableMapping):
             Used internally for the dictionary type.
         meminfo : MemInfo; keyword-only
             Used internally to pass the MemInfo object when boxing.
+        n_keys : int; keyword-only
+            Used internally to pass the number of keys to make room for.
         """
         if kwargs:
             self._dict_type, self._opaque = self._parse_arg(**kwargs)
         else:
             self._dict_type = None
+            self._n_keys = 0
 
-    def _parse_arg(self, dcttype, meminfo=None):
+    def _parse_arg(self, dcttype, meminfo=None, n_keys=0):
         if not isinstance(dcttype, DictType):
             raise TypeError('*dcttype* must be a DictType')
 
         if meminfo is not None:
             opaque = meminfo
         else:
-            opaque = _make_dict(dcttype.key_type, dcttype.value_type)
+            opaque = _make_dict(dcttype.key_type, dcttype.value_type,
+                                n_keys=n_keys)
         return dcttype, opaque
 
     @property
@@ -142,7 +198,8 @@ class Dict(MutableMapping):
 
     def _initialise_dict(self, key, value):
         dcttype = types.DictType(typeof(key), typeof(value))
-        self._dict_type, self._opaque = self._parse_arg(dcttype)
+        self._dict_type, self._opaque = self._parse_arg(dcttype,
+                                                        n_keys=self._n_keys)
 
     def __getitem__(self, key):
         if not self._typed:
@@ -208,15 +265,82 @@ class Dict(MutableMapping):
     def copy(self):
         return _copy(self)
 
+    def reserve(self, n_keys):
+        """Make room for *n_keys* keys in total, so that inserting them does
+        not resize the dictionary.
+        """
+        if not self._typed:
+            # applied when the dictionary gets typed
+            self._n_keys = max(self._n_keys, n_keys)
+        else:
+            _reserve(self, n_keys)
+
+    def __sizeof__(self):
+        """Returns the memory footprint of the dictionary, in bytes.  The
+        memory owned by the keys and values, like the data of strings or
+        arrays, is not included.
+        """
+        size = object.__sizeof__(self)
+        if self._typed:
+            size += _sizeof(self)
+        return size
+
+    def update_from_arrays(self, keys, values):
+        """Insert the items of the array *keys* with the matching items of the
+        array *values* in a single compiled loop.
+        """
+        keys = np.asarray(keys)
+        values = np.asarray(values)
+        if not self._typed:
+            dcttype = types.DictType(from_dtype(keys.dtype),
+                                     from_dtype(values.dtype))
+            self._dict_type, self._opaque = self._parse_arg(
+                dcttype, n_keys=self._n_keys)
+        _update_from_arrays(self, keys, values)
+
+    def keys_array(self):
+        """Returns the keys, in insertion order, in a new 1D array.
+        """
+        return _keys_array(self)
+
+    def values_array(self):
+        """Returns the values, in insertion order, in a new 1D array.
+        """
+        return _values_array(self)
+
+    def lookup_array(self, keys, default=None):
+        """Returns an array of the shape of the array *keys* holding the value
+        of each key.  Missing keys get *default*, or raise a KeyError when no
+        default is given.
+        """
+        return _lookup_array(self, np.asarray(keys), default)
+
 
 # XXX: should we have a better way to classmethod
 @overload_method(TypeRef, 'empty')
-def typeddict_empty(cls, key_type, value_type):
+def typeddict_empty(cls, key_type, value_type, n_keys=0):
     if cls.instance_type is not DictType:
         return
 
-    def impl(cls, key_type, value_type):
-        return dictobject.new_dict(key_type, value_type)
+    def impl(cls, key_type, value_type, n_keys=0):
+        return dictobject.new_dict(key_type, value_type, n_keys=n_keys)
+
+    return impl
+
+
+@overload_method(TypeRef, 'from_arrays')
+def typeddict_from_arrays(cls, keys, values):
+    if cls.instance_type is not DictType:
+        return
+    if not (isinstance(keys, types.Array) and isinstance(values, types.Array)):
+        raise errors.TypingError('expected *keys* and *values* to be arrays')
+
+    key_type, value_type = keys.dtype, values.dtype
+
+    def impl(cls, keys, values):
+        d = dictobject.new_dict(key_type, value_type, n_keys=keys.size)
+        d.update_from_arrays(keys, values)
+        return d
 
     return impl
 
@@ -10,6 +10,8 @@ it should really quack like the CPython `list`.
 """
 from collections.abc import MutableSequence
 
+import numpy as np
+
 from numba.core.types import ListType, TypeRef
 from numba.core.imputils import numba_typeref_ctor
 from numba.core.dispatcher import Dispatcher
@@ -26,6 +28,7 @@ from numba.core.extending import (
 from numba.typed import listobject
 from numba.core.errors import TypingError, LoweringError
 from numba.core.typing.templates import Signature
+from numba.np.numpy_support import from_dtype
 
 DEFAULT_ALLOCATED = listobject.DEFAULT_ALLOCATED
 
@@ -166,6 +169,44 @@ def _sort(l, key, reverse):
     return l.sort(key, reverse)
 
 
+@njit
+def _as_array(l):
+    return listobject._list_as_array(l)
+
+
+# live array views per list, keyed by the data of its meminfo: the number
+# of views and whether the list was mutable before the first one
+_array_views = {}
+
+
+class _ListArrayView(object):
+    """Exports the storage of a typed-list through the array interface.
+
+    The list is kept immutable while arrays created from this object are
+    alive, so that its storage is not reallocated under them.
+    """
+
+    def __init__(self, lst):
+        key = lst._opaque.data
+        if key not in _array_views:
+            _array_views[key] = [0, lst._is_mutable()]
+            lst._make_immutable()
+        _array_views[key][0] += 1
+        self._key = key
+        self._list = lst
+        # the boxed array holds a reference to the meminfo of the list
+        self._array = _as_array(lst)
+        self.__array_interface__ = self._array.__array_interface__
+
+    def __del__(self):
+        views = _array_views[self._key]
+        views[0] -= 1
+        if views[0] == 0:
+            del _array_views[self._key]
+            if views[1]:
+                self._list._make_mutable()
+
+
 def _from_meminfo_ptr(ptr, listtype):
     return List(meminfo=ptr, lsttype=listtype)
 
@@ -204,6 +245,20 @@ class List(MutableSequence):
         else:
             return cls(lsttype=ListType(item_type), allocated=allocated)
 
+    @classmethod
+    def from_array(cls, arr):
+        """Create a new List holding the items of the 1D array *arr*, copied
+        in a single block.  The item type is the dtype of the array.
+        """
+        arr = np.asarray(arr)
+        if arr.ndim != 1:
+            raise ValueError("List.from_array() expects a 1D array")
+        if config.DISABLE_JIT:
+            return arr.tolist()
+        lst = cls.empty_list(from_dtype(arr.dtype), allocated=len(arr))
+        lst.extend(arr)
+        return lst
+
     def __init__(self, *args, **kwargs):
         """
         For users, the constructor does not take any parameters.
@@ -299,6 +354,15 @@ class List(MutableSequence):
     def _make_immutable(self):
         return _make_immutable(self)
 
+    def asarray(self):
+        """Returns a 1D array viewing the items of the list without copying
+        them.  The list is immutable while the array, or any view of it,
+        is alive.
+        """
+        if not self._typed:
+            raise TypeError("invalid operation on untyped list")
+        return np.asarray(_ListArrayView(self))
+
     def __eq__(self, other):
         return _eq(self, other)
 
@@ -413,6 +477,23 @@ def typedlist_empty(cls, item_type, allocated=DEFAULT_ALLOCATED):
     return impl
 
 
+@overload_method(TypeRef, 'from_array')
+def typedlist_from_array(cls, arr):
+    if cls.instance_type is not ListType:
+        return
+    if not (isinstance(arr, types.Array) and arr.ndim == 1):
+        raise TypingError("List.from_array() expects a 1D array")
+
+    item_type = arr.dtype
+
+    def impl(cls, arr):
+        l = listobject.new_list(item_type, allocated=len(arr))
+        l.extend(arr)
+        return l
+
+    return impl
+
+
 @box(types.ListType)
 def box_lsttype(typ, val, c):
     context = c.context
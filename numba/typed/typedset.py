@@ -0,0 +1,531 @@
+"""
+Python wrapper that connects CPython interpreter to the numba setobject.
+"""
+from collections.abc import MutableSet
+
+import numpy as np
+
+from numba.core.types import SetType, TypeRef
+from numba.core.imputils import numba_typeref_ctor
+from numba import njit, typeof
+from numba.core import types, errors, config, cgutils
+from numba.core.extending import (
+    overload_method,
+    overload,
+    box,
+    unbox,
+    NativeValue,
+    type_callable,
+)
+from numba.core.typing import signature
+from numba.core.typing.templates import Signature
+from numba.typed import dictobject, setobject
+
+
+@njit
+def _make_set(itemty):
+    return dictobject._as_meminfo(
+        setobject._as_dict(setobject.new_set(itemty)))
+
+
+@njit
+def _length(s):
+    return len(s)
+
+
+@njit
+def _contains(s, item):
+    return item in s
+
+
+@njit
+def _add(s, item):
+    s.add(item)
+
+
+@njit
+def _discard(s, item):
+    s.discard(item)
+
+
+@njit
+def _remove(s, item):
+    s.remove(item)
+
+
+@njit
+def _pop(s):
+    return s.pop()
+
+
+@njit
+def _clear(s):
+    s.clear()
+
+
+@njit
+def _copy(s):
+    return s.copy()
+
+
+@njit
+def _iter(s):
+    return list(s)
+
+
+@njit
+def _update(s, items):
+    s.update(items)
+
+
+@njit
+def _difference_update(s, items):
+    s.difference_update(items)
+
+
+@njit
+def _intersection_update(s, items):
+    s.intersection_update(items)
+
+
+@njit
+def _symmetric_difference_update(s, items):
+    s.symmetric_difference_update(items)
+
+
+@njit
+def _isdisjoint(s, items):
+    return s.isdisjoint(items)
+
+
+@njit
+def _issubset(s, other):
+    return s.issubset(other)
+
+
+@njit
+def _eq(s, other):
+    return s == other
+
+
+@njit
+def _contains_array(s, items):
+    return s.contains(items)
+
+
+def _from_meminfo_ptr(ptr, settype):
+    return Set(meminfo=ptr, settype=settype)
+
+
+class Set(MutableSet):
+    """A typed-set usable in Numba compiled functions.
+
+    Implements the MutableSet interface.  Set operations taking a NumPy
+    array or another typed-set as operand run entirely in compiled code.
+    """
+
+    def __new__(cls, *args, settype=None, meminfo=None):
+        if config.DISABLE_JIT:
+            return set(*args)
+        else:
+            return object.__new__(cls)
+
+    @classmethod
+    def empty(cls, item_type):
+        """Create a new empty Set with *item_type* as the type for the items
+        of the set.
+        """
+        if config.DISABLE_JIT:
+            return set()
+        else:
+            return cls(settype=SetType(item_type))
+
+    def __init__(self, *args, **kwargs):
+        """
+        For users, the constructor takes an optional iterable to initialise
+        the set from.  The keyword arguments are for internal use only.
+
+        Parameters
+        ----------
+        args: iterable
+            The iterable to initialise the set from
+        settype : numba.core.types.SetType; keyword-only
+            Used internally for the set type.
+        meminfo : MemInfo; keyword-only
+            Used internally to pass the MemInfo object when boxing.
+        """
+        if kwargs:
+            self._set_type, self._opaque = self._parse_arg(**kwargs)
+        else:
+            self._set_type = None
+        if args:
+            if len(args) > 1:
+                raise TypeError("Set() expected at most 1 argument, got {}"
+                                .format(len(args)))
+            self.update(args[0])
+
+    def _parse_arg(self, settype, meminfo=None):
+        if not isinstance(settype, SetType):
+            raise TypeError('*settype* must be a SetType')
+
+        if meminfo is not None:
+            opaque = meminfo
+        else:
+            opaque = _make_set(settype.item_type)
+        return settype, opaque
+
+    @property
+    def _numba_type_(self):
+        if self._set_type is None:
+            raise TypeError("invalid operation on untyped set")
+        return self._set_type
+
+    @property
+    def _typed(self):
+        """Returns True if the set is typed.
+        """
+        return self._set_type is not None
+
+    def _initialise_set(self, item):
+        self._set_type, self._opaque = self._parse_arg(
+            types.SetType(typeof(item)))
+
+    def _as_operand(self, items):
+        """Returns *items* in a form accepted by the compiled set operations,
+        or None if they have to be processed one at a time.
+        """
+        if isinstance(items, (Set, np.ndarray)):
+            if not self._typed:
+                if isinstance(items, Set):
+                    if not items._typed:
+                        return None
+                    self._set_type, self._opaque = self._parse_arg(
+                        items._set_type)
+                else:
+                    self._set_type, self._opaque = self._parse_arg(
+                        types.SetType(typeof(items).dtype))
+            return items
+        return None
+
+    def __len__(self):
+        if not self._typed:
+            return 0
+        else:
+            return _length(self)
+
+    def __contains__(self, item):
+        if len(self) == 0:
+            return False
+        else:
+            return _contains(self, item)
+
+    def __iter__(self):
+        if not self._typed:
+            return iter(())
+        else:
+            return iter(_iter(self))
+
+    def add(self, item):
+        if not self._typed:
+            self._initialise_set(item)
+        _add(self, item)
+
+    def discard(self, item):
+        if self._typed:
+            _discard(self, item)
+
+    def remove(self, item):
+        if not self._typed:
+            raise KeyError(item)
+        _remove(self, item)
+
+    def pop(self):
+        if len(self) == 0:
+            raise KeyError('pop from an empty set')
+        return _pop(self)
+
+    def clear(self):
+        if self._typed:
+            _clear(self)
+
+    def copy(self):
+        if not self._typed:
+            return Set()
+        return _copy(self)
+
+    def update(self, *others):
+        for items in others:
+            operand = self._as_operand(items)
+            if operand is not None:
+                _update(self, operand)
+            else:
+                for item in items:
+                    self.add(item)
+
+    def difference_update(self, *others):
+        for items in others:
+            if not self._typed:
+                return
+            operand = self._as_operand(items)
+            if operand is not None:
+                _difference_update(self, operand)
+            else:
+                for item in items:
+                    self.discard(item)
+
+    def intersection_update(self, *others):
+        for items in others:
+            if not self._typed:
+                return
+            operand = self._as_operand(items)
+            if operand is not None:
+                _intersection_update(self, operand)
+            else:
+                keep = Set.empty(self._set_type.item_type)
+                for item in items:
+                    if item in self:
+                        keep.add(item)
+                _clear(self)
+                _update(self, keep)
+
+    def symmetric_difference_update(self, items):
+        operand = self._as_operand(items)
+        if operand is None:
+            operand = Set(items)
+            if not operand._typed:
+                return
+            if not self._typed:
+                self._as_operand(operand)
+        _symmetric_difference_update(self, operand)
+
+    def union(self, *others):
+        res = self.copy()
+        res.update(*others)
+        return res
+
+    def intersection(self, *others):
+        res = self.copy()
+        res.intersection_update(*others)
+        return res
+
+    def difference(self, *others):
+        res = self.copy()
+        res.difference_update(*others)
+        return res
+
+    def symmetric_difference(self, items):
+        res = self.copy()
+        res.symmetric_difference_update(items)
+        return res
+
+    def isdisjoint(self, items):
+        if not self._typed:
+            return True
+        operand = self._as_operand(items)
+        if operand is not None:
+            return _isdisjoint(self, operand)
+        return all(item not in self for item in items)
+
+    def issubset(self, items):
+        if not isinstance(items, Set):
+            items = Set(items)
+        if not self._typed:
+            return True
+        if not items._typed:
+            return len(self) == 0
+        return _issubset(self, items)
+
+    def issuperset(self, items):
+        if not isinstance(items, Set):
+            items = Set(items)
+        return items.issubset(self)
+
+    def contains(self, items):
+        """Returns a boolean array of the shape of the array *items* telling
+        which of its items are in the set.
+        """
+        items = np.asarray(items)
+        if not self._typed:
+            return np.zeros(items.shape, dtype=np.bool_)
+        return _contains_array(self, items)
+
+    def __eq__(self, other):
+        if not isinstance(other, Set):
+            return super(Set, self).__eq__(other)
+        if not (self._typed and other._typed):
+            return len(self) == len(other)
+        return _eq(self, other)
+
+    def __le__(self, other):
+        if not isinstance(other, Set):
+            return super(Set, self).__le__(other)
+        return self.issubset(other)
+
+    def __ge__(self, other):
+        if not isinstance(other, Set):
+            return super(Set, self).__ge__(other)
+        return self.issuperset(other)
+
+    __hash__ = None
+
+    def __str__(self):
+        return '{{{0}}}'.format(', '.join(str(item) for item in self))
+
+    def __repr__(self):
+        body = str(self)
+        prefix = str(self._set_type)
+        return "{prefix}({body})".format(prefix=prefix, body=body)
+
+
+# XXX: should we have a better way to classmethod
+@overload_method(TypeRef, 'empty')
+def typedset_empty(cls, item_type):
+    if cls.instance_type is not SetType:
+        return
+
+    def impl(cls, item_type):
+        return setobject.new_set(item_type)
+
+    return impl
+
+
+@box(types.SetType)
+def box_settype(typ, val, c):
+    context = c.context
+    builder = c.builder
+
+    ctor = cgutils.create_struct_proxy(typ)
+    sstruct = ctor(context, builder, value=val)
+    # Returns the plain MemInfo
+    boxed_meminfo = c.box(
+        types.MemInfoPointer(types.voidptr),
+        sstruct.meminfo,
+    )
+
+    modname = c.context.insert_const_string(
+        c.builder.module, 'numba.typed.typedset',
+    )
+    typedset_mod = c.pyapi.import_module_noblock(modname)
+    fmp_fn = c.pyapi.object_getattr_string(typedset_mod, '_from_meminfo_ptr')
+
+    settype_obj = c.pyapi.unserialize(c.pyapi.serialize_object(typ))
+
+    res = c.pyapi.call_function_objargs(fmp_fn, (boxed_meminfo, settype_obj))
+    c.pyapi.decref(fmp_fn)
+    c.pyapi.decref(typedset_mod)
+    c.pyapi.decref(boxed_meminfo)
+    return res
+
+
+@unbox(types.SetType)
+def unbox_settype(typ, val, c):
+    context = c.context
+
+    miptr = c.pyapi.object_getattr_string(val, '_opaque')
+
+    mip_type = types.MemInfoPointer(types.voidptr)
+    native = c.unbox(mip_type, miptr)
+
+    mi = native.value
+
+    # The set is rebuilt from the meminfo of its dictionary
+    argtypes = mip_type, typeof(typ.dict_type)
+
+    def convert(mi, dcttype):
+        return setobject._from_dict(dictobject._from_meminfo(mi, dcttype))
+
+    sig = signature(typ, *argtypes)
+    nil_typeref = context.get_constant_null(argtypes[1])
+    args = (mi, nil_typeref)
+    is_error, setobj = c.pyapi.call_jit_code(convert, sig, args)
+    # decref here because we are stealing a reference.
+    c.context.nrt.decref(c.builder, typ, setobj)
+
+    c.pyapi.decref(miptr)
+    return NativeValue(setobj, is_error=is_error)
+
+
+#
+# The following contains the logic for the type-inferred constructor
+#
+
+def _guess_item_type(iterable):
+    """Guess the item type of a set built from *iterable*. """
+    if isinstance(iterable, types.SetType):
+        return iterable.item_type
+    elif isinstance(iterable, types.Array):
+        # all the items of arrays are added, whatever their dimension
+        return iterable.dtype
+    elif isinstance(iterable, types.DictType):
+        return iterable.key_type
+    elif isinstance(iterable, types.IterableType):
+        return iterable.iterator_type.yield_type
+    raise errors.TypingError("Set() argument must be iterable")
+
+
+@type_callable(SetType)
+def typedset_call(context):
+    """Defines typing logic for ``Set(iterable)``.
+
+    The returned typer types a new typed-set with its item type guessed from
+    the iterable.  Sets without items must be created with ``Set.empty()``
+    since the item type of an empty typed-set is not inferred.
+    """
+
+    class Typer(object):
+
+        def attach_sig(self):
+            from inspect import signature as mypysig
+
+            def mytyper(iterable):
+                pass
+            self.pysig = mypysig(mytyper)
+
+        def __call__(self, *args, **kwargs):
+            if kwargs:
+                raise errors.TypingError(
+                    "Set() takes no keyword arguments"
+                )
+            if len(args) != 1:
+                raise errors.TypingError(
+                    "Set() expected 1 argument, got {}; use Set.empty() to "
+                    "create an empty set".format(len(args))
+                )
+            rt = types.SetType(_guess_item_type(args[0]))
+            self.attach_sig()
+            return Signature(rt, args, None, pysig=self.pysig)
+
+    return Typer()
+
+
+@overload(numba_typeref_ctor)
+def impl_numba_typeref_ctor(cls, *args):
+    """
+    Defines ``Set(iterable)``, the type-inferred version of the set ctor.
+
+    Parameters
+    ----------
+    cls : TypeRef
+        Expecting a TypeRef of a precise SetType.
+    args: tuple
+        A tuple that contains a single iterable
+
+    See also: `redirect_type_ctor` in numba/cpython/bulitins.py
+    """
+    set_ty = cls.instance_type
+    if not isinstance(set_ty, types.SetType):
+        return  # reject
+    # Ensure the set is precisely typed.
+    if not set_ty.is_precise():
+        msg = "expecting a precise SetType but got {}".format(set_ty)
+        raise errors.LoweringError(msg)
+
+    item_type = types.TypeRef(set_ty.item_type)
+
+    def impl(cls, *args):
+        # Instantiate an empty set and populate it from the iterable.
+        r = Set.empty(item_type)
+        r.update(args[0])
+        return r
+
+    return impl